@@ -11,6 +11,7 @@ Generates detailed reports for each guardrail type with:
 Usage:
     python analyze_guardrails.py --results output/screener_results.csv
     python analyze_guardrails.py --results output/screener_results.csv --guardrail beneish
+    python analyze_guardrails.py --results data/results            # latest columnar run
 """
 
 import pandas as pd
@@ -983,7 +984,7 @@ class GuardrailAnalyzer:
 def main():
     """Run guardrail analysis from command line."""
     parser = argparse.ArgumentParser(description='Analyze guardrail calibration')
-    parser.add_argument('--results', type=str, required=True, help='Path to screener results CSV')
+    parser.add_argument('--results', type=str, required=True, help='Path to screener results CSV, .arrow file or results directory')
     parser.add_argument('--output', type=str, help='Output file for report (default: print to console)')
     parser.add_argument('--guardrail', type=str, choices=['beneish', 'altman', 'revenue', 'mna', 'dilution', 'accruals'],
                        help='Analyze specific guardrail only')
@@ -997,7 +998,12 @@ def main():
         sys.exit(1)
 
     print(f"Loading results from: {results_path}")
-    df = pd.read_csv(results_path)
+    if results_path.is_dir() or results_path.suffix == '.arrow':
+        sys.path.insert(0, str(Path(__file__).parent / 'src'))
+        from screener.results_store import load_results
+        df = load_results(results_path)
+    else:
+        df = pd.read_csv(results_path)
     print(f"Loaded {len(df)} companies\n")
 
     # Run analysis
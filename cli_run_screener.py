@@ -5,6 +5,8 @@ Convenience script to run UltraQuality screener.
 Usage:
     python run_screener.py                    # Run full screening
     python run_screener.py --symbol AAPL      # Qualitative analysis for AAPL
+    python run_screener.py --resume RUN_ID    # Resume an interrupted run
+    python run_screener.py --qualitative-batch   # Qualitative analysis for all BUY/MONITOR
     python run_screener.py --help             # Show help
 """
 import sys
@@ -35,11 +37,18 @@ Examples:
   # Run with custom config
   python run_screener.py --config my_settings.yaml
 
+  # Resume an interrupted run (run ID is logged at start-up)
+  python run_screener.py --resume 20240115-093012-1a2b3c
+
   # Qualitative analysis for specific symbol
   python run_screener.py --symbol MSFT
 
   # Qualitative analysis with output file
   python run_screener.py --symbol AAPL --output aapl_analysis.json
+
+  # Qualitative analysis for every BUY/MONITOR ticker of the latest run
+  # (or of a checkpointed run with --resume RUN_ID), saved per ticker
+  python run_screener.py --qualitative-batch --workers 6
 """
     )
 
@@ -59,6 +68,36 @@ Examples:
         help='Output file for qualitative analysis (JSON)'
     )
 
+    parser.add_argument(
+        '--qualitative-batch',
+        action='store_true',
+        help='Run qualitative analysis for all BUY/MONITOR tickers of a run (results saved per ticker)'
+    )
+
+    parser.add_argument(
+        '--decisions',
+        default='BUY,MONITOR',
+        help='Decisions included in --qualitative-batch (default: BUY,MONITOR)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Tickers analyzed in parallel in --qualitative-batch (default: qualitative.batch_workers)'
+    )
+
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Re-analyze tickers already saved for the run in --qualitative-batch'
+    )
+
+    parser.add_argument(
+        '--resume',
+        metavar='RUN_ID',
+        help='Resume a checkpointed run: skips completed stages and tickers'
+    )
+
     args = parser.parse_args()
 
     # Verify API key
@@ -84,7 +123,31 @@ Examples:
         # Initialize pipeline
         pipeline = ScreenerPipeline(args.config)
 
-        if args.symbol:
+        if args.qualitative_batch:
+            # Qualitative analysis for the whole BUY/MONITOR list
+            decisions = [d.strip().upper() for d in args.decisions.split(',') if d.strip()]
+            print(f"\nRunning qualitative analysis for {'/'.join(decisions)} tickers...")
+            print("-" * 80)
+
+            def report(done, total, symbol):
+                print(f"  [{done}/{total}] {symbol}")
+
+            summaries = pipeline.run_qualitative_batch(
+                decisions=decisions,
+                run_id=args.resume,
+                max_workers=args.workers,
+                refresh=args.refresh,
+                progress=report
+            )
+
+            failed = [s for s, summary in summaries.items() if summary.get('error')]
+            print(f"\n{'='*80}")
+            print(f"✓ QUALITATIVE BATCH COMPLETE: {len(summaries)} tickers ({len(failed)} with errors)")
+            print(f"{'='*80}")
+            if failed:
+                print(f"With errors: {', '.join(failed)}")
+
+        elif args.symbol:
             # On-demand qualitative analysis
             print(f"\nRunning qualitative analysis for {args.symbol}...")
             print("-" * 80)
@@ -146,7 +209,7 @@ Examples:
             print("\nRunning full screening pipeline...")
             print("This may take several minutes depending on universe size.\n")
 
-            output_csv = pipeline.run()
+            output_csv = pipeline.run(resume_run_id=args.resume)
 
             print(f"\n{'='*80}")
             print(f"✓ SCREENING COMPLETE")
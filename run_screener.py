@@ -9042,6 +9042,14 @@ with tab7:
                     # Initialize analyzer
                     tech_analyzer = TechnicalAnalyzer(fmp)
 
+                    # Current prices for all rows in a few batch requests (cached per
+                    # symbol, so the analyzer's own quote lookups hit the cache too)
+                    try:
+                        batch_quotes = fmp.get_quotes_batch(df_technical['ticker'].tolist())
+                    except Exception as e:
+                        logger.warning(f"Batch quote fetch failed: {e}")
+                        batch_quotes = {}
+
                     # Analyze each stock
                     technical_results = []
                     progress_bar = st.progress(0)
@@ -9065,14 +9073,8 @@ with tab7:
                                 fundamental_decision=fundamental_decision
                             )
 
-                            # Fetch current price from FMP
-                            current_price = 0
-                            try:
-                                quote = fmp.get_quote(symbol)
-                                if quote and len(quote) > 0:
-                                    current_price = quote[0].get('price', 0)
-                            except:
-                                pass  # Use 0 if price fetch fails
+                            # Current price from the batch quotes (0 if unavailable)
+                            current_price = batch_quotes.get(symbol, {}).get('price', 0)
 
                             # Add to results (using NEW enhanced analyzer fields)
                             technical_results.append({
@@ -9105,14 +9107,8 @@ with tab7:
                         except Exception as e:
                             logger.error(f"Error analyzing {symbol}: {e}")
 
-                            # Fetch current price from FMP (even on error)
-                            current_price = 0
-                            try:
-                                quote = fmp.get_quote(symbol)
-                                if quote and len(quote) > 0:
-                                    current_price = quote[0].get('price', 0)
-                            except:
-                                pass  # Use 0 if price fetch fails
+                            # Current price from the batch quotes (even on error)
+                            current_price = batch_quotes.get(symbol, {}).get('price', 0)
 
                             # Add with error
                             technical_results.append({
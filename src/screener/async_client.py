@@ -0,0 +1,438 @@
+"""
+Asyncio I/O engine for FMPClient.
+
+FMPClient holds a thread for every in-flight request. AsyncFMPClient issues
+the same requests from one event loop:
+
+- Transport: AsyncHTTPPool, HTTP/1.1 over asyncio streams (stdlib; TLS via
+  ssl, no aiohttp/httpx dependency). Keep-alive connections are pooled per
+  host and reused; at most `max_concurrency` requests are in flight.
+- Same method surface: every FMPClient.get_* is a coroutine with the same
+  signature. The method body is FMPClient's own (endpoint, params, cache
+  bucket, statement slicing); only its network requests are awaited here.
+- Same policy: response cache, shared rate limiter (RateLimiter.wait_async),
+  single-flight coalescing, retries with backoff, HTTP 429 handling and
+  request metrics are FMPClient's.
+
+ScreenerPipeline drives it directly when fmp.async_io is set: each ticker's
+calculator inputs (compute_pool.calls_for) are fetched concurrently on the
+loop and the calculators run on a SnapshotFMPClient of those payloads.
+
+Usage:
+    aclient = AsyncFMPClient(fmp_client, max_concurrency=32)
+    profile = aclient.run(aclient.get_profile('AAPL'))
+    payloads = aclient.run(aclient.collect_payloads('AAPL', 'non_financial'))
+"""
+import asyncio
+import copy
+import functools
+import gzip
+import json
+import logging
+import ssl
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+try:
+    from .cache_store import endpoint_from_url
+    from .compute_pool import calls_for
+    from .ingest import FMPCache
+except ImportError:
+    # Fallback for direct execution
+    from cache_store import endpoint_from_url
+    from compute_pool import calls_for
+    from ingest import FMPCache
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPStatusError(Exception):
+    """Non-2xx/3xx HTTP response."""
+
+    def __init__(self, status: int, headers: Dict[str, str], url: str):
+        super().__init__(f"{status} Error for url: {url}")
+        self.status = status
+        self.headers = headers
+
+
+class AsyncHTTPPool:
+    """
+    HTTP/1.1 keep-alive connection pool on asyncio streams.
+
+    Bound to the event loop it is used on. A connection is returned to the
+    pool after a complete response unless the server asked to close it; a
+    pooled connection the server has since closed is replaced once.
+    """
+
+    def __init__(self, max_connections: int, stats: Optional[Dict[str, int]] = None):
+        self._slots = asyncio.Semaphore(max_connections)
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self._ssl = None
+        self.stats = stats if stats is not None else {'connections_opened': 0, 'requests': 0}
+
+    async def get(self, url: str, params: Dict, timeout: float) -> Tuple[int, Dict[str, str], bytes]:
+        """GET url?params -> (status, headers (lowercase names), body)."""
+        parts = urlsplit(url)
+        query = '&'.join(q for q in (parts.query, urlencode(params)) if q)
+        target = (parts.path or '/') + (f'?{query}' if query else '')
+        https = parts.scheme == 'https'
+        origin = (parts.scheme, parts.hostname, parts.port or (443 if https else 80))
+
+        async with self._slots:
+            return await asyncio.wait_for(self._exchange(origin, parts.netloc, target), timeout)
+
+    async def _exchange(self, origin: Tuple[str, str, int], host: str, target: str):
+        request = (
+            f"GET {target} HTTP/1.1\r\n"
+            f"Host: {host}\r\n"
+            "Accept: application/json\r\n"
+            "Accept-Encoding: gzip\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode('latin-1')
+
+        for attempt in range(2):
+            idle = self._idle.get(origin)
+            reused = bool(idle)
+            reader, writer = idle.pop() if idle else await self._connect(origin)
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, headers, body, keep_alive = await self._read_response(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused and attempt == 0:
+                    continue  # Closed by the server while idle: retry on a new connection
+                raise
+            except BaseException:
+                # Timeout/cancellation mid-response: the connection state is unknown
+                writer.close()
+                raise
+
+            self.stats['requests'] += 1
+            if keep_alive:
+                self._idle.setdefault(origin, []).append((reader, writer))
+            else:
+                writer.close()
+            return status, headers, body
+
+    async def _connect(self, origin: Tuple[str, str, int]):
+        scheme, hostname, port = origin
+        ssl_context = None
+        if scheme == 'https':
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            ssl_context = self._ssl
+        connection = await asyncio.open_connection(hostname, port, ssl=ssl_context)
+        self.stats['connections_opened'] += 1
+        return connection
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader):
+        """Status, headers, body and whether the connection can be reused."""
+        while True:
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionResetError("Connection closed before response")
+            version, status, *_ = status_line.decode('latin-1').split(' ', 2)
+            status = int(status)
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            if status >= 200:
+                break  # 1xx: interim response, the real one follows
+
+        keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass  # Trailers
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:
+            body = await reader.read()
+            keep_alive = False
+
+        if headers.get('content-encoding', '').lower() == 'gzip':
+            body = gzip.decompress(body)
+        return status, headers, body, keep_alive
+
+    async def close(self):
+        """Close idle connections."""
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle = {}
+
+
+class _Pending(BaseException):
+    """
+    Raised inside a replayed FMPClient method at a request with no response
+    yet (BaseException, so the method's own `except Exception` passes it on).
+    """
+
+    def __init__(self, key: Tuple[str, str], endpoint: str, params: Optional[Dict], cache):
+        super().__init__(endpoint)
+        self.key = key
+        self.endpoint = endpoint
+        self.params = params
+        self.cache = cache
+
+
+class _LoopIO:
+    """Per-event-loop state: connection pool and in-flight requests."""
+
+    def __init__(self, max_connections: int, stats: Dict[str, int]):
+        self.pool = AsyncHTTPPool(max_connections, stats)
+        self.inflight: Dict[str, asyncio.Future] = {}
+
+
+class AsyncFMPClient:
+    """
+    Asyncio client with FMPClient's method surface and policies.
+
+    Every FMPClient.get_* method is exposed as a coroutine with the same
+    signature. Calling one runs FMPClient's method against a replay client:
+    each request it makes is awaited here (cache, rate limit, pooled
+    connection) and the method is re-run with the responses it has so far,
+    so its parameters and post-processing never diverge from FMPClient.
+    """
+
+    def __init__(self, fmp_client, max_concurrency: Optional[int] = None):
+        """
+        Args:
+            fmp_client: FMPClient instance (provides cache, rate limiter, metrics, retries)
+            max_concurrency: Max in-flight requests / pooled connections (default: client pool size)
+        """
+        self.fmp = fmp_client
+        self.max_concurrency = max_concurrency or getattr(fmp_client, 'pool_size', 32)
+        self.coalesced = 0
+        self.stats = {'connections_opened': 0, 'requests': 0}
+        self._loops: Dict[asyncio.AbstractEventLoop, _LoopIO] = {}
+        self._loops_lock = threading.Lock()
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.fmp, name)
+        if name.startswith('get_') and name != 'get_metrics' and callable(attr):
+            @functools.wraps(attr)
+            async def call(*args, **kwargs):
+                return await self._call(name, *args, **kwargs)
+            return call
+        return attr
+
+    def _loop_io(self) -> _LoopIO:
+        loop = asyncio.get_running_loop()
+        with self._loops_lock:
+            io = self._loops.get(loop)
+            if io is None:
+                io = self._loops[loop] = _LoopIO(self.max_concurrency, self.stats)
+            return io
+
+    # ========================
+    # Method surface
+    # ========================
+
+    async def _call(self, name: str, *args, **kwargs) -> Any:
+        """Run FMPClient.<name>, awaiting each request it makes."""
+        responses: Dict[Tuple[str, str], Any] = {}
+
+        def replay_request(endpoint, params=None, cache=None, retry_count=0):
+            key = (endpoint, json.dumps(params or {}, sort_keys=True, default=str))
+            if key not in responses:
+                raise _Pending(key, endpoint, params, cache)
+            # The method may mutate the response; keep ours for later re-runs
+            return copy.deepcopy(responses[key])
+
+        replay = copy.copy(self.fmp)
+        replay._request = replay_request
+        method = getattr(replay, name)
+        while True:
+            try:
+                return method(*args, **kwargs)
+            except _Pending as pending:
+                responses[pending.key] = await self.request(pending.endpoint, pending.params, pending.cache)
+
+    async def collect_payloads(
+        self,
+        symbol: str,
+        company_type: str,
+        include_features: bool = True,
+        include_guardrails: bool = True
+    ) -> Dict[str, Any]:
+        """
+        compute_pool.collect_payloads on the loop: a ticker's calculator
+        inputs, fetched concurrently. Failed calls are left out of the
+        snapshot (the calculators then see [] as for an empty response).
+        """
+        calls = calls_for(company_type, include_features, include_guardrails)
+
+        async def one(key, method, kwargs):
+            try:
+                return key, await getattr(self, method)(symbol, **kwargs), None
+            except Exception as e:
+                return key, None, e
+
+        payloads = {}
+        for key, value, error in await asyncio.gather(*(one(k, m, kw) for k, (m, kw) in calls.items())):
+            if error is not None:
+                logger.warning(f"{symbol}: {calls[key][0]} failed during payload collection: {error}")
+            else:
+                payloads[key] = value
+        return payloads
+
+    # ========================
+    # Requests
+    # ========================
+
+    async def request(self, endpoint: str, params: Optional[Dict] = None, cache=None) -> Any:
+        """FMPClient._request on the event loop (cache, single-flight, rate limit, retries)."""
+        fmp = self.fmp
+        url = f"{fmp.base_url}/{endpoint}"
+        params = dict(params or {})
+        params['apikey'] = fmp.api_key
+        key = FMPCache._get_key(url, params)
+
+        if cache:
+            cached, stale = cache.lookup(url, params)
+            if cached is not None:
+                fmp.total_cached += 1
+                if stale:
+                    # Stale-while-revalidate: answer now, refresh in the background (FMPClient's worker pool)
+                    cache.cache.revalidate(key, lambda: fmp._inflight.do(
+                        key, lambda: fmp._fetch(endpoint, url, params, cache)
+                    ))
+                return cached
+
+        inflight = self._loop_io().inflight
+        task = inflight.get(key)
+        leader = task is None
+        if leader:
+            task = inflight[key] = asyncio.ensure_future(self._fetch(endpoint, url, params, cache))
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        result = await asyncio.shield(task)
+        # Callers may mutate responses; never hand out the leader's object
+        return result if leader else copy.deepcopy(result)
+
+    async def _fetch(self, endpoint: str, url: str, params: Dict, cache) -> Any:
+        """Network fetch with rate limiting and retries (cache already missed)."""
+        fmp = self.fmp
+        family = endpoint_from_url(url)
+        pool = self._loop_io().pool
+        safe_params = {k: (v[:10] + '...' if k == 'apikey' and v else v) for k, v in params.items()}
+
+        retry_count = 0
+        while True:
+            await fmp.rate_limiter.wait_async(endpoint)
+            fmp.total_requests += 1
+            fmp.requests_by_endpoint[endpoint] = fmp.requests_by_endpoint.get(endpoint, 0) + 1
+            logger.info(f"→ API Request (async): GET {url} params={safe_params}")
+
+            rate_limited = False
+            request_start = time.perf_counter()
+            try:
+                status, headers, body = await pool.get(url, params, fmp.timeout)
+                fmp.request_metrics.record(family, time.perf_counter() - request_start, len(body), ok=status < 400)
+                logger.info(f"← API Response: Status {status}, Size: {len(body)} bytes")
+                if status >= 400:
+                    raise HTTPStatusError(status, headers, url)
+                data = json.loads(body)
+            except HTTPStatusError as e:
+                error = e
+                if e.status == 429:
+                    # Slow the shared limiter down instead of backing off locally
+                    fmp.rate_limiter.penalize(fmp._parse_retry_after(e.headers.get('retry-after')))
+                    rate_limited = True
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                fmp.request_metrics.record(family, time.perf_counter() - request_start, ok=False)
+                error = e
+            else:
+                # Handle FMP error messages
+                if isinstance(data, dict) and 'Error Message' in data:
+                    raise Exception(f"FMP API Error: {data['Error Message']}")
+                if cache:
+                    cache.set(url, params, data)
+                return data
+
+            logger.warning(f"Request failed for {url}: {error!r}")
+            if retry_count >= fmp.max_retries:
+                fmp.errors.append({"endpoint": endpoint, "error": str(error), "time": datetime.now().isoformat()})
+                logger.error(f"Max retries exceeded for {url}")
+                raise error
+
+            fmp.request_metrics.record_retry(family)
+            if not rate_limited:
+                wait_time = (2 ** retry_count) + (hash(url) % 100) / 100  # 2s, 4s, 8s + jitter
+                logger.info(f"Retrying in {wait_time:.2f}s (attempt {retry_count + 1}/{fmp.max_retries})")
+                await asyncio.sleep(wait_time)
+            retry_count += 1
+
+    # ========================
+    # Event loop
+    # ========================
+
+    def run(self, coro):
+        """
+        Run a coroutine to completion from synchronous code, then close the
+        loop's pooled connections.
+
+        Works both from plain scripts and from threads that already own a
+        running event loop (e.g. notebook kernels).
+        """
+        async def main():
+            try:
+                return await coro
+            finally:
+                await self.aclose()
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(main())
+
+        result = {}
+
+        def runner():
+            try:
+                result['value'] = asyncio.run(main())
+            except BaseException as e:
+                result['error'] = e
+
+        thread = threading.Thread(target=runner, name='fmp-async-runner')
+        thread.start()
+        thread.join()
+        if 'error' in result:
+            raise result['error']
+        return result['value']
+
+    async def aclose(self):
+        """Close the current event loop's pooled connections."""
+        loop = asyncio.get_running_loop()
+        with self._loops_lock:
+            io = self._loops.pop(loop, None)
+        if io is not None:
+            await io.pool.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'max_concurrency': self.max_concurrency,
+            'connections_opened': self.stats['connections_opened'],
+            'requests': self.stats['requests'],
+            'coalesced_requests': self.coalesced
+        }
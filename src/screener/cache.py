@@ -2,63 +2,356 @@
 Caching layer for FMP API calls.
 
 Reduces API costs and improves performance by caching responses locally.
-
-Cache TTLs by endpoint type:
-- Profile data: 7 days (rarely changes)
-- Financial statements: 1 day (updates quarterly but check daily)
+One subsystem serves both FMPClient and CachedFMPClient:
+- Storage: SQLiteCacheStore (single database file) + MemoryLRUCache tier
+- Policy: per-endpoint TTL table (DEFAULT_TTL_POLICY), overridable via
+  settings.yaml `cache.ttl_policy_hours`; endpoints not in the table use
+  the TTL of the caller's bucket (universe / symbol / qualitative)
+- Stats: TieredCache.get_stats() (per tier and per endpoint)
+- Stale-while-revalidate (optional): within an endpoint's grace window
+  (DEFAULT_GRACE_POLICY, `cache.grace_policy_hours`) an expired entry is
+  served immediately and refreshed by a bounded background worker pool
+
+Default TTLs by endpoint type:
+- Real-time quotes: 6 hours
+- Historical prices: 1 day (EOD refresh)
 - Earnings transcripts: 30 days (historical, immutable)
 - News: 1 hour (frequently updated)
-- Key metrics: 1 day
+- Executives, peers, institutional holders: 7 days
 """
-import pickle
 import hashlib
-import os
-from datetime import datetime, timedelta
-from pathlib import Path
+import json
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    from .cache_store import SQLiteCacheStore, MemoryLRUCache, copy_payload
+except ImportError:
+    # Fallback for direct execution
+    from cache_store import SQLiteCacheStore, MemoryLRUCache, copy_payload
 
 logger = logging.getLogger(__name__)
 
 
+# TTL per FMP endpoint (first path segment of the request URL)
+DEFAULT_TTL_POLICY = {
+    'quote': timedelta(hours=6),  # Real-time quote, refresh 4x/day
+    'historical-price-full': timedelta(days=1),  # Historical prices, daily EOD refresh
+    'earning_call_transcript': timedelta(days=30),
+    'press-releases': timedelta(days=1),
+    'stock_news': timedelta(hours=1),
+    'insider-trading': timedelta(hours=6),
+    'key-executives': timedelta(days=7),
+    'stock_peers': timedelta(days=7),
+    'institutional-holder': timedelta(days=7),  # Updates quarterly
+    'earning_calendar': timedelta(hours=12),  # Updates twice daily
+}
+
+# How long past its TTL an entry may still be served while it is refreshed
+# in the background (stale-while-revalidate). Endpoints not listed are
+# never served stale. Quotes drive price-based metrics, so their grace is
+# minutes, not hours.
+DEFAULT_GRACE_POLICY = {
+    'quote': timedelta(minutes=15),
+    'historical-price-full': timedelta(days=2),
+    'earning_call_transcript': timedelta(days=30),
+    'press-releases': timedelta(days=1),
+    'stock_news': timedelta(hours=6),
+    'insider-trading': timedelta(days=1),
+    'key-executives': timedelta(days=7),
+    'stock_peers': timedelta(days=7),
+    'institutional-holder': timedelta(days=7),
+    'earning_calendar': timedelta(hours=12),
+}
+
+# CachedFMPClient method names -> FMP endpoints
+ENDPOINT_ALIASES = {
+    'profile': 'profile',
+    'quote': 'quote',
+    'historical_prices': 'historical-price-full',
+    'balance_sheet': 'balance-sheet-statement',
+    'income_statement': 'income-statement',
+    'cash_flow': 'cash-flow-statement',
+    'key_metrics': 'key-metrics',
+    'ratios': 'ratios',
+    'earnings_call_transcript': 'earning_call_transcript',
+    'press_releases': 'press-releases',
+    'stock_news': 'stock_news',
+    'insider_trading': 'insider-trading',
+    'key_executives': 'key-executives',
+    'stock_screener': 'stock-screener',
+    'stock_peers': 'stock_peers',
+    'institutional_holders': 'institutional-holder',
+    'earnings_calendar': 'earning_calendar',
+}
+
+
+class TieredCache:
+    """
+    Memory + disk response cache with per-endpoint TTL policy.
+
+    Lookups check the in-process LRU tier, then the SQLite store, and
+    promote disk hits into memory. The TTL for an entry comes from the
+    policy table, falling back to the caller-supplied default.
+
+    With `stale_while_revalidate`, `lookup` also returns entries that are
+    past their TTL but inside the endpoint's grace window, flagged stale;
+    the caller serves them and hands a refresh to `revalidate`, which runs
+    at most `max_refreshes` refreshes at a time (one per key).
+    """
+
+    def __init__(
+        self,
+        store: SQLiteCacheStore,
+        memory: Optional[MemoryLRUCache] = None,
+        ttl_policy: Optional[Dict[str, timedelta]] = None,
+        default_ttl: timedelta = timedelta(hours=24),
+        stale_while_revalidate: bool = False,
+        grace_policy: Optional[Dict[str, timedelta]] = None,
+        max_refreshes: int = 4
+    ):
+        self.store = store
+        self.memory = memory
+        self.ttl_policy = dict(DEFAULT_TTL_POLICY)
+        self.ttl_policy.update(ttl_policy or {})
+        self.default_ttl = default_ttl
+
+        self.stale_while_revalidate = stale_while_revalidate
+        self.grace_policy = dict(DEFAULT_GRACE_POLICY)
+        self.grace_policy.update(grace_policy or {})
+        self.max_refreshes = max(1, max_refreshes)
+        self._refreshing: Dict[str, Any] = {}
+        self._refresh_lock = threading.Lock()
+        self._refresh_pool: Optional[ThreadPoolExecutor] = None
+
+        self.by_endpoint: Dict[str, Dict[str, int]] = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refreshes_skipped = 0
+        self.refresh_errors = 0
+
+    @classmethod
+    def from_config(cls, cache_config: Dict) -> 'TieredCache':
+        """Build the cache described by the `cache:` section of settings.yaml."""
+        cache_dir = cache_config.get('cache_dir', './cache')
+        store = SQLiteCacheStore(cache_config.get('db_path', f"{cache_dir}/fmp_cache.sqlite"))
+
+        # In-process LRU tier, shared per database so it survives client
+        # re-creation (e.g. one FMPClient per Streamlit rerun)
+        memory = None
+        memory_mb = cache_config.get('memory_max_mb', 128)
+        if memory_mb:
+            memory = MemoryLRUCache.shared(str(store.db_path.resolve()), int(memory_mb * 1024 * 1024))
+
+        policy = {
+            endpoint: timedelta(hours=hours)
+            for endpoint, hours in (cache_config.get('ttl_policy_hours') or {}).items()
+        }
+        grace = {
+            endpoint: timedelta(hours=hours)
+            for endpoint, hours in (cache_config.get('grace_policy_hours') or {}).items()
+        }
+        return cls(
+            store, memory, policy,
+            stale_while_revalidate=cache_config.get('stale_while_revalidate', False),
+            grace_policy=grace,
+            max_refreshes=cache_config.get('max_background_refreshes', 4)
+        )
+
+    def ttl_for(self, endpoint: str, default: Optional[timedelta] = None) -> timedelta:
+        """TTL for an endpoint (policy table, else `default`, else cache default)."""
+        return self.ttl_policy.get(endpoint) or default or self.default_ttl
+
+    def grace_for(self, endpoint: str) -> timedelta:
+        """Stale-serving window past the TTL (zero when SWR is off)."""
+        if not self.stale_while_revalidate:
+            return timedelta(0)
+        return self.grace_policy.get(endpoint, timedelta(0))
+
+    def _count(self, endpoint: str, field: str):
+        counts = self.by_endpoint.setdefault(endpoint, {'hits': 0, 'stale_hits': 0, 'misses': 0})
+        counts[field] += 1
+
+    def get(self, key: str, endpoint: str, default_ttl: Optional[timedelta] = None) -> Optional[Any]:
+        """Return cached data if fresh under the endpoint's TTL."""
+        return self._lookup(key, endpoint, default_ttl, allow_stale=False)[0]
+
+    def lookup(
+        self,
+        key: str,
+        endpoint: str,
+        default_ttl: Optional[timedelta] = None
+    ) -> Tuple[Optional[Any], bool]:
+        """
+        Return (data, is_stale).
+
+        Stale data is only returned inside the endpoint's grace window; the
+        caller should serve it and schedule a refresh with `revalidate`.
+        """
+        return self._lookup(key, endpoint, default_ttl, allow_stale=True)
+
+    def _lookup(
+        self,
+        key: str,
+        endpoint: str,
+        default_ttl: Optional[timedelta],
+        allow_stale: bool
+    ) -> Tuple[Optional[Any], bool]:
+        ttl = self.ttl_for(endpoint, default_ttl).total_seconds()
+        max_age = ttl + (self.grace_for(endpoint).total_seconds() if allow_stale else 0)
+
+        entry = None
+        if self.memory is not None:
+            entry = self.memory.get_entry(key, max_age_seconds=max_age)
+            if entry is not None:
+                self.memory_hits += 1
+
+        if entry is None:
+            raw_entry = self.store.get_raw_entry(key)
+            if raw_entry is not None and time.time() - raw_entry[1] < max_age:
+                raw, fetched_at = raw_entry
+                data = json.loads(raw)
+                if self.memory is not None:
+                    self.memory.put(key, data, fetched_at, size=len(raw))
+                    data = copy_payload(data)
+                entry = (data, fetched_at)
+                self.disk_hits += 1
+
+        if entry is None:
+            self.misses += 1
+            self._count(endpoint, 'misses')
+            return None, False
+
+        data, fetched_at = entry
+        stale = time.time() - fetched_at >= ttl
+        if stale:
+            self.stale_hits += 1
+            self._count(endpoint, 'stale_hits')
+        else:
+            self._count(endpoint, 'hits')
+        return data, stale
+
+    def revalidate(self, key: str, refresh: Callable[[], Any]) -> bool:
+        """
+        Run `refresh` in the background (it is expected to write the cache).
+
+        Returns False when a refresh for `key` is already running or the
+        concurrent-refresh cap is reached; the stale entry keeps being served
+        and the next stale hit tries again.
+        """
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return False
+            if len(self._refreshing) >= self.max_refreshes:
+                self.refreshes_skipped += 1
+                return False
+            if self._refresh_pool is None:
+                self._refresh_pool = ThreadPoolExecutor(
+                    max_workers=self.max_refreshes, thread_name_prefix='cache-refresh'
+                )
+            self.refreshes += 1
+            self._refreshing[key] = self._refresh_pool.submit(self._run_refresh, key, refresh)
+        return True
+
+    def _run_refresh(self, key: str, refresh: Callable[[], Any]):
+        try:
+            refresh()
+        except Exception as e:
+            self.refresh_errors += 1
+            logger.warning(f"Background cache refresh failed: {e}")
+        finally:
+            with self._refresh_lock:
+                self._refreshing.pop(key, None)
+
+    def wait_for_refreshes(self, timeout: Optional[float] = None):
+        """Block until in-flight background refreshes finish."""
+        with self._refresh_lock:
+            pending = list(self._refreshing.values())
+        wait(pending, timeout=timeout)
+
+    def set(self, key: str, data: Any, endpoint: str, ttl_class: str):
+        """Write through both tiers."""
+        raw = SQLiteCacheStore.serialize(data)
+        if self.memory is not None:
+            # The tier keeps its own object: parsed from the stored bytes, like a disk hit
+            self.memory.put(key, json.loads(raw), size=len(raw))
+        self.store.set_raw(key, raw, endpoint=endpoint, ttl_class=ttl_class)
+
+    def clear(self, endpoint: Optional[str] = None, older_than_seconds: Optional[float] = None) -> int:
+        """Delete entries from disk and drop the memory tier."""
+        if self.memory is not None:
+            self.memory.clear()
+        return self.store.clear(endpoint=endpoint, older_than_seconds=older_than_seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Single stats surface: totals, per tier and per endpoint."""
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            'hits': hits,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'hit_rate': hits / total if total > 0 else 0.0,
+            'refreshes': self.refreshes,
+            'refreshes_skipped': self.refreshes_skipped,
+            'refresh_errors': self.refresh_errors,
+            'by_endpoint': dict(self.by_endpoint),
+            'memory': self.memory.get_stats() if self.memory is not None else None,
+            'store': self.store.get_stats()
+        }
+
+
 class CachedFMPClient:
     """
     Wrapper around FMP client with intelligent caching.
 
-    Cache structure:
-    .cache/
-        {endpoint}/
-            {cache_key}.pkl
-            {cache_key}.meta  # Stores timestamp
+    Uses the same TieredCache as FMPClient: when the wrapped client already
+    caches an endpoint, calls pass straight through (one write, one TTL);
+    endpoints the client deliberately leaves uncached (real-time quotes)
+    are cached here under the shared policy.
 
     Usage:
         cached_fmp = CachedFMPClient(fmp_client)
-        data = cached_fmp.get_profile('AAPL')  # Cached for 7 days
+        data = cached_fmp.get_profile('AAPL')
     """
 
+    # Endpoints FMPClient fetches without caching
+    CLIENT_UNCACHED = {'quote'}
+
     def __init__(self, fmp_client, cache_dir='.cache'):
         self.fmp = fmp_client
-        self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(exist_ok=True)
 
-        # Cache TTLs by endpoint
+        shared = getattr(fmp_client, 'cache', None)
+        if isinstance(shared, TieredCache):
+            self.cache = shared
+            self._shares_client_cache = True
+        else:
+            self.cache = TieredCache.from_config({
+                'cache_dir': cache_dir,
+                'db_path': str(Path(cache_dir) / 'fmp_cache.sqlite')
+            })
+            self._shares_client_cache = False
+        self.cache_dir = self.cache.store.db_path.parent
+
+        # Effective TTLs by method name (read-only view of the shared policy)
         self.ttls = {
-            'profile': timedelta(days=7),
-            'quote': timedelta(hours=6),  # Real-time quote, refresh 4x/day
-            'historical_prices': timedelta(days=1),  # Historical prices, daily EOD refresh
-            'balance_sheet': timedelta(days=1),
-            'income_statement': timedelta(days=1),
-            'cash_flow': timedelta(days=1),
-            'key_metrics': timedelta(days=1),
-            'ratios': timedelta(days=1),
-            'earnings_call_transcript': timedelta(days=30),
-            'press_releases': timedelta(days=1),
-            'stock_news': timedelta(hours=1),
-            'insider_trading': timedelta(hours=6),
-            'key_executives': timedelta(days=7),
-            'stock_screener': timedelta(hours=1),
-            'stock_peers': timedelta(days=7),
-            'institutional_holders': timedelta(days=7),  # Updates quarterly
-            'earnings_calendar': timedelta(hours=12),  # Updates twice daily
+            name: self.cache.ttl_for(endpoint)
+            for name, endpoint in ENDPOINT_ALIASES.items()
+        }
+        # Stale-serving windows past the TTL (all zero unless SWR is enabled)
+        self.grace_windows = {
+            name: self.cache.grace_for(endpoint)
+            for name, endpoint in ENDPOINT_ALIASES.items()
         }
 
         # Stats
@@ -75,91 +368,51 @@ class CachedFMPClient:
         key_str = f"{endpoint}:{symbol}:{params_str}"
         return hashlib.md5(key_str.encode()).hexdigest()
 
-    def _get_cache_path(self, endpoint, cache_key):
-        """Get file path for cache entry."""
-        endpoint_dir = self.cache_dir / endpoint
-        endpoint_dir.mkdir(exist_ok=True)
-        return endpoint_dir / f"{cache_key}.pkl"
-
-    def _get_meta_path(self, endpoint, cache_key):
-        """Get file path for cache metadata."""
-        endpoint_dir = self.cache_dir / endpoint
-        return endpoint_dir / f"{cache_key}.meta"
-
-    def _is_cache_valid(self, endpoint, cache_key):
-        """Check if cache entry exists and is fresh."""
-        meta_path = self._get_meta_path(endpoint, cache_key)
-
-        if not meta_path.exists():
-            return False
-
-        try:
-            with open(meta_path, 'r') as f:
-                timestamp_str = f.read().strip()
-                cached_time = datetime.fromisoformat(timestamp_str)
-
-            ttl = self.ttls.get(endpoint, timedelta(hours=1))
-            age = datetime.now() - cached_time
-
-            return age < ttl
-        except Exception as e:
-            logger.debug(f"Error checking cache validity: {e}")
-            return False
-
-    def _get_from_cache(self, endpoint, cache_key):
-        """Retrieve data from cache."""
-        cache_path = self._get_cache_path(endpoint, cache_key)
-
-        try:
-            with open(cache_path, 'rb') as f:
-                data = pickle.load(f)
-
-            self.stats['hits'] += 1
-            logger.debug(f"Cache HIT for {endpoint} (key: {cache_key[:8]}...)")
-            return data
-        except Exception as e:
-            logger.debug(f"Error reading from cache: {e}")
-            return None
-
-    def _save_to_cache(self, endpoint, cache_key, data):
-        """Save data to cache with timestamp."""
-        cache_path = self._get_cache_path(endpoint, cache_key)
-        meta_path = self._get_meta_path(endpoint, cache_key)
-
-        try:
-            # Save data
-            with open(cache_path, 'wb') as f:
-                pickle.dump(data, f)
-
-            # Save timestamp
-            with open(meta_path, 'w') as f:
-                f.write(datetime.now().isoformat())
-
-            logger.debug(f"Cached data for {endpoint} (key: {cache_key[:8]}...)")
-        except Exception as e:
-            logger.warning(f"Error saving to cache: {e}")
-
     def _fetch_with_cache(self, endpoint, fetch_func, *args, **kwargs):
         """Generic cached fetch wrapper."""
+        fmp_endpoint = ENDPOINT_ALIASES.get(endpoint, endpoint)
+
+        # The wrapped FMPClient caches this endpoint in the shared tiers already
+        if self._shares_client_cache and fmp_endpoint not in self.CLIENT_UNCACHED:
+            try:
+                return fetch_func(*args, **kwargs)
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"Error fetching {endpoint}: {e}")
+                raise
+
         # Extract symbol (usually first arg)
         symbol = args[0] if args else kwargs.get('symbol', 'unknown')
+        return self._cached_call(
+            endpoint, self._get_cache_key(endpoint, symbol, **kwargs),
+            lambda: fetch_func(*args, **kwargs)
+        )
 
-        # Generate cache key
-        cache_key = self._get_cache_key(endpoint, symbol, **kwargs)
+    def _cached_call(self, endpoint, cache_key, fetch):
+        """Serve `cache_key` from the shared cache or fetch and store it."""
+        fmp_endpoint = ENDPOINT_ALIASES.get(endpoint, endpoint)
 
-        # Check cache
-        if self._is_cache_valid(endpoint, cache_key):
-            data = self._get_from_cache(endpoint, cache_key)
-            if data is not None:
-                return data
+        data, stale = self.cache.lookup(cache_key, fmp_endpoint)
+        if data is not None:
+            self.stats['hits'] += 1
+            if stale:
+                # Serve the expired entry now; refresh it off the caller's path
+                logger.debug(f"Cache STALE for {endpoint} (key: {cache_key[:8]}...), revalidating")
+                self.cache.revalidate(
+                    cache_key,
+                    lambda: self.cache.set(cache_key, fetch(), fmp_endpoint, ttl_class='wrapper')
+                )
+            else:
+                logger.debug(f"Cache HIT for {endpoint} (key: {cache_key[:8]}...)")
+            return data
 
         # Cache miss - fetch from API
         self.stats['misses'] += 1
         logger.debug(f"Cache MISS for {endpoint} (fetching from API...)")
 
         try:
-            data = fetch_func(*args, **kwargs)
-            self._save_to_cache(endpoint, cache_key, data)
+            data = fetch()
+            self.cache.set(cache_key, data, fmp_endpoint, ttl_class='wrapper')
             return data
         except Exception as e:
             self.stats['errors'] += 1
@@ -171,7 +424,7 @@ class CachedFMPClient:
     # ===================================
 
     def get_profile(self, symbol):
-        """Get company profile (cached 7 days)."""
+        """Get company profile."""
         return self._fetch_with_cache(
             'profile',
             self.fmp.get_profile,
@@ -180,12 +433,33 @@ class CachedFMPClient:
 
     def get_quote(self, symbol):
         """Get real-time quote (cached 6 hours)."""
+        if self._shares_client_cache and hasattr(self.fmp, 'get_quotes_batch'):
+            # Same per-symbol entry that batch quote requests fill
+            quote = self.get_quotes_batch([symbol]).get(symbol)
+            return [quote] if quote else []
         return self._fetch_with_cache(
             'quote',
             self.fmp.get_quote,
             symbol
         )
 
+    def get_quotes_batch(self, symbols):
+        """Get quotes for many symbols ({symbol: quote}), batched and cached per symbol."""
+        if self._shares_client_cache and hasattr(self.fmp, 'get_quotes_batch'):
+            try:
+                return self.fmp.get_quotes_batch(symbols)
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"Error fetching quotes batch: {e}")
+                raise
+
+        quotes = {}
+        for symbol in symbols:
+            quote = self.get_quote(symbol)
+            if quote:
+                quotes[symbol] = quote[0]
+        return quotes
+
     def get_historical_prices(self, symbol, from_date=None, to_date=None):
         """Get historical prices (cached 1 day)."""
         return self._fetch_with_cache(
@@ -197,7 +471,7 @@ class CachedFMPClient:
         )
 
     def get_balance_sheet(self, symbol, period='quarter', limit=8):
-        """Get balance sheet (cached 1 day)."""
+        """Get balance sheet."""
         return self._fetch_with_cache(
             'balance_sheet',
             self.fmp.get_balance_sheet,
@@ -207,7 +481,7 @@ class CachedFMPClient:
         )
 
     def get_income_statement(self, symbol, period='quarter', limit=12):
-        """Get income statement (cached 1 day)."""
+        """Get income statement."""
         return self._fetch_with_cache(
             'income_statement',
             self.fmp.get_income_statement,
@@ -217,7 +491,7 @@ class CachedFMPClient:
         )
 
     def get_cash_flow(self, symbol, period='quarter', limit=8):
-        """Get cash flow statement (cached 1 day)."""
+        """Get cash flow statement."""
         return self._fetch_with_cache(
             'cash_flow',
             self.fmp.get_cash_flow,
@@ -227,7 +501,7 @@ class CachedFMPClient:
         )
 
     def get_key_metrics(self, symbol, period='quarter', limit=8):
-        """Get key metrics (cached 1 day)."""
+        """Get key metrics."""
         return self._fetch_with_cache(
             'key_metrics',
             self.fmp.get_key_metrics,
@@ -237,7 +511,7 @@ class CachedFMPClient:
         )
 
     def get_financial_ratios(self, symbol, period='quarter', limit=8):
-        """Get financial ratios (cached 1 day)."""
+        """Get financial ratios."""
         return self._fetch_with_cache(
             'ratios',
             self.fmp.get_financial_ratios,
@@ -293,7 +567,7 @@ class CachedFMPClient:
         )
 
     def get_stock_screener(self, **kwargs):
-        """Get stock screener results (cached 1 hour)."""
+        """Get stock screener results."""
         # For screener, use kwargs as symbol for cache key
         symbol = 'screener'
         return self._fetch_with_cache(
@@ -321,33 +595,19 @@ class CachedFMPClient:
 
     def get_earnings_calendar(self, from_date=None, to_date=None):
         """Get earnings calendar (cached 12 hours)."""
-        # For earnings calendar, use 'calendar' as symbol for cache key
         # NOTE: earnings_calendar API doesn't take a symbol parameter,
         # only from_date and to_date. We use 'calendar' for cache key only.
-        symbol = 'calendar'
-
-        # Generate cache key
-        cache_key = self._get_cache_key('earnings_calendar', symbol, from_date=from_date, to_date=to_date)
-
-        # Check cache
-        if self._is_cache_valid('earnings_calendar', cache_key):
-            data = self._get_from_cache('earnings_calendar', cache_key)
-            if data is not None:
-                return data
-
-        # Cache miss - fetch from API
-        self.stats['misses'] += 1
-        logger.debug(f"Cache MISS for earnings_calendar (fetching from API...)")
-
-        try:
-            # Call API directly without symbol parameter
-            data = self.fmp.get_earnings_calendar(from_date=from_date, to_date=to_date)
-            self._save_to_cache('earnings_calendar', cache_key, data)
-            return data
-        except Exception as e:
-            self.stats['errors'] += 1
-            logger.error(f"Error fetching earnings_calendar: {e}")
-            raise
+        if self._shares_client_cache:
+            return self._fetch_with_cache(
+                'earnings_calendar', self.fmp.get_earnings_calendar,
+                from_date=from_date, to_date=to_date
+            )
+
+        cache_key = self._get_cache_key('earnings_calendar', 'calendar', from_date=from_date, to_date=to_date)
+        return self._cached_call(
+            'earnings_calendar', cache_key,
+            lambda: self.fmp.get_earnings_calendar(from_date=from_date, to_date=to_date)
+        )
 
     # ===================================
     # Cache Management
@@ -361,65 +621,27 @@ class CachedFMPClient:
             endpoint: If specified, only clear this endpoint
             older_than_days: If specified, only clear entries older than N days
         """
-        if endpoint:
-            endpoints = [endpoint]
-        else:
-            endpoints = [d.name for d in self.cache_dir.iterdir() if d.is_dir()]
-
-        cleared_count = 0
-
-        for ep in endpoints:
-            endpoint_dir = self.cache_dir / ep
-            if not endpoint_dir.exists():
-                continue
-
-            for file_path in endpoint_dir.glob('*.pkl'):
-                meta_path = file_path.with_suffix('.meta')
-
-                should_delete = True
-
-                if older_than_days is not None:
-                    try:
-                        with open(meta_path, 'r') as f:
-                            timestamp_str = f.read().strip()
-                            cached_time = datetime.fromisoformat(timestamp_str)
-
-                        age = datetime.now() - cached_time
-                        should_delete = age > timedelta(days=older_than_days)
-                    except:
-                        pass
-
-                if should_delete:
-                    file_path.unlink(missing_ok=True)
-                    meta_path.unlink(missing_ok=True)
-                    cleared_count += 1
-
+        cleared_count = self.cache.clear(
+            endpoint=ENDPOINT_ALIASES.get(endpoint, endpoint) if endpoint else None,
+            older_than_seconds=older_than_days * 86400 if older_than_days is not None else None
+        )
         logger.info(f"Cleared {cleared_count} cache entries")
         return cleared_count
 
     def get_cache_stats(self):
-        """Get cache statistics."""
-        total_requests = self.stats['hits'] + self.stats['misses']
-        hit_rate = (self.stats['hits'] / total_requests * 100) if total_requests > 0 else 0
-
-        # Calculate cache size
-        total_size = 0
-        total_files = 0
-
-        for endpoint_dir in self.cache_dir.iterdir():
-            if endpoint_dir.is_dir():
-                for file_path in endpoint_dir.glob('*.pkl'):
-                    total_size += file_path.stat().st_size
-                    total_files += 1
+        """Get cache statistics (shared cache; includes pass-through traffic)."""
+        unified = self.cache.get_stats()
+        total_requests = unified['hits'] + unified['misses']
 
         return {
-            'hits': self.stats['hits'],
-            'misses': self.stats['misses'],
+            'hits': unified['hits'],
+            'misses': unified['misses'],
             'errors': self.stats['errors'],
             'total_requests': total_requests,
-            'hit_rate': hit_rate,
-            'cache_size_mb': total_size / (1024 * 1024),
-            'cache_files': total_files
+            'hit_rate': unified['hit_rate'] * 100,
+            'cache_size_mb': unified['store']['size_bytes'] / (1024 * 1024),
+            'cache_files': unified['store']['entries'],
+            'by_endpoint': unified['by_endpoint']
         }
 
     def print_stats(self):
@@ -0,0 +1,403 @@
+"""
+Single-file response store for FMP API payloads.
+
+Replaces one-JSON-file-per-request caching with one SQLite database
+(WAL mode) holding every response:
+- key: request hash (FMPCache._get_key)
+- endpoint: first path segment (e.g. 'income-statement')
+- ttl_class: cache bucket ('universe', 'symbol', 'qualitative', ...)
+- payload: zlib-compressed JSON
+- fetched_at: unix timestamp of the fetch
+
+Safe for concurrent threads (one connection per thread) and for multiple
+processes (WAL + busy timeout).
+
+MemoryLRUCache is an optional in-process tier in front of the store: it keeps
+decoded payloads under a byte budget so repeated reads across pipeline
+stages (and Streamlit reruns) skip the database and JSON parsing entirely.
+
+Migration of existing cache directories:
+    python src/screener/cache_store.py migrate --cache-dir ./cache --pkl-dir .cache
+"""
+import json
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCacheStore:
+    """
+    Embedded key/value store for API responses.
+
+    Usage:
+        store = SQLiteCacheStore('./cache/fmp_cache.sqlite')
+        store.set(key, data, endpoint='profile', ttl_class='symbol')
+        data = store.get(key, max_age_seconds=48 * 3600)
+    """
+
+    def __init__(self, db_path: str, compress_level: int = 6, busy_timeout_ms: int = 30000):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.compress_level = compress_level
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections are not shared across threads)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000)
+            conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_database(self):
+        """Create schema."""
+        conn = self._connect()
+        with conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    ttl_class TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    payload BLOB NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_endpoint ON responses(endpoint)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_ttl_class ON responses(ttl_class)')
+
+    @staticmethod
+    def serialize(data: Any) -> bytes:
+        """Compact JSON encoding used for stored payloads."""
+        return json.dumps(data, separators=(',', ':')).encode()
+
+    def get_raw_entry(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """Return (json_bytes, fetched_at) regardless of age, or None."""
+        row = self._connect().execute(
+            'SELECT payload, fetched_at FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            return zlib.decompress(row[0]), row[1]
+        except zlib.error as e:
+            logger.warning(f"Corrupt cache entry {key[:8]}...: {e}")
+            return None
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (data, fetched_at) regardless of age, or None."""
+        entry = self.get_raw_entry(key)
+        if entry is None:
+            return None
+        try:
+            return json.loads(entry[0]), entry[1]
+        except ValueError as e:
+            logger.warning(f"Corrupt cache entry {key[:8]}...: {e}")
+            return None
+
+    def get(self, key: str, max_age_seconds: Optional[float] = None) -> Optional[Any]:
+        """Return data if present and younger than `max_age_seconds`."""
+        entry = self.get_entry(key)
+        if entry is None:
+            return None
+        data, fetched_at = entry
+        if max_age_seconds is not None and time.time() - fetched_at >= max_age_seconds:
+            return None
+        return data
+
+    def set(
+        self,
+        key: str,
+        data: Any,
+        endpoint: str,
+        ttl_class: str,
+        fetched_at: Optional[float] = None
+    ):
+        """Insert or replace an entry."""
+        self.set_raw(key, self.serialize(data), endpoint, ttl_class, fetched_at)
+
+    def set_raw(
+        self,
+        key: str,
+        raw: bytes,
+        endpoint: str,
+        ttl_class: str,
+        fetched_at: Optional[float] = None
+    ):
+        """Insert or replace an entry from already-serialized JSON bytes."""
+        blob = zlib.compress(raw, self.compress_level)
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(key, endpoint, ttl_class, fetched_at, size, payload) VALUES (?, ?, ?, ?, ?, ?)',
+                (key, endpoint, ttl_class, fetched_at or time.time(), len(blob), blob)
+            )
+
+    def delete(self, key: str):
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def clear(
+        self,
+        endpoint: Optional[str] = None,
+        ttl_class: Optional[str] = None,
+        older_than_seconds: Optional[float] = None
+    ) -> int:
+        """Delete matching entries. Returns number of rows removed."""
+        clauses, args = [], []
+        if endpoint:
+            clauses.append('endpoint = ?')
+            args.append(endpoint)
+        if ttl_class:
+            clauses.append('ttl_class = ?')
+            args.append(ttl_class)
+        if older_than_seconds is not None:
+            clauses.append('fetched_at < ?')
+            args.append(time.time() - older_than_seconds)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(f'DELETE FROM responses{where}', args)
+        return cursor.rowcount
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry counts and compressed size, total and per endpoint."""
+        conn = self._connect()
+        by_endpoint = {
+            endpoint: {'entries': count, 'size_bytes': size}
+            for endpoint, count, size in conn.execute(
+                'SELECT endpoint, COUNT(*), COALESCE(SUM(size), 0) FROM responses '
+                'GROUP BY endpoint ORDER BY SUM(size) DESC'
+            )
+        }
+        return {
+            'db_path': str(self.db_path),
+            'entries': sum(v['entries'] for v in by_endpoint.values()),
+            'size_bytes': sum(v['size_bytes'] for v in by_endpoint.values()),
+            'by_endpoint': by_endpoint
+        }
+
+    def close(self):
+        """Close this thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def copy_payload(data: Any) -> Any:
+    """Structural copy of a decoded JSON payload (dicts and lists; scalars are immutable)."""
+    if isinstance(data, dict):
+        return {key: copy_payload(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [copy_payload(value) for value in data]
+    return data
+
+
+class MemoryLRUCache:
+    """
+    Thread-safe in-process LRU of decoded payloads.
+
+    Bounded by total serialized payload bytes rather than entry count.
+    Payloads are parsed once; every reader gets its own copy (copy_payload,
+    about twice as fast as re-parsing the JSON), so callers can never mutate
+    each other's data. One instance per name is shared process-wide (see
+    `shared`), so short-lived clients - e.g. one per Streamlit rerun - keep
+    a warm tier.
+    """
+
+    _shared: Dict[str, 'MemoryLRUCache'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        # key -> (payload, fetched_at, serialized size)
+        self._entries: 'OrderedDict[str, Tuple[Any, float, int]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def shared(cls, name: str, max_bytes: int) -> 'MemoryLRUCache':
+        """Return the process-wide tier for `name`, creating it once."""
+        with cls._shared_lock:
+            cache = cls._shared.get(name)
+            if cache is None:
+                cache = cls(max_bytes)
+                cls._shared[name] = cache
+            return cache
+
+    def get(self, key: str, max_age_seconds: Optional[float] = None) -> Optional[Any]:
+        """Return a copy of the payload if present and fresh enough."""
+        entry = self.get_entry(key, max_age_seconds)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: str, max_age_seconds: Optional[float] = None) -> Optional[Tuple[Any, float]]:
+        """Return (copy of the payload, fetched_at) if present and fresh enough."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                max_age_seconds is None or time.time() - entry[1] < max_age_seconds
+            ):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                data, fetched_at = entry[0], entry[1]
+            else:
+                self.misses += 1
+                return None
+        return copy_payload(data), fetched_at
+
+    def put(self, key: str, data: Any, fetched_at: Optional[float] = None, size: Optional[int] = None):
+        """
+        Insert a payload (the tier keeps this object: don't mutate it
+        afterwards), evicting least recently used entries over budget.
+
+        `size` is its serialized size in bytes (computed if not given).
+        """
+        if size is None:
+            size = len(data) if isinstance(data, bytes) else len(SQLiteCacheStore.serialize(data))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (data, fetched_at or time.time(), size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def invalidate(self, key: str):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return tier statistics."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total > 0 else 0.0,
+                'entries': len(self._entries),
+                'size_bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions
+            }
+
+
+def endpoint_from_url(url: str) -> str:
+    """'https://.../api/v3/income-statement/AAPL' -> 'income-statement'."""
+    for marker in ('/api/v3/', '/api/v4/', '/stable/'):
+        if marker in url:
+            return url.split(marker, 1)[1].split('/', 1)[0].split('?', 1)[0]
+    return url.rstrip('/').rsplit('/', 1)[-1]
+
+
+def migrate_legacy_cache(
+    store: SQLiteCacheStore,
+    cache_dir: Optional[str] = None,
+    pkl_dir: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Import existing file caches into `store`.
+
+    - FMPCache layout: {cache_dir}/{universe,symbol,qualitative}/{sha256}.json
+      (the URL is not stored in these files, so the endpoint is recorded as
+      'legacy'; keys match FMPCache._get_key so entries are served as-is)
+    - CachedFMPClient layout: {pkl_dir}/{endpoint}/{md5}.pkl + .meta
+
+    Original modification/metadata times become `fetched_at`, so TTLs keep
+    counting from the original fetch. Returns counts of imported/skipped files.
+    """
+    counts = {'imported': 0, 'skipped': 0}
+
+    if cache_dir and Path(cache_dir).exists():
+        for bucket_dir in sorted(p for p in Path(cache_dir).iterdir() if p.is_dir()):
+            for path in bucket_dir.glob('*.json'):
+                try:
+                    with open(path, 'r') as f:
+                        data = json.load(f)
+                    store.set(path.stem, data, endpoint='legacy', ttl_class=bucket_dir.name,
+                              fetched_at=path.stat().st_mtime)
+                    counts['imported'] += 1
+                except Exception as e:
+                    logger.debug(f"Skipping {path}: {e}")
+                    counts['skipped'] += 1
+
+    if pkl_dir and Path(pkl_dir).exists():
+        from datetime import datetime
+        for endpoint_dir in sorted(p for p in Path(pkl_dir).iterdir() if p.is_dir()):
+            for path in endpoint_dir.glob('*.pkl'):
+                try:
+                    with open(path, 'rb') as f:
+                        data = pickle.load(f)
+                    meta_path = path.with_suffix('.meta')
+                    if meta_path.exists():
+                        fetched_at = datetime.fromisoformat(meta_path.read_text().strip()).timestamp()
+                    else:
+                        fetched_at = path.stat().st_mtime
+                    store.set(path.stem, data, endpoint=endpoint_dir.name,
+                              ttl_class=endpoint_dir.name, fetched_at=fetched_at)
+                    counts['imported'] += 1
+                except Exception as e:
+                    logger.debug(f"Skipping {path}: {e}")
+                    counts['skipped'] += 1
+
+    logger.info(f"Cache migration: {counts['imported']} imported, {counts['skipped']} skipped")
+    return counts
+
+
+def main():
+    """CLI entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='FMP response cache store')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    migrate = sub.add_parser('migrate', help='Import legacy cache directories')
+    migrate.add_argument('--db', default='./cache/fmp_cache.sqlite', help='Target database')
+    migrate.add_argument('--cache-dir', default='./cache', help='FMPCache directory (JSON files)')
+    migrate.add_argument('--pkl-dir', default='.cache', help='CachedFMPClient directory (pickle files)')
+
+    stats = sub.add_parser('stats', help='Show size per endpoint')
+    stats.add_argument('--db', default='./cache/fmp_cache.sqlite', help='Database path')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+
+    store = SQLiteCacheStore(args.db)
+    if args.command == 'migrate':
+        print(json.dumps(migrate_legacy_cache(store, args.cache_dir, args.pkl_dir), indent=2))
+    print(json.dumps(store.get_stats(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""
+Checkpoints for resumable pipeline runs.
+
+Every run gets a run ID and a directory under `pipeline.runs_dir`:
+
+    runs/20240115-093012-1a2b3c/
+        manifest.json          completed stages (rewritten atomically)
+        universe.pkl           stage outputs (DataFrames, written atomically)
+        topk.pkl
+        guardrails.pkl
+        scores.pkl
+        universe.partial       per-item progress inside a stage
+        features.partial       (append-only pickle records: one market or ticker each)
+        guardrails.partial
+
+A run interrupted mid-stage (rate limit, network, crash) is resumed with
+`--resume <run_id>`: completed stages are loaded from disk and, inside the
+stage that was interrupted, markets/tickers already in the .partial file
+are not fetched or computed again.
+
+Run directories are pruned by prune_runs: only the newest
+`pipeline.keep_runs` runs are kept (see ScreenerPipeline.run).
+
+Usage:
+    checkpoint = RunCheckpoint(runs_dir)                  # new run
+    checkpoint = RunCheckpoint.resume(runs_dir, run_id)   # existing run
+    if checkpoint.is_complete('universe'):
+        df = checkpoint.load_frame('universe')
+"""
+import json
+import logging
+import os
+import pickle
+import shutil
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+STAGES = ('universe', 'topk', 'features', 'guardrails', 'scores')
+
+MANIFEST = 'manifest.json'
+
+
+def new_run_id() -> str:
+    """Sortable, collision-safe run ID: timestamp + short random suffix."""
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def atomic_write(path: Path, write: Callable[[Path], None]):
+    """Write via a temp file in the same directory, then rename over `path`."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def prune_runs(runs_dir: str, keep: int, exclude: Iterable[str] = ()) -> List[str]:
+    """
+    Delete all but the newest `keep` run directories (run IDs sort by time).
+
+    Only directories with a manifest are considered, so nothing else under
+    runs_dir is touched; runs in `exclude` (e.g. the current one) are never
+    deleted and don't count towards `keep`.
+
+    Returns:
+        Run IDs deleted
+    """
+    root = Path(runs_dir)
+    if not root.is_dir():
+        return []
+    exclude = set(exclude)
+    runs = sorted(
+        (p for p in root.iterdir() if p.name not in exclude and (p / MANIFEST).exists()),
+        key=lambda p: p.name,
+        reverse=True
+    )
+    deleted = []
+    for run_dir in runs[max(0, keep):]:
+        try:
+            shutil.rmtree(run_dir)
+            deleted.append(run_dir.name)
+        except OSError as e:
+            logger.warning(f"Could not delete old run {run_dir}: {e}")
+    if deleted:
+        logger.info(f"Pruned {len(deleted)} old run(s) from {runs_dir} (keeping {keep})")
+    return deleted
+
+
+class RunCheckpoint:
+    """
+    Stage outputs and per-item progress of one pipeline run.
+
+    Stage files are only ever replaced whole (temp file + rename), so a
+    crash leaves either the previous version or the new one. Per-item
+    records are appended and flushed one at a time; a torn last record
+    from a crash is dropped on load.
+    """
+
+    def __init__(self, runs_dir: str, run_id: Optional[str] = None):
+        self.run_id = run_id or new_run_id()
+        self.run_dir = Path(runs_dir) / self.run_id
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._items: Dict[str, Dict[str, Any]] = {}
+
+        manifest_path = self.run_dir / MANIFEST
+        if manifest_path.exists():
+            with open(manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {
+                'run_id': self.run_id,
+                'created_at': datetime.now().isoformat(),
+                'stages': {}
+            }
+            self._write_manifest()
+
+    @classmethod
+    def resume(cls, runs_dir: str, run_id: str) -> 'RunCheckpoint':
+        """Open an existing run; raises FileNotFoundError if there is none."""
+        if not (Path(runs_dir) / run_id / MANIFEST).exists():
+            raise FileNotFoundError(f"No checkpointed run '{run_id}' in {runs_dir}")
+        checkpoint = cls(runs_dir, run_id)
+        logger.info(
+            f"Resuming run {run_id}: completed stages "
+            f"{list(checkpoint.manifest['stages']) or 'none'}"
+        )
+        return checkpoint
+
+    # ========================
+    # Stage outputs
+    # ========================
+
+    def is_complete(self, stage: str) -> bool:
+        return stage in self.manifest['stages'] and self._frame_path(stage).exists()
+
+    def save_frame(self, stage: str, df: pd.DataFrame):
+        """Persist a stage's output and mark the stage complete."""
+        atomic_write(self._frame_path(stage), df.to_pickle)
+        with self._lock:
+            self.manifest['stages'][stage] = {
+                'completed_at': datetime.now().isoformat(),
+                'rows': len(df)
+            }
+            self._write_manifest()
+        logger.info(f"✓ Checkpoint: {stage} ({len(df)} rows) -> {self.run_dir}")
+
+    def load_frame(self, stage: str) -> pd.DataFrame:
+        return pd.read_pickle(self._frame_path(stage))
+
+    # ========================
+    # Per-item progress
+    # ========================
+
+    def record(self, stage: str, key: str, value: Any):
+        """Append one completed item (market, ticker) of an in-progress stage."""
+        with self._lock:
+            items = self._load_items(stage)
+            with open(self._partial_path(stage), 'ab') as f:
+                pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+            items[key] = value
+
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        """A completed item of `stage`, or None."""
+        with self._lock:
+            return self._load_items(stage).get(key)
+
+    def completed(self, stage: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._load_items(stage))
+
+    def _load_items(self, stage: str) -> Dict[str, Any]:
+        """Read a .partial file once (caller holds the lock)."""
+        if stage in self._items:
+            return self._items[stage]
+
+        items = {}
+        path = self._partial_path(stage)
+        if path.exists():
+            torn = False
+            with open(path, 'rb') as f:
+                while True:
+                    try:
+                        key, value = pickle.load(f)
+                    except EOFError:
+                        break
+                    except Exception:
+                        torn = True
+                        break
+                    items[key] = value
+
+            if torn:
+                # Rewrite without the torn record so later appends stay readable
+                logger.warning(f"Checkpoint {path.name}: dropped a truncated record")
+
+                def rewrite(tmp):
+                    with open(tmp, 'wb') as out:
+                        for item in items.items():
+                            pickle.dump(item, out, protocol=pickle.HIGHEST_PROTOCOL)
+
+                atomic_write(path, rewrite)
+
+        self._items[stage] = items
+        return items
+
+    # ========================
+    # Files
+    # ========================
+
+    def _frame_path(self, stage: str) -> Path:
+        return self.run_dir / f"{stage}.pkl"
+
+    def _partial_path(self, stage: str) -> Path:
+        return self.run_dir / f"{stage}.partial"
+
+    def _write_manifest(self):
+        self.manifest['updated_at'] = datetime.now().isoformat()
+
+        def write(tmp):
+            with open(tmp, 'w') as f:
+                json.dump(self.manifest, f, indent=2)
+
+        atomic_write(self.run_dir / MANIFEST, write)
@@ -0,0 +1,299 @@
+"""
+Vectorized universe enrichment and classification.
+
+_build_universe used to run six row-wise `df.apply(..., axis=1)` passes
+(sector fallback, financial/REIT/utility/ETF flags, exchange suffixes),
+each doing Python substring checks per row. Here the same rules run
+column-wise:
+- industry/sector rules are evaluated once per distinct value and mapped
+  back (a 40k-row global universe has only a few hundred industries)
+- name rules use one precompiled alternation regex via `str.contains`
+- exchange suffixes are a dict lookup on the exchange column
+
+The row-wise rules these replace are kept as the reference implementation
+in tests/test_classification.py.
+
+Usage:
+    df['symbol'] = fix_symbol_suffixes(df)
+    df['sector'] = enrich_sectors(df)
+    df[FLAG_COLUMNS] = classify(df)
+"""
+import logging
+import re
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# ETF/Index tickers that must not be compared with stocks
+ETF_TICKERS = ['QQQ', 'SPY', 'IWM', 'DIA', 'VTI', 'VOO', 'VEA', 'VWO',
+               'EFA', 'EEM', 'AGG', 'BND', 'TLT', 'GLD', 'SLV',
+               'XLK', 'XLF', 'XLE', 'XLV', 'XLI', 'XLC', 'XLY', 'XLP', 'XLRE']
+
+# Sector fallback: industry keywords per sector (first match in this order wins)
+SECTOR_KEYWORDS: Dict[str, List[str]] = {
+    'Technology': [
+        'software', 'internet', 'semiconductor', 'computer',
+        'electronics', 'it services', 'cloud', 'saas',
+        'cybersecurity', 'artificial intelligence', 'data'
+    ],
+    'Consumer Cyclical': [
+        'retail', 'e-commerce', 'automotive', 'apparel',
+        'leisure', 'hotels', 'restaurants', 'travel',
+        'homebuilding', 'luxury goods'
+    ],
+    'Consumer Defensive': [
+        'food', 'beverage', 'tobacco', 'household products',
+        'personal products', 'discount stores'
+    ],
+    'Healthcare': [
+        'pharmaceutical', 'biotechnology', 'medical',
+        'health care', 'diagnostics', 'hospital'
+    ],
+    'Financials': [
+        'bank', 'insurance', 'asset management', 'brokerage',
+        'credit services', 'capital markets', 'mortgage'
+    ],
+    'Communication Services': [
+        'telecommunication', 'media', 'entertainment',
+        'publishing', 'broadcasting', 'internet content'
+    ],
+    'Industrials': [
+        'aerospace', 'defense', 'construction', 'machinery',
+        'transportation', 'logistics', 'engineering'
+    ],
+    'Energy': [
+        'oil', 'gas', 'petroleum', 'energy', 'coal',
+        'renewable energy', 'utilities'  # Some energy utilities
+    ],
+    'Basic Materials': [
+        'chemicals', 'metals', 'mining', 'steel',
+        'paper', 'packaging', 'commodities'
+    ],
+    'Real Estate': [
+        'reit', 'real estate', 'property'
+    ],
+    'Utilities': [
+        'electric', 'water', 'utility', 'power generation'
+    ]
+}
+
+# API sector values treated as missing
+INVALID_SECTORS = ['unknown', 'n/a', '']
+
+FINANCIAL_KEYWORDS = ['bank', 'insurance', 'asset management', 'brokerage',
+                      'diversified financial', 'credit services', 'capital markets']
+
+ETF_INDUSTRIES = [
+    'exchange traded fund',
+    'exchange-traded fund',
+    'investment trust',
+    'closed-end fund',
+    'open-end fund'
+]
+
+ETF_NAME_KEYWORDS = [
+    ' etf',           # Space before to avoid "marketplace", "et cetera"
+    'etf ',           # Space after
+    ' fund',          # Generic funds
+    'index fund',
+    'yield etf',
+    'income etf',
+    'dividend etf',
+    'sector etf',
+    'covered call',   # Common in Canadian ETFs (e.g., Hamilton, Purpose)
+    'yield maximizer',  # Canadian covered call ETFs
+    'premium yield',
+    'high interest savings',  # Money market ETFs
+    'money market',
+    'cash management',
+    'aggregate bond',
+    'bond index',
+    'equity index',
+    'composite index',
+    'total market',
+    'global x',       # ETF provider
+    'ishares',        # ETF provider
+    'vanguard',       # ETF provider (though some are funds, most are ETFs)
+    'betapro',        # Leveraged ETF provider
+    'harvest',        # Canadian ETF provider
+    'hamilton',       # Canadian ETF provider
+    'purpose',        # Canadian ETF provider
+    'evolve',         # Canadian ETF provider
+]
+
+# FMP sometimes returns international symbols without the exchange suffix
+# (e.g. 'BP' instead of 'BP.L'), but later API calls need the full symbol
+EXCHANGE_SUFFIXES = {
+    'LSE': '.L',      # London Stock Exchange
+    'LON': '.L',      # London (alternative code)
+    'IDX': '.JK',     # Indonesia Stock Exchange
+    'NSE': '.NS',     # National Stock Exchange of India
+    'BSE': '.BO',     # Bombay Stock Exchange
+    'ASX': '.AX',     # Australian Securities Exchange
+    'TSX': '.TO',     # Toronto Stock Exchange
+    'TSXV': '.V',     # TSX Venture Exchange
+    'NEO': '.NE',     # NEO Exchange Canada
+    'SAO': '.SA',     # B3 São Paulo
+    'BVMF': '.SA',    # Bovespa (Brazil)
+    'BMV': '.MX',     # Bolsa Mexicana de Valores
+    'MEX': '.MX',     # Mexico Stock Exchange
+    'SIX': '.SW',     # SIX Swiss Exchange
+    'SW': '.SW',      # Swiss Exchange
+    'EPA': '.PA',     # Euronext Paris
+    'PAR': '.PA',     # Paris Stock Exchange
+    'ETR': '.DE',     # Deutsche Börse XETRA
+    'GER': '.DE',     # Germany
+    'FRA': '.F',      # Frankfurt
+    'XETRA': '.DE',   # XETRA
+    'MIL': '.MI',     # Borsa Italiana Milan
+    'BIT': '.MI',     # Milan Stock Exchange
+    'BME': '.MC',     # Bolsa de Madrid
+    'MCE': '.MC',     # Madrid Stock Exchange
+    'AMS': '.AS',     # Euronext Amsterdam
+    'STO': '.ST',     # Nasdaq Stockholm
+    'OSE': '.OL',     # Oslo Børs
+    'CPH': '.CO',     # Nasdaq Copenhagen
+    'HEL': '.HE',     # Nasdaq Helsinki
+    'BRU': '.BR',     # Euronext Brussels
+    'VIE': '.VI',     # Vienna Stock Exchange
+    'WSE': '.WA',     # Warsaw Stock Exchange
+    'TSE': '.T',      # Tokyo Stock Exchange
+    'JPX': '.T',      # Japan Exchange Group
+    'HKSE': '.HK',    # Hong Kong Stock Exchange
+    'HKG': '.HK',     # Hong Kong
+    'SSE': '.SS',     # Shanghai Stock Exchange
+    'SZSE': '.SZ',    # Shenzhen Stock Exchange
+    'KRX': '.KS',     # Korea Exchange
+    'KOSDAQ': '.KQ',  # KOSDAQ
+    'SGX': '.SI',     # Singapore Exchange
+    'SET': '.BK',     # Stock Exchange of Thailand
+    'Tadawul': '.SAU',  # Saudi Stock Exchange
+    'DFM': '.DU',     # Dubai Financial Market
+    'ADX': '.AD',     # Abu Dhabi Securities Exchange
+    'QE': '.QA',      # Qatar Exchange
+    'TASE': '.TA',    # Tel Aviv Stock Exchange
+    'JSE': '.JO',     # Johannesburg Stock Exchange (South Africa)
+    'EGX': '.CA',     # Egyptian Exchange
+    # US exchanges don't need suffix
+    'NYSE': '',
+    'NASDAQ': '',
+    'AMEX': '',
+    'NYSEArca': '',
+    'BATS': '',
+}
+
+FLAG_COLUMNS = ['is_financial', 'is_REIT', 'is_utility', 'is_ETF']
+
+
+def _keyword_pattern(keywords: List[str]) -> re.Pattern:
+    """One compiled alternation for plain substring keywords."""
+    return re.compile('|'.join(re.escape(k) for k in keywords))
+
+
+SECTOR_PATTERNS = [(sector, _keyword_pattern(kws)) for sector, kws in SECTOR_KEYWORDS.items()]
+FINANCIAL_PATTERN = _keyword_pattern(FINANCIAL_KEYWORDS)
+ETF_INDUSTRY_PATTERN = _keyword_pattern(ETF_INDUSTRIES)
+ETF_NAME_PATTERN = _keyword_pattern(ETF_NAME_KEYWORDS)
+ETF_EXEMPT_INDUSTRY_PATTERN = _keyword_pattern(['reit', 'real estate investment trust', 'royalt'])
+
+
+def text_column(df: pd.DataFrame, *columns: str) -> pd.Series:
+    """
+    First non-empty value among `columns` as a string ('' if none).
+
+    Column-wise equivalent of `row.get(a) or row.get(b) or ''`; missing
+    values (None/NaN) count as empty.
+    """
+    result = pd.Series('', index=df.index, dtype=object)
+    for column in reversed(columns):
+        if column in df.columns:
+            values = df[column]
+            present = values.notna() & (values.astype(str) != '')
+            result = values.astype(object).where(present, result)
+    return result.astype(str)
+
+
+def _per_value(values: pd.Series, fn: Callable, dtype=object) -> pd.Series:
+    """Evaluate `fn` once per distinct value and map the results back."""
+    codes, uniques = pd.factorize(values)
+    table = np.array([fn(value) for value in uniques], dtype=dtype)
+    return pd.Series(table[codes], index=values.index)
+
+
+def infer_sector(industry: str) -> str:
+    """Sector from (lower-case) industry keywords, or 'Unknown'."""
+    for sector, pattern in SECTOR_PATTERNS:
+        if pattern.search(industry):
+            return sector
+    return 'Unknown'
+
+
+def fix_symbol_suffixes(df: pd.DataFrame) -> pd.Series:
+    """Symbols with the exchange suffix added where missing."""
+    symbols = text_column(df, 'symbol')
+    suffixes = df['exchangeShortName'].map(EXCHANGE_SUFFIXES).fillna('').astype(str)
+    needs_suffix = ~symbols.str.contains('.', regex=False) & (suffixes != '')
+    return symbols.where(~needs_suffix, symbols + suffixes)
+
+
+def enrich_sectors(df: pd.DataFrame) -> pd.Series:
+    """
+    Sector with fallback logic (same rules as the former row-wise pass):
+    ETF/Index tickers -> 'ETF_Index', valid API sector, industry keywords, 'Unknown'.
+    """
+    tickers = text_column(df, 'symbol', 'ticker').str.upper()
+    sectors = text_column(df, 'sector').str.strip()
+    industries = text_column(df, 'industry').str.lower()
+
+    inferred = _per_value(industries, infer_sector)
+    valid = ~sectors.str.lower().isin(INVALID_SECTORS)
+    result = sectors.where(valid, inferred)
+
+    is_etf = tickers.isin(ETF_TICKERS)
+    if is_etf.any():
+        logger.info(f"ETF/Index tickers → Sector ETF_Index: {tickers[is_etf].tolist()}")
+    result = result.where(~is_etf, 'ETF_Index')
+
+    unknown = result == 'Unknown'
+    if unknown.any():
+        logger.warning(
+            f"Could not infer sector for {unknown.sum()} stocks "
+            f"(e.g. {tickers[unknown].head(5).tolist()})"
+        )
+    return result.astype(str)
+
+
+def classify(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    is_financial / is_REIT / is_utility / is_ETF flags (same rules as the
+    ScreenerPipeline._classify_* methods). Expects the enriched sector.
+    """
+    sectors = text_column(df, 'sector').str.lower()
+    industries = text_column(df, 'industry').str.lower()
+    names = text_column(df, 'name', 'companyName').str.lower()
+    types = text_column(df, 'type').str.lower()
+
+    financial_industry = _per_value(industries, lambda i: bool(FINANCIAL_PATTERN.search(i)), bool)
+    reit_industry = _per_value(industries, lambda i: 'reit' in i, bool)
+    etf_industry = _per_value(industries, lambda i: bool(ETF_INDUSTRY_PATTERN.search(i)), bool)
+    exempt_industry = _per_value(industries, lambda i: bool(ETF_EXEMPT_INDUSTRY_PATTERN.search(i)), bool)
+
+    # Name keywords, except REITs, royalty trusts/funds and mortgage investment corporations
+    etf_name = names.str.contains(ETF_NAME_PATTERN, regex=True)
+    exempt_name = (
+        names.str.contains('royalt', regex=False)
+        | (names.str.contains('mortgage', regex=False)
+           & names.str.contains('investment', regex=False)
+           & names.str.contains('corporation', regex=False))
+    )
+
+    return pd.DataFrame({
+        'is_financial': sectors.str.contains('financial', regex=False) | financial_industry,
+        'is_REIT': reit_industry,
+        'is_utility': sectors.str.contains('utilit(?:ies|y)', regex=True),
+        'is_ETF': (types == 'etf') | etf_industry | (etf_name & ~exempt_industry & ~exempt_name),
+    }, index=df.index).astype(bool)
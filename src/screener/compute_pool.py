@@ -0,0 +1,174 @@
+"""
+Process-pool CPU stage for feature and guardrail math.
+
+Once a ticker's data is in hand, FeatureCalculator and GuardrailCalculator
+are pure-Python CPU work, so a thread pool is capped to one core by the
+GIL. In process mode the I/O layer (threads, pooled session, cache)
+collects each ticker's raw payloads into a small dict - only the
+responses the calculators read, one per endpoint/period - and the math
+runs in a ProcessPoolExecutor on a SnapshotFMPClient built from that dict.
+
+Usage:
+    payloads = collect_payloads(fmp, symbol, company_type)
+    pool.submit(compute_ticker, symbol, company_type, industry, payloads, True)
+"""
+import copy
+import logging
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .features import FEATURE_CALLS, FeatureCalculator
+    from .guardrails import GUARDRAIL_CALLS, GuardrailCalculator
+except ImportError:
+    # Fallback for direct execution
+    from features import FEATURE_CALLS, FeatureCalculator
+    from guardrails import GUARDRAIL_CALLS, GuardrailCalculator
+
+logger = logging.getLogger(__name__)
+
+
+# Series methods that are served from one payload per period by slicing
+STATEMENT_METHODS = {'get_income_statement', 'get_balance_sheet', 'get_cash_flow'}
+
+
+def payload_key(method: str, kwargs: Dict) -> str:
+    """Snapshot key for a client call (statements: one entry per period)."""
+    if method in STATEMENT_METHODS:
+        return f"{method}:{kwargs.get('period', 'quarter')}"
+    return method
+
+
+class SnapshotFMPClient:
+    """
+    Read-only FMPClient stand-in backed by pre-fetched payloads.
+
+    Exposes the get_* surface the calculators use. Statement calls are
+    sliced to the requested limit (newest first, like the API). Calls not
+    in the snapshot return [] and are recorded in `misses`.
+    """
+
+    def __init__(self, payloads: Dict[str, Any]):
+        self.payloads = payloads
+        self.misses: List[str] = []
+
+    def __getattr__(self, name: str):
+        if not name.startswith('get_'):
+            raise AttributeError(name)
+
+        def lookup(symbol, **kwargs):
+            key = payload_key(name, kwargs)
+            if key not in self.payloads:
+                self.misses.append(key)
+                return []
+            data = copy.deepcopy(self.payloads[key])
+            limit = kwargs.get('limit')
+            if name in STATEMENT_METHODS and limit is not None and isinstance(data, list):
+                return data[:limit]
+            return data
+
+        return lookup
+
+
+def calls_for(
+    company_type: str,
+    include_features: bool = True,
+    include_guardrails: bool = True
+) -> Dict[str, Tuple[str, Dict]]:
+    """Calls the calculators make for a company type, one per snapshot key (largest limit wins)."""
+    plan = (
+        (FEATURE_CALLS.get(company_type, []) if include_features else [])
+        + (GUARDRAIL_CALLS if include_guardrails else [])
+    )
+    calls: Dict[str, Tuple[str, Dict]] = {}
+    for method, kwargs in plan:
+        key = payload_key(method, kwargs)
+        current = calls.get(key)
+        if current is None or kwargs.get('limit', 0) > current[1].get('limit', 0):
+            calls[key] = (method, kwargs)
+    return calls
+
+
+def collect_payloads(fmp_client, symbol: str, company_type: str, include_features: bool = True) -> Dict[str, Any]:
+    """
+    I/O side: fetch (or read from cache) everything a ticker's calculators need.
+
+    Failed calls are left out of the snapshot; the calculators then see []
+    exactly as they would for an empty API response.
+    """
+    payloads = {}
+    for key, (method, kwargs) in calls_for(company_type, include_features).items():
+        try:
+            payloads[key] = getattr(fmp_client, method)(symbol, **kwargs)
+        except Exception as e:
+            logger.warning(f"{symbol}: {method} failed during payload collection: {e}")
+    return payloads
+
+
+def calculate_features_safe(calculator, symbol: str, company_type: str) -> Dict:
+    """Process a single stock's features."""
+    try:
+        features = calculator.calculate_features(symbol, company_type)
+        features['ticker'] = symbol
+        # Only log if actually got data (not empty dict)
+        if len(features) > 1:  # More than just ticker
+            logger.info(f"✓ Features calculated for {symbol}")
+        else:
+            logger.warning(f"⚠ Features calculation returned empty data for {symbol}")
+        return features
+    except Exception as e:
+        logger.error(f"✗ Failed to calculate features for {symbol}: {e}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return {'ticker': symbol}
+
+
+def calculate_guardrails_safe(calculator, symbol: str, company_type: str, industry: str) -> Dict:
+    """Process a single stock's guardrails."""
+    try:
+        guardrails = calculator.calculate_guardrails(symbol, company_type, industry)
+        guardrails['ticker'] = symbol
+        logger.info(f"✓ Guardrails calculated for {symbol}")
+        return guardrails
+    except Exception as e:
+        logger.error(f"✗ Failed to calculate guardrails for {symbol}: {e}")
+        return {
+            'ticker': symbol,
+            'guardrail_status': 'AMBAR',
+            'guardrail_reasons': f'Error: {str(e)[:50]}'
+        }
+
+
+# ========================
+# Worker process side
+# ========================
+
+_worker_config: Dict = {}
+
+
+def init_worker(config: Dict):
+    """ProcessPoolExecutor initializer: keep the (picklable) config per process."""
+    global _worker_config
+    _worker_config = config
+
+
+def compute_ticker(
+    symbol: str,
+    company_type: str,
+    industry: str,
+    payloads: Dict[str, Any],
+    include_features: bool = True
+) -> Tuple[Optional[Dict], Dict, List[str]]:
+    """
+    CPU side: features (optional) and guardrails from a payload snapshot.
+
+    Returns:
+        (features or None, guardrails, snapshot misses)
+    """
+    client = SnapshotFMPClient(payloads)
+    features = None
+    if include_features:
+        features = calculate_features_safe(FeatureCalculator(client), symbol, company_type)
+    guardrails = calculate_guardrails_safe(
+        GuardrailCalculator(client, _worker_config), symbol, company_type, industry or ''
+    )
+    return features, guardrails, client.misses
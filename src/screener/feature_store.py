@@ -0,0 +1,182 @@
+"""
+Per-symbol store for incremental feature computation.
+
+Each symbol's last computed features are kept together with the
+fingerprint of the inputs they were computed from: the company type plus
+the `date`/`fillingDate` of the latest quarterly statement. A symbol is
+recomputed when that fingerprint changes (a new 10-Q/10-K was filed), and
+at least every max age (24h by default in the pipeline): the features
+also read price-driven inputs (TTM ratios, enterprise value, market cap),
+which change without a filing.
+
+Replaces the monolithic incremental_processing.json, which was read and
+rewritten (indent=2) in full on every run: rows are upserted per symbol
+in one transaction.
+
+Usage:
+    store = FeatureStore('./cache/features.sqlite')
+    fingerprint = filing_fingerprint(fmp_client, 'AAPL', 'non_financial')
+    entry = store.get_many(['AAPL']).get('AAPL')
+    if store.is_current(entry, fingerprint, max_age_hours=24):
+        features = entry['features']
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def filing_fingerprint(fmp_client, symbol: str, company_type: str, period: str = 'quarter') -> Optional[str]:
+    """
+    Input fingerprint for a symbol's features, or None if it can't be determined.
+
+    Reads the latest income statement of `period` ('quarter' or 'annual').
+    In statement-store mode this is sliced from the same cached series
+    FeatureCalculator reads, so the check costs no extra API call.
+
+    Staleness: the statement comes through the client's response cache, so
+    a new filing is seen once the cached income statement expires - up to
+    the 'income-statement' TTL (`cache.ttl_policy_hours`, else
+    `cache.ttl_symbol_hours`, 48h by default). Statements have no
+    stale-while-revalidate grace window. The cache is deliberately not
+    bypassed here: the recomputed features would read the same cached
+    statements, so shorten that TTL to pick up filings sooner.
+    """
+    try:
+        statements = fmp_client.get_income_statement(symbol, period=period, limit=1)
+    except Exception as e:
+        logger.debug(f"{symbol}: filing date check failed: {e}")
+        return None
+    if not statements or not isinstance(statements, list):
+        return None
+    latest = statements[0]
+    return f"{company_type}|{latest.get('date')}|{latest.get('fillingDate')}"
+
+
+def _json_default(value: Any):
+    """numpy scalars -> Python scalars."""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class FeatureStore:
+    """
+    SQLite table of features per symbol.
+
+    Table (`table` defaults to 'features'; other per-symbol payloads, e.g.
+    peer metrics, use their own table in the same layout):
+    - features(symbol PRIMARY KEY, fingerprint, computed_at, payload)
+    """
+
+    def __init__(self, db_path: str, busy_timeout_ms: int = 30000, table: str = 'features'):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table!r}")
+        self.table = table
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections are not thread-safe)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_database(self):
+        conn = self._connect()
+        with conn:
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    symbol TEXT PRIMARY KEY,
+                    fingerprint TEXT,
+                    computed_at REAL NOT NULL,
+                    payload TEXT NOT NULL
+                )
+            """)
+
+    def get_many(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """{symbol: {'fingerprint', 'computed_at', 'features'}} for stored symbols."""
+        symbols = list(symbols)
+        entries = {}
+        conn = self._connect()
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(symbols), 500):
+            chunk = symbols[i:i + 500]
+            rows = conn.execute(
+                f"SELECT symbol, fingerprint, computed_at, payload FROM {self.table} "
+                f"WHERE symbol IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchall()
+            for symbol, fingerprint, computed_at, payload in rows:
+                try:
+                    features = json.loads(payload)
+                except ValueError as e:
+                    logger.warning(f"Corrupt feature entry for {symbol}: {e}")
+                    continue
+                entries[symbol] = {
+                    'fingerprint': fingerprint,
+                    'computed_at': computed_at,
+                    'features': features
+                }
+        return entries
+
+    def put_many(self, records: List[Dict[str, Any]]):
+        """Upsert [{'symbol', 'fingerprint', 'features'}] in one transaction."""
+        if not records:
+            return
+        now = time.time()
+        rows = [
+            (r['symbol'], r.get('fingerprint'), now, json.dumps(r['features'], default=_json_default))
+            for r in records
+        ]
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (symbol, fingerprint, computed_at, payload) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    @staticmethod
+    def is_current(
+        entry: Optional[Dict[str, Any]],
+        fingerprint: Optional[str],
+        max_age_hours: float,
+        fallback_ttl_hours: float = 24
+    ) -> bool:
+        """
+        True if stored features can be reused.
+
+        Reused while the input fingerprint is unchanged and the entry is
+        younger than `max_age_hours`. Without a fingerprint (filing date not
+        available) the wall-clock `fallback_ttl_hours` applies.
+        """
+        if entry is None:
+            return False
+        age_hours = (time.time() - entry['computed_at']) / 3600
+        if fingerprint is None or entry['fingerprint'] is None:
+            return age_hours <= fallback_ttl_hours
+        return entry['fingerprint'] == fingerprint and age_hours <= max_age_hours
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return store statistics."""
+        count = self._connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        return {'symbols': count, 'db_path': str(self.db_path)}
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -7,9 +7,53 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 
+try:
+    from .tracing import traced
+except ImportError:
+    # Fallback for direct execution
+    from tracing import traced
+
 logger = logging.getLogger(__name__)
 
 
+# API calls made per company type, in the order the calculator unpacks
+# them: (method, kwargs). Payload collection for the asyncio client
+# (async_client) and process mode (compute_pool) reads this same plan.
+FEATURE_CALLS = {
+    'non_financial': [
+        ('get_profile', {}),
+        ('get_key_metrics_ttm', {}),
+        ('get_ratios_ttm', {}),
+        ('get_enterprise_values', {'limit': 4}),
+        # 12 quarters for growth/trend analysis (3 years)
+        ('get_income_statement', {'period': 'quarter', 'limit': 12}),
+        ('get_balance_sheet', {'period': 'quarter', 'limit': 12}),
+        ('get_cash_flow', {'period': 'quarter', 'limit': 12}),
+    ],
+    'financial': [
+        ('get_profile', {}),
+        ('get_key_metrics_ttm', {}),
+        ('get_ratios_ttm', {}),
+        ('get_income_statement', {'period': 'quarter', 'limit': 4}),
+        ('get_balance_sheet', {'period': 'quarter', 'limit': 4}),
+        ('get_cash_flow', {'period': 'quarter', 'limit': 4}),
+    ],
+    'reit': [
+        ('get_profile', {}),
+        ('get_key_metrics_ttm', {}),
+        ('get_ratios_ttm', {}),
+        ('get_income_statement', {'period': 'quarter', 'limit': 4}),
+        ('get_balance_sheet', {'period': 'quarter', 'limit': 4}),
+        ('get_cash_flow', {'period': 'quarter', 'limit': 4}),
+    ],
+    'utility': [
+        ('get_income_statement', {'period': 'quarter', 'limit': 8}),
+        ('get_balance_sheet', {'period': 'quarter', 'limit': 8}),
+        ('get_cash_flow', {'period': 'quarter', 'limit': 8}),
+    ],
+}
+
+
 class FeatureCalculator:
     """
     Calculate Value and Quality metrics for different company types:
@@ -21,6 +65,11 @@ class FeatureCalculator:
     def __init__(self, fmp_client):
         self.fmp = fmp_client
 
+    def _fetch(self, symbol: str, company_type: str) -> List:
+        """Results of FEATURE_CALLS[company_type], in plan order."""
+        return [getattr(self.fmp, method)(symbol, **kwargs) for method, kwargs in FEATURE_CALLS[company_type]]
+
+    @traced('features.calculate', attributes=('symbol', 'company_type'))
     def calculate_features(self, symbol: str, company_type: str) -> Dict:
         """
         Main entry point: calculate all features for a symbol.
@@ -78,14 +127,9 @@ class FeatureCalculator:
 
         # Get data from FMP
         try:
-            profile = self.fmp.get_profile(symbol)
-            metrics_ttm = self.fmp.get_key_metrics_ttm(symbol)
-            ratios_ttm = self.fmp.get_ratios_ttm(symbol)
-            ev_data = self.fmp.get_enterprise_values(symbol, limit=4)
-            # Fetch 12 quarters for growth/trend analysis (3 years)
-            income = self.fmp.get_income_statement(symbol, period='quarter', limit=12)
-            balance = self.fmp.get_balance_sheet(symbol, period='quarter', limit=12)
-            cashflow = self.fmp.get_cash_flow(symbol, period='quarter', limit=12)
+            # 12 quarters of statements for growth/trend analysis (3 years)
+            profile, metrics_ttm, ratios_ttm, ev_data, income, balance, cashflow = \
+                self._fetch(symbol, 'non_financial')
 
             # Check if we got minimal required data
             if not profile or not income or len(income) < 4:
@@ -595,12 +639,7 @@ class FeatureCalculator:
         features = {}
 
         try:
-            profile = self.fmp.get_profile(symbol)
-            metrics_ttm = self.fmp.get_key_metrics_ttm(symbol)
-            ratios_ttm = self.fmp.get_ratios_ttm(symbol)
-            income = self.fmp.get_income_statement(symbol, period='quarter', limit=4)
-            balance = self.fmp.get_balance_sheet(symbol, period='quarter', limit=4)
-            cashflow = self.fmp.get_cash_flow(symbol, period='quarter', limit=4)
+            profile, metrics_ttm, ratios_ttm, income, balance, cashflow = self._fetch(symbol, 'financial')
 
             # Check if we got minimal required data
             if not profile or not income or len(income) < 4:
@@ -813,12 +852,7 @@ class FeatureCalculator:
         features = {}
 
         try:
-            profile = self.fmp.get_profile(symbol)
-            metrics_ttm = self.fmp.get_key_metrics_ttm(symbol)
-            ratios_ttm = self.fmp.get_ratios_ttm(symbol)
-            income = self.fmp.get_income_statement(symbol, period='quarter', limit=4)
-            balance = self.fmp.get_balance_sheet(symbol, period='quarter', limit=4)
-            cashflow = self.fmp.get_cash_flow(symbol, period='quarter', limit=4)
+            profile, metrics_ttm, ratios_ttm, income, balance, cashflow = self._fetch(symbol, 'reit')
 
             # Check if we got minimal required data
             if not profile or not income or len(income) < 4:
@@ -959,9 +993,7 @@ class FeatureCalculator:
         """
         features = {}
 
-        income = self.fmp.get_income_statement(symbol, period='quarter', limit=8)
-        balance = self.fmp.get_balance_sheet(symbol, period='quarter', limit=8)
-        cashflow = self.fmp.get_cash_flow_statement(symbol, period='quarter', limit=8)
+        income, balance, cashflow = self._fetch(symbol, 'utility')
 
         if not income or not balance or not cashflow:
             return {}
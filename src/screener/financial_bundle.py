@@ -0,0 +1,235 @@
+"""
+Per-symbol financial bundle for QualitativeAnalyzer.
+
+analyze_symbol's sections (DCF, reverse DCF, earnings quality, balance
+sheet strength, multiples, red flags, ...) each re-read the profile and the
+statements with their own period/limit - limit=1, 2, 3, 5, 6 of the same
+annual series. Even on a warm cache every call is a key hash, a cache
+lookup and a JSON decode. The bundle loads each series once, at the
+deepest history any section reads, and serves every smaller limit by
+slicing in memory:
+
+- profile, quote, key metrics (TTM)
+- income statement / balance sheet / cash flow, annual and quarterly
+
+It is a drop-in for the client: calls for other symbols (peers), deeper
+history than loaded, and other endpoints (news, transcripts, insiders)
+pass straight through.
+
+BundleCache extends this across symbols for batch runs: one bundle per
+symbol, shared by every analysis in the batch, so a peer that appears in
+ten tickers' peer sets is loaded once.
+
+Usage:
+    bundle = FinancialBundle(fmp_client, 'AAPL')
+    income = bundle.get_income_statement('AAPL', period='annual', limit=3)
+
+    shared = BundleCache(fmp_client)     # batch: QualitativeAnalyzer(shared, config)
+"""
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Depth loaded per period when the client has no statement_history of its own
+DEFAULT_HISTORY = {'annual': 10, 'quarter': 12}
+
+
+class FinancialBundle:
+    """
+    One symbol's profile, quote, key metrics and statements, loaded once.
+
+    Each series is fetched lazily on first use, once even when concurrent
+    sections ask for it at the same time. A failed fetch is remembered and
+    re-raised, so sections see the same exception the client raised
+    without calling the API again. Returned lists are copies; the records
+    inside are shared and treated as read-only.
+    """
+
+    def __init__(self, fmp_client, symbol: str, history: Optional[Dict[str, int]] = None):
+        self.fmp = fmp_client
+        self.symbol = symbol
+        self.history = dict(DEFAULT_HISTORY)
+        self.history.update(getattr(fmp_client, 'statement_history', None) or {})
+        self.history.update(history or {})
+
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+        self._data: Dict[str, Any] = {}
+        self._errors: Dict[str, Exception] = {}
+        self.loads = 0
+        self.hits = 0
+
+    def __getattr__(self, name: str):
+        # Everything not bundled goes to the client
+        if name == 'fmp':
+            raise AttributeError(name)
+        return getattr(self.fmp, name)
+
+    # ========================
+    # Bundled series
+    # ========================
+
+    def get_profile(self, symbol: str):
+        if symbol != self.symbol:
+            return self.fmp.get_profile(symbol)
+        return self._get('profile', lambda: self.fmp.get_profile(symbol))
+
+    def get_quote(self, symbol: str):
+        if symbol != self.symbol:
+            return self.fmp.get_quote(symbol)
+        return self._get('quote', lambda: self.fmp.get_quote(symbol))
+
+    def get_key_metrics_ttm(self, symbol: str):
+        if symbol != self.symbol:
+            return self.fmp.get_key_metrics_ttm(symbol)
+        return self._get('key_metrics_ttm', lambda: self.fmp.get_key_metrics_ttm(symbol))
+
+    def get_income_statement(self, symbol: str, period: str = 'quarter', limit: int = 4):
+        return self._statement('get_income_statement', symbol, period, limit)
+
+    def get_balance_sheet(self, symbol: str, period: str = 'quarter', limit: int = 4):
+        return self._statement('get_balance_sheet', symbol, period, limit)
+
+    def get_cash_flow(self, symbol: str, period: str = 'quarter', limit: int = 4):
+        return self._statement('get_cash_flow', symbol, period, limit)
+
+    def load(self) -> 'FinancialBundle':
+        """Fetch every bundled series now (failures are kept for the callers)."""
+        calls = [(self.get_profile, {}), (self.get_quote, {}), (self.get_key_metrics_ttm, {})]
+        for method in (self.get_income_statement, self.get_balance_sheet, self.get_cash_flow):
+            calls += [(method, {'period': 'annual', 'limit': 1}), (method, {'period': 'quarter', 'limit': 1})]
+        for method, kwargs in calls:
+            try:
+                method(self.symbol, **kwargs)
+            except Exception:
+                pass
+        return self
+
+    def get_stats(self) -> Dict[str, int]:
+        return {'loads': self.loads, 'hits': self.hits}
+
+    def has(self, key: str) -> bool:
+        """True if `key` ('profile', 'get_income_statement:annual', ...) is loaded."""
+        return key in self._data
+
+    def seed(self, key: str, data: Any):
+        """Store data fetched elsewhere (e.g. a bulk profile call)."""
+        with self._lock:
+            loading = self._loading.setdefault(key, threading.Lock())
+        with loading:
+            self._data.setdefault(key, data)
+
+    # ========================
+    # Internals
+    # ========================
+
+    def _statement(self, method: str, symbol: str, period: str, limit: Optional[int]):
+        depth = self.history.get(period)
+        fetch = getattr(self.fmp, method)
+        if symbol != self.symbol or depth is None or limit is None or limit > depth:
+            return fetch(symbol, period=period, limit=limit)
+
+        data = self._get(f"{method}:{period}", lambda: fetch(symbol, period=period, limit=depth))
+        return data[:limit] if isinstance(data, list) else data
+
+    def _get(self, key: str, fetch: Callable[[], Any]):
+        """Memoized fetch; concurrent callers of one key wait for a single load."""
+        with self._lock:
+            loading = self._loading.setdefault(key, threading.Lock())
+
+        with loading:
+            if key in self._data or key in self._errors:
+                with self._lock:
+                    self.hits += 1
+                if key in self._errors:
+                    raise self._errors[key]
+            else:
+                with self._lock:
+                    self.loads += 1
+                try:
+                    self._data[key] = fetch()
+                except Exception as e:
+                    logger.debug(f"{self.symbol}: bundle load of {key} failed: {e}")
+                    self._errors[key] = e
+                    raise
+
+        data = self._data[key]
+        return list(data) if isinstance(data, list) else data
+
+
+class BundleCache:
+    """
+    Client facade that keeps a FinancialBundle per symbol (batch runs).
+
+    Bundled series, stock peers and profiles requested in bulk are loaded
+    once per symbol for the whole batch; everything else passes through to
+    the client.
+    """
+
+    def __init__(self, fmp_client):
+        self.fmp = fmp_client
+        self._lock = threading.Lock()
+        self._bundles: Dict[str, FinancialBundle] = {}
+
+    def __getattr__(self, name: str):
+        if name == 'fmp':
+            raise AttributeError(name)
+        return getattr(self.fmp, name)
+
+    def bundle(self, symbol: str) -> FinancialBundle:
+        with self._lock:
+            bundle = self._bundles.get(symbol)
+            if bundle is None:
+                bundle = self._bundles[symbol] = FinancialBundle(self.fmp, symbol)
+            return bundle
+
+    def get_profile(self, symbol: str):
+        return self.bundle(symbol).get_profile(symbol)
+
+    def get_quote(self, symbol: str):
+        return self.bundle(symbol).get_quote(symbol)
+
+    def get_key_metrics_ttm(self, symbol: str):
+        return self.bundle(symbol).get_key_metrics_ttm(symbol)
+
+    def get_income_statement(self, symbol: str, period: str = 'quarter', limit: int = 4):
+        return self.bundle(symbol).get_income_statement(symbol, period=period, limit=limit)
+
+    def get_balance_sheet(self, symbol: str, period: str = 'quarter', limit: int = 4):
+        return self.bundle(symbol).get_balance_sheet(symbol, period=period, limit=limit)
+
+    def get_cash_flow(self, symbol: str, period: str = 'quarter', limit: int = 4):
+        return self.bundle(symbol).get_cash_flow(symbol, period=period, limit=limit)
+
+    def get_stock_peers(self, symbol: str):
+        bundle = self.bundle(symbol)
+        return bundle._get('stock_peers', lambda: self.fmp.get_stock_peers(symbol))
+
+    def get_profile_bulk(self, symbols):
+        """Profiles in one bulk call for the symbols not loaded yet; each seeds its bundle."""
+        symbols = list(symbols)
+        missing = [s for s in symbols if not self.bundle(s).has('profile')]
+        if missing:
+            for profile in self.fmp.get_profile_bulk(missing) or []:
+                symbol = profile.get('symbol')
+                if symbol in missing:
+                    self.bundle(symbol).seed('profile', [profile])
+
+        profiles = []
+        for symbol in symbols:
+            bundle = self.bundle(symbol)
+            if bundle.has('profile'):
+                profiles.extend(bundle.get_profile(symbol) or [])
+        return profiles
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            bundles = list(self._bundles.values())
+        return {
+            'symbols': len(bundles),
+            'loads': sum(b.loads for b in bundles),
+            'hits': sum(b.hits for b in bundles)
+        }
@@ -11,9 +11,25 @@ import logging
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 
+try:
+    from .tracing import traced
+except ImportError:
+    # Fallback for direct execution
+    from tracing import traced
+
 logger = logging.getLogger(__name__)
 
 
+# API calls made for every company type, in the order the calculator
+# unpacks them: (method, kwargs). Shared with payload collection for the
+# asyncio client (async_client) and process mode (compute_pool).
+GUARDRAIL_CALLS = [
+    ('get_income_statement', {'period': 'quarter', 'limit': 12}),
+    ('get_balance_sheet', {'period': 'quarter', 'limit': 8}),
+    ('get_cash_flow', {'period': 'quarter', 'limit': 8}),
+]
+
+
 class GuardrailCalculator:
     """
     Calculate accounting guardrails to flag potential issues:
@@ -29,6 +45,7 @@ class GuardrailCalculator:
         self.fmp = fmp_client
         self.config = config
 
+    @traced('guardrails.calculate', attributes=('symbol', 'company_type'))
     def calculate_guardrails(
         self,
         symbol: str,
@@ -65,9 +82,9 @@ class GuardrailCalculator:
 
         try:
             # Fetch data (need 12 quarters for revenue growth trend)
-            income = self.fmp.get_income_statement(symbol, period='quarter', limit=12)
-            balance = self.fmp.get_balance_sheet(symbol, period='quarter', limit=8)
-            cashflow = self.fmp.get_cash_flow(symbol, period='quarter', limit=8)
+            income, balance, cashflow = [
+                getattr(self.fmp, method)(symbol, **kwargs) for method, kwargs in GUARDRAIL_CALLS
+            ]
 
             if not income or not balance or not cashflow:
                 result['guardrail_status'] = 'AMBAR'
@@ -2,54 +2,223 @@
 FMP API Wrapper with caching, rate limiting, and backoff.
 """
 import os
+import csv
+import asyncio
+import copy
 import json
 import time
 import logging
 import hashlib
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
 from functools import wraps
 
+try:
+    from .cache import TieredCache
+    from .cache_store import endpoint_from_url
+    from .metrics import RequestMetrics
+    from .price_store import PriceStore
+    from .tracing import traced
+except ImportError:
+    # Fallback for direct execution
+    from cache import TieredCache
+    from cache_store import endpoint_from_url
+    from metrics import RequestMetrics
+    from price_store import PriceStore
+    from tracing import traced
+
 logger = logging.getLogger(__name__)
 
 
 class RateLimiter:
-    """Token bucket rate limiter with jitter."""
+    """
+    Thread-safe token bucket rate limiter.
+
+    - Refills at `rate` tokens/sec up to `burst` tokens
+    - Endpoints can cost more than one token (per-endpoint weights)
+    - Waiters block on a condition variable, so concurrent workers neither
+      burst past the limit nor serialize behind a single timestamp
+    - On HTTP 429 the refill rate is cut (honouring Retry-After) and then
+      recovers linearly back to the configured rate
+
+    One limiter is shared per API key within a process (see `shared`), so
+    features, guardrails, qualitative and technical analysis draw from the
+    same plan budget.
+    """
 
-    def __init__(self, rate: float):
+    _shared: Dict[str, 'RateLimiter'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        weights: Optional[Dict[str, float]] = None,
+        min_rate_fraction: float = 0.25,
+        recovery_seconds: float = 30.0
+    ):
         """
         Args:
-            rate: Requests per second
-        """
-        self.rate = rate
-        self.interval = 1.0 / rate
-        self.last_request = 0.0
+            rate: Requests (tokens) per second
+            burst: Bucket capacity (default: one second worth of tokens)
+            weights: Token cost per endpoint prefix (default 1.0)
+            min_rate_fraction: Floor for the adaptive rate after 429s
+            recovery_seconds: Time to climb back from floor to full rate
+        """
+        self.rate = float(rate)
+        self.burst = float(burst) if burst else max(1.0, self.rate)
+        self.weights = weights or {}
+        self.min_rate = self.rate * min_rate_fraction
+        self.recovery_seconds = recovery_seconds
+
+        self.current_rate = self.rate
+        self.tokens = self.burst
+        self.paused_until = 0.0
+        self._last_refill = time.monotonic()
+        self._cond = threading.Condition()
 
-    def wait(self):
-        """Wait if necessary to respect rate limit."""
-        now = time.time()
-        time_since_last = now - self.last_request
-        if time_since_last < self.interval:
-            sleep_time = self.interval - time_since_last
-            # Add small jitter (±10%)
-            jitter = sleep_time * 0.1 * (2 * (hash(str(now)) % 100) / 100 - 1)
-            time.sleep(sleep_time + jitter)
-        self.last_request = time.time()
+        # Metrics
+        self.requests = 0
+        self.tokens_consumed = 0.0
+        self.tokens_waited = 0.0
+        self.throttled_requests = 0
+        self.time_throttled = 0.0
+        self.rate_limited_responses = 0
+
+    @classmethod
+    def shared(cls, key: str, rate: float, **kwargs) -> 'RateLimiter':
+        """Return the process-wide limiter for `key` (e.g. an API key), creating it once."""
+        with cls._shared_lock:
+            limiter = cls._shared.get(key)
+            if limiter is None:
+                limiter = cls(rate, **kwargs)
+                cls._shared[key] = limiter
+            return limiter
+
+    def _cost(self, endpoint: Optional[str]) -> float:
+        """Token cost for an endpoint, matched on its first path segment."""
+        if not endpoint:
+            return 1.0
+        cost = self.weights.get(endpoint.split('/')[0], 1.0)
+        return min(float(cost), self.burst)
+
+    def _refill(self, now: float):
+        """Add tokens for elapsed time and let the adaptive rate recover (lock held)."""
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if elapsed <= 0:
+            return
+        if self.current_rate < self.rate and now >= self.paused_until:
+            step = (self.rate - self.min_rate) * elapsed / self.recovery_seconds
+            self.current_rate = min(self.rate, self.current_rate + step)
+        if now >= self.paused_until:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.current_rate)
+
+    def wait(self, endpoint: Optional[str] = None):
+        """Block until enough tokens are available for `endpoint`, then consume them."""
+        cost = self._cost(endpoint)
+        start = time.monotonic()
+        deficit = 0.0
+
+        with self._cond:
+            while True:
+                delay, deficit = self._try_acquire(cost, deficit)
+                if delay is None:
+                    break
+                self._cond.wait(delay)
+            self._record(cost, time.monotonic() - start, deficit)
+
+    async def wait_async(self, endpoint: Optional[str] = None):
+        """wait() for asyncio callers: sleeps on the event loop instead of blocking a thread."""
+        cost = self._cost(endpoint)
+        start = time.monotonic()
+        deficit = 0.0
+
+        while True:
+            with self._cond:
+                delay, deficit = self._try_acquire(cost, deficit)
+                if delay is None:
+                    self._record(cost, time.monotonic() - start, deficit)
+                    return
+            await asyncio.sleep(delay)
+
+    def _try_acquire(self, cost: float, deficit: float) -> tuple:
+        """Consume `cost` tokens if available (lock held): (None, deficit) or (seconds to wait, deficit)."""
+        now = time.monotonic()
+        self._refill(now)
+        if now < self.paused_until:
+            return self.paused_until - now, deficit
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return None, deficit
+        deficit = max(deficit, cost - self.tokens)
+        return (cost - self.tokens) / self.current_rate, deficit
+
+    def _record(self, cost: float, waited: float, deficit: float):
+        """Update limiter metrics for one granted request (lock held)."""
+        self.requests += 1
+        self.tokens_consumed += cost
+        if waited > 0.001:
+            self.throttled_requests += 1
+            self.time_throttled += waited
+            self.tokens_waited += deficit
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """
+        React to an HTTP 429: pause all callers for `retry_after` seconds
+        (default 1s), drain the bucket and halve the refill rate.
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate_limited_responses += 1
+            self.paused_until = max(self.paused_until, now + (retry_after if retry_after is not None else 1.0))
+            self.tokens = 0.0
+            self.current_rate = max(self.min_rate, self.current_rate / 2)
+            self._cond.notify_all()
+        logger.warning(
+            f"Rate limited (HTTP 429): pausing {retry_after if retry_after is not None else 1.0:.1f}s, "
+            f"rate now {self.current_rate:.1f} req/s"
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return limiter statistics."""
+        with self._cond:
+            return {
+                "rate": self.rate,
+                "current_rate": round(self.current_rate, 3),
+                "burst": self.burst,
+                "requests": self.requests,
+                "tokens_consumed": round(self.tokens_consumed, 3),
+                "tokens_waited": round(self.tokens_waited, 3),
+                "throttled_requests": self.throttled_requests,
+                "time_throttled_seconds": round(self.time_throttled, 3),
+                "rate_limited_responses": self.rate_limited_responses
+            }
 
 
 class FMPCache:
-    """Simple file-based cache for FMP responses."""
+    """
+    TTL bucket over the shared TieredCache.
 
-    def __init__(self, cache_dir: str, ttl_hours: int = 48):
-        self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    Each bucket (universe / symbol / qualitative) supplies the default TTL
+    for its endpoints; endpoints listed in the cache's TTL policy use the
+    policy value instead. Storage and tiers are shared by all buckets.
+    """
+
+    def __init__(self, cache: TieredCache, ttl_hours: int = 48, ttl_class: str = 'symbol'):
+        self.cache = cache
+        self.ttl_class = ttl_class
         self.ttl = timedelta(hours=ttl_hours)
         self.hits = 0
         self.misses = 0
 
-    def _get_key(self, url: str, params: Dict) -> str:
+    @staticmethod
+    def _get_key(url: str, params: Dict) -> str:
         """Generate cache key from URL and params."""
         # Remove API key from cache key
         cache_params = {k: v for k, v in params.items() if k != 'apikey'}
@@ -57,36 +226,35 @@ class FMPCache:
         return hashlib.sha256(key_str.encode()).hexdigest()
 
     def get(self, url: str, params: Dict) -> Optional[Any]:
-        """Retrieve cached response if valid."""
-        key = self._get_key(url, params)
-        cache_file = self.cache_dir / f"{key}.json"
-
-        if cache_file.exists():
-            stat = cache_file.stat()
-            age = datetime.now() - datetime.fromtimestamp(stat.st_mtime)
-
-            if age < self.ttl:
-                with open(cache_file, 'r') as f:
-                    self.hits += 1
-                    logger.debug(f"Cache HIT: {url}")
-                    return json.load(f)
+        """Retrieve cached response if valid (memory tier first, then disk)."""
+        data = self.cache.get(self._get_key(url, params), endpoint_from_url(url), self.ttl)
+        if data is not None:
+            self.hits += 1
+            logger.debug(f"Cache HIT: {url}")
+            return data
 
         self.misses += 1
         logger.debug(f"Cache MISS: {url}")
         return None
 
+    def lookup(self, url: str, params: Dict) -> tuple:
+        """Like get, but may return an expired entry inside its grace window: (data, is_stale)."""
+        data, stale = self.cache.lookup(self._get_key(url, params), endpoint_from_url(url), self.ttl)
+        if data is not None:
+            self.hits += 1
+            logger.debug(f"Cache {'STALE' if stale else 'HIT'}: {url}")
+        else:
+            self.misses += 1
+            logger.debug(f"Cache MISS: {url}")
+        return data, stale
+
     def set(self, url: str, params: Dict, data: Any):
         """Store response in cache."""
-        key = self._get_key(url, params)
-        cache_file = self.cache_dir / f"{key}.json"
-
-        with open(cache_file, 'w') as f:
-            json.dump(data, f)
-
+        self.cache.set(self._get_key(url, params), data, endpoint_from_url(url), self.ttl_class)
         logger.debug(f"Cached: {url}")
 
     def get_stats(self) -> Dict[str, Any]:
-        """Return cache statistics."""
+        """Return cache statistics for this bucket."""
         total = self.hits + self.misses
         hit_rate = self.hits / total if total > 0 else 0.0
         return {
@@ -96,10 +264,65 @@ class FMPCache:
         }
 
 
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls.
+
+    The first caller for a key runs the fetch; callers arriving while it is
+    in flight block until it finishes and receive a copy of its result (or
+    its exception). Nothing is remembered once the call completes - the
+    response cache handles reuse after that.
+    """
+
+    class _Call:
+        __slots__ = ('event', 'result', 'error')
+
+        def __init__(self):
+            self.event = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, 'SingleFlight._Call'] = {}
+        self.coalesced = 0
+
+    def do(self, key: str, fn):
+        """Run `fn` once per concurrent `key` and share the outcome."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._Call()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            # Callers may mutate responses; never hand out the leader's object
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
 class FMPClient:
     """
     Financial Modeling Prep API client with:
     - Rate limiting (configurable req/sec)
+    - Pooled keep-alive HTTP session
+    - Single-flight coalescing of identical in-flight requests
     - Caching (file-based with TTL)
     - Exponential backoff with jitter
     - Request metrics tracking
@@ -118,27 +341,83 @@ class FMPClient:
         # Extract FMP-specific config
         fmp_config = config.get('fmp', config)  # Backward compatible: if 'fmp' not in config, assume config IS fmp_config
         self.base_url = fmp_config.get('base_url', 'https://financialmodelingprep.com/api/v3')
-        self.rate_limiter = RateLimiter(fmp_config.get('rate_limit_rps', 8))
+        limiter_kwargs = {
+            'burst': fmp_config.get('rate_limit_burst'),
+            'weights': fmp_config.get('endpoint_weights'),
+        }
+        if fmp_config.get('shared_rate_limiter', True):
+            # One token bucket per API key for the whole process
+            self.rate_limiter = RateLimiter.shared(
+                hashlib.sha256(api_key.encode()).hexdigest(),
+                fmp_config.get('rate_limit_rps', 8),
+                **limiter_kwargs
+            )
+        else:
+            self.rate_limiter = RateLimiter(fmp_config.get('rate_limit_rps', 8), **limiter_kwargs)
         self.max_retries = fmp_config.get('max_retries', 3)
         self.timeout = fmp_config.get('timeout_seconds', 30)
 
-        # Caches with different TTLs (read from root config)
+        # Statement store: fetch the full configured history once per
+        # symbol/period and slice smaller limits from it
+        self.statement_store = fmp_config.get('statement_store', True)
+        self.statement_history = {'quarter': 12, 'annual': 10}
+        self.statement_history.update(fmp_config.get('statement_history', {}))
+
+        # Pooled keep-alive session (one TCP/TLS handshake per pooled connection,
+        # not per request). Shared by all worker threads.
+        self.pool_size = fmp_config.get('pool_size', 32)
+        self.session = self._build_session(self.pool_size)
+
+        # One tiered cache (memory LRU + SQLite) with a per-endpoint TTL
+        # policy; the buckets below only supply default TTLs
         cache_config = config.get('cache', {})
-        cache_dir = cache_config.get('cache_dir', './cache')
+        self.cache = TieredCache.from_config(cache_config)
+        self.cache_store = self.cache.store
+        self.cache_memory = self.cache.memory
+
         ttl_universe = cache_config.get('ttl_universe_hours', 12)
         ttl_symbol = cache_config.get('ttl_symbol_hours', 48)
         ttl_qualitative = cache_config.get('ttl_qualitative_hours', 24)
-
-        self.cache_universe = FMPCache(f"{cache_dir}/universe", ttl_hours=ttl_universe)
-        self.cache_symbol = FMPCache(f"{cache_dir}/symbol", ttl_hours=ttl_symbol)
-        self.cache_qualitative = FMPCache(f"{cache_dir}/qualitative", ttl_hours=ttl_qualitative)
+        self.cache_universe = FMPCache(self.cache, ttl_hours=ttl_universe, ttl_class='universe')
+        self.cache_symbol = FMPCache(self.cache, ttl_hours=ttl_symbol, ttl_class='symbol')
+        self.cache_qualitative = FMPCache(self.cache, ttl_hours=ttl_qualitative, ttl_class='qualitative')
+        # Per-symbol quotes written by get_quotes_batch (TTL: policy 'quote')
+        self.cache_quote = FMPCache(self.cache, ttl_hours=6, ttl_class='quote')
+
+        # Incremental EOD bar store behind get_historical_prices (delta fetches)
+        self.price_store = None
+        if cache_config.get('price_store', True):
+            cache_dir = cache_config.get('cache_dir', './cache')
+            self.price_store = PriceStore(
+                cache_config.get('price_db_path', f"{cache_dir}/prices.sqlite"),
+                refresh_hours=cache_config.get('price_refresh_hours', 6)
+            )
+
+        # Concurrent identical requests share one network fetch
+        self._inflight = SingleFlight()
 
         # Metrics
         self.requests_by_endpoint = {}
         self.total_requests = 0
         self.total_cached = 0
         self.errors = []
-
+        # Per-endpoint latency / bytes / retries (p50/p95/p99 in get_metrics)
+        self.request_metrics = RequestMetrics()
+
+    @staticmethod
+    def _build_session(pool_size: int) -> requests.Session:
+        """Create a requests session with a connection pool sized for the worker count."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def close(self):
+        """Release pooled connections."""
+        self.session.close()
+
+    @traced('fmp.request', attributes=('endpoint',))
     def _request(
         self,
         endpoint: str,
@@ -162,15 +441,36 @@ class FMPClient:
         params = params or {}
         params['apikey'] = self.api_key
 
+        # Single-flight: concurrent identical requests wait on one fetch
+        key = FMPCache._get_key(url, params)
+
         # Check cache first
         if cache:
-            cached = cache.get(url, params)
+            cached, stale = cache.lookup(url, params)
             if cached is not None:
                 self.total_cached += 1
+                if stale:
+                    # Stale-while-revalidate: answer now, refresh in the background
+                    cache.cache.revalidate(key, lambda: self._inflight.do(
+                        key, lambda: self._fetch(endpoint, url, params, cache)
+                    ))
                 return cached
 
+        return self._inflight.do(
+            key, lambda: self._fetch(endpoint, url, params, cache, retry_count)
+        )
+
+    def _fetch(
+        self,
+        endpoint: str,
+        url: str,
+        params: Dict,
+        cache: Optional[FMPCache],
+        retry_count: int = 0
+    ) -> Any:
+        """Network fetch with rate limiting and retries (cache already missed)."""
         # Rate limit
-        self.rate_limiter.wait()
+        self.rate_limiter.wait(endpoint)
 
         # Track metrics
         self.total_requests += 1
@@ -181,7 +481,17 @@ class FMPClient:
             safe_params = {k: (v[:10] + '...' if k == 'apikey' and v else v) for k, v in params.items()}
             logger.info(f"→ API Request: GET {url} params={safe_params}")
 
-            response = requests.get(url, params=params, timeout=self.timeout)
+            # Latency is tracked per endpoint family ('profile', not 'profile/AAPL')
+            family = endpoint_from_url(url)
+            request_start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except requests.exceptions.RequestException:
+                self.request_metrics.record(family, time.perf_counter() - request_start, ok=False)
+                raise
+            self.request_metrics.record(
+                family, time.perf_counter() - request_start, len(response.content), ok=response.ok
+            )
 
             logger.info(f"← API Response: Status {response.status_code}, Size: {len(response.content)} bytes")
 
@@ -201,17 +511,91 @@ class FMPClient:
         except requests.exceptions.RequestException as e:
             logger.warning(f"Request failed for {url}: {e}")
 
+            # HTTP 429: slow the shared limiter down instead of backing off locally
+            rate_limited = self._handle_rate_limited(e)
+
             # Retry with exponential backoff
             if retry_count < self.max_retries:
-                wait_time = (2 ** retry_count) + (hash(url) % 100) / 100  # 2s, 4s, 8s + jitter
-                logger.info(f"Retrying in {wait_time:.2f}s (attempt {retry_count + 1}/{self.max_retries})")
-                time.sleep(wait_time)
-                return self._request(endpoint, params, cache, retry_count + 1)
+                self.request_metrics.record_retry(endpoint_from_url(url))
+                if rate_limited:
+                    logger.info(f"Retrying after rate-limit pause (attempt {retry_count + 1}/{self.max_retries})")
+                else:
+                    wait_time = (2 ** retry_count) + (hash(url) % 100) / 100  # 2s, 4s, 8s + jitter
+                    logger.info(f"Retrying in {wait_time:.2f}s (attempt {retry_count + 1}/{self.max_retries})")
+                    time.sleep(wait_time)
+                return self._fetch(endpoint, url, params, cache, retry_count + 1)
             else:
                 self.errors.append({"endpoint": endpoint, "error": str(e), "time": datetime.now().isoformat()})
                 logger.error(f"Max retries exceeded for {url}")
                 raise
 
+    def stream_csv(self, endpoint: str, params: Optional[Dict] = None, api_version: str = 'v4') -> Iterator[Dict[str, str]]:
+        """
+        Stream a CSV (bulk) endpoint row by row without holding the file in memory.
+
+        Not cached: bulk files are consumed once and fanned out into
+        per-symbol cache entries (see seed_cache / bulk_ingest.py).
+        """
+        base_url = self.base_url.replace('/api/v3', f'/api/{api_version}')
+        url = f"{base_url}/{endpoint}"
+        params = dict(params or {})
+        params['apikey'] = self.api_key
+
+        self.rate_limiter.wait(endpoint)
+        self.total_requests += 1
+        self.requests_by_endpoint[endpoint] = self.requests_by_endpoint.get(endpoint, 0) + 1
+
+        safe_params = {k: (v[:10] + '...' if k == 'apikey' and v else v) for k, v in params.items()}
+        logger.info(f"→ API Request (bulk): GET {url} params={safe_params}")
+        request_start = time.perf_counter()
+        downloaded = [0]
+
+        def counted(lines):
+            for line in lines:
+                downloaded[0] += len(line) + 1
+                yield line
+
+        try:
+            with self.session.get(url, params=params, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                if response.encoding is None:
+                    response.encoding = 'utf-8'
+                yield from csv.DictReader(counted(response.iter_lines(decode_unicode=True)))
+            self.request_metrics.record(endpoint, time.perf_counter() - request_start, downloaded[0])
+        except requests.exceptions.RequestException as e:
+            self.request_metrics.record(endpoint, time.perf_counter() - request_start, downloaded[0], ok=False)
+            self._handle_rate_limited(e)
+            self.errors.append({"endpoint": endpoint, "error": str(e), "time": datetime.now().isoformat()})
+            raise
+
+    def seed_cache(self, endpoint: str, data: Any, params: Optional[Dict] = None, cache: Optional[FMPCache] = None):
+        """Store `data` as the cached response of `_request(endpoint, params)`."""
+        (cache or self.cache_symbol).set(f"{self.base_url}/{endpoint}", dict(params or {}), data)
+
+    def _handle_rate_limited(self, error: Exception) -> bool:
+        """If `error` is an HTTP 429, penalize the rate limiter and return True."""
+        response = getattr(error, 'response', None)
+        if response is None or response.status_code != 429:
+            return False
+        self.rate_limiter.penalize(self._parse_retry_after(response.headers.get('Retry-After')))
+        return True
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header (delta-seconds or HTTP date)."""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            from email.utils import parsedate_to_datetime
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
     # ========================
     # Screener & Universe
     # ========================
@@ -282,6 +666,52 @@ class FMPClient:
         """
         return self._request(f'quote/{symbol}', cache=False)  # Real-time data, no cache
 
+    def get_quotes_batch(self, symbols: List[str], chunk_size: int = 100) -> Dict[str, Dict]:
+        """
+        Endpoint: /quote/{symbol1,symbol2,...}
+        Quotes for many symbols in ceil(N / chunk_size) requests.
+
+        Each quote is cached per symbol (quote TTL policy), so overlapping
+        batches and later single-symbol lookups reuse it. Expired entries
+        inside the grace window are served and refreshed in the background
+        when stale-while-revalidate is on.
+
+        Returns:
+            {symbol: quote}; symbols FMP does not know are omitted
+        """
+        quotes = {}
+        missing = []
+        stale = []
+        for symbol in dict.fromkeys(symbols):
+            cached, is_stale = self.cache_quote.lookup(f"{self.base_url}/quote/{symbol}", {})
+            if cached:
+                self.total_cached += 1
+                quotes[symbol] = cached[0]
+                if is_stale:
+                    stale.append(symbol)
+            else:
+                missing.append(symbol)
+
+        for i in range(0, len(missing), chunk_size):
+            quotes.update(self._fetch_quotes(missing[i:i + chunk_size]))
+
+        for i in range(0, len(stale), chunk_size):
+            chunk = stale[i:i + chunk_size]
+            self.cache.revalidate(f"quote-batch:{','.join(chunk)}", lambda chunk=chunk: self._fetch_quotes(chunk))
+
+        return quotes
+
+    def _fetch_quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        """One batch quote request; stores each quote under its own cache key."""
+        data = self._request(f"quote/{','.join(symbols)}", cache=False)
+        quotes = {}
+        for quote in data if isinstance(data, list) else []:
+            symbol = quote.get('symbol')
+            if symbol in symbols:
+                quotes[symbol] = quote
+                self.seed_cache(f'quote/{symbol}', [quote], cache=self.cache_quote)
+        return quotes
+
     def get_historical_prices(self, symbol: str, from_date: str = None, to_date: str = None) -> Dict:
         """
         Endpoint: /historical-price-full/{symbol}
@@ -292,35 +722,69 @@ class FMPClient:
             from_date: Optional start date (YYYY-MM-DD)
             to_date: Optional end date (YYYY-MM-DD)
         """
+        if self.price_store is not None:
+            # Served from the local bar store; only missing bars hit the API
+            return self.price_store.history(
+                symbol, lambda start, end: self._fetch_historical_prices(symbol, start, end),
+                from_date=from_date, to_date=to_date
+            )
+        return self._fetch_historical_prices(symbol, from_date, to_date, cache=self.cache_symbol)
+
+    def _fetch_historical_prices(
+        self,
+        symbol: str,
+        from_date: str = None,
+        to_date: str = None,
+        cache: Optional[FMPCache] = None
+    ) -> Dict:
         params = {}
         if from_date:
             params['from'] = from_date
         if to_date:
             params['to'] = to_date
-        return self._request(f'historical-price-full/{symbol}', params, cache=self.cache_symbol)
+        return self._request(f'historical-price-full/{symbol}', params, cache=cache)
 
     # ========================
     # Financial Statements
     # ========================
 
+    def _get_statement(self, endpoint: str, symbol: str, period: str, limit: int) -> List[Dict]:
+        """
+        Fetch a financial statement series.
+
+        In statement-store mode the largest configured history for the period
+        is fetched once per symbol and any smaller `limit` is served by
+        slicing it (FMP returns newest first), so limit=4/8/12 share a single
+        cache entry and API call. Requests beyond the configured history are
+        fetched as asked.
+        """
+        fetch_limit = limit
+        history = self.statement_history.get(period) if self.statement_store else None
+        if history and limit is not None and limit <= history:
+            fetch_limit = history
+
+        params = {'period': period, 'limit': fetch_limit}
+        data = self._request(f'{endpoint}/{symbol}', params, cache=self.cache_symbol)
+
+        if fetch_limit != limit and isinstance(data, list):
+            return data[:limit]
+        return data
+
     def get_income_statement(self, symbol: str, period: str = 'quarter', limit: int = 4) -> List[Dict]:
         """
         Endpoint: /income-statement/{symbol}
         Args:
             period: 'quarter' or 'annual'
         """
-        params = {'period': period, 'limit': limit}
-        return self._request(f'income-statement/{symbol}', params, cache=self.cache_symbol)
+        return self._get_statement('income-statement', symbol, period, limit)
 
     def get_balance_sheet(self, symbol: str, period: str = 'quarter', limit: int = 4) -> List[Dict]:
         """Endpoint: /balance-sheet-statement/{symbol}"""
-        params = {'period': period, 'limit': limit}
-        return self._request(f'balance-sheet-statement/{symbol}', params, cache=self.cache_symbol)
+        return self._get_statement('balance-sheet-statement', symbol, period, limit)
 
     def get_cash_flow(self, symbol: str, period: str = 'quarter', limit: int = 4) -> List[Dict]:
         """Endpoint: /cash-flow-statement/{symbol}"""
-        params = {'period': period, 'limit': limit}
-        return self._request(f'cash-flow-statement/{symbol}', params, cache=self.cache_symbol)
+        return self._get_statement('cash-flow-statement', symbol, period, limit)
 
     # ========================
     # Ratios & Metrics (TTM preferred)
@@ -388,7 +852,7 @@ class FMPClient:
                 return cached
 
         # Rate limit
-        self.rate_limiter.wait()
+        self.rate_limiter.wait('insider-trading')
 
         # Track metrics
         self.total_requests += 1
@@ -399,7 +863,7 @@ class FMPClient:
             safe_params = {k: (v[:10] + '...' if k == 'apikey' and v else v) for k, v in params.items()}
             logger.info(f"→ API Request (v4): GET {url} params={safe_params}")
 
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self.session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
             data = response.json()
 
@@ -418,6 +882,7 @@ class FMPClient:
             logger.warning(f"Timeout for insider-trading ({symbol})")
             return []
         except requests.exceptions.RequestException as e:
+            self._handle_rate_limited(e)
             logger.warning(f"Request error for insider-trading ({symbol}): {e}")
             return []
         except Exception as e:
@@ -510,11 +975,16 @@ class FMPClient:
         return {
             "total_requests": self.total_requests,
             "total_cached": self.total_cached,
+            "coalesced_requests": self._inflight.coalesced,
             "requests_by_endpoint": self.requests_by_endpoint,
+            "rate_limiter": self.rate_limiter.get_metrics(),
             "cache_stats": {
                 "universe": self.cache_universe.get_stats(),
                 "symbol": self.cache_symbol.get_stats(),
                 "qualitative": self.cache_qualitative.get_stats()
             },
+            "cache": self.cache.get_stats(),
+            "price_store": self.price_store.get_stats() if self.price_store else None,
+            "requests": self.request_metrics.summary(),
             "errors": self.errors
         }
@@ -27,6 +27,27 @@ class MarketTimingAnalyzer:
         """
         self.fmp = fmp_client
 
+    def _get_quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Quotes by symbol: batch requests when the client supports them,
+        one request per symbol otherwise.
+        """
+        if hasattr(self.fmp, 'get_quotes_batch'):
+            try:
+                return self.fmp.get_quotes_batch(symbols)
+            except Exception as e:
+                logger.warning(f"Batch quote request failed, falling back to per-symbol quotes: {e}")
+
+        quotes = {}
+        for symbol in symbols:
+            try:
+                quote = self.fmp.get_quote(symbol)
+                if quote:
+                    quotes[symbol] = quote[0]
+            except Exception as e:
+                logger.debug(f"Error fetching quote for {symbol}: {e}")
+        return quotes
+
     def analyze_market_overextension(
         self,
         stocks_list: List[str]
@@ -56,13 +77,14 @@ class MarketTimingAnalyzer:
         low_count = 0
         total = 0
 
+        quotes = self._get_quotes(stocks_list)
+
         for symbol in stocks_list:
             try:
-                quote = self.fmp.get_quote(symbol)
-                if not quote or len(quote) == 0:
+                q = quotes.get(symbol)
+                if not q:
                     continue
 
-                q = quote[0]
                 price = q.get('price', 0)
                 ma_200 = q.get('priceAvg200', 0)
 
@@ -189,6 +211,7 @@ class MarketTimingAnalyzer:
         }
 
         sector_analysis = {}
+        quotes = self._get_quotes([sector_etfs[s] for s in sectors if s in sector_etfs])
 
         for sector in sectors:
             etf = sector_etfs.get(sector)
@@ -196,11 +219,10 @@ class MarketTimingAnalyzer:
                 continue
 
             try:
-                quote = self.fmp.get_quote(etf)
-                if not quote or len(quote) == 0:
+                q = quotes.get(etf)
+                if not q:
                     continue
 
-                q = quote[0]
                 price = q.get('price', 0)
                 ma_200 = q.get('priceAvg200', 0)
 
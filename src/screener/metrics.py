@@ -0,0 +1,146 @@
+"""
+Run instrumentation: stage and ticker timings, per-endpoint request stats.
+
+- RequestMetrics (owned by FMPClient): latency samples, bytes, errors and
+  retries per endpoint; summarized as p50/p95/p99.
+- RunMetrics (owned by ScreenerPipeline for one run): wall-clock time per
+  stage and per ticker/step, so the slowest tickers can be listed.
+
+ScreenerPipeline._log_metrics combines both with the client's limiter
+(throttle wait) and cache-tier stats into one JSON document per run under
+logs/metrics/.
+
+Usage:
+    run_metrics = RunMetrics()
+    with run_metrics.stage('universe'):
+        ...
+    run_metrics.record_ticker('AAPL', 'features', 0.42)
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+def latency_summary(samples: List[float]) -> Dict[str, Optional[float]]:
+    """count / mean / p50 / p95 / p99 / max of a list of seconds."""
+    if not samples:
+        return {'count': 0, 'mean': None, 'p50': None, 'p95': None, 'p99': None, 'max': None}
+    values = np.asarray(samples, dtype=float)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'count': int(values.size),
+        'mean': round(float(values.mean()), 4),
+        'p50': round(float(p50), 4),
+        'p95': round(float(p95), 4),
+        'p99': round(float(p99), 4),
+        'max': round(float(values.max()), 4),
+    }
+
+
+class RequestMetrics:
+    """Thread-safe per-endpoint request statistics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+
+    def _entry(self, endpoint: str) -> Dict[str, Any]:
+        entry = self._endpoints.get(endpoint)
+        if entry is None:
+            entry = {'latencies': [], 'bytes': 0, 'errors': 0, 'retries': 0}
+            self._endpoints[endpoint] = entry
+        return entry
+
+    def record(self, endpoint: str, seconds: float, nbytes: int = 0, ok: bool = True):
+        """One HTTP round trip (successful or not)."""
+        with self._lock:
+            entry = self._entry(endpoint)
+            entry['latencies'].append(seconds)
+            entry['bytes'] += nbytes
+            if not ok:
+                entry['errors'] += 1
+
+    def record_retry(self, endpoint: str):
+        with self._lock:
+            self._entry(endpoint)['retries'] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """{'bytes_downloaded', 'retries', 'endpoints': {endpoint: latency summary + counters}}."""
+        with self._lock:
+            snapshot = {
+                endpoint: (list(e['latencies']), e['bytes'], e['errors'], e['retries'])
+                for endpoint, e in self._endpoints.items()
+            }
+        endpoints = {}
+        for endpoint, (latencies, nbytes, errors, retries) in snapshot.items():
+            stats = latency_summary(latencies)
+            stats.update({'bytes': nbytes, 'errors': errors, 'retries': retries})
+            endpoints[endpoint] = stats
+        return {
+            'bytes_downloaded': sum(e['bytes'] for e in endpoints.values()),
+            'retries': sum(e['retries'] for e in endpoints.values()),
+            'endpoints': dict(sorted(endpoints.items(), key=lambda kv: -(kv[1]['count'] * (kv[1]['mean'] or 0))))
+        }
+
+
+class RunMetrics:
+    """Thread-safe stage and per-ticker timings for one pipeline run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, float] = {}
+        self._tickers: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def record_ticker(self, symbol: str, step: str, seconds: float):
+        """Time spent on one ticker in one step ('features', 'guardrails', 'payloads', ...)."""
+        with self._lock:
+            steps = self._tickers.setdefault(symbol, {})
+            steps[step] = steps.get(step, 0.0) + seconds
+
+    @contextmanager
+    def ticker(self, symbol: str, step: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_ticker(symbol, step, time.perf_counter() - start)
+
+    def summary(self, slowest: int = 20) -> Dict[str, Any]:
+        """Stage seconds, per-step ticker latency summaries and the slowest tickers."""
+        with self._lock:
+            tickers = {symbol: dict(steps) for symbol, steps in self._tickers.items()}
+            stages = {name: round(seconds, 3) for name, seconds in self.stages.items()}
+
+        by_step: Dict[str, List[float]] = {}
+        for steps in tickers.values():
+            for step, seconds in steps.items():
+                by_step.setdefault(step, []).append(seconds)
+
+        totals = sorted(
+            ((symbol, sum(steps.values()), steps) for symbol, steps in tickers.items()),
+            key=lambda t: -t[1]
+        )
+        return {
+            'stages_seconds': stages,
+            'tickers': {
+                'count': len(tickers),
+                'by_step': {step: latency_summary(samples) for step, samples in by_step.items()},
+                'slowest': [
+                    {'ticker': symbol, 'seconds': round(total, 3),
+                     'steps': {step: round(s, 3) for step, s in steps.items()}}
+                    for symbol, total, steps in totals[:slowest]
+                ]
+            }
+        }
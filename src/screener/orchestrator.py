@@ -9,31 +9,122 @@ Pipeline stages:
 5. Scoring: Normalize by industry and score
 6. Export: Generate CSV with all results
 """
+import asyncio
 import logging
 import os
 import sys
 import time
+import re
 import json
 import yaml
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import Dict, List, Optional
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from ingest import FMPClient
-from features import FeatureCalculator
-from guardrails import GuardrailCalculator
-from scoring import ScoringEngine
-from qualitative import QualitativeAnalyzer
+try:
+    # Package import: share module state (e.g. the process-wide rate limiter)
+    # with screener.ingest used elsewhere in the app
+    from .ingest import FMPClient
+    from .async_client import AsyncFMPClient
+    from .bulk_ingest import BulkIngestor
+    from .checkpoint import RunCheckpoint, atomic_write, new_run_id, prune_runs
+    from .metrics import RunMetrics
+    from .tracing import configure_tracing, flush_traces, span
+    from .feature_store import FeatureStore, filing_fingerprint
+    from .financial_bundle import BundleCache
+    from .results_store import HAS_PYARROW, list_results, load_results, write_results
+    from .classification import (
+        FLAG_COLUMNS, classify, enrich_sectors, fix_symbol_suffixes
+    )
+    from .compute_pool import (
+        SnapshotFMPClient, collect_payloads, compute_ticker, init_worker,
+        calculate_features_safe, calculate_guardrails_safe
+    )
+    from .features import FeatureCalculator
+    from .guardrails import GuardrailCalculator
+    from .scoring import ScoringEngine
+    from .qualitative import QualitativeAnalyzer
+except ImportError:
+    # Fallback for direct execution
+    from ingest import FMPClient
+    from async_client import AsyncFMPClient
+    from bulk_ingest import BulkIngestor
+    from checkpoint import RunCheckpoint, atomic_write, new_run_id, prune_runs
+    from metrics import RunMetrics
+    from tracing import configure_tracing, flush_traces, span
+    from feature_store import FeatureStore, filing_fingerprint
+    from financial_bundle import BundleCache
+    from results_store import HAS_PYARROW, list_results, load_results, write_results
+    from classification import (
+        FLAG_COLUMNS, classify, enrich_sectors, fix_symbol_suffixes
+    )
+    from compute_pool import (
+        SnapshotFMPClient, collect_payloads, compute_ticker, init_worker,
+        calculate_features_safe, calculate_guardrails_safe
+    )
+    from features import FeatureCalculator
+    from guardrails import GuardrailCalculator
+    from scoring import ScoringEngine
+    from qualitative import QualitativeAnalyzer
 
 logger = logging.getLogger(__name__)
 
 
+# CSV column order (as specified in requirements)
+EXPORT_COLUMNS = [
+    'ticker', 'name', 'country', 'exchange', 'sector', 'industry',
+    'marketCap', 'avgDollarVol_3m', 'freeFloat',
+    'is_financial', 'is_REIT', 'is_utility',
+    # Value (non-fin)
+    'ev_ebit_ttm', 'ev_fcf_ttm', 'pe_ttm', 'pb_ttm', 'shareholder_yield_%',
+    # Value (fin)
+    'p_tangibleBook',
+    # Value (REIT)
+    'p_ffo', 'p_affo',
+    # Quality (non-fin)
+    'roic_%', 'roic_persistence', 'grossProfits_to_assets', 'fcf_margin_%', 'cfo_to_ni',
+    'netDebt_ebitda', 'interestCoverage', 'fixedChargeCoverage',
+    # Quality (fin)
+    'roa_%', 'roe_%', 'efficiency_ratio', 'nim_%', 'combined_ratio_%',
+    'cet1_or_leverage_ratio_%', 'loans_to_deposits',
+    # Quality (REIT)
+    'ffo_payout_%', 'affo_payout_%', 'sameStoreNOI_growth_%', 'occupancy_%',
+    'netDebt_ebitda_re', 'debt_to_grossAssets_%', 'securedDebt_%',
+    # Guardrails
+    'altmanZ', 'beneishM', 'accruals_noa_%', 'netShareIssuance_12m_%',
+    'mna_flag', 'debt_maturity_<24m_%', 'rate_mix_variable_%',
+    'guardrail_status', 'guardrail_reasons',
+    # Momentum & Trend Filters
+    'revenue_growth_3y', 'roic_trend', 'margin_trend',
+    # Moat Score
+    'moat_score', 'pricing_power_score', 'operating_leverage_score', 'roic_persistence_score',
+    # Quality Degradation Scores (Piotroski for VALUE, Mohanram for GROWTH)
+    'piotroski_fscore', 'piotroski_fscore_delta',
+    'mohanram_gscore', 'mohanram_gscore_delta',
+    'quality_degradation_type', 'quality_degradation_score', 'quality_degradation_delta',
+    # Scores & decision
+    'value_score_0_100', 'quality_score_0_100', 'composite_0_100',
+    'decision', 'notes_short'
+]
+
+# Free-text columns flattened to one line in both exports (CSV and columnar)
+TEXT_COLUMNS = ['name', 'sector', 'industry', 'guardrail_reasons', 'decision', 'decision_reason']
+
+
+def _one_line(value):
+    """Newlines/carriage returns -> spaces, stripped (non-strings unchanged)."""
+    if isinstance(value, str):
+        return re.sub(r'[\n\r]+', ' ', value).strip()
+    return value
+
+
 class ScreenerPipeline:
     """
     End-to-end pipeline for Quality+Value screening.
@@ -46,6 +137,7 @@ class ScreenerPipeline:
 
         # Setup logging
         self._setup_logging()
+        configure_tracing(self.config)
 
         # Initialize FMP client
         # Try multiple sources for API key (in order of priority):
@@ -92,6 +184,14 @@ class ScreenerPipeline:
         self.fmp = FMPClient(api_key, self.config)  # Pass full config for cache & premium settings
         logger.info("FMP client initialized")
 
+        # Optional asyncio I/O engine: per-ticker endpoint fetches run on one
+        # event loop over pooled keep-alive connections (async_client.py)
+        fmp_config = self.config.get('fmp', {})
+        self.async_fmp = None
+        if fmp_config.get('async_io', False):
+            self.async_fmp = AsyncFMPClient(self.fmp, fmp_config.get('async_max_concurrency'))
+            logger.info(f"Async I/O enabled (max {self.async_fmp.max_concurrency} concurrent requests)")
+
         # Initialize calculators
         self.features = FeatureCalculator(self.fmp)
         self.guardrails = GuardrailCalculator(self.fmp, self.config)
@@ -104,11 +204,22 @@ class ScreenerPipeline:
         self.df_final = None
         self._using_sample_data = False  # Flag if we had to use hardcoded sample symbols
 
+        # Run checkpoints (set per run; see run(resume_run_id))
+        self.checkpoint = None
+        self.run_id = None  # Labels per-run outputs (checkpoint run ID when checkpointing)
+        self.results_path = None  # Columnar copy of the last export (results_store.py)
+        self.runs_dir = self.config.get('pipeline', {}).get('runs_dir', './runs')
+        self.run_metrics = RunMetrics()  # Stage/ticker timings (reset per run)
+
         # Incremental processing cache
         cache_config = self.config.get('cache', {})
         cache_dir = cache_config.get('cache_dir', './cache')
-        self.incremental_cache_file = Path(cache_dir) / 'incremental_processing.json'
-        self.incremental_ttl_hours = cache_config.get('incremental_ttl_hours', 24)  # Re-process after 24h
+        # Features are recomputed when the latest filing changes (see feature_store.py)
+        self.feature_store = FeatureStore(
+            cache_config.get('features_db_path', str(Path(cache_dir) / 'features.sqlite'))
+        )
+        self.incremental_max_age_hours = cache_config.get('incremental_max_age_hours', 24)
+        self.incremental_ttl_hours = cache_config.get('incremental_ttl_hours', 24)  # No filing date: re-process after 24h
 
     def _setup_logging(self):
         """Configure logging."""
@@ -128,10 +239,14 @@ class ScreenerPipeline:
             ]
         )
 
-    def run(self):
+    def run(self, resume_run_id: Optional[str] = None):
         """
         Execute full pipeline.
 
+        Args:
+            resume_run_id: Continue a checkpointed run: completed stages are
+                loaded from disk and completed markets/tickers are skipped
+
         Returns: Path to output CSV
         """
         logger.info("=" * 80)
@@ -140,30 +255,75 @@ class ScreenerPipeline:
 
         start_time = datetime.now()
 
+        pipeline_config = self.config.get('pipeline', {})
+        if resume_run_id:
+            self.checkpoint = RunCheckpoint.resume(self.runs_dir, resume_run_id)
+        elif pipeline_config.get('checkpoints', True):
+            self.checkpoint = RunCheckpoint(self.runs_dir)
+        self.run_id = self.checkpoint.run_id if self.checkpoint is not None else new_run_id()
+        if self.checkpoint is not None:
+            logger.info(f"Run ID: {self.checkpoint.run_id} (resume with --resume {self.checkpoint.run_id})")
+            # Keep the newest N previous runs (resume / --qualitative-batch) besides this one
+            try:
+                prune_runs(self.runs_dir, pipeline_config.get('keep_runs', 5), exclude=[self.checkpoint.run_id])
+            except Exception as e:
+                logger.warning(f"Run pruning failed: {e}")
+
+        self.run_metrics = RunMetrics()
+        stage = self._stage
+
         try:
             # Stage 1: Screener (Universe)
             logger.info("\n[Stage 1/6] Building universe...")
-            self._build_universe()
+            with stage('universe'):
+                if not self._load_checkpointed('universe', 'df_universe'):
+                    self._build_universe()
+                    self._save_checkpoint('universe', self.df_universe)
 
             # Stage 2: Preliminary Ranking (Top-K)
             logger.info("\n[Stage 2/6] Selecting Top-K for deep analysis...")
-            self._select_topk()
-
-            # Stage 3: Features (Value & Quality metrics)
-            logger.info("\n[Stage 3/6] Calculating features for Top-K...")
-            self._calculate_features()
-
-            # Stage 4: Guardrails (Accounting quality)
-            logger.info("\n[Stage 4/6] Calculating guardrails...")
-            self._calculate_guardrails()
+            with stage('topk'):
+                if not self._load_checkpointed('topk', 'df_topk'):
+                    self._select_topk()
+                    self._save_checkpoint('topk', self.df_topk)
+
+            pipeline_mode = pipeline_config.get('mode', 'staged')
+            if not self._load_checkpointed('guardrails', 'df_topk'):
+                if pipeline_mode == 'pipelined':
+                    # Stages 3+4 per ticker: fetch -> features -> guardrails
+                    logger.info("\n[Stage 3-4/6] Calculating features and guardrails (pipelined)...")
+                    with stage('features+guardrails'):
+                        self._calculate_pipelined()
+                elif pipeline_mode == 'process':
+                    # Stages 3+4 per ticker: I/O threads fetch, worker processes compute
+                    logger.info("\n[Stage 3-4/6] Calculating features and guardrails (process pool)...")
+                    with stage('features+guardrails'):
+                        self._calculate_process_pool()
+                else:
+                    # Stage 3: Features (Value & Quality metrics)
+                    logger.info("\n[Stage 3/6] Calculating features for Top-K...")
+                    with stage('features'):
+                        if not self._load_checkpointed('features', 'df_topk'):
+                            self._calculate_features()
+                            self._save_checkpoint('features', self.df_topk)
+
+                    # Stage 4: Guardrails (Accounting quality)
+                    logger.info("\n[Stage 4/6] Calculating guardrails...")
+                    with stage('guardrails'):
+                        self._calculate_guardrails()
+                self._save_checkpoint('guardrails', self.df_topk)
 
             # Stage 5: Scoring & Normalization
             logger.info("\n[Stage 5/6] Scoring and normalization...")
-            self._score_universe()
+            with stage('scores'):
+                if not self._load_checkpointed('scores', 'df_final'):
+                    self._score_universe()
+                    self._save_checkpoint('scores', self.df_final)
 
             # Stage 6: Export
             logger.info("\n[Stage 6/6] Exporting results...")
-            output_path = self._export_results()
+            with stage('export'):
+                output_path = self._export_results()
 
             # Log metrics
             self._log_metrics(start_time)
@@ -176,8 +336,53 @@ class ScreenerPipeline:
 
         except Exception as e:
             logger.error(f"Pipeline failed: {e}", exc_info=True)
+            if self.checkpoint is not None:
+                logger.error(f"Resume with: --resume {self.checkpoint.run_id}")
             raise
 
+        finally:
+            flush_traces()
+
+    @contextmanager
+    def _stage(self, name: str):
+        """Time a stage (run metrics) and trace it as pipeline.<name>."""
+        run_id = self.checkpoint.run_id if self.checkpoint is not None else None
+        with self.run_metrics.stage(name), span(f"pipeline.{name}", run_id=run_id):
+            yield
+
+    # ===================================
+    # CHECKPOINTS
+    # ===================================
+
+    def _load_checkpointed(self, stage: str, attr: str) -> bool:
+        """Load a completed stage's output into `attr`; False if it has to run."""
+        if self.checkpoint is None or not self.checkpoint.is_complete(stage):
+            return False
+        setattr(self, attr, self.checkpoint.load_frame(stage))
+        logger.info(f"✓ {stage} loaded from checkpoint (run {self.checkpoint.run_id})")
+        return True
+
+    def _save_checkpoint(self, stage: str, df: pd.DataFrame):
+        if self.checkpoint is not None:
+            self.checkpoint.save_frame(stage, df)
+
+    def _checkpointed(self, stage: str, key: str) -> Optional[Dict]:
+        """A market/ticker result already completed in this run, or None."""
+        if self.checkpoint is None:
+            return None
+        return self.checkpoint.get(stage, key)
+
+    def _checkpoint_result(self, stage: str, result: Dict):
+        """Record a ticker's result; failure placeholders are not recorded so a resume retries them."""
+        if self.checkpoint is None:
+            return
+        if stage == 'features':
+            failed = len(result) <= 1
+        else:
+            failed = str(result.get('guardrail_reasons', '')).startswith('Error:')
+        if not failed:
+            self.checkpoint.record(stage, result['ticker'], result)
+
     # ===================================
     # STAGE 1: SCREENER (Universe)
     # ===================================
@@ -217,38 +422,14 @@ class ScreenerPipeline:
             if has_country_filter:
                 # Specific country/countries selected (e.g., US, UK, JP)
                 logger.info(f"Country filter active: {countries}")
-                for country in countries:
-                    logger.info(f"Fetching from country: {country}")
-                    profiles = self.fmp.get_stock_screener(
-                        market_cap_more_than=min_mcap,
-                        volume_more_than=min_vol // 1000,  # API expects volume in thousands
-                        country=country,  # Country code (US, CA, UK, IN, etc.)
-                        limit=10000  # Maximum results
-                    )
-
-                    if profiles:
-                        all_profiles.extend(profiles)
-                        logger.info(f"✓ Fetched {len(profiles)} profiles from country {country}")
-                    else:
-                        logger.warning(f"Country {country} returned empty - trying to continue")
+                # Country codes (US, CA, UK, IN, etc.)
+                all_profiles.extend(self._screen_markets('country', countries, min_mcap, min_vol))
 
             elif has_exchange_filter:
                 # Specific exchange filter (less common, but supported)
                 logger.info(f"Exchange filter active: {exchanges}")
-                for exchange in exchanges:
-                    logger.info(f"Fetching from exchange: {exchange}")
-                    profiles = self.fmp.get_stock_screener(
-                        market_cap_more_than=min_mcap,
-                        volume_more_than=min_vol // 1000,  # API expects volume in thousands
-                        exchange=exchange,  # Exchange code (TSX, LSE, NSE, etc.)
-                        limit=10000  # Maximum results
-                    )
-
-                    if profiles:
-                        all_profiles.extend(profiles)
-                        logger.info(f"✓ Fetched {len(profiles)} profiles from {exchange}")
-                    else:
-                        logger.warning(f"{exchange} returned empty - trying to continue")
+                # Exchange codes (TSX, LSE, NSE, etc.)
+                all_profiles.extend(self._screen_markets('exchange', exchanges, min_mcap, min_vol))
             else:
                 # No filter specified - fetch all major regions (slower but comprehensive)
                 # FMP API without country parameter only returns US/CA by default
@@ -321,24 +502,7 @@ class ScreenerPipeline:
 
                 logger.info(f"Fetching from {len(global_markets)} markets to achieve true global coverage")
 
-                for country in global_markets:
-                    logger.info(f"Fetching from country: {country}")
-                    try:
-                        profiles = self.fmp.get_stock_screener(
-                            market_cap_more_than=min_mcap,
-                            volume_more_than=min_vol // 1000,  # API expects volume in thousands
-                            country=country,  # Country code
-                            limit=10000  # Maximum results per country
-                        )
-
-                        if profiles:
-                            all_profiles.extend(profiles)
-                            logger.info(f"✓ Fetched {len(profiles)} profiles from {country}")
-                        else:
-                            logger.debug(f"Country {country} returned empty (may not have stocks meeting criteria)")
-                    except Exception as e:
-                        logger.warning(f"Failed to fetch from {country}: {e}")
-                        continue
+                all_profiles.extend(self._screen_markets('country', global_markets, min_mcap, min_vol))
 
                 logger.info(f"✓ Total profiles fetched from all regions: {len(all_profiles)}")
 
@@ -506,87 +670,12 @@ class ScreenerPipeline:
 
         # CRITICAL FIX: Add exchange suffix to symbols for international stocks
         # FMP API sometimes returns symbols without exchange suffix (e.g., 'BP' instead of 'BP.L')
-        # But subsequent API calls require the full symbol with suffix
-        exchange_suffix_map = {
-            'LSE': '.L',      # London Stock Exchange
-            'LON': '.L',      # London (alternative code)
-            'JSE': '.JK',     # Jakarta Stock Exchange
-            'IDX': '.JK',     # Indonesia Stock Exchange
-            'NSE': '.NS',     # National Stock Exchange of India
-            'BSE': '.BO',     # Bombay Stock Exchange
-            'ASX': '.AX',     # Australian Securities Exchange
-            'TSX': '.TO',     # Toronto Stock Exchange
-            'TSXV': '.V',     # TSX Venture Exchange
-            'NEO': '.NE',     # NEO Exchange Canada
-            'SAO': '.SA',     # B3 São Paulo
-            'BVMF': '.SA',    # Bovespa (Brazil)
-            'BMV': '.MX',     # Bolsa Mexicana de Valores
-            'MEX': '.MX',     # Mexico Stock Exchange
-            'SIX': '.SW',     # SIX Swiss Exchange
-            'SW': '.SW',      # Swiss Exchange
-            'EPA': '.PA',     # Euronext Paris
-            'PAR': '.PA',     # Paris Stock Exchange
-            'ETR': '.DE',     # Deutsche Börse XETRA
-            'GER': '.DE',     # Germany
-            'FRA': '.F',      # Frankfurt
-            'XETRA': '.DE',   # XETRA
-            'MIL': '.MI',     # Borsa Italiana Milan
-            'BIT': '.MI',     # Milan Stock Exchange
-            'BME': '.MC',     # Bolsa de Madrid
-            'MCE': '.MC',     # Madrid Stock Exchange
-            'AMS': '.AS',     # Euronext Amsterdam
-            'STO': '.ST',     # Nasdaq Stockholm
-            'OSE': '.OL',     # Oslo Børs
-            'CPH': '.CO',     # Nasdaq Copenhagen
-            'HEL': '.HE',     # Nasdaq Helsinki
-            'BRU': '.BR',     # Euronext Brussels
-            'VIE': '.VI',     # Vienna Stock Exchange
-            'WSE': '.WA',     # Warsaw Stock Exchange
-            'TSE': '.T',      # Tokyo Stock Exchange
-            'JPX': '.T',      # Japan Exchange Group
-            'HKSE': '.HK',    # Hong Kong Stock Exchange
-            'HKG': '.HK',     # Hong Kong
-            'SSE': '.SS',     # Shanghai Stock Exchange
-            'SZSE': '.SZ',    # Shenzhen Stock Exchange
-            'KRX': '.KS',     # Korea Exchange
-            'KOSDAQ': '.KQ',  # KOSDAQ
-            'SGX': '.SI',     # Singapore Exchange
-            'SET': '.BK',     # Stock Exchange of Thailand
-            'Tadawul': '.SAU', # Saudi Stock Exchange
-            'DFM': '.DU',     # Dubai Financial Market
-            'ADX': '.AD',     # Abu Dhabi Securities Exchange
-            'QE': '.QA',      # Qatar Exchange
-            'TASE': '.TA',    # Tel Aviv Stock Exchange
-            'JSE': '.JO',     # Johannesburg Stock Exchange (South Africa)
-            'EGX': '.CA',     # Egyptian Exchange
-            # US exchanges don't need suffix
-            'NYSE': '',
-            'NASDAQ': '',
-            'AMEX': '',
-            'NYSEArca': '',
-            'BATS': '',
-        }
-
-        def fix_symbol_suffix(row):
-            """Add exchange suffix to symbol if missing."""
-            symbol = row.get('symbol', '')
-            exchange = row.get('exchangeShortName', '')
-
-            # Skip if symbol already has a suffix (contains a dot)
-            if '.' in symbol:
-                return symbol
-
-            # Add suffix based on exchange
-            suffix = exchange_suffix_map.get(exchange, '')
-            if suffix:
-                return symbol + suffix
-            return symbol
-
+        # But subsequent API calls require the full symbol with suffix (see EXCHANGE_SUFFIXES)
         if 'symbol' in df.columns and 'exchangeShortName' in df.columns:
             original_count = len(df)
-            df['symbol'] = df.apply(fix_symbol_suffix, axis=1)
+            df['symbol'] = fix_symbol_suffixes(df)
             # Count how many were modified
-            symbols_with_suffix = df['symbol'].str.contains('\.', regex=True).sum()
+            symbols_with_suffix = df['symbol'].str.contains('.', regex=False).sum()
             logger.info(f"✓ Fixed exchange suffixes: {symbols_with_suffix}/{original_count} symbols now have exchange suffix")
 
         # Normalize column names (stock-screener uses different names than profile-bulk)
@@ -645,18 +734,15 @@ class ScreenerPipeline:
 
         # Enrich sector with fallback logic (BEFORE classification)
         logger.info("Enriching sectors with fallback logic...")
-        df['sector'] = df.apply(self._enrich_sector, axis=1)
+        df['sector'] = enrich_sectors(df)
         unknown_count = (df['sector'] == 'Unknown').sum()
         if unknown_count > 0:
             logger.warning(f"{unknown_count} stocks still have Unknown sector after enrichment")
         else:
             logger.info("✓ All stocks have valid sectors")
 
-        # Classify companies
-        df['is_financial'] = df.apply(self._classify_financial, axis=1)
-        df['is_REIT'] = df.apply(self._classify_reit, axis=1)
-        df['is_utility'] = df.apply(self._classify_utility, axis=1)
-        df['is_ETF'] = df.apply(self._classify_etf, axis=1)
+        # Classify companies (vectorized; same rules as the _classify_* methods)
+        df[FLAG_COLUMNS] = classify(df)
 
         # Filter out ETFs (Exchange Traded Funds should not be in stock screener)
         etf_count = df['is_ETF'].sum()
@@ -688,206 +774,76 @@ class ScreenerPipeline:
         logger.info(f"  Financials: {(self.df_universe['is_financial'] & ~self.df_universe['is_REIT']).sum()}")
         logger.info(f"  REITs: {self.df_universe['is_REIT'].sum()}")
 
-    def _enrich_sector(self, row) -> str:
-        """
-        Enrich sector with fallback logic for Unknown/empty sectors.
-
-        Fallback strategy:
-        1. ETF/Index exception (QQQ, SPY, IWM, etc.)
-        2. Use API sector if available and valid
-        3. Infer from industry keywords
-        4. Return 'Unknown' as last resort
-
-        Examples:
-        - QQQ: ETF_Index (not Financial Services)
-        - Amazon: Industry "Internet Retail" → Sector "Consumer Cyclical"
-        - Google: Industry "Internet Content" → Sector "Communication Services"
+    def _screen_markets(self, field: str, markets: List[str], min_mcap: int, min_vol: int) -> List[Dict]:
         """
-        ticker = (row.get('symbol') or row.get('ticker') or '').upper()
-
-        # CRITICAL: ETF/Index Exception (QQQ, SPY, IWM should NOT be compared with stocks)
-        ETF_TICKERS = ['QQQ', 'SPY', 'IWM', 'DIA', 'VTI', 'VOO', 'VEA', 'VWO',
-                       'EFA', 'EEM', 'AGG', 'BND', 'TLT', 'GLD', 'SLV',
-                       'XLK', 'XLF', 'XLE', 'XLV', 'XLI', 'XLC', 'XLY', 'XLP', 'XLRE']
-        if ticker in ETF_TICKERS:
-            logger.info(f"ETF detected: {ticker} → Sector: ETF_Index")
-            return 'ETF_Index'
-
-        sector = (row.get('sector') or '').strip()
-        industry = (row.get('industry') or '').lower()
-
-        # If sector is valid (not empty, not 'Unknown'), use it
-        if sector and sector.lower() not in ['unknown', 'n/a', '']:
-            return sector
-
-        # FALLBACK: Infer sector from industry keywords
-        sector_mapping = {
-            'Technology': [
-                'software', 'internet', 'semiconductor', 'computer',
-                'electronics', 'it services', 'cloud', 'saas',
-                'cybersecurity', 'artificial intelligence', 'data'
-            ],
-            'Consumer Cyclical': [
-                'retail', 'e-commerce', 'automotive', 'apparel',
-                'leisure', 'hotels', 'restaurants', 'travel',
-                'homebuilding', 'luxury goods'
-            ],
-            'Consumer Defensive': [
-                'food', 'beverage', 'tobacco', 'household products',
-                'personal products', 'discount stores'
-            ],
-            'Healthcare': [
-                'pharmaceutical', 'biotechnology', 'medical',
-                'health care', 'diagnostics', 'hospital'
-            ],
-            'Financials': [
-                'bank', 'insurance', 'asset management', 'brokerage',
-                'credit services', 'capital markets', 'mortgage'
-            ],
-            'Communication Services': [
-                'telecommunication', 'media', 'entertainment',
-                'publishing', 'broadcasting', 'internet content'
-            ],
-            'Industrials': [
-                'aerospace', 'defense', 'construction', 'machinery',
-                'transportation', 'logistics', 'engineering'
-            ],
-            'Energy': [
-                'oil', 'gas', 'petroleum', 'energy', 'coal',
-                'renewable energy', 'utilities' #  Some energy utilities
-            ],
-            'Basic Materials': [
-                'chemicals', 'metals', 'mining', 'steel',
-                'paper', 'packaging', 'commodities'
-            ],
-            'Real Estate': [
-                'reit', 'real estate', 'property'
-            ],
-            'Utilities': [
-                'electric', 'water', 'utility', 'power generation'
-            ]
-        }
-
-        # Search for industry keywords in mapping
-        for sector_name, keywords in sector_mapping.items():
-            for keyword in keywords:
-                if keyword in industry:
-                    logger.debug(f"Sector inferred for {row.get('ticker')}: {sector_name} (from industry: {industry})")
-                    return sector_name
-
-        # Last resort: return Unknown
-        logger.warning(f"Could not infer sector for {row.get('ticker')} (industry: {industry})")
-        return 'Unknown'
+        stock-screener queries for several countries/exchanges, issued concurrently.
 
-    def _classify_financial(self, row) -> bool:
-        """Classify if company is a financial."""
-        sector = (row.get('sector') or '').lower()
-        industry = (row.get('industry') or '').lower()
+        Every request goes through the client's rate limiter, so concurrency
+        stays within the configured calls/min. Each market is cached (and
+        checkpointed) on its own: a failing market is logged and skipped, and
+        a rerun only refetches the markets that failed. If every market
+        fails, the first error is raised (caller falls back to other endpoints).
 
-        financial_keywords = ['bank', 'insurance', 'asset management', 'brokerage',
-                              'diversified financial', 'credit services', 'capital markets']
-
-        if 'financial' in sector:
-            return True
-
-        for kw in financial_keywords:
-            if kw in industry:
-                return True
+        Returns profiles concatenated in the order of `markets`.
+        """
+        max_workers = self.config['universe'].get('fetch_workers', 8)
+        start_time = time.time()
 
-        return False
+        def fetch(market):
+            return self._screen_market(
+                f"{field}:{market}",
+                market_cap_more_than=min_mcap,
+                volume_more_than=min_vol // 1000,  # API expects volume in thousands
+                limit=10000,  # Maximum results per market
+                **{field: market}
+            )
 
-    def _classify_reit(self, row) -> bool:
-        """Classify if company is a REIT."""
-        industry = (row.get('industry') or '').lower()
-        return 'reit' in industry
+        results = {}
+        errors = []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(markets)))) as executor:
+            future_to_market = {executor.submit(fetch, market): market for market in markets}
+            for future in as_completed(future_to_market):
+                market = future_to_market[future]
+                try:
+                    results[market] = future.result() or []
+                except Exception as e:
+                    logger.warning(f"Failed to fetch from {field} {market}: {e}")
+                    errors.append(e)
+
+        if errors and not results:
+            raise errors[0]
 
-    def _classify_utility(self, row) -> bool:
-        """Classify if company is a utility."""
-        sector = (row.get('sector') or '').lower()
-        return 'utilities' in sector or 'utility' in sector
+        all_profiles = []
+        for market in markets:
+            profiles = results.get(market)
+            if profiles:
+                all_profiles.extend(profiles)
+                logger.info(f"✓ Fetched {len(profiles)} profiles from {field} {market}")
+            elif market in results:
+                logger.debug(f"{field} {market} returned empty (may not have stocks meeting criteria)")
+
+        logger.info(
+            f"✓ {len(results)}/{len(markets)} markets fetched in {time.time() - start_time:.1f}s "
+            f"({len(errors)} failed)"
+        )
+        return all_profiles
 
-    def _classify_etf(self, row) -> bool:
+    def _screen_market(self, key: str, **filters) -> List[Dict]:
         """
-        Classify if instrument is an ETF (Exchange Traded Fund).
-
-        ETFs should be filtered out from stock screeners as they are:
-        - Not individual companies with fundamentals
-        - Baskets of other securities
-        - Have different risk/return profiles
+        stock-screener call for one market.
 
-        Detection criteria:
-        - Name contains: ETF, Fund, Index, Trust (with exceptions)
-        - Industry contains: Exchange Traded Fund, Investment Trust
-        - Type field = 'etf' (if available)
+        Non-empty results are checkpointed per market, so a resumed
+        multi-region run only queries the markets it had not reached.
         """
-        name = (row.get('name') or row.get('companyName') or '').lower()
-        industry = (row.get('industry') or '').lower()
-        type_field = (row.get('type') or '').lower()
+        profiles = self._checkpointed('universe', key)
+        if profiles is not None:
+            logger.info(f"✓ {key}: {len(profiles)} profiles from checkpoint")
+            return profiles
 
-        # Direct type indicator
-        if type_field == 'etf':
-            return True
-
-        # Industry indicators
-        etf_industries = [
-            'exchange traded fund',
-            'exchange-traded fund',
-            'investment trust',
-            'closed-end fund',
-            'open-end fund'
-        ]
-
-        for ind in etf_industries:
-            if ind in industry:
-                return True
-
-        # Name indicators (with common patterns)
-        # ETF keywords
-        etf_keywords = [
-            ' etf',           # Space before to avoid "marketplace", "et cetera"
-            'etf ',           # Space after
-            ' fund',          # Generic funds
-            'index fund',
-            'yield etf',
-            'income etf',
-            'dividend etf',
-            'sector etf',
-            'covered call',   # Common in Canadian ETFs (e.g., Hamilton, Purpose)
-            'yield maximizer', # Canadian covered call ETFs
-            'premium yield',
-            'high interest savings',  # Money market ETFs
-            'money market',
-            'cash management',
-            'aggregate bond',
-            'bond index',
-            'equity index',
-            'composite index',
-            'total market',
-            'global x',       # ETF provider
-            'ishares',        # ETF provider
-            'vanguard',       # ETF provider (though some are funds, most are ETFs)
-            'betapro',        # Leveraged ETF provider
-            'harvest',        # Canadian ETF provider
-            'hamilton',       # Canadian ETF provider
-            'purpose',        # Canadian ETF provider
-            'evolve',         # Canadian ETF provider
-        ]
-
-        for keyword in etf_keywords:
-            if keyword in name:
-                # Exception: Some companies have "fund" or "trust" in name but are REITs or operating companies
-                # Allow REITs through (they're already classified separately)
-                if 'reit' in industry or 'real estate investment trust' in industry:
-                    return False
-                # Exception: Royalty trusts/funds (e.g., A&W Revenue Royalties Income Fund)
-                if 'royalt' in name or 'royalt' in industry:
-                    return False
-                # Exception: Mortgage Investment Corporations
-                if 'mortgage' in name and 'investment' in name and 'corporation' in name:
-                    return False
-                return True
-
-        return False
+        profiles = self.fmp.get_stock_screener(**filters)
+        if profiles and self.checkpoint is not None:
+            self.checkpoint.record('universe', key, profiles)
+        return profiles
 
     # ===================================
     # STAGE 2: TOP-K SELECTION
@@ -936,38 +892,53 @@ class ScreenerPipeline:
     # STAGE 3: FEATURES
     # ===================================
 
-    def _load_incremental_cache(self) -> Dict:
-        """Load incremental processing cache."""
-        if self.incremental_cache_file.exists():
-            try:
-                with open(self.incremental_cache_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load incremental cache: {e}")
-        return {}
+    def _load_incremental_state(self, stocks: List[Dict]) -> Dict:
+        """
+        Stored features and current input fingerprints for `stocks`.
 
-    def _save_incremental_cache(self, cache_data: Dict):
-        """Save incremental processing cache."""
+        Fingerprints are only checked for symbols with stored features
+        (everything else is computed anyway), concurrently.
+        """
+        stored = self.feature_store.get_many([s['ticker'] for s in stocks])
+        candidates = [s for s in stocks if s['ticker'] in stored]
+
+        fingerprints = {}
+        if candidates:
+            max_workers = self.config.get('pipeline', {}).get('max_workers', 20)
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(candidates)))) as executor:
+                results = executor.map(
+                    lambda s: filing_fingerprint(self.fmp, s['ticker'], self._get_company_type(s)),
+                    candidates
+                )
+                fingerprints = {s['ticker']: fp for s, fp in zip(candidates, results)}
+
+        return {'stored': stored, 'fingerprints': fingerprints}
+
+    def _save_incremental_features(self, feature_results: List[Dict], state: Dict, stocks: List[Dict]):
+        """Store newly computed features with their input fingerprint (failures are not stored)."""
+        company_types = {s['ticker']: self._get_company_type(s) for s in stocks}
+        records = []
+        for features in feature_results:
+            symbol = features['ticker']
+            if len(features) <= 1:
+                continue
+            fingerprint = state['fingerprints'].get(symbol)
+            if fingerprint is None:
+                fingerprint = filing_fingerprint(self.fmp, symbol, company_types.get(symbol, 'non_financial'))
+            records.append({'symbol': symbol, 'fingerprint': fingerprint, 'features': features})
         try:
-            self.incremental_cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.incremental_cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            self.feature_store.put_many(records)
         except Exception as e:
-            logger.warning(f"Failed to save incremental cache: {e}")
-
-    def _should_reprocess(self, symbol: str, cache_data: Dict) -> bool:
-        """Determine if a stock needs reprocessing."""
-        if symbol not in cache_data:
-            return True  # New stock
-
-        stock_data = cache_data[symbol]
-        last_processed = datetime.fromisoformat(stock_data.get('timestamp', '2000-01-01'))
-        age_hours = (datetime.now() - last_processed).total_seconds() / 3600
-
-        if age_hours > self.incremental_ttl_hours:
-            return True  # Cache expired
-
-        return False  # Use cached result
+            logger.warning(f"Failed to save incremental features: {e}")
+
+    def _should_reprocess(self, symbol: str, state: Dict) -> bool:
+        """Determine if a stock needs reprocessing (new filing, too old, or never computed)."""
+        return not FeatureStore.is_current(
+            state['stored'].get(symbol),
+            state['fingerprints'].get(symbol),
+            self.incremental_max_age_hours,
+            self.incremental_ttl_hours
+        )
 
     def _warm_cache_batch(self, symbols: List[str]):
         """
@@ -992,6 +963,88 @@ class ScreenerPipeline:
         elapsed = time.time() - batch_start
         logger.info(f"✓ Cache warmed in {elapsed:.1f}s")
 
+    def _bulk_ingest(self, symbols: List[str]) -> bool:
+        """
+        Seed statement and profile caches from FMP bulk downloads for large
+        runs (fmp.bulk_ingest). Returns True if bulk ingestion ran.
+        """
+        bulk_config = self.config.get('fmp', {}).get('bulk_ingest', {})
+        if not bulk_config.get('enabled', False) or len(symbols) < bulk_config.get('min_symbols', 1000):
+            return False
+
+        try:
+            BulkIngestor(self.fmp, self.config).ingest(symbols)
+            return True
+        except Exception as e:
+            logger.warning(f"Bulk ingestion failed, falling back to per-symbol fetch: {e}")
+            return False
+
+    def _collect_async(
+        self,
+        stocks: List[Dict],
+        wants: Callable[[Dict], tuple],
+        on_ready: Callable[[Dict, Dict, bool, bool], None]
+    ):
+        """
+        Fetch tickers' calculator inputs concurrently on the asyncio client.
+
+        wants(stock) -> (include_features, include_guardrails); tickers that
+        need neither are not fetched. on_ready(stock, payloads, features,
+        guardrails) runs on the loop thread as soon as a ticker's payloads
+        are complete, so its computation overlaps other tickers' I/O.
+        """
+        async def one(stock):
+            features, guardrails = wants(stock)
+            payloads = {}
+            if features or guardrails:
+                with self.run_metrics.ticker(stock['ticker'], 'payloads'):
+                    payloads = await self.async_fmp.collect_payloads(
+                        stock['ticker'], self._get_company_type(stock), features, guardrails
+                    )
+            on_ready(stock, payloads, features, guardrails)
+
+        async def collect_all():
+            await asyncio.gather(*(one(stock) for stock in stocks))
+
+        self.async_fmp.run(collect_all())
+
+    def _calculate_async(self, stocks: List[Dict], needs_features: set, include_guardrails: bool = True):
+        """
+        Features (for needs_features) and guardrails with I/O on the asyncio
+        client (fmp.async_io): no thread blocks on a socket. The calculators
+        run on a SnapshotFMPClient of each ticker's payloads.
+
+        Returns:
+            (feature results, guardrail results)
+        """
+        feature_results = []
+        guardrail_results = []
+        misses = []
+
+        def wants(stock):
+            symbol = stock['ticker']
+            # Tickers completed before a resume are not fetched again
+            return (
+                symbol in needs_features and self._checkpointed('features', symbol) is None,
+                include_guardrails and self._checkpointed('guardrails', symbol) is None
+            )
+
+        def compute(stock, payloads, features, guardrails):
+            client = SnapshotFMPClient(payloads)
+            if stock['ticker'] in needs_features:
+                feature_results.append(self._process_stock_features(stock, FeatureCalculator(client)))
+            if include_guardrails:
+                guardrail_results.append(
+                    self._process_stock_guardrails(stock, GuardrailCalculator(client, self.config))
+                )
+            misses.extend(client.misses)
+
+        self._collect_async(stocks, wants, compute)
+
+        if misses:
+            logger.warning(f"Async I/O: {len(misses)} calculator calls were not in the payload snapshots")
+        return feature_results, guardrail_results
+
     def _calculate_features(self):
         """Calculate Value & Quality features for Top-K using parallel processing + incremental."""
         start_time = time.time()
@@ -1001,74 +1054,49 @@ class ScreenerPipeline:
         stocks = self.df_topk[['ticker', 'is_financial', 'is_REIT', 'is_utility']].to_dict('records')
         all_symbols = [s['ticker'] for s in stocks]
 
-        # PHASE 3 OPTIMIZATION: Incremental processing
-        incremental_cache = self._load_incremental_cache()
-        stocks_to_process = [s for s in stocks if self._should_reprocess(s['ticker'], incremental_cache)]
-        stocks_cached = [s for s in stocks if not self._should_reprocess(s['ticker'], incremental_cache)]
+        # PHASE 3 OPTIMIZATION: Incremental processing (recompute on new filings)
+        incremental = self._load_incremental_state(stocks)
+        stocks_to_process = [s for s in stocks if self._should_reprocess(s['ticker'], incremental)]
+        stocks_cached = [s for s in stocks if not self._should_reprocess(s['ticker'], incremental)]
 
         logger.info(f"Incremental stats: {len(stocks_to_process)} to process, {len(stocks_cached)} from cache")
 
         # PHASE 3 OPTIMIZATION: Warm cache before parallel processing (only for stocks to process)
         if stocks_to_process:
             symbols_to_warm = [s['ticker'] for s in stocks_to_process]
-            self._warm_cache_batch(symbols_to_warm)
-
-        def process_stock_features(stock_data):
-            """Process a single stock's features."""
-            symbol = stock_data['ticker']
-            company_type = self._get_company_type(stock_data)
-
-            try:
-                features = self.features.calculate_features(symbol, company_type)
-                features['ticker'] = symbol
-                # Only log if actually got data (not empty dict)
-                if len(features) > 1:  # More than just ticker
-                    logger.info(f"✓ Features calculated for {symbol}")
-                else:
-                    logger.warning(f"⚠ Features calculation returned empty data for {symbol}")
-                return features
-            except Exception as e:
-                logger.error(f"✗ Failed to calculate features for {symbol}: {e}")
-                import traceback
-                logger.error(f"Traceback: {traceback.format_exc()}")
-                return {'ticker': symbol}
+            if not self._bulk_ingest(symbols_to_warm):
+                self._warm_cache_batch(symbols_to_warm)
 
         # Parallel processing with thread pool (only for stocks that need processing)
         results = []
 
-        if stocks_to_process:
+        if stocks_to_process and self.async_fmp:
+            results, _ = self._calculate_async(
+                stocks_to_process, {s['ticker'] for s in stocks_to_process}, include_guardrails=False
+            )
+        elif stocks_to_process:
             max_workers = min(20, len(stocks_to_process))
 
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 # Submit all tasks
                 future_to_stock = {
-                    executor.submit(process_stock_features, stock): stock
+                    executor.submit(self._process_stock_features, stock): stock
                     for stock in stocks_to_process
                 }
 
                 # Collect results as they complete
                 for future in as_completed(future_to_stock):
-                    result = future.result()
-                    results.append(result)
+                    results.append(future.result())
 
-                    # Save to incremental cache
-                    if 'ticker' in result:
-                        incremental_cache[result['ticker']] = {
-                            'timestamp': datetime.now().isoformat(),
-                            'features': result
-                        }
+        # Save newly computed features to the incremental store
+        if results:
+            self._save_incremental_features(results, incremental, stocks_to_process)
 
         # Add cached results
         for stock in stocks_cached:
             symbol = stock['ticker']
-            if symbol in incremental_cache:
-                cached_features = incremental_cache[symbol].get('features', {'ticker': symbol})
-                results.append(cached_features)
-                logger.debug(f"✓ Using cached features for {symbol}")
-
-        # Save updated incremental cache
-        if stocks_to_process:
-            self._save_incremental_cache(incremental_cache)
+            results.append(incremental['stored'][symbol]['features'])
+            logger.debug(f"✓ Using cached features for {symbol}")
 
         # Merge features with universe data
         df_features = pd.DataFrame(results)
@@ -1080,6 +1108,18 @@ class ScreenerPipeline:
         else:
             logger.info(f"✓ All {len(stocks_cached)} features from cache in {elapsed:.1f}s [incremental]")
 
+    def _process_stock_features(self, stock_data: Dict, calculator: Optional[FeatureCalculator] = None) -> Dict:
+        """Process a single stock's features (default calculator: self.features)."""
+        resumed = self._checkpointed('features', stock_data['ticker'])
+        if resumed is not None:
+            return resumed
+        with self.run_metrics.ticker(stock_data['ticker'], 'features'):
+            features = calculate_features_safe(
+                calculator or self.features, stock_data['ticker'], self._get_company_type(stock_data)
+            )
+        self._checkpoint_result('features', features)
+        return features
+
     # ===================================
     # STAGE 4: GUARDRAILS
     # ===================================
@@ -1092,41 +1132,23 @@ class ScreenerPipeline:
         # Convert to list of dicts
         stocks = self.df_topk[['ticker', 'is_financial', 'is_REIT', 'is_utility', 'industry']].to_dict('records')
 
-        def process_stock_guardrails(stock_data):
-            """Process a single stock's guardrails."""
-            symbol = stock_data['ticker']
-            company_type = self._get_company_type(stock_data)
-            industry = stock_data.get('industry', '')
+        if self.async_fmp:
+            _, results = self._calculate_async(stocks, set())
+        else:
+            # Parallel processing with thread pool
+            max_workers = min(20, len(stocks))
+            results = []
 
-            try:
-                guardrails = self.guardrails.calculate_guardrails(
-                    symbol, company_type, industry
-                )
-                guardrails['ticker'] = symbol
-                logger.info(f"✓ Guardrails calculated for {symbol}")
-                return guardrails
-            except Exception as e:
-                logger.error(f"✗ Failed to calculate guardrails for {symbol}: {e}")
-                return {
-                    'ticker': symbol,
-                    'guardrail_status': 'AMBAR',
-                    'guardrail_reasons': f'Error: {str(e)[:50]}'
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Submit all tasks
+                future_to_stock = {
+                    executor.submit(self._process_stock_guardrails, stock): stock
+                    for stock in stocks
                 }
 
-        # Parallel processing with thread pool
-        max_workers = min(20, len(stocks))
-        results = []
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_stock = {
-                executor.submit(process_stock_guardrails, stock): stock
-                for stock in stocks
-            }
-
-            # Collect results as they complete
-            for future in as_completed(future_to_stock):
-                results.append(future.result())
+                # Collect results as they complete
+                for future in as_completed(future_to_stock):
+                    results.append(future.result())
 
         # Merge guardrails
         df_guardrails = pd.DataFrame(results)
@@ -1135,6 +1157,209 @@ class ScreenerPipeline:
         elapsed = time.time() - start_time
         logger.info(f"✓ Guardrails calculated for {len(results)} stocks in {elapsed:.1f}s ({len(results)/elapsed:.1f} stocks/sec) [parallel processing]")
 
+    def _process_stock_guardrails(
+        self,
+        stock_data: Dict,
+        calculator: Optional[GuardrailCalculator] = None
+    ) -> Dict:
+        """Process a single stock's guardrails (default calculator: self.guardrails)."""
+        resumed = self._checkpointed('guardrails', stock_data['ticker'])
+        if resumed is not None:
+            return resumed
+        with self.run_metrics.ticker(stock_data['ticker'], 'guardrails'):
+            guardrails = calculate_guardrails_safe(
+                calculator or self.guardrails, stock_data['ticker'], self._get_company_type(stock_data),
+                stock_data.get('industry', '')
+            )
+        self._checkpoint_result('guardrails', guardrails)
+        return guardrails
+
+    # ===================================
+    # STAGES 3+4: PIPELINED
+    # ===================================
+
+    def _calculate_pipelined(self):
+        """
+        Features and guardrails as one task per ticker.
+
+        Each worker takes a ticker through fetch -> features -> guardrails, so
+        there is no barrier between the stages: network waits of one ticker
+        overlap computation of others. Results are merged into df_topk once
+        at the end, in the same way as the staged path.
+        """
+        start_time = time.time()
+        logger.info(f"Starting pipelined feature + guardrail calculation for {len(self.df_topk)} stocks...")
+
+        stocks, incremental, needs_features = self._prepare_per_ticker_run()
+        if not stocks:
+            return
+
+        def process_stock(stock_data):
+            """fetch -> features -> guardrails for one ticker."""
+            features = None
+            if stock_data['ticker'] in needs_features:
+                features = self._process_stock_features(stock_data)
+            return features, self._process_stock_guardrails(stock_data)
+
+        feature_results = []
+        guardrail_results = []
+        max_workers = self.config.get('pipeline', {}).get('max_workers', 20)
+
+        if self.async_fmp:
+            feature_results, guardrail_results = self._calculate_async(stocks, needs_features)
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(stocks)))) as executor:
+                futures = [executor.submit(process_stock, stock) for stock in stocks]
+                for future in as_completed(futures):
+                    features, guardrails = future.result()
+                    guardrail_results.append(guardrails)
+                    if features is not None:
+                        feature_results.append(features)
+
+        self._merge_per_ticker_results(
+            stocks, incremental, needs_features, feature_results, guardrail_results
+        )
+
+        elapsed = time.time() - start_time
+        logger.info(
+            f"✓ Pipelined: {len(stocks)} stocks ({len(needs_features)} features computed) "
+            f"in {elapsed:.1f}s ({len(stocks)/max(elapsed, 0.1):.1f} stocks/sec)"
+        )
+
+    def _calculate_process_pool(self):
+        """
+        Features and guardrails with the math on a process pool.
+
+        I/O threads collect each ticker's raw payloads (cache or API); as soon
+        as a ticker's snapshot is complete it is sent to a worker process,
+        which runs the calculators on a SnapshotFMPClient. The CPU-bound part
+        escapes the GIL while network fetches keep overlapping computation.
+        """
+        start_time = time.time()
+        logger.info(f"Starting process-pool feature + guardrail calculation for {len(self.df_topk)} stocks...")
+
+        stocks, incremental, needs_features = self._prepare_per_ticker_run()
+        if not stocks:
+            return
+
+        pipeline_config = self.config.get('pipeline', {})
+        io_workers = max(1, min(pipeline_config.get('max_workers', 20), len(stocks)))
+        cpu_workers = pipeline_config.get('cpu_workers') or os.cpu_count() or 1
+
+        feature_results = []
+        guardrail_results = []
+        misses = 0
+
+        # Resumed run: tickers completed before the interruption are not resubmitted
+        pending = []
+        resumed_features = set()
+        for stock in stocks:
+            symbol = stock['ticker']
+            features = self._checkpointed('features', symbol) if symbol in needs_features else None
+            guardrails = self._checkpointed('guardrails', symbol)
+            if features is not None:
+                feature_results.append(features)
+                resumed_features.add(symbol)
+            if guardrails is not None and (features is not None or symbol not in needs_features):
+                guardrail_results.append(guardrails)
+            else:
+                pending.append(stock)
+
+        def collect(stock_data):
+            """I/O side: raw payloads for one ticker -> compute_ticker arguments."""
+            symbol = stock_data['ticker']
+            company_type = self._get_company_type(stock_data)
+            include_features = symbol in needs_features and symbol not in resumed_features
+            with self.run_metrics.ticker(symbol, 'payloads'):
+                payloads = collect_payloads(self.fmp, symbol, company_type, include_features)
+            return symbol, company_type, stock_data.get('industry', ''), payloads, include_features
+
+        with ThreadPoolExecutor(max_workers=io_workers) as io_pool, \
+                ProcessPoolExecutor(max_workers=cpu_workers, initializer=init_worker,
+                                    initargs=(self.config,)) as cpu_pool:
+            if self.async_fmp:
+                # Payloads fetched on the event loop; each ticker goes to the pool when complete
+                cpu_futures = []
+
+                def wants(stock_data):
+                    symbol = stock_data['ticker']
+                    return symbol in needs_features and symbol not in resumed_features, True
+
+                def submit(stock_data, payloads, include_features, _):
+                    cpu_futures.append(cpu_pool.submit(
+                        compute_ticker, stock_data['ticker'], self._get_company_type(stock_data),
+                        stock_data.get('industry', ''), payloads, include_features
+                    ))
+
+                self._collect_async(pending, wants, submit)
+            else:
+                io_futures = [io_pool.submit(collect, stock) for stock in pending]
+                cpu_futures = [cpu_pool.submit(compute_ticker, *f.result()) for f in as_completed(io_futures)]
+
+            for future in as_completed(cpu_futures):
+                features, guardrails, snapshot_misses = future.result()
+                guardrail_results.append(guardrails)
+                self._checkpoint_result('guardrails', guardrails)
+                misses += len(snapshot_misses)
+                if features is not None:
+                    feature_results.append(features)
+                    self._checkpoint_result('features', features)
+
+        if misses:
+            logger.warning(f"Process pool: {misses} calculator calls were not in the payload snapshots")
+
+        self._merge_per_ticker_results(
+            stocks, incremental, needs_features, feature_results, guardrail_results
+        )
+
+        elapsed = time.time() - start_time
+        logger.info(
+            f"✓ Process pool ({cpu_workers} workers): {len(stocks)} stocks "
+            f"({len(needs_features)} features computed) in {elapsed:.1f}s "
+            f"({len(stocks)/max(elapsed, 0.1):.1f} stocks/sec)"
+        )
+
+    def _prepare_per_ticker_run(self):
+        """Shared setup for per-ticker modes: stocks, incremental state, tickers needing features."""
+        stocks = self.df_topk[['ticker', 'is_financial', 'is_REIT', 'is_utility', 'industry']].to_dict('records')
+        if not stocks:
+            logger.warning("No stocks to process")
+            return [], {}, set()
+
+        # Incremental processing applies to features only (as in the staged path)
+        incremental = self._load_incremental_state(stocks)
+        needs_features = {s['ticker'] for s in stocks if self._should_reprocess(s['ticker'], incremental)}
+
+        if needs_features:
+            symbols_to_warm = [s['ticker'] for s in stocks if s['ticker'] in needs_features]
+            if not self._bulk_ingest(symbols_to_warm):
+                self._warm_cache_batch(symbols_to_warm)
+
+        return stocks, incremental, needs_features
+
+    def _merge_per_ticker_results(
+        self,
+        stocks: List[Dict],
+        incremental: Dict,
+        needs_features: set,
+        feature_results: List[Dict],
+        guardrail_results: List[Dict]
+    ):
+        """Store new features, then merge features + guardrails into df_topk in one pass."""
+        if feature_results:
+            self._save_incremental_features(feature_results, incremental, stocks)
+
+        for stock in stocks:
+            symbol = stock['ticker']
+            if symbol not in needs_features and symbol in incremental['stored']:
+                feature_results.append(incremental['stored'][symbol]['features'])
+
+        self.df_topk = (
+            self.df_topk
+            .merge(pd.DataFrame(feature_results), on='ticker', how='left')
+            .merge(pd.DataFrame(guardrail_results), on='ticker', how='left')
+        )
+
     # ===================================
     # STAGE 5: SCORING
     # ===================================
@@ -1156,45 +1381,9 @@ class ScreenerPipeline:
     # ===================================
 
     def _export_results(self) -> str:
-        """Export results to CSV."""
+        """Export results to CSV (and the full frame to the columnar store)."""
         output_path = self.config['output']['csv_path']
-
-        # Define column order (as specified in requirements)
-        columns = [
-            'ticker', 'name', 'country', 'exchange', 'sector', 'industry',
-            'marketCap', 'avgDollarVol_3m', 'freeFloat',
-            'is_financial', 'is_REIT', 'is_utility',
-            # Value (non-fin)
-            'ev_ebit_ttm', 'ev_fcf_ttm', 'pe_ttm', 'pb_ttm', 'shareholder_yield_%',
-            # Value (fin)
-            'p_tangibleBook',
-            # Value (REIT)
-            'p_ffo', 'p_affo',
-            # Quality (non-fin)
-            'roic_%', 'roic_persistence', 'grossProfits_to_assets', 'fcf_margin_%', 'cfo_to_ni',
-            'netDebt_ebitda', 'interestCoverage', 'fixedChargeCoverage',
-            # Quality (fin)
-            'roa_%', 'roe_%', 'efficiency_ratio', 'nim_%', 'combined_ratio_%',
-            'cet1_or_leverage_ratio_%', 'loans_to_deposits',
-            # Quality (REIT)
-            'ffo_payout_%', 'affo_payout_%', 'sameStoreNOI_growth_%', 'occupancy_%',
-            'netDebt_ebitda_re', 'debt_to_grossAssets_%', 'securedDebt_%',
-            # Guardrails
-            'altmanZ', 'beneishM', 'accruals_noa_%', 'netShareIssuance_12m_%',
-            'mna_flag', 'debt_maturity_<24m_%', 'rate_mix_variable_%',
-            'guardrail_status', 'guardrail_reasons',
-            # Momentum & Trend Filters
-            'revenue_growth_3y', 'roic_trend', 'margin_trend',
-            # Moat Score
-            'moat_score', 'pricing_power_score', 'operating_leverage_score', 'roic_persistence_score',
-            # Quality Degradation Scores (Piotroski for VALUE, Mohanram for GROWTH)
-            'piotroski_fscore', 'piotroski_fscore_delta',
-            'mohanram_gscore', 'mohanram_gscore_delta',
-            'quality_degradation_type', 'quality_degradation_score', 'quality_degradation_delta',
-            # Scores & decision
-            'value_score_0_100', 'quality_score_0_100', 'composite_0_100',
-            'decision', 'notes_short'
-        ]
+        columns = EXPORT_COLUMNS
 
         # Ensure all columns exist (fill missing with None)
         for col in columns:
@@ -1210,8 +1399,7 @@ class ScreenerPipeline:
         df_export = self.df_final[columns].copy()
 
         # Clean text fields that might contain problematic characters
-        text_columns = ['name', 'sector', 'industry', 'guardrail_reasons', 'decision', 'decision_reason']
-        for col in text_columns:
+        for col in TEXT_COLUMNS:
             if col in df_export.columns:
                 # Replace newlines and carriage returns with spaces
                 df_export[col] = df_export[col].astype(str).str.replace(r'[\n\r]+', ' ', regex=True)
@@ -1223,45 +1411,110 @@ class ScreenerPipeline:
 
         logger.info(f"Results exported to {output_path}")
 
+        self._export_columnar(columns)
+
         return str(output_file)
 
+    def _export_columnar(self, columns: List[str]):
+        """Full scored frame (incl. nested guardrail details) to the Arrow results store."""
+        output_config = self.config['output']
+        self.results_path = None
+        if not output_config.get('columnar', False):
+            return
+
+        ordered = columns + [c for c in self.df_final.columns if c not in columns]
+        df_export = self.df_final[ordered].copy()
+        # Same text cleaning as the CSV (missing values stay missing)
+        for col in TEXT_COLUMNS:
+            if col in df_export.columns:
+                df_export[col] = df_export[col].map(_one_line)
+
+        run_id = self.checkpoint.run_id if self.checkpoint is not None else None
+        try:
+            self.results_path = write_results(
+                df_export, output_config.get('results_dir', './data/results'), run_id=run_id
+            )
+        except Exception as e:
+            logger.warning(f"Columnar results export failed: {e}")
+
     # ===================================
     # METRICS & LOGGING
     # ===================================
 
     def _log_metrics(self, start_time: datetime):
-        """Log pipeline metrics."""
+        """
+        Log pipeline metrics and write the run's metrics document.
+
+        One JSON document per run (logs/metrics/<run_id>.json) with stage
+        and per-ticker timings, per-endpoint latency percentiles, bytes,
+        retries, throttle wait and cache hit rates per tier. The latest run
+        is also written to output.metrics_log_path.
+        """
         elapsed = (datetime.now() - start_time).total_seconds()
 
         metrics = self.fmp.get_metrics()
+        run_summary = self.run_metrics.summary()
+        requests = metrics['requests']
+        throttle = metrics['rate_limiter']
+        cache = metrics['cache']
 
         logger.info("\n" + "=" * 80)
         logger.info("PIPELINE METRICS")
         logger.info("=" * 80)
         logger.info(f"Total runtime: {elapsed:.1f}s")
+        for stage, seconds in run_summary['stages_seconds'].items():
+            logger.info(f"  {stage}: {seconds:.1f}s")
         logger.info(f"Total API requests: {metrics['total_requests']}")
         logger.info(f"Cached responses: {metrics['total_cached']}")
-        logger.info(f"Cache hit rate: {metrics['cache_stats']['symbol']['hit_rate']:.1%}")
-        logger.info("\nRequests by endpoint:")
-        for endpoint, count in sorted(metrics['requests_by_endpoint'].items(), key=lambda x: -x[1])[:10]:
-            logger.info(f"  {endpoint}: {count}")
+        logger.info(
+            f"Cache hit rate: {cache['hit_rate']:.1%} "
+            f"(memory {cache['memory_hits']}, disk {cache['disk_hits']}, misses {cache['misses']})"
+        )
+        logger.info(
+            f"Downloaded: {requests['bytes_downloaded'] / 1e6:.1f} MB, "
+            f"retries: {requests['retries']}, "
+            f"throttled: {throttle['time_throttled_seconds']:.1f}s"
+        )
+        logger.info("\nSlowest endpoints (p50 / p95 / p99):")
+        by_p95 = sorted(
+            ((e, stats) for e, stats in requests['endpoints'].items() if stats['count']),
+            key=lambda x: -x[1]['p95']
+        )
+        for endpoint, stats in by_p95[:10]:
+            logger.info(
+                f"  {endpoint}: {stats['count']} requests, "
+                f"{stats['p50']:.3f}s / {stats['p95']:.3f}s / {stats['p99']:.3f}s"
+            )
+        if run_summary['tickers']['slowest']:
+            logger.info("\nSlowest tickers:")
+            for entry in run_summary['tickers']['slowest'][:5]:
+                logger.info(f"  {entry['ticker']}: {entry['seconds']:.2f}s {entry['steps']}")
 
         if metrics['errors']:
             logger.warning(f"\nErrors encountered: {len(metrics['errors'])}")
 
-        # Save metrics to JSON
-        import json
-        metrics_path = self.config['output'].get('metrics_log_path', './logs/pipeline_metrics.json')
-        Path(metrics_path).parent.mkdir(parents=True, exist_ok=True)
+        run_id = self.checkpoint.run_id if self.checkpoint is not None else None
+        document = {
+            'run_id': run_id,
+            'runtime_seconds': elapsed,
+            'timestamp': datetime.now().isoformat(),
+            **run_summary,
+            'requests': requests,
+            'throttle': throttle,
+            'cache': cache,
+            'metrics': metrics
+        }
+
+        metrics_path = Path(self.config['output'].get('metrics_log_path', './logs/pipeline_metrics.json'))
+        log_dir = self.config.get('logging', {}).get('log_dir', './logs')
+        run_path = Path(log_dir) / 'metrics' / f"{run_id or start_time.strftime('%Y%m%d-%H%M%S')}.json"
 
-        with open(metrics_path, 'w') as f:
-            json.dump({
-                'runtime_seconds': elapsed,
-                'timestamp': datetime.now().isoformat(),
-                'metrics': metrics
-            }, f, indent=2)
+        for path in (metrics_path, run_path):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(document, f, indent=2, default=str)
 
-        logger.info(f"\nMetrics saved to {metrics_path}")
+        logger.info(f"\nMetrics saved to {run_path}")
         logger.info("=" * 80)
 
     # ===================================
@@ -1290,6 +1543,9 @@ class ScreenerPipeline:
         """
         logger.info(f"Running qualitative analysis for {symbol}")
 
+        if self.df_final is None:
+            self._load_final_results()
+
         # Find symbol in final results
         row = self.df_final[self.df_final['ticker'] == symbol]
 
@@ -1303,6 +1559,143 @@ class ScreenerPipeline:
         # Run qualitative analysis
         return self.qualitative.analyze_symbol(symbol, company_type, self.df_final)
 
+    def run_qualitative_batch(
+        self,
+        decisions: Sequence[str] = ('BUY', 'MONITOR'),
+        symbols: Optional[List[str]] = None,
+        run_id: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        refresh: bool = False,
+        progress: Optional[Callable[[int, int, str], None]] = None
+    ) -> Dict[str, Dict]:
+        """
+        Qualitative analysis for every BUY/MONITOR ticker of a run.
+
+        Tickers are analyzed in parallel on one shared BundleCache, so peer
+        lists, profiles and statements common to several tickers are loaded
+        once for the batch. Each summary is written to
+        <output.qualitative_dir>/<run>/<ticker>.json as soon as it completes;
+        tickers already written for the run are loaded instead of analyzed
+        again (unless refresh=True), so an interrupted batch resumes. Failed
+        analyses are not written, so a resumed batch retries them.
+
+        Args:
+            decisions: Decisions to include
+            symbols: Explicit tickers (instead of filtering by decision)
+            run_id: Checkpointed run to analyze (default: results in memory,
+                else the latest exported run)
+            max_workers: Tickers analyzed at once (default qualitative.batch_workers)
+            refresh: Re-analyze tickers already written for this run
+            progress: Called as progress(done, total, ticker) after each ticker
+
+        Returns:
+            {ticker: qualitative summary}
+        """
+        if run_id:
+            self.checkpoint = RunCheckpoint.resume(self.runs_dir, run_id)
+            self.df_final = self.checkpoint.load_frame('scores')
+            run_label = run_id
+        elif self.df_final is not None:
+            # Results screened in this process: one label per run, so same-day runs don't share a directory
+            if self.run_id is None:
+                self.run_id = self.checkpoint.run_id if self.checkpoint is not None else new_run_id()
+            run_label = self.run_id
+        else:
+            run_label = self._load_final_results()
+
+        df = self.df_final
+        if symbols:
+            selected = df[df['ticker'].isin(symbols)]
+        else:
+            selected = df[df['decision'].isin(decisions)]
+        rows = selected.drop_duplicates('ticker').to_dict('records')
+
+        output_dir = Path(self.config.get('output', {}).get('qualitative_dir', './data/qualitative')) / run_label
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        summaries: Dict[str, Dict] = {}
+        todo = []
+        for row in rows:
+            path = output_dir / f"{row['ticker']}.json"
+            if path.exists() and not refresh:
+                with open(path, 'r') as f:
+                    summary = json.load(f)
+                if 'error' not in summary:
+                    summaries[row['ticker']] = summary
+                    continue
+            todo.append(row)
+
+        total = len(rows)
+        logger.info(
+            f"Qualitative batch ({run_label}): {total} tickers "
+            f"({len(summaries)} already done, {len(todo)} to analyze) -> {output_dir}"
+        )
+
+        # One analyzer over a shared cache: peers/profiles are loaded once per batch
+        analyzer = QualitativeAnalyzer(BundleCache(self.fmp), self.config)
+        workers = max_workers or self.config.get('qualitative', {}).get('batch_workers', 4)
+        start_time = time.time()
+
+        def analyze(row):
+            summary = analyzer.analyze_symbol(row['ticker'], self._get_company_type(row), df)
+            if 'error' in summary:
+                return summary
+            atomic_write(
+                output_dir / f"{row['ticker']}.json",
+                lambda tmp: tmp.write_text(json.dumps(summary, indent=2, default=str))
+            )
+            return summary
+
+        done = len(summaries)
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(todo) or 1))) as executor:
+            futures = {executor.submit(analyze, row): row['ticker'] for row in todo}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    summaries[symbol] = future.result()
+                except Exception as e:
+                    logger.error(f"Qualitative analysis failed for {symbol}: {e}")
+                    summaries[symbol] = {'symbol': symbol, 'error': str(e)}
+                done += 1
+                logger.info(f"[{done}/{total}] {symbol} ({time.time() - start_time:.0f}s)")
+                if progress is not None:
+                    progress(done, total, symbol)
+
+        index = {
+            row['ticker']: {
+                'decision': row.get('decision'),
+                'file': f"{row['ticker']}.json",
+                'error': summaries.get(row['ticker'], {}).get('error')
+            }
+            for row in rows
+        }
+        atomic_write(output_dir / 'index.json', lambda tmp: tmp.write_text(json.dumps(index, indent=2, default=str)))
+
+        logger.info(f"✓ Qualitative batch: {len(todo)} analyzed in {time.time() - start_time:.1f}s -> {output_dir}")
+        return {row['ticker']: summaries[row['ticker']] for row in rows if row['ticker'] in summaries}
+
+    def _load_final_results(self) -> str:
+        """
+        Load the latest exported run into df_final (screening not run in this process).
+
+        The columnar copy is used while output.columnar is enabled and it is
+        at least as new as the CSV (a later CSV-only run supersedes it).
+
+        Returns the run label used for per-run outputs.
+        """
+        output_config = self.config.get('output', {})
+        results_dir = output_config.get('results_dir', './data/results')
+        csv_path = Path(output_config.get('csv_path', './data/screener_results.csv'))
+        runs = list_results(results_dir) if HAS_PYARROW and output_config.get('columnar', False) else []
+        if runs and (not csv_path.exists() or runs[-1].stat().st_mtime >= csv_path.stat().st_mtime):
+            self.df_final = load_results(runs[-1])
+            return runs[-1].stem[len('results-'):]
+
+        if not csv_path.exists():
+            raise FileNotFoundError(f"No screener results found ({results_dir}, {csv_path}); run the screener first")
+        self.df_final = pd.read_csv(csv_path)
+        return datetime.fromtimestamp(csv_path.stat().st_mtime).strftime('%Y%m%d-%H%M%S')
+
 
 def main():
     """CLI entry point."""
@@ -1311,13 +1704,18 @@ def main():
     parser = argparse.ArgumentParser(description='UltraQuality Screener Pipeline')
     parser.add_argument('--config', default='settings.yaml', help='Path to config file')
     parser.add_argument('--qualitative', help='Run qualitative analysis for symbol (after screening)')
+    parser.add_argument('--qualitative-batch', action='store_true',
+                        help='Run qualitative analysis for all BUY/MONITOR tickers of the latest run')
 
     args = parser.parse_args()
 
     # Run pipeline
     pipeline = ScreenerPipeline(args.config)
 
-    if args.qualitative:
+    if args.qualitative_batch:
+        summaries = pipeline.run_qualitative_batch()
+        print(f"\n✓ Qualitative batch complete: {len(summaries)} tickers")
+    elif args.qualitative:
         # On-demand qualitative analysis
         summary = pipeline.get_qualitative_analysis(args.qualitative)
 
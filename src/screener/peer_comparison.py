@@ -11,6 +11,12 @@ import logging
 from typing import Dict, List, Optional
 import numpy as np
 
+try:
+    from .peer_metrics import PeerMetricsCache
+except ImportError:
+    # Fallback for direct execution
+    from peer_metrics import PeerMetricsCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,9 +47,13 @@ class PeerComparator:
         # }
     """
 
-    def __init__(self, fmp_client, guardrails_calc):
+    def __init__(self, fmp_client, guardrails_calc, peer_metrics: Optional[PeerMetricsCache] = None):
         self.fmp = fmp_client
         self.guardrails_calc = guardrails_calc
+        # Peer guardrails are computed once per peer and filing (see peer_metrics.py);
+        # persisted across sessions when the config sets cache.peer_metrics_db_path
+        config = getattr(guardrails_calc, 'config', None) or {}
+        self.peer_metrics = peer_metrics or PeerMetricsCache.from_config(config)
 
     def compare_to_peers(
         self,
@@ -76,7 +86,8 @@ class PeerComparator:
                 continue
 
             try:
-                peer_gr = self.guardrails_calc.calculate_guardrails(
+                peer_gr = self.peer_metrics.guardrails(
+                    self.guardrails_calc,
                     peer,
                     'non_financial',  # Simplification
                     industry
@@ -0,0 +1,227 @@
+"""
+Peer metrics shared across tickers and sessions.
+
+Valuation multiples (QualitativeAnalyzer._get_peer_multiples) and peer
+comparison (PeerComparator.compare_to_peers) compute the same numbers for
+the same peers over and over: tickers in one industry share most of their
+peers, and every analysis re-read each peer's statements and re-ran its
+full guardrails. PeerMetricsCache computes each peer once:
+
+- statement inputs for the multiples (EPS, revenue, EBITDA, equity, debt,
+  cash from the last two annual filings)
+- guardrail outputs (per company type and industry)
+
+Entries are keyed by symbol and fingerprinted with the latest filing date
+(feature_store.filing_fingerprint): they are reused until the peer files
+a new statement, with a max age as backstop. Price-driven values are not
+cached - multiples are recomputed from the current profile, which callers
+fetch for all peers in one bulk call.
+
+Within a process entries are kept in a bounded LRU (memory_max_entries,
+least recently used dropped first) and revalidated like stored ones
+(fingerprint, max age); concurrent analyses of tickers with overlapping
+peers wait for a single computation. With a db_path, entries
+also persist across sessions in SQLite (FeatureStore layout, one table
+per metric kind).
+
+Usage:
+    peer_metrics = PeerMetricsCache.from_config(config)
+    inputs = peer_metrics.multiples_inputs(fmp_client, 'AMD')
+    guardrails = peer_metrics.guardrails(guardrails_calc, 'AMD', 'non_financial', 'Semiconductors')
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from .feature_store import FeatureStore, filing_fingerprint
+except ImportError:
+    # Fallback for direct execution
+    from feature_store import FeatureStore, filing_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+# Statement fields the peer multiples read (P/E, P/B, P/S, EV/EBITDA, PEG)
+MULTIPLES_INCOME_FIELDS = ('date', 'fillingDate', 'eps', 'revenue', 'ebitda')
+MULTIPLES_BALANCE_FIELDS = ('date', 'fillingDate', 'totalStockholdersEquity', 'totalDebt', 'cashAndCashEquivalents')
+
+
+def _fields(record: Dict, fields) -> Dict:
+    """Subset of a statement record (absent keys stay absent)."""
+    return {key: record[key] for key in fields if key in record}
+
+
+class PeerMetricsCache:
+    """
+    Per-peer multiples inputs and guardrail outputs, computed once.
+
+    A computation that raises is not cached (the caller handles the error
+    as before); one that finds no data (None) is neither remembered nor
+    persisted, so the next lookup retries it.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_age_hours: float = 168,
+        fallback_ttl_hours: float = 24,
+        memory_max_entries: int = 4096
+    ):
+        self.db_path = db_path
+        self.max_age_hours = max_age_hours
+        self.fallback_ttl_hours = fallback_ttl_hours
+        self.memory_max_entries = memory_max_entries
+
+        self._stores: Dict[str, FeatureStore] = {}
+        self._lock = threading.Lock()
+        # Per-key locks, only while a key is being computed
+        self._loading: Dict[tuple, threading.Lock] = {}
+        # key -> {'fingerprint', 'computed_at', 'features'} (FeatureStore entry layout)
+        self._memory: 'OrderedDict[tuple, Dict]' = OrderedDict()
+        self.computed = 0
+        self.memory_hits = 0
+        self.store_hits = 0
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'PeerMetricsCache':
+        """Cache configured by `cache.peer_metrics_*` (memory-only without a db path)."""
+        cache_config = config.get('cache', {})
+        return cls(
+            db_path=cache_config.get('peer_metrics_db_path'),
+            max_age_hours=cache_config.get('peer_metrics_max_age_hours', 168),
+            fallback_ttl_hours=cache_config.get('incremental_ttl_hours', 24),
+            memory_max_entries=cache_config.get('peer_metrics_memory_entries', 4096)
+        )
+
+    # ========================
+    # Metrics
+    # ========================
+
+    def multiples_inputs(self, fmp_client, symbol: str) -> Optional[Dict]:
+        """
+        {'income': last 2 annual income records, 'balance': [latest annual
+        balance sheet]} trimmed to the fields the multiples use, or None
+        if either statement is missing.
+        """
+        def compute():
+            income = fmp_client.get_income_statement(symbol, period='annual', limit=2)
+            balance = fmp_client.get_balance_sheet(symbol, period='annual', limit=1)
+            if not (income and balance):
+                return None
+            return {
+                'income': [_fields(record, MULTIPLES_INCOME_FIELDS) for record in income[:2]],
+                'balance': [_fields(balance[0], MULTIPLES_BALANCE_FIELDS)]
+            }
+
+        return self.get(
+            'peer_multiples', symbol, compute,
+            lambda: filing_fingerprint(fmp_client, symbol, 'multiples', period='annual')
+        )
+
+    def guardrails(self, guardrails_calc, symbol: str, company_type: str, industry: str = '') -> Optional[Dict]:
+        """guardrails_calc.calculate_guardrails(symbol, company_type, industry), cached."""
+        def fingerprint():
+            filing = filing_fingerprint(guardrails_calc.fmp, symbol, company_type)
+            return f"{filing}|{industry}" if filing is not None else None
+
+        return self.get(
+            'peer_guardrails', symbol,
+            lambda: guardrails_calc.calculate_guardrails(symbol, company_type, industry),
+            fingerprint,
+            context=(company_type, industry)
+        )
+
+    def get(
+        self,
+        kind: str,
+        symbol: str,
+        compute: Callable[[], Any],
+        fingerprint: Callable[[], Optional[str]],
+        context: tuple = ()
+    ) -> Any:
+        """
+        Value of `kind` for `symbol`: from this session or the store if its
+        fingerprint is current, else computed (and stored).
+        """
+        key = (kind, symbol) + tuple(context)
+        current = fingerprint()
+        with self._lock:
+            found, value = self._memory_get(key, current)
+            if found:
+                return value
+            loading = self._loading.setdefault(key, threading.Lock())
+
+        with loading:
+            with self._lock:
+                found, value = self._memory_get(key, current)
+            if found:
+                return value
+
+            entry = self._load_or_compute(kind, symbol, compute, current)
+            with self._lock:
+                if entry['features'] is not None:
+                    self._memory[key] = entry
+                    while len(self._memory) > self.memory_max_entries:
+                        self._memory.popitem(last=False)
+                self._loading.pop(key, None)
+            return entry['features']
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'computed': self.computed,
+            'memory_hits': self.memory_hits,
+            'store_hits': self.store_hits,
+            'memory_entries': len(self._memory),
+            'db_path': self.db_path
+        }
+
+    # ========================
+    # Internals
+    # ========================
+
+    def _memory_get(self, key: tuple, fingerprint: Optional[str]):
+        """(found, value) from the in-process LRU if still current; caller holds self._lock."""
+        entry = self._memory.get(key)
+        if not FeatureStore.is_current(entry, fingerprint, self.max_age_hours, self.fallback_ttl_hours):
+            self._memory.pop(key, None)
+            return False, None
+        self._memory.move_to_end(key)
+        self.memory_hits += 1
+        return True, entry['features']
+
+    def _store(self, kind: str) -> Optional[FeatureStore]:
+        if not self.db_path:
+            return None
+        with self._lock:
+            store = self._stores.get(kind)
+            if store is None:
+                store = self._stores[kind] = FeatureStore(self.db_path, table=kind)
+            return store
+
+    def _load_or_compute(self, kind, symbol, compute, current) -> Dict:
+        """Store entry if current, else a freshly computed one."""
+        store = self._store(kind)
+        if store is not None:
+            try:
+                entry = store.get_many([symbol]).get(symbol)
+            except Exception as e:
+                logger.warning(f"Peer metrics store read failed ({kind}, {symbol}): {e}")
+                entry = None
+            if FeatureStore.is_current(entry, current, self.max_age_hours, self.fallback_ttl_hours):
+                with self._lock:
+                    self.store_hits += 1
+                return entry
+
+        entry = {'fingerprint': current, 'computed_at': time.time(), 'features': compute()}
+        with self._lock:
+            self.computed += 1
+
+        if store is not None and entry['features'] is not None:
+            try:
+                store.put_many([{'symbol': symbol, 'fingerprint': current, 'features': entry['features']}])
+            except Exception as e:
+                logger.warning(f"Peer metrics store write failed ({kind}, {symbol}): {e}")
+        return entry
@@ -0,0 +1,307 @@
+"""
+Incremental end-of-day price store.
+
+Daily OHLCV bars per symbol live in one SQLite table clustered on
+(symbol, date), so a symbol's history is a contiguous range scan and new
+bars are plain appends. `PriceStore.history` serves any date window and
+only asks the API for what is missing: bars after the last stored date
+(plus that date itself, so a partial intraday bar gets replaced, and the
+bar before it, see below) and, when an older window is requested, the
+span before the covered range.
+
+A daily technical refresh therefore downloads ~1 bar per symbol instead
+of the full 400-day series.
+
+Splits and dividends rewrite past OHLC/adjClose retroactively. Each
+forward sync therefore re-fetches one already-final stored bar (the one
+before the last stored date; the last may have been a partial intraday
+bar) and, if FMP now reports it differently, replaces the symbol's whole
+stored window instead of mixing pre- and post-adjustment prices.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Fields compared on the re-fetched anchor bar to detect a re-adjustment
+ADJUSTED_FIELDS = ('close', 'adjClose')
+
+
+# Stored bar fields (FMP name -> column)
+BAR_COLUMNS = {
+    'open': 'open',
+    'high': 'high',
+    'low': 'low',
+    'close': 'close',
+    'adjClose': 'adj_close',
+    'volume': 'volume',
+    'vwap': 'vwap',
+    'change': 'change',
+    'changePercent': 'change_percent',
+}
+
+
+class PriceStore:
+    """
+    SQLite store of daily bars with per-symbol sync state.
+
+    Tables:
+    - bars(symbol, date, <BAR_COLUMNS>)  PRIMARY KEY (symbol, date) WITHOUT ROWID
+    - sync(symbol, covered_from, last_date, synced_at)
+
+    `covered_from` is the earliest date ever requested, so symbols that
+    listed after a window's start are not back-filled on every call.
+    """
+
+    def __init__(self, db_path: str, refresh_hours: float = 6, busy_timeout_ms: int = 30000):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.refresh_seconds = refresh_hours * 3600
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._symbol_locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.bars_fetched = 0
+        self.fetches = 0
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections are not thread-safe)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_database(self):
+        columns = ', '.join(f"{col} REAL" for col in BAR_COLUMNS.values())
+        conn = self._connect()
+        with conn:
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS bars (
+                    symbol TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    {columns},
+                    PRIMARY KEY (symbol, date)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync (
+                    symbol TEXT PRIMARY KEY,
+                    covered_from TEXT,
+                    last_date TEXT,
+                    synced_at REAL NOT NULL
+                )
+            """)
+
+    def _symbol_lock(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._symbol_locks.setdefault(symbol, threading.Lock())
+
+    # ========================
+    # Storage
+    # ========================
+
+    def get_sync_state(self, symbol: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            "SELECT covered_from, last_date, synced_at FROM sync WHERE symbol = ?", (symbol,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'covered_from': row[0], 'last_date': row[1], 'synced_at': row[2]}
+
+    def append(
+        self,
+        symbol: str,
+        bars: List[Dict],
+        covered_from: Optional[str] = None,
+        replace: bool = False
+    ) -> int:
+        """
+        Upsert FMP-format bars and update the symbol's sync state.
+
+        With replace=True the symbol's stored bars are deleted first (same
+        transaction), e.g. after a split re-adjusted its history.
+        """
+        fmp_names = list(BAR_COLUMNS)
+        rows = [
+            (symbol, bar['date'][:10], *(bar.get(name) for name in fmp_names))
+            for bar in bars if bar.get('date')
+        ]
+        placeholders = ', '.join('?' * (len(fmp_names) + 2))
+        columns = ', '.join(BAR_COLUMNS.values())
+
+        conn = self._connect()
+        with conn:
+            if replace:
+                conn.execute("DELETE FROM bars WHERE symbol = ?", (symbol,))
+            conn.executemany(
+                f"INSERT OR REPLACE INTO bars (symbol, date, {columns}) VALUES ({placeholders})", rows
+            )
+            first, last = conn.execute(
+                "SELECT MIN(date), MAX(date) FROM bars WHERE symbol = ?", (symbol,)
+            ).fetchone()
+            state = self.get_sync_state(symbol)
+            candidates = [d for d in (covered_from, first, state and state['covered_from']) if d]
+            conn.execute(
+                "INSERT OR REPLACE INTO sync (symbol, covered_from, last_date, synced_at) VALUES (?, ?, ?, ?)",
+                (symbol, min(candidates) if candidates else None, last, time.time())
+            )
+        return len(rows)
+
+    def get_bars(self, symbol: str, from_date: Optional[str] = None, to_date: Optional[str] = None) -> List[Dict]:
+        """Stored bars in [from_date, to_date], newest first (FMP order and field names)."""
+        query = f"SELECT date, {', '.join(BAR_COLUMNS.values())} FROM bars WHERE symbol = ?"
+        args: List[Any] = [symbol]
+        if from_date:
+            query += " AND date >= ?"
+            args.append(from_date)
+        if to_date:
+            query += " AND date <= ?"
+            args.append(to_date)
+        query += " ORDER BY date DESC"
+
+        fmp_names = list(BAR_COLUMNS)
+        return [
+            {'date': row[0], **{name: value for name, value in zip(fmp_names, row[1:]) if value is not None}}
+            for row in self._connect().execute(query, args)
+        ]
+
+    def get_frame(self, symbol: str, from_date: Optional[str] = None, to_date: Optional[str] = None):
+        """
+        Stored bars as a chronological DataFrame with columns
+        ['date', 'open', 'high', 'low', 'close', 'volume', ...] - the shape
+        WalkForwardBacktester and MultiStrategyTester expect.
+        """
+        import pandas as pd
+
+        bars = self.get_bars(symbol, from_date, to_date)[::-1]
+        df = pd.DataFrame(bars)
+        if not df.empty:
+            df['date'] = pd.to_datetime(df['date'])
+        return df
+
+    # ========================
+    # Delta sync
+    # ========================
+
+    def history(
+        self,
+        symbol: str,
+        fetch: Callable[[Optional[str], Optional[str]], Any],
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None
+    ) -> Dict:
+        """
+        Serve a window, fetching only missing bars.
+
+        Args:
+            symbol: Stock ticker
+            fetch: fetch(from_date, to_date) -> FMP historical-price-full response
+            from_date / to_date: Optional window bounds (YYYY-MM-DD)
+
+        Returns:
+            {'symbol': ..., 'historical': [...newest first]} or {} if nothing is known
+        """
+        with self._symbol_lock(symbol):
+            self._sync(symbol, fetch, from_date, to_date)
+
+        bars = self.get_bars(symbol, from_date, to_date)
+        if not bars:
+            return {}
+        return {'symbol': symbol, 'historical': bars}
+
+    def _sync(self, symbol: str, fetch: Callable, from_date: Optional[str], to_date: Optional[str]):
+        state = self.get_sync_state(symbol)
+
+        if state is None:
+            self._fetch_range(symbol, fetch, from_date, None, covered_from=from_date or '0000-00-00')
+            return
+        if state['last_date'] is None:
+            # Nothing came back last time (unknown / delisted symbol)
+            if time.time() - state['synced_at'] >= self.refresh_seconds:
+                self._fetch_range(symbol, fetch, from_date, None, covered_from=from_date or '0000-00-00')
+            return
+
+        # Back-fill: window starts before anything requested so far
+        if from_date and from_date < state['covered_from']:
+            self._fetch_range(symbol, fetch, from_date, state['covered_from'], covered_from=from_date)
+
+        # Forward: new bars since the last stored date, at most once per refresh period
+        wants_recent = to_date is None or to_date > state['last_date']
+        if wants_recent and time.time() - state['synced_at'] >= self.refresh_seconds:
+            self._sync_forward(symbol, fetch, state)
+
+    def _sync_forward(self, symbol: str, fetch: Callable, state: Dict[str, Any]):
+        """Append new bars; re-sync the whole window if the anchor bar was re-adjusted."""
+        anchor = self.get_bars(symbol, to_date=state['last_date'])[1:2]
+        since = anchor[0]['date'] if anchor else state['last_date']
+        bars = self._fetch(symbol, fetch, since, None)
+
+        if anchor and _readjusted(anchor[0], bars):
+            logger.info(f"{symbol}: stored prices re-adjusted upstream (split/dividend); re-syncing history")
+            covered_from = state['covered_from']
+            bars = self._fetch(symbol, fetch, None if covered_from == '0000-00-00' else covered_from, None)
+            self.append(symbol, bars, covered_from=covered_from, replace=True)
+            return
+        self.append(symbol, bars)
+
+    def _fetch_range(
+        self,
+        symbol: str,
+        fetch: Callable,
+        from_date: Optional[str],
+        to_date: Optional[str],
+        covered_from: Optional[str] = None
+    ):
+        bars = self._fetch(symbol, fetch, from_date, to_date)
+        self.append(symbol, bars, covered_from=covered_from)
+
+    def _fetch(self, symbol: str, fetch: Callable, from_date: Optional[str], to_date: Optional[str]) -> List[Dict]:
+        data = fetch(from_date, to_date)
+        self.fetches += 1
+        bars = data.get('historical', []) if isinstance(data, dict) else []
+        self.bars_fetched += len(bars)
+        logger.debug(f"{symbol}: fetched {len(bars)} bars ({from_date or 'start'} -> {to_date or 'latest'})")
+        return bars
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return store statistics."""
+        symbols, bars = self._connect().execute(
+            "SELECT COUNT(DISTINCT symbol), COUNT(*) FROM bars"
+        ).fetchone()
+        return {
+            'symbols': symbols,
+            'bars': bars,
+            'fetches': self.fetches,
+            'bars_fetched': self.bars_fetched,
+            'db_path': str(self.db_path)
+        }
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _readjusted(stored: Dict, fetched: List[Dict]) -> bool:
+    """True if the re-fetched copy of a stored bar differs in ADJUSTED_FIELDS."""
+    for bar in fetched:
+        if (bar.get('date') or '')[:10] != stored['date']:
+            continue
+        for field in ADJUSTED_FIELDS:
+            old, new = stored.get(field), bar.get(field)
+            if old is None or new is None:
+                continue
+            if abs(new - old) > 1e-9 * max(abs(old), 1.0):
+                return True
+        return False
+    return False
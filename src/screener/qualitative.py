@@ -9,25 +9,178 @@ Provides deep-dive analysis including:
 - M&A activity
 - Key risks
 """
+import copy
 import logging
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import re
 
+try:
+    from .financial_bundle import FinancialBundle
+    from .peer_metrics import PeerMetricsCache
+    from .task_graph import Task, run_tasks
+    from .text_matching import KeywordMatcher
+    from .tracing import traced
+except ImportError:
+    # Fallback for direct execution
+    from financial_bundle import FinancialBundle
+    from peer_metrics import PeerMetricsCache
+    from task_graph import Task, run_tasks
+    from text_matching import KeywordMatcher
+    from tracing import traced
+
 logger = logging.getLogger(__name__)
 
 
+# ===================================
+# Keyword categories (compiled once)
+# ===================================
+# Each matcher reports every category found in a text in one call;
+# matching is case-insensitive substring search.
+
+# Business description + industry + sector (_assess_moats)
+MOAT_KEYWORDS = KeywordMatcher({
+    'switching_strong': [
+        'enterprise software', 'saas', 'cloud platform', 'erp', 'crm',
+        'database', 'operating system', 'productivity suite',
+        'mission-critical', 'integrated platform', 'ecosystem'
+    ],
+    'switching_probable': [
+        'subscription', 'recurring revenue', 'long-term contract',
+        'platform', 'multi-year', 'customer data', 'workflow'
+    ],
+    'network_strong': [
+        'search engine', 'social network', 'social media', 'messaging',
+        'marketplace', 'two-sided platform', 'payment network',
+        'ride-sharing', 'food delivery', 'app store'
+    ],
+    'network_probable': [
+        'platform', 'network', 'community', 'user-generated',
+        'developer ecosystem', 'third-party'
+    ],
+    'ip_strong': [
+        'patent', 'proprietary technology', 'intellectual property',
+        'algorithm', 'ai model', 'machine learning', 'trade secret',
+        'exclusive license', 'semiconductor design', 'drug pipeline'
+    ],
+    'brand_probable': [
+        'brand', 'trademark', 'licensed', 'franchise', 'premium',
+        'luxury', 'reputation', 'trust'
+    ],
+    'scale_strong': [
+        'largest', 'market leader', 'dominant', '#1', 'leading provider',
+        'economies of scale', 'cost advantage', 'low-cost producer',
+        'manufacturing scale', 'distribution network', 'global footprint'
+    ],
+    'scale_probable': [
+        'scale', 'leading', 'major', 'significant market share',
+        'infrastructure', 'data centers', 'warehouse network'
+    ],
+    'regulatory_strong': [
+        'regulated utility', 'telecom license', 'spectrum license',
+        'fda approved', 'pharmaceutical', 'biotech', 'drug',
+        'banking license', 'insurance license', 'gaming license'
+    ],
+    'regulatory_probable': [
+        'regulated', 'license', 'compliance', 'certification',
+        'approval required', 'barrier to entry'
+    ],
+})
+
+# Business description only (_assess_moats_basic fallback)
+BASIC_MOAT_KEYWORDS = KeywordMatcher({
+    'switching_costs': ['subscription', 'contract', 'enterprise software', 'platform'],
+    'network_effects': ['network', 'marketplace', 'social', 'platform', 'two-sided'],
+    'brand_IP': ['brand', 'patent', 'trademark', 'proprietary', 'licensed', 'franchise'],
+    'scale_efficiency': ['largest', 'leading', 'scale', 'manufacturing', 'distribution'],
+    'regulatory_assets': ['regulated', 'license', 'utility', 'telecom', 'pharmaceutical'],
+})
+
+# News title + text (_summarize_news)
+NEWS_TAGS = KeywordMatcher({
+    'products': ['product', 'launch', 'release'],
+    'guidance': ['guidance', 'forecast', 'outlook', 'expect'],
+    'mna': ['acquisition', 'merger', 'm&a', 'buyout'],
+    'litigation': ['lawsuit', 'litigation', 'sue', 'settlement'],
+    'regulatory': ['regulation', 'sec', 'fda', 'approval', 'complian'],
+    'financing': ['financing', 'debt', 'equity', 'raise', 'offering'],
+    'ESG': ['esg', 'sustainability', 'environment', 'social'],
+})
+
+# Earnings call paragraphs (_summarize_transcript)
+TRANSCRIPT_TOPICS = KeywordMatcher({
+    'highlights': ['revenue', 'growth', 'margin', 'customer', 'user', 'cohort', 'bookings'],
+    'risks': ['risk', 'challenge', 'headwind', 'concern', 'uncertainty', 'pressure'],
+    'outlook': ['guidance', 'outlook', 'expect', 'anticipate', 'forecast', 'next quarter'],
+})
+
+# Industries whose transcripts are worth mining for backlog (_extract_backlog_data)
+ORDER_DRIVEN_INDUSTRIES = KeywordMatcher({
+    'order_driven': [
+        'aerospace', 'defense', 'aircraft', 'aviation',
+        'heavy equipment', 'machinery', 'capital goods',
+        'shipbuilding', 'industrial equipment', 'construction equipment',
+        'engineering', 'turbine', 'locomotive', 'mining equipment'
+    ],
+})
+
+# Backlog mentions and their tone in a transcript (_extract_backlog_data)
+BACKLOG_TERMS = KeywordMatcher({
+    'backlog': ['backlog', 'order book', 'orders', 'book-to-bill', 'book to bill', 'bookings'],
+    'positive': ['strong backlog', 'robust backlog', 'record backlog', 'growing backlog',
+                 'healthy backlog', 'solid backlog', 'improving backlog'],
+    'negative': ['weak backlog', 'declining backlog', 'softening backlog', 'lower backlog',
+                 'reduced backlog', 'challenging backlog'],
+})
+
+
+# Transcript extraction patterns, compiled once. A leading `[\d.]+` is
+# spelled `[\d.][\d.]*` and the guidance pattern starts with a lookahead on
+# its first letter: same matches, but the regex engine can skip ahead to
+# candidate positions instead of trying every character of the transcript.
+GUIDANCE_PATTERN = re.compile(
+    r'(?=[QqFf])(Q\d|FY\d{2,4}|full[- ]year)\s+(revenue|EPS|earnings|EBITDA)[^\d]*([\d.,]+[BMK%]?)',
+    re.IGNORECASE
+)
+BACKLOG_VALUE_PATTERNS = [
+    re.compile(r'backlog\s+(?:of|is|was|totaled|reached|stood at)\s+[\$€£]?([\d,.]+)\s*(billion|million|B|M|bn|mn)'),
+    re.compile(r'order\s+book\s+(?:of|is|was|totaled|reached|stood at)\s+[\$€£]?([\d,.]+)\s*(billion|million|B|M|bn|mn)'),
+    re.compile(r'total\s+backlog\s+[\$€£]?([\d,.]+)\s*(billion|million|B|M|bn|mn)'),
+    re.compile(r'[\$€£]([\d,.]+)\s*(billion|million|B|M|bn|mn)\s+(?:in|of)\s+backlog'),
+]
+BACKLOG_CHANGE_PATTERNS = [
+    re.compile(r'backlog\s+(?:increased|grew|rose|up|higher)\s+(?:by\s+)?([\d.][\d.]*)%'),
+    re.compile(r'backlog\s+(?:decreased|declined|fell|down|lower)\s+(?:by\s+)?([\d.][\d.]*)%'),
+    re.compile(r'([\d.][\d.]*)%\s+(?:increase|growth|rise)\s+in\s+backlog'),
+    re.compile(r'([\d.][\d.]*)%\s+(?:decrease|decline|drop)\s+in\s+backlog'),
+    re.compile(r'backlog\s+of\s+[\$€£][\d,.]+[BMbm],?\s+(?:up|down)\s+([\d.][\d.]*)%'),
+]
+BOOK_TO_BILL_PATTERNS = [
+    re.compile(r'book[- ]to[- ]bill\s+(?:ratio\s+)?(?:of\s+)?(\d+\.?\d*)\b'),
+    re.compile(r'book[- ]to[- ]bill\s+(?:was|is)\s+(\d+\.?\d*)\b'),
+    re.compile(r'btb\s+(?:ratio\s+)?(?:of\s+)?(\d+\.?\d*)\b'),
+]
+BACKLOG_DURATION_PATTERNS = [
+    re.compile(r'backlog\s+(?:represents|equals|covers)\s+(?:approximately\s+)?([\d.]+)\s+(months|quarters|years)'),
+    re.compile(r'([\d.][\d.]*)[- ](month|quarter|year)\s+backlog'),
+    re.compile(r'backlog\s+of\s+(?:approximately\s+)?([\d.]+)\s+(months|quarters|years)'),
+]
+
+
 class QualitativeAnalyzer:
     """
     On-demand qualitative analysis for selected symbols.
     Cached for 24-72h to minimize API calls.
     """
 
-    def __init__(self, fmp_client, config: Dict):
+    def __init__(self, fmp_client, config: Dict, peer_metrics: Optional[PeerMetricsCache] = None):
         self.fmp = fmp_client
         self.config = config
+        # Peer multiples inputs, shared across tickers (see peer_metrics.py)
+        self.peer_metrics = peer_metrics or PeerMetricsCache.from_config(config)
 
+    @traced('qualitative.analyze_symbol', attributes=('symbol', 'company_type'))
     def analyze_symbol(
         self,
         symbol: str,
@@ -45,6 +198,24 @@ class QualitativeAnalyzer:
         Returns:
             qualitative_summary dict (see schema in docstring below)
         """
+        # Sections run on a per-symbol copy whose client is a FinancialBundle:
+        # profile and statements are fetched once and sliced in memory
+        bundle = FinancialBundle(self.fmp, symbol)
+        analyzer = copy.copy(self)
+        analyzer.fmp = bundle
+        summary = analyzer._analyze_sections(symbol, company_type, peers_df)
+
+        stats = bundle.get_stats()
+        logger.debug(f"{symbol}: financial bundle served {stats['hits']} reads from {stats['loads']} loads")
+        return summary
+
+    def _analyze_sections(
+        self,
+        symbol: str,
+        company_type: str,
+        peers_df: Optional[Any] = None
+    ) -> Dict:
+        """Run every section of analyze_symbol (self.fmp is the symbol's bundle)."""
         logger.info(f"Starting qualitative analysis for {symbol}")
 
         summary = {
@@ -70,84 +241,94 @@ class QualitativeAnalyzer:
             'contextual_warnings': []  # New: non-disqualifying warnings (customer concentration, etc.)
         }
 
-        try:
+        # Independent sections run concurrently; deps keep the orders that
+        # matter (peers -> moats -> intrinsic value, transcript/news -> risks)
+        qualitative_config = self.config.get('qualitative', {})
+        timeouts = qualitative_config.get('section_timeouts', {})
+        tasks = [
             # 1. Business description
-            summary['business_summary'] = self._get_business_summary(symbol)
-
+            Task('business_summary', lambda r: self._get_business_summary(symbol), default=''),
             # 2. Peers & competitive position
-            summary['peers_list'], summary['peer_snapshot'] = self._get_peer_analysis(
-                symbol, company_type, peers_df
-            )
-
+            Task('peers', lambda r: self._get_peer_analysis(symbol, company_type, peers_df), default=([], [])),
             # 3. Moats (competitive advantages)
-            summary['moats_raw'] = self._assess_moats(
-                symbol,
-                summary['business_summary'],
-                summary['peer_snapshot']
-            )
-            # Format moats as readable list
-            summary['moats'] = self._format_moats(summary['moats_raw'])
-
+            Task('moats', lambda r: self._assess_moats(symbol, r['business_summary'], r['peers'][1]),
+                 deps=('business_summary', 'peers'), default={}),
             # 4. Skin in the game (insiders & dilution)
-            summary['skin_in_the_game'] = self._assess_skin_in_game(symbol)
-            summary['insider_trading'] = summary['skin_in_the_game']  # UI compatibility
-
+            Task('skin_in_the_game', lambda r: self._assess_skin_in_game(symbol), default={}),
             # 5. News & PR (last 60-90 days)
-            summary['news_TLDR'], summary['news_tags'] = self._summarize_news(symbol, days=90)
-            summary['pr_highlights'] = self._summarize_press_releases(symbol, days=90)
-            # Format news for UI
-            summary['recent_news'] = self._format_news(summary['news_TLDR'], summary['news_tags'])
-
+            Task('news', lambda r: self._summarize_news(symbol, days=90), default=([], [])),
+            Task('press_releases', lambda r: self._summarize_press_releases(symbol, days=90), default=[]),
             # 6. Latest earnings transcript
-            summary['transcript_TLDR'] = self._summarize_transcript(symbol)
-
+            Task('transcript', lambda r: self._summarize_transcript(symbol), default={}),
             # 6b. Backlog analysis (for order-driven industrials)
-            # Get industry from profile
-            try:
-                profile = self.fmp.get_profile(symbol)
-                industry = profile[0].get('industry', '') if profile else ''
-            except:
-                industry = ''
-            summary['backlog_data'] = self._extract_backlog_data(symbol, industry)
-
+            Task('backlog', lambda r: self._extract_backlog_data(symbol, self._get_industry(symbol)), default={}),
             # 7. Recent M&A
-            summary['mna_recent'] = self._get_recent_mna(symbol)
-
+            Task('mna', lambda r: self._get_recent_mna(symbol), default=[]),
             # 8. Top risks (synthesized)
-            summary['top_risks'] = self._synthesize_risks(
-                symbol,
-                summary['transcript_TLDR'],
-                summary['news_TLDR'],
-                summary['news_tags']
-            )
-            # Format risks for UI
-            summary['risks'] = self._format_risks(summary['top_risks'])
-
+            Task('risks', lambda r: self._synthesize_risks(symbol, r['transcript'], *r['news']),
+                 deps=('transcript', 'news'), default=[]),
             # 9. Intrinsic value estimation
-            summary['intrinsic_value'] = self._estimate_intrinsic_value(
-                symbol,
-                company_type,
-                peers_df,
-                summary.get('peers_list', [])
-            )
-
-            # 10. Contextual Warnings (non-disqualifying)
-            # These are informational only, don't affect scoring
-            summary['contextual_warnings'] = self._assess_contextual_warnings(
-                symbol,
-                summary['transcript_TLDR']
-            )
-
-        except Exception as e:
-            logger.error(f"Error in qualitative analysis for {symbol}: {e}")
-            summary['error'] = str(e)
+            Task('intrinsic_value',
+                 lambda r: self._estimate_intrinsic_value(symbol, company_type, peers_df, r['peers'][0]),
+                 deps=('peers', 'moats'), default={}),
+            # 10. Contextual Warnings (non-disqualifying, informational only)
+            Task('contextual_warnings', lambda r: self._assess_contextual_warnings(symbol, r['transcript']),
+                 deps=('transcript',), default=[]),
+        ]
+        for task in tasks:
+            task.timeout = timeouts.get(task.name)
+
+        results, failures = run_tasks(
+            tasks,
+            max_workers=qualitative_config.get('max_workers'),
+            timeout=qualitative_config.get('section_timeout_seconds', 30)
+        )
+
+        summary['business_summary'] = results['business_summary']
+        summary['peers_list'], summary['peer_snapshot'] = results['peers']
+        summary['moats_raw'] = results['moats']
+        # Format moats as readable list
+        summary['moats'] = self._format_moats(summary['moats_raw'])
+        summary['skin_in_the_game'] = results['skin_in_the_game']
+        summary['insider_trading'] = summary['skin_in_the_game']  # UI compatibility
+        summary['news_TLDR'], summary['news_tags'] = results['news']
+        summary['pr_highlights'] = results['press_releases']
+        # Format news for UI
+        summary['recent_news'] = self._format_news(summary['news_TLDR'], summary['news_tags'])
+        summary['transcript_TLDR'] = results['transcript']
+        summary['backlog_data'] = results['backlog']
+        summary['mna_recent'] = results['mna']
+        summary['top_risks'] = results['risks']
+        # Format risks for UI
+        summary['risks'] = self._format_risks(summary['top_risks'])
+        summary['intrinsic_value'] = results['intrinsic_value']
+        summary['contextual_warnings'] = results['contextual_warnings']
+
+        if failures:
+            # Partial failures keep the report usable (callers treat 'error'
+            # as a failed analysis); 'error' only when nothing succeeded
+            summary['sections_failed'] = failures
+            if len(failures) == len(tasks):
+                logger.error(f"Error in qualitative analysis for {symbol}: {failures}")
+                summary['error'] = '; '.join(f"{name}: {reason}" for name, reason in failures.items())
+            else:
+                logger.warning(f"{symbol}: qualitative sections failed: {failures}")
 
         return summary
 
+    def _get_industry(self, symbol: str) -> str:
+        """Industry from the profile ('' if unavailable)."""
+        try:
+            profile = self.fmp.get_profile(symbol)
+            return profile[0].get('industry', '') if profile else ''
+        except Exception:
+            return ''
+
     # ===================================
     # 1. Business Description
     # ===================================
 
+    @traced('qualitative.business_summary', attributes=('symbol',))
     def _get_business_summary(self, symbol: str) -> str:
         """
         Generate 300-600 char business summary.
@@ -196,6 +377,7 @@ class QualitativeAnalyzer:
     # 2. Peers & Competitive Position
     # ===================================
 
+    @traced('qualitative.peers', attributes=('symbol',))
     def _get_peer_analysis(
         self,
         symbol: str,
@@ -278,6 +460,7 @@ class QualitativeAnalyzer:
     # 3. Moats (Competitive Advantages)
     # ===================================
 
+    @traced('qualitative.moats', attributes=('symbol',))
     def _assess_moats(
         self,
         symbol: str,
@@ -325,8 +508,8 @@ class QualitativeAnalyzer:
             market_cap = prof.get('mktCap', 0)
             company_name = prof.get('companyName', '')
 
-            summary_lower = business_summary.lower()
-            combined_text = f"{summary_lower} {industry} {sector}"
+            # Every keyword category in one pass over description + industry + sector
+            keyword_hits = MOAT_KEYWORDS.hits(f"{business_summary} {industry} {sector}")
 
             # Special handling for mega-cap tech companies with known strong moats
             # These are well-documented companies with clear competitive advantages
@@ -358,19 +541,12 @@ class QualitativeAnalyzer:
                 switching_evidence.append('Ecosystem lock-in (proven)')
                 moats['switching_costs'] = 'Strong'
             # Strong indicators
-            elif any(kw in combined_text for kw in [
-                'enterprise software', 'saas', 'cloud platform', 'erp', 'crm',
-                'database', 'operating system', 'productivity suite',
-                'mission-critical', 'integrated platform', 'ecosystem'
-            ]):
+            elif 'switching_strong' in keyword_hits:
                 switching_evidence.append('Enterprise/mission-critical software')
                 moats['switching_costs'] = 'Strong'
 
             # Probable indicators
-            elif any(kw in combined_text for kw in [
-                'subscription', 'recurring revenue', 'long-term contract',
-                'platform', 'multi-year', 'customer data', 'workflow'
-            ]):
+            elif 'switching_probable' in keyword_hits:
                 switching_evidence.append('Subscription/contract model')
                 moats['switching_costs'] = 'Probable'
 
@@ -381,19 +557,12 @@ class QualitativeAnalyzer:
                 network_evidence.append('Multi-sided platform (proven)')
                 moats['network_effects'] = 'Strong'
             # Strong indicators
-            elif any(kw in combined_text for kw in [
-                'search engine', 'social network', 'social media', 'messaging',
-                'marketplace', 'two-sided platform', 'payment network',
-                'ride-sharing', 'food delivery', 'app store'
-            ]):
+            elif 'network_strong' in keyword_hits:
                 network_evidence.append('Multi-sided platform/network')
                 moats['network_effects'] = 'Strong'
 
             # Probable indicators
-            elif any(kw in combined_text for kw in [
-                'platform', 'network', 'community', 'user-generated',
-                'developer ecosystem', 'third-party'
-            ]):
+            elif 'network_probable' in keyword_hits:
                 network_evidence.append('Platform with ecosystem')
                 moats['network_effects'] = 'Probable'
 
@@ -419,19 +588,12 @@ class QualitativeAnalyzer:
                     moats['brand_IP'] = 'Strong'
 
             # Strong IP indicators (if not already set as Strong)
-            if moats['brand_IP'] != 'Strong' and any(kw in combined_text for kw in [
-                'patent', 'proprietary technology', 'intellectual property',
-                'algorithm', 'ai model', 'machine learning', 'trade secret',
-                'exclusive license', 'semiconductor design', 'drug pipeline'
-            ]):
+            if moats['brand_IP'] != 'Strong' and 'ip_strong' in keyword_hits:
                 brand_evidence.append('Strong IP portfolio')
                 moats['brand_IP'] = 'Strong'
 
             # Probable indicators
-            elif any(kw in combined_text for kw in [
-                'brand', 'trademark', 'licensed', 'franchise', 'premium',
-                'luxury', 'reputation', 'trust'
-            ]):
+            elif 'brand_probable' in keyword_hits:
                 brand_evidence.append('Brand recognition')
                 moats['brand_IP'] = 'Probable'
 
@@ -452,20 +614,13 @@ class QualitativeAnalyzer:
                         moats['scale_efficiency'] = 'Strong' if moats['scale_efficiency'] != 'Strong' else 'Strong'
 
             # Strong indicators
-            if any(kw in combined_text for kw in [
-                'largest', 'market leader', 'dominant', '#1', 'leading provider',
-                'economies of scale', 'cost advantage', 'low-cost producer',
-                'manufacturing scale', 'distribution network', 'global footprint'
-            ]):
+            if 'scale_strong' in keyword_hits:
                 scale_evidence.append('Market leadership/scale')
                 if moats['scale_efficiency'] == 'No':
                     moats['scale_efficiency'] = 'Strong'
 
             # Probable indicators
-            elif any(kw in combined_text for kw in [
-                'scale', 'leading', 'major', 'significant market share',
-                'infrastructure', 'data centers', 'warehouse network'
-            ]):
+            elif 'scale_probable' in keyword_hits:
                 scale_evidence.append('Significant scale')
                 if moats['scale_efficiency'] == 'No':
                     moats['scale_efficiency'] = 'Probable'
@@ -474,19 +629,12 @@ class QualitativeAnalyzer:
             regulatory_evidence = []
 
             # Strong indicators
-            if any(kw in combined_text for kw in [
-                'regulated utility', 'telecom license', 'spectrum license',
-                'fda approved', 'pharmaceutical', 'biotech', 'drug',
-                'banking license', 'insurance license', 'gaming license'
-            ]):
+            if 'regulatory_strong' in keyword_hits:
                 regulatory_evidence.append('Regulated industry/licenses required')
                 moats['regulatory_assets'] = 'Strong'
 
             # Probable indicators
-            elif any(kw in combined_text for kw in [
-                'regulated', 'license', 'compliance', 'certification',
-                'approval required', 'barrier to entry'
-            ]):
+            elif 'regulatory_probable' in keyword_hits:
                 regulatory_evidence.append('Regulatory requirements')
                 moats['regulatory_assets'] = 'Probable'
 
@@ -536,18 +684,8 @@ class QualitativeAnalyzer:
             'confidence': 'Low'
         }
 
-        summary_lower = business_summary.lower()
-
-        if any(kw in summary_lower for kw in ['subscription', 'contract', 'enterprise software', 'SaaS', 'platform']):
-            moats['switching_costs'] = 'Probable'
-        if any(kw in summary_lower for kw in ['network', 'marketplace', 'social', 'platform', 'two-sided']):
-            moats['network_effects'] = 'Probable'
-        if any(kw in summary_lower for kw in ['brand', 'patent', 'trademark', 'proprietary', 'licensed', 'franchise']):
-            moats['brand_IP'] = 'Probable'
-        if any(kw in summary_lower for kw in ['largest', 'leading', 'scale', 'manufacturing', 'distribution']):
-            moats['scale_efficiency'] = 'Probable'
-        if any(kw in summary_lower for kw in ['regulated', 'license', 'utility', 'telecom', 'pharmaceutical', 'FDA']):
-            moats['regulatory_assets'] = 'Probable'
+        for moat_type in BASIC_MOAT_KEYWORDS.hits(business_summary):
+            moats[moat_type] = 'Probable'
 
         moat_count = sum(1 for v in moats.values() if v in ['Probable'])
         moats['notes'] = f"{moat_count} potential moats identified from business description (basic analysis)."
@@ -558,6 +696,7 @@ class QualitativeAnalyzer:
     # 4. Skin in the Game
     # ===================================
 
+    @traced('qualitative.skin_in_the_game', attributes=('symbol',))
     def _assess_skin_in_game(self, symbol: str) -> Dict:
         """
         Assess insider alignment and dilution.
@@ -898,6 +1037,7 @@ class QualitativeAnalyzer:
     # 5. News & Press Releases
     # ===================================
 
+    @traced('qualitative.news', attributes=('symbol',))
     def _summarize_news(self, symbol: str, days: int = 90) -> tuple:
         """
         Summarize stock news from last N days.
@@ -965,22 +1105,7 @@ class QualitativeAnalyzer:
                 })
 
                 # Tag classification (keyword-based)
-                content_lower = (title + ' ' + text).lower()
-
-                if any(kw in content_lower for kw in ['product', 'launch', 'release']):
-                    tags_set.add('products')
-                if any(kw in content_lower for kw in ['guidance', 'forecast', 'outlook', 'expect']):
-                    tags_set.add('guidance')
-                if any(kw in content_lower for kw in ['acquisition', 'merger', 'm&a', 'buyout']):
-                    tags_set.add('mna')
-                if any(kw in content_lower for kw in ['lawsuit', 'litigation', 'sue', 'settlement']):
-                    tags_set.add('litigation')
-                if any(kw in content_lower for kw in ['regulation', 'sec', 'fda', 'approval', 'complian']):
-                    tags_set.add('regulatory')
-                if any(kw in content_lower for kw in ['financing', 'debt', 'equity', 'raise', 'offering']):
-                    tags_set.add('financing')
-                if any(kw in content_lower for kw in ['esg', 'sustainability', 'environment', 'social']):
-                    tags_set.add('ESG')
+                tags_set |= NEWS_TAGS.hits(title + ' ' + text)
 
             return news_items, list(tags_set)
 
@@ -988,6 +1113,7 @@ class QualitativeAnalyzer:
             logger.warning(f"Failed to summarize news for {symbol}: {e}")
             return [], []
 
+    @traced('qualitative.press_releases', attributes=('symbol',))
     def _summarize_press_releases(self, symbol: str, days: int = 90) -> List[str]:
         """
         Summarize press releases.
@@ -1025,6 +1151,7 @@ class QualitativeAnalyzer:
     # 6. Earnings Transcript
     # ===================================
 
+    @traced('qualitative.transcript', attributes=('symbol',))
     def _summarize_transcript(self, symbol: str) -> Dict:
         """
         Summarize latest earnings call transcript.
@@ -1065,40 +1192,30 @@ class QualitativeAnalyzer:
             # Typical structure: Prepared Remarks → Q&A
             sections = content.split('\n\n')
 
-            # Extract highlights (look for growth, margins, customers, unit economics)
-            highlights_keywords = ['revenue', 'growth', 'margin', 'customer', 'user', 'cohort', 'ARR', 'bookings']
-            for section in sections[:10]:  # First 10 paragraphs
-                if any(kw in section.lower() for kw in highlights_keywords):
-                    snippet = section[:150].strip()
-                    if snippet:
+            # One pass per paragraph classifies it as highlight (growth, margins,
+            # customers, unit economics), risk ("risk", "challenge", "headwind")
+            # and/or outlook / guidance. Highlights and risks come from the
+            # first 10 paragraphs, outlook from all of them.
+            for i, section in enumerate(sections):
+                snippet = section[:150].strip()
+                if not snippet:
+                    continue
+                topics = TRANSCRIPT_TOPICS.hits(section, None if i < 10 else ('outlook',))
+                if i < 10:
+                    if 'highlights' in topics:
                         tldr['highlights'].append(snippet)
-
-            tldr['highlights'] = tldr['highlights'][:5]  # Top 5
-
-            # Extract risks (look for "risk", "challenge", "headwind")
-            risk_keywords = ['risk', 'challenge', 'headwind', 'concern', 'uncertainty', 'pressure']
-            for section in sections[:10]:
-                if any(kw in section.lower() for kw in risk_keywords):
-                    snippet = section[:150].strip()
-                    if snippet:
+                    if 'risks' in topics:
                         tldr['risks'].append(snippet)
+                if 'outlook' in topics:
+                    tldr['outlook'].append(snippet)
 
+            tldr['highlights'] = tldr['highlights'][:5]  # Top 5
             tldr['risks'] = tldr['risks'][:4]  # Top 4
-
-            # Extract outlook / guidance
-            outlook_keywords = ['guidance', 'outlook', 'expect', 'anticipate', 'forecast', 'next quarter', 'FY']
-            for section in sections:
-                if any(kw in section.lower() for kw in outlook_keywords):
-                    snippet = section[:150].strip()
-                    if snippet:
-                        tldr['outlook'].append(snippet)
-
             tldr['outlook'] = tldr['outlook'][:3]  # Top 3
 
             # Extract numeric guidance (if present)
             # Look for patterns like "Q4 revenue $X-Y million" or "FY EPS $Z"
-            guidance_pattern = r'(Q\d|FY\d{2,4}|full[- ]year)\s+(revenue|EPS|earnings|EBITDA)[^\d]*([\d.,]+[BMK%]?)'
-            matches = re.findall(guidance_pattern, content, re.IGNORECASE)
+            matches = GUIDANCE_PATTERN.findall(content)
 
             for match in matches[:3]:
                 tldr['guidance_points'].append({
@@ -1112,6 +1229,7 @@ class QualitativeAnalyzer:
 
         return tldr
 
+    @traced('qualitative.backlog', attributes=('symbol',))
     def _extract_backlog_data(self, symbol: str, industry: str = '') -> Dict:
         """
         Extract backlog/order book data from latest earnings call transcript.
@@ -1140,15 +1258,7 @@ class QualitativeAnalyzer:
         }
 
         # Only relevant for order-driven companies
-        order_driven_keywords = [
-            'aerospace', 'defense', 'aircraft', 'aviation',
-            'heavy equipment', 'machinery', 'capital goods',
-            'shipbuilding', 'industrial equipment', 'construction equipment',
-            'engineering', 'turbine', 'locomotive', 'mining equipment'
-        ]
-
-        industry_lower = industry.lower()
-        is_order_driven = any(keyword in industry_lower for keyword in order_driven_keywords)
+        is_order_driven = ORDER_DRIVEN_INDUSTRIES.matches(industry, 'order_driven')
 
         if not is_order_driven:
             # Not an order-driven business - skip backlog analysis
@@ -1169,26 +1279,18 @@ class QualitativeAnalyzer:
 
             content_lower = content.lower()
 
-            # Check if backlog is mentioned
-            backlog_keywords = ['backlog', 'order book', 'orders', 'book-to-bill', 'book to bill', 'bookings']
-            backlog_mentioned = any(keyword in content_lower for keyword in backlog_keywords)
+            # Check if backlog is mentioned (and its tone, for later) in one pass
+            backlog_terms = BACKLOG_TERMS.hits(content_lower)
 
-            if not backlog_mentioned:
+            if 'backlog' not in backlog_terms:
                 return result
 
             result['backlog_mentioned'] = True
 
             # Extract backlog value (dollar amounts)
             # Pattern: "backlog of $X.XB" or "order book of $X.X billion"
-            backlog_value_patterns = [
-                r'backlog\s+(?:of|is|was|totaled|reached|stood at)\s+[\$€£]?([\d,.]+)\s*(billion|million|B|M|bn|mn)',
-                r'order\s+book\s+(?:of|is|was|totaled|reached|stood at)\s+[\$€£]?([\d,.]+)\s*(billion|million|B|M|bn|mn)',
-                r'total\s+backlog\s+[\$€£]?([\d,.]+)\s*(billion|million|B|M|bn|mn)',
-                r'[\$€£]([\d,.]+)\s*(billion|million|B|M|bn|mn)\s+(?:in|of)\s+backlog'
-            ]
-
-            for pattern in backlog_value_patterns:
-                match = re.search(pattern, content_lower)
+            for pattern in BACKLOG_VALUE_PATTERNS:
+                match = pattern.search(content_lower)
                 if match:
                     value = match.group(1)
                     unit = match.group(2)
@@ -1201,16 +1303,8 @@ class QualitativeAnalyzer:
                     break
 
             # Extract backlog change (YoY or QoQ)
-            change_patterns = [
-                r'backlog\s+(?:increased|grew|rose|up|higher)\s+(?:by\s+)?([\d.]+)%',
-                r'backlog\s+(?:decreased|declined|fell|down|lower)\s+(?:by\s+)?([\d.]+)%',
-                r'([\d.]+)%\s+(?:increase|growth|rise)\s+in\s+backlog',
-                r'([\d.]+)%\s+(?:decrease|decline|drop)\s+in\s+backlog',
-                r'backlog\s+of\s+[\$€£][\d,.]+[BMbm],?\s+(?:up|down)\s+([\d.]+)%'
-            ]
-
-            for pattern in change_patterns:
-                match = re.search(pattern, content_lower)
+            for pattern in BACKLOG_CHANGE_PATTERNS:
+                match = pattern.search(content_lower)
                 if match:
                     change_pct = match.group(1)
                     # Check if positive or negative from context
@@ -1226,14 +1320,8 @@ class QualitativeAnalyzer:
                     break
 
             # Extract book-to-bill ratio
-            btb_patterns = [
-                r'book[- ]to[- ]bill\s+(?:ratio\s+)?(?:of\s+)?(\d+\.?\d*)\b',
-                r'book[- ]to[- ]bill\s+(?:was|is)\s+(\d+\.?\d*)\b',
-                r'btb\s+(?:ratio\s+)?(?:of\s+)?(\d+\.?\d*)\b'
-            ]
-
-            for pattern in btb_patterns:
-                match = re.search(pattern, content_lower)
+            for pattern in BOOK_TO_BILL_PATTERNS:
+                match = pattern.search(content_lower)
                 if match:
                     btb_value = match.group(1)
                     result['book_to_bill'] = f"{btb_value}x"
@@ -1251,14 +1339,8 @@ class QualitativeAnalyzer:
                     break
 
             # Extract backlog duration
-            duration_patterns = [
-                r'backlog\s+(?:represents|equals|covers)\s+(?:approximately\s+)?([\d.]+)\s+(months|quarters|years)',
-                r'([\d.]+)[- ](month|quarter|year)\s+backlog',
-                r'backlog\s+of\s+(?:approximately\s+)?([\d.]+)\s+(months|quarters|years)'
-            ]
-
-            for pattern in duration_patterns:
-                match = re.search(pattern, content_lower)
+            for pattern in BACKLOG_DURATION_PATTERNS:
+                match = pattern.search(content_lower)
                 if match:
                     duration_num = match.group(1)
                     duration_unit = match.group(2)
@@ -1268,8 +1350,7 @@ class QualitativeAnalyzer:
             # Extract relevant snippets (sentences mentioning backlog)
             sentences = re.split(r'[.!?]\s+', content)
             for sentence in sentences:
-                sentence_lower = sentence.lower()
-                if any(keyword in sentence_lower for keyword in backlog_keywords):
+                if BACKLOG_TERMS.matches(sentence, 'backlog'):
                     # Clean up and limit length
                     snippet = sentence.strip()[:200]
                     if snippet and len(snippet) > 30:  # Meaningful snippet
@@ -1281,14 +1362,9 @@ class QualitativeAnalyzer:
             # If no explicit change detected but backlog mentioned, check overall sentiment
             if result['order_trend'] == 'Unknown' and result['backlog_mentioned']:
                 # Look for qualitative indicators
-                positive_indicators = ['strong backlog', 'robust backlog', 'record backlog', 'growing backlog',
-                                     'healthy backlog', 'solid backlog', 'improving backlog']
-                negative_indicators = ['weak backlog', 'declining backlog', 'softening backlog', 'lower backlog',
-                                     'reduced backlog', 'challenging backlog']
-
-                if any(indicator in content_lower for indicator in positive_indicators):
+                if 'positive' in backlog_terms:
                     result['order_trend'] = 'Positive'
-                elif any(indicator in content_lower for indicator in negative_indicators):
+                elif 'negative' in backlog_terms:
                     result['order_trend'] = 'Declining'
                 else:
                     result['order_trend'] = 'Stable'
@@ -1302,6 +1378,7 @@ class QualitativeAnalyzer:
 
         return result
 
+    @traced('qualitative.contextual_warnings', attributes=('symbol',))
     def _assess_contextual_warnings(
         self,
         symbol: str,
@@ -1715,6 +1792,7 @@ class QualitativeAnalyzer:
     # 7. Recent M&A
     # ===================================
 
+    @traced('qualitative.mna', attributes=('symbol',))
     def _get_recent_mna(self, symbol: str) -> List[Dict]:
         """
         Get recent M&A deals (if available).
@@ -1735,6 +1813,7 @@ class QualitativeAnalyzer:
     # 8. Top Risks (Synthesis)
     # ===================================
 
+    @traced('qualitative.risks', attributes=('symbol',))
     def _synthesize_risks(
         self,
         symbol: str,
@@ -2076,6 +2155,7 @@ class QualitativeAnalyzer:
             logger.warning(f"Failed to detect company type for {symbol}: {e}")
             return 'non_financial'
 
+    @traced('qualitative.intrinsic_value', attributes=('symbol',))
     def _estimate_intrinsic_value(
         self,
         symbol: str,
@@ -5239,22 +5319,35 @@ class QualitativeAnalyzer:
             return {}
 
     def _get_peer_multiples(self, peers_list: List[str]) -> List[Dict]:
-        """Get valuation multiples for a list of peers."""
+        """
+        Get valuation multiples for a list of peers.
+
+        Profiles (price, market cap) are fetched for all peers in one bulk
+        call; statement inputs come from the shared peer metrics cache, so
+        a peer common to many tickers is read once.
+        """
         peer_multiples = []
 
         try:
+            profiles = {}
+            try:
+                for prof in self.fmp.get_profile_bulk(peers_list) or []:
+                    profiles.setdefault(prof.get('symbol'), [prof])
+            except Exception as e:
+                logger.debug(f"Bulk peer profiles failed, fetching one by one: {e}")
+
             for peer in peers_list:
                 try:
-                    profile = self.fmp.get_profile(peer)
-                    income = self.fmp.get_income_statement(peer, period='annual', limit=2)
-                    balance = self.fmp.get_balance_sheet(peer, period='annual', limit=1)
+                    profile = profiles.get(peer) or self.fmp.get_profile(peer)
+                    inputs = self.peer_metrics.multiples_inputs(self.fmp, peer) if profile else None
 
-                    if not (profile and income and balance):
+                    if not (profile and inputs):
                         continue
 
+                    income = inputs['income']
                     prof = profile[0]
                     inc = income[0]
-                    bal = balance[0]
+                    bal = inputs['balance'][0]
 
                     price = prof.get('price', 0)
                     market_cap = prof.get('mktCap', 0)
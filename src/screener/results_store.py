@@ -0,0 +1,161 @@
+"""
+Columnar store for pipeline results (Arrow IPC), alongside the CSV export.
+
+The CSV drops the nested guardrail details (working_capital,
+cash_conversion, benfords_law, ...) and every reader re-parses it with type
+inference. Here the full scored frame is written as an uncompressed Arrow
+IPC file, so it can be memory-mapped and read back without parsing:
+- dtypes are preserved (floats, bools, strings, nulls; all-null columns
+  load as float NaN, like the CSV)
+- dict columns are stored as structs and come back as dicts
+- object columns Arrow can't type (e.g. mixed str/float) are stored as JSON
+  strings and decoded on load
+
+Files are partitioned by run date:
+
+    data/results/run_date=2024-01-15/results-20240115-093012-1a2b3c.arrow
+
+Enabled by `output.columnar` (off by default). Requires pyarrow (optional);
+without it only the CSV is written.
+
+Usage:
+    path = write_results(df_final, './data/results', run_id=run_id)
+    df = load_results('./data/results')                       # latest run
+    df = load_results(path, columns=['ticker', 'composite_0_100'])
+"""
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+try:
+    from .checkpoint import atomic_write
+except ImportError:
+    # Fallback for direct execution
+    from checkpoint import atomic_write
+
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except ImportError:
+    pa = None
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+
+# Field metadata marking columns stored as JSON text
+JSON_ENCODING = {b'encoding': b'json'}
+
+
+def _json_default(value):
+    """numpy scalars -> Python scalars."""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def _object_column(name: str, series: pd.Series):
+    """Arrow array + field for an object column (struct/list/string, else JSON)."""
+    values = [None if _is_missing(v) else v for v in series.tolist()]
+    try:
+        array = pa.array(values, from_pandas=True)
+        return array, pa.field(name, array.type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        encoded = [None if v is None else json.dumps(v, default=_json_default) for v in values]
+        return pa.array(encoded, type=pa.string()), pa.field(name, pa.string(), metadata=JSON_ENCODING)
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def to_table(df: pd.DataFrame) -> 'pa.Table':
+    """DataFrame -> Arrow table, keeping dict columns as structs."""
+    arrays, fields = [], []
+    for name in df.columns:
+        series = df[name]
+        if series.dtype == object:
+            array, field = _object_column(str(name), series)
+        else:
+            array = pa.array(series, from_pandas=True)
+            if isinstance(array, pa.ChunkedArray):
+                # Arrow-backed pandas columns: one contiguous buffer -> one record batch
+                array = array.combine_chunks()
+            field = pa.field(str(name), array.type)
+        arrays.append(array)
+        fields.append(field)
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def write_results(
+    df: pd.DataFrame,
+    base_dir: str,
+    run_id: Optional[str] = None,
+    run_at: Optional[datetime] = None
+) -> Optional[Path]:
+    """
+    Write one run's results under base_dir/run_date=YYYY-MM-DD/.
+
+    Returns:
+        Path of the .arrow file, or None if pyarrow is not installed
+    """
+    if not HAS_PYARROW:
+        logger.warning("pyarrow not installed - skipping columnar results export (CSV only)")
+        return None
+
+    run_at = run_at or datetime.now()
+    partition = Path(base_dir) / f"run_date={run_at.strftime('%Y-%m-%d')}"
+    partition.mkdir(parents=True, exist_ok=True)
+    path = partition / f"results-{run_id or run_at.strftime('%Y%m%d-%H%M%S')}.arrow"
+
+    table = to_table(df.reset_index(drop=True))
+
+    def write(tmp):
+        with pa.OSFile(str(tmp), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    atomic_write(path, write)
+    logger.info(f"Columnar results exported to {path} ({len(df)} rows)")
+    return path
+
+
+def list_results(base_dir: str) -> List[Path]:
+    """All result files under base_dir, oldest first."""
+    return sorted(Path(base_dir).glob('run_date=*/results-*.arrow'), key=lambda p: (p.parent.name, p.name))
+
+
+def load_results(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Memory-map a result file and return it as a DataFrame.
+
+    Args:
+        path: A .arrow file, or a results directory (latest run is loaded)
+        columns: Only these columns (others are never materialized)
+    """
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow is required to load columnar results")
+
+    path = Path(path)
+    if path.is_dir():
+        runs = list_results(path)
+        if not runs:
+            raise FileNotFoundError(f"No results in {path}")
+        path = runs[-1]
+
+    with pa.memory_map(str(path), 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select([c for c in columns if c in table.column_names])
+        df = table.to_pandas()
+
+    for field in table.schema:
+        if pa.types.is_null(field.type):
+            # All-missing column: float NaN, as the CSV reader returns it
+            df[field.name] = df[field.name].astype(float)
+        elif field.metadata == JSON_ENCODING:
+            df[field.name] = df[field.name].map(lambda v: json.loads(v) if isinstance(v, str) else None)
+    return df
@@ -0,0 +1,135 @@
+"""
+Dependency-aware concurrent execution of independent tasks.
+
+Used by QualitativeAnalyzer.analyze_symbol: its sections (news, press
+releases, transcript, insiders, peers, backlog, intrinsic value, ...) are
+mostly independent API-bound calls. Each task declares the tasks whose
+results it reads; a task starts as soon as all of them have finished, so
+independent sections overlap while chains like peers -> moats -> intrinsic
+value keep their order.
+
+Every task has a timeout (measured from when it starts). A task that
+fails or overruns its timeout yields its `default` instead, and dependents
+still run with that default; an overrunning thread is abandoned, not
+waited for, so one slow endpoint can't stall the report.
+
+Usage:
+    tasks = [
+        Task('peers', lambda r: get_peers(symbol), default=[]),
+        Task('moats', lambda r: assess_moats(r['peers']), deps=('peers',), default={}),
+    ]
+    results, failures = run_tasks(tasks, timeout=20)
+"""
+import contextvars
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Task:
+    """One unit of work: fn(results of deps) -> result."""
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[Dict[str, Any]], Any],
+        deps: Sequence[str] = (),
+        default: Any = None,
+        timeout: Optional[float] = None
+    ):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.default = default
+        self.timeout = timeout
+
+
+def _check_graph(tasks: List[Task]):
+    """Raise ValueError for duplicate names, unknown dependencies or cycles."""
+    names = [task.name for task in tasks]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate task names: {names}")
+    by_name = {task.name: task for task in tasks}
+    for task in tasks:
+        unknown = [dep for dep in task.deps if dep not in by_name]
+        if unknown:
+            raise ValueError(f"Task '{task.name}' depends on unknown task(s) {unknown}")
+
+    done = set()
+    remaining = list(tasks)
+    while remaining:
+        ready = [task for task in remaining if all(dep in done for dep in task.deps)]
+        if not ready:
+            raise ValueError(f"Dependency cycle among {[task.name for task in remaining]}")
+        done.update(task.name for task in ready)
+        remaining = [task for task in remaining if task.name not in done]
+
+
+def run_tasks(
+    tasks: List[Task],
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Run tasks concurrently in dependency order.
+
+    Args:
+        tasks: Tasks to run (dependencies must be in the list, no cycles)
+        max_workers: Thread count (default: one per task, so every ready
+            task starts immediately and its timeout is its own run time)
+        timeout: Default per-task timeout in seconds (None: no limit)
+
+    Returns:
+        (results by task name, {task name: failure reason} for tasks that
+        raised or timed out and got their default)
+    """
+    _check_graph(tasks)
+    results: Dict[str, Any] = {}
+    failures: Dict[str, str] = {}
+    pending = list(tasks)
+    running = {}  # future -> (task, deadline)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or max(1, len(tasks)),
+                                  thread_name_prefix='task-graph')
+    try:
+        while pending or running:
+            # Start every task whose dependencies have finished
+            for task in [t for t in pending if all(dep in results for dep in t.deps)]:
+                pending.remove(task)
+                inputs = {dep: results[dep] for dep in task.deps}
+                # Copy the caller's context so tracing spans nest under it
+                context = contextvars.copy_context()
+                future = executor.submit(context.run, task.fn, inputs)
+                task_timeout = task.timeout if task.timeout is not None else timeout
+                deadline = time.monotonic() + task_timeout if task_timeout is not None else None
+                running[future] = (task, deadline)
+
+            deadlines = [deadline for _, deadline in running.values() if deadline is not None]
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            finished, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                task, _ = running.pop(future)
+                try:
+                    results[task.name] = future.result()
+                except Exception as e:
+                    logger.warning(f"Task '{task.name}' failed: {e}")
+                    failures[task.name] = f"{type(e).__name__}: {e}"
+                    results[task.name] = task.default
+
+            now = time.monotonic()
+            for future, (task, deadline) in list(running.items()):
+                if deadline is not None and now >= deadline and not future.done():
+                    task_timeout = task.timeout if task.timeout is not None else timeout
+                    logger.warning(f"Task '{task.name}' timed out after {task_timeout}s")
+                    failures[task.name] = 'timeout'
+                    results[task.name] = task.default
+                    del running[future]
+    finally:
+        # Don't wait for abandoned (timed-out) threads
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results, failures
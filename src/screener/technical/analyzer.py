@@ -25,6 +25,12 @@ from datetime import datetime, timedelta
 import logging
 import statistics
 
+try:
+    from ..tracing import traced
+except ImportError:
+    # Fallback for direct execution
+    from tracing import traced
+
 logger = logging.getLogger(__name__)
 
 
@@ -90,6 +96,7 @@ class EnhancedTechnicalAnalyzer:
     # MAIN ANALYSIS METHOD
     # ============================================================================
 
+    @traced('technical.analyze', attributes=('symbol',))
     def analyze(self, symbol: str, sector: str = None, country: str = 'USA',
                 fundamental_score: float = None, guardrails_status: str = None,
                 fundamental_decision: str = None) -> Dict:
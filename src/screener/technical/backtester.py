@@ -44,6 +44,11 @@ class WalkForwardBacktester:
         self.prices['date'] = pd.to_datetime(self.prices['date'])
         self.prices = self.prices.sort_values('date').reset_index(drop=True)
 
+    @classmethod
+    def from_price_store(cls, price_store, symbol: str, from_date: Optional[str] = None, to_date: Optional[str] = None):
+        """Build a backtester from bars held in a PriceStore (no API calls)."""
+        return cls(price_store.get_frame(symbol, from_date, to_date))
+
     def run_walk_forward_fixed(
         self,
         fixed_params: Dict,
@@ -74,6 +74,11 @@ class MultiStrategyTester:
             }
         }
 
+    @classmethod
+    def from_price_store(cls, price_store, symbol: str, from_date: Optional[str] = None, to_date: Optional[str] = None):
+        """Build a tester from bars held in a PriceStore (no API calls)."""
+        return cls(price_store.get_frame(symbol, from_date, to_date))
+
     def _calculate_indicators(self, data: pd.DataFrame, strategy_name: str, spy_data: pd.DataFrame = None) -> pd.DataFrame:
         """
         Calculate academic momentum indicators.
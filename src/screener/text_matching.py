@@ -0,0 +1,76 @@
+"""
+Precompiled keyword matching for the qualitative text heuristics.
+
+Moat, news, transcript and backlog classification all ask the same
+question: which keyword categories occur (as substrings, case-insensitive)
+in this text? Written as `any(kw in text.lower() for kw in [...])` per
+category, each call rebuilds its keyword list, and a transcript paragraph
+is lowercased once per category that looks at it.
+
+KeywordMatcher is built once, at import, from named categories and answers
+for all of them in one call:
+
+- The text is lowercased once per call.
+- Each category keeps only its minimal keywords: one that contains another
+  keyword of the same category ('cloud platform' next to 'platform') can
+  never decide the result, so it is dropped.
+- A keyword shared between categories ('platform') is searched once.
+- `categories=` restricts the call to the categories the caller still
+  needs; a category stops at its first hit.
+
+Searching happens with `str.__contains__` rather than one combined regex:
+CPython's substring search is several times faster than an alternation
+regex over the same keywords on 100KB transcripts.
+
+Usage:
+    NEWS_TAGS = KeywordMatcher({
+        'mna': ['acquisition', 'merger', 'm&a'],
+        'litigation': ['lawsuit', 'litigation', 'sue'],
+    })
+    NEWS_TAGS.hits("Company settles lawsuit")   # -> {'litigation'}
+"""
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+class KeywordMatcher:
+    """Case-insensitive substring matcher over named keyword categories."""
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        self.categories: Dict[str, Tuple[str, ...]] = {
+            name: _minimal_keywords(kw.lower() for kw in keywords)
+            for name, keywords in categories.items()
+        }
+
+    def hits(self, text: str, categories: Optional[Iterable[str]] = None) -> Set[str]:
+        """
+        Names of the categories with at least one keyword in `text`.
+
+        Args:
+            text: Text to search (any case)
+            categories: Only test these categories (default: all)
+        """
+        found: Set[str] = set()
+        if not text:
+            return found
+
+        text = text.lower()
+        searched: Dict[str, bool] = {}
+        for name in (self.categories if categories is None else categories):
+            for kw in self.categories[name]:
+                hit = searched.get(kw)
+                if hit is None:
+                    hit = searched[kw] = kw in text
+                if hit:
+                    found.add(name)
+                    break
+        return found
+
+    def matches(self, text: str, category: str) -> bool:
+        """True if any keyword of `category` occurs in `text`."""
+        return bool(self.hits(text, (category,)))
+
+
+def _minimal_keywords(keywords: Iterable[str]) -> Tuple[str, ...]:
+    """Drop keywords that contain another keyword (first-seen order kept)."""
+    unique = list(dict.fromkeys(keywords))
+    return tuple(kw for kw in unique if not any(other != kw and other in kw for other in unique))
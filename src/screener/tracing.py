@@ -0,0 +1,341 @@
+"""
+Lightweight tracing: nested, timed spans across the pipeline.
+
+Spans are exported in the OpenTelemetry OTLP/JSON shape (traceId, spanId,
+parentSpanId, start/end in unix nanos, attributes, status), so they can be
+written to a local JSON-lines file or POSTed to an OTLP/HTTP collector
+(e.g. http://localhost:4318/v1/traces) without the OpenTelemetry SDK.
+
+Instrumented:
+- ScreenerPipeline stages               pipeline.<stage>
+- FMPClient._request                    fmp.request (endpoint)
+- FeatureCalculator.calculate_features  features.calculate (symbol)
+- GuardrailCalculator.calculate_guardrails
+- QualitativeAnalyzer.analyze_symbol and its sections
+- EnhancedTechnicalAnalyzer.analyze
+
+Disabled by default. While disabled `span()` returns a shared no-op context
+manager and `@traced` functions call straight through: no span objects,
+IDs or clock reads.
+
+Config (settings.yaml):
+    tracing:
+      enabled: true
+      exporter: file             # or 'otlp'
+      file_path: ./logs/traces.jsonl
+      otlp_endpoint: http://localhost:4318/v1/traces
+
+Usage:
+    configure_tracing(config)
+    with span('pipeline.universe', markets=12):
+        ...
+
+    @traced('features.calculate', attributes=('symbol',))
+    def calculate_features(self, symbol, company_type): ...
+"""
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+SERVICE_NAME = 'ultraquality-screener'
+
+# Innermost open span of the current thread / task
+_current_span: contextvars.ContextVar = contextvars.ContextVar('screener_current_span', default=None)
+
+# Process-wide tracer; None means tracing is disabled
+_tracer: Optional['Tracer'] = None
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """Python value -> OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+class Span:
+    """One timed operation."""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'start_ns', 'end_ns',
+                 'attributes', 'error', '_token')
+
+    def __init__(self, name: str, parent: Optional['Span'], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.error = None
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def duration_seconds(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP/JSON span."""
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,  # SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [
+                {'key': key, 'value': _otlp_value(value)}
+                for key, value in self.attributes.items() if value is not None
+            ],
+            'status': {'code': 2, 'message': self.error} if self.error else {'code': 1}
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        return span
+
+
+class _NoopSpan:
+    """Shared stand-in while tracing is disabled."""
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _SpanContext:
+    """Context manager that opens a span on a tracer."""
+
+    __slots__ = ('tracer', 'name', 'attributes', 'span')
+
+    def __init__(self, tracer: 'Tracer', name: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.span = None
+
+    def __enter__(self) -> Span:
+        self.span = Span(self.name, _current_span.get(), self.attributes)
+        self.span._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self.span
+        span.end_ns = time.time_ns()
+        if exc is not None:
+            span.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(span._token)
+        self.tracer._finish(span)
+        return False
+
+
+# ========================
+# Exporters
+# ========================
+
+class InMemorySpanExporter:
+    """Keeps exported spans in a list (tests, notebooks)."""
+
+    def __init__(self):
+        self.spans: List[Dict[str, Any]] = []
+
+    def export(self, spans: List[Span]):
+        self.spans.extend(span.to_otlp() for span in spans)
+
+    def shutdown(self):
+        pass
+
+
+class FileSpanExporter:
+    """Appends one OTLP/JSON span per line to a local file."""
+
+    def __init__(self, path: str, service_name: str = SERVICE_NAME):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.service_name = service_name
+
+    def export(self, spans: List[Span]):
+        with open(self.path, 'a') as f:
+            for span in spans:
+                record = span.to_otlp()
+                record['service'] = self.service_name
+                f.write(json.dumps(record) + '\n')
+
+    def shutdown(self):
+        pass
+
+
+class OTLPHttpExporter:
+    """POSTs batches to an OTLP/HTTP (JSON) collector; failures are logged and dropped."""
+
+    def __init__(self, endpoint: str, service_name: str = SERVICE_NAME, timeout: float = 5.0):
+        import requests
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def payload(self, spans: List[Span]) -> Dict[str, Any]:
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [
+                    {'key': 'service.name', 'value': {'stringValue': self.service_name}}
+                ]},
+                'scopeSpans': [{
+                    'scope': {'name': 'screener.tracing'},
+                    'spans': [span.to_otlp() for span in spans]
+                }]
+            }]
+        }
+
+    def export(self, spans: List[Span]):
+        try:
+            response = self.session.post(self.endpoint, json=self.payload(spans), timeout=self.timeout)
+            response.raise_for_status()
+        except Exception as e:
+            logger.warning(f"Trace export to {self.endpoint} failed ({len(spans)} spans dropped): {e}")
+
+    def shutdown(self):
+        self.session.close()
+
+
+# ========================
+# Tracer
+# ========================
+
+class Tracer:
+    """Creates spans and hands finished ones to the exporter in batches."""
+
+    def __init__(self, exporter, batch_size: int = 256):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending: List[Span] = []
+
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> _SpanContext:
+        return _SpanContext(self, name, dict(attributes or {}))
+
+    def _finish(self, span: Span):
+        with self._lock:
+            self._pending.append(span)
+            if len(self._pending) < self.batch_size:
+                return
+            batch, self._pending = self._pending, []
+        self.exporter.export(batch)
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self.exporter.export(batch)
+
+    def shutdown(self):
+        self.flush()
+        self.exporter.shutdown()
+
+
+# ========================
+# Module API
+# ========================
+
+def configure_tracing(config: Dict) -> Optional[Tracer]:
+    """Install the process-wide tracer from config['tracing'] (or disable it)."""
+    tracing_config = config.get('tracing', {}) or {}
+    if not tracing_config.get('enabled', False):
+        set_tracer(None)
+        return None
+
+    service_name = tracing_config.get('service_name', SERVICE_NAME)
+    if tracing_config.get('exporter', 'file') == 'otlp':
+        exporter = OTLPHttpExporter(
+            tracing_config.get('otlp_endpoint', 'http://localhost:4318/v1/traces'), service_name
+        )
+    else:
+        exporter = FileSpanExporter(tracing_config.get('file_path', './logs/traces.jsonl'), service_name)
+
+    tracer = Tracer(exporter, batch_size=tracing_config.get('batch_size', 256))
+    set_tracer(tracer)
+    logger.info(f"Tracing enabled ({type(exporter).__name__})")
+    return tracer
+
+
+def set_tracer(tracer: Optional[Tracer]):
+    """Replace the process-wide tracer; the previous one is flushed."""
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    if previous is not None and previous is not tracer:
+        previous.shutdown()
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def flush_traces():
+    """Export pending spans (end of a run)."""
+    if _tracer is not None:
+        _tracer.flush()
+
+
+def span(name: str, **attributes):
+    """Context manager for a span (no-op while tracing is disabled)."""
+    tracer = _tracer
+    if tracer is None:
+        return NOOP_SPAN
+    return tracer.span(name, attributes)
+
+
+def traced(name: Optional[str] = None, attributes: Sequence[str] = ()) -> Callable:
+    """
+    Decorator: run the function inside a span.
+
+    Args:
+        name: Span name (default: the function's qualified name)
+        attributes: Argument names recorded as span attributes (e.g. 'symbol')
+    """
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+        parameters = list(inspect.signature(fn).parameters)
+        positions = [(attr, parameters.index(attr)) for attr in attributes]
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return fn(*args, **kwargs)
+            span_attributes = {}
+            for attr, position in positions:
+                if attr in kwargs:
+                    span_attributes[attr] = kwargs[attr]
+                elif position < len(args):
+                    span_attributes[attr] = args[position]
+            with tracer.span(span_name, span_attributes):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
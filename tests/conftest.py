@@ -0,0 +1,128 @@
+"""
+Shared fixtures: a local stub of the FMP HTTP API.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+
+class StubFMPServer:
+    """
+    Minimal FMP stand-in.
+
+    Routes are matched on the path after /api/v3 (e.g. 'profile/AAPL').
+    Unknown routes return []. Tracks request count, distinct TCP
+    connections and peak concurrency so tests can assert on I/O behaviour.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.routes = {}
+        self.queued = {}
+        self.delay = delay
+        self.requests = []
+        self.connections = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/api/v3"
+
+    def route(self, path: str, payload=None, status: int = 200, headers=None):
+        """Register a response (payload may be a callable taking the query dict)."""
+        self.routes[path] = (status, payload, headers or {})
+
+    def queue(self, path: str, payload=None, status: int = 200, headers=None):
+        """Register a one-shot response served before the route's default."""
+        self.queued.setdefault(path, []).append((status, payload, headers or {}))
+
+    def count(self, path: str) -> int:
+        return sum(1 for p, _ in self.requests if p == path)
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                path = parsed.path
+                for prefix in ('/api/v3/', '/api/v4/'):
+                    if path.startswith(prefix):
+                        path = path[len(prefix):]
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+
+                with stub._lock:
+                    stub.requests.append((path, query))
+                    stub.connections.add(self.client_address)
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    if stub.delay:
+                        time.sleep(stub.delay)
+                    with stub._lock:
+                        pending = stub.queued.get(path)
+                        response = pending.pop(0) if pending else None
+                    if response is None:
+                        response = stub.routes.get(path, (200, [], {}))
+                    status, payload, headers = response
+                    if callable(payload):
+                        payload = payload(query)
+                    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    for key, value in headers.items():
+                        self.send_header(key, value)
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def fmp_stub():
+    """Running stub FMP server."""
+    server = StubFMPServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def stub_config(fmp_stub, tmp_path):
+    """FMPClient config pointing at the stub server with an isolated cache."""
+    return {
+        'fmp': {
+            'base_url': fmp_stub.base_url,
+            'rate_limit_rps': 1000,
+            'shared_rate_limiter': False,
+            'max_retries': 0,
+            'timeout_seconds': 5,
+            'pool_size': 4,
+        },
+        'cache': {'cache_dir': str(tmp_path / 'cache')},
+    }
@@ -0,0 +1,155 @@
+"""
+Tests for the asyncio FMP client against a local stub FMP server.
+"""
+import asyncio
+
+import pandas as pd
+import pytest
+
+from src.screener.async_client import AsyncFMPClient, HTTPStatusError
+from src.screener.ingest import FMPClient
+
+
+@pytest.fixture
+def client(stub_config):
+    fmp = FMPClient('test-key', stub_config)
+    yield fmp
+    fmp.close()
+
+
+def _gather(aclient, *coros):
+    async def run_all():
+        return await asyncio.gather(*coros, return_exceptions=True)
+    return aclient.run(run_all())
+
+
+class TestAsyncFMPClient:
+    """Same surface as FMPClient, native asyncio I/O, bounded concurrency, pooled connections."""
+
+    def test_same_results_as_sync_client(self, fmp_stub, client):
+        fmp_stub.route('profile/AAPL', [{'symbol': 'AAPL', 'sector': 'Technology'}])
+        fmp_stub.route('income-statement/AAPL', [{'date': f'2024-{m:02d}-01'} for m in range(12, 0, -1)])
+        aclient = AsyncFMPClient(client, max_concurrency=4)
+
+        assert aclient.run(aclient.get_profile('AAPL')) == [{'symbol': 'AAPL', 'sector': 'Technology'}]
+        # FMPClient's own method body: statement-store fetch of the full history, sliced
+        income = aclient.run(aclient.get_income_statement('AAPL', period='quarter', limit=2))
+        assert income == [{'date': '2024-12-01'}, {'date': '2024-11-01'}]
+        assert fmp_stub.requests[-1][1]['limit'] == '12'
+
+        # Same cache as the sync client
+        assert client.get_income_statement('AAPL', period='quarter', limit=4)[3] == {'date': '2024-09-01'}
+        assert client.get_metrics()['total_requests'] == 2
+
+    def test_concurrency_is_bounded_and_connections_reused(self, fmp_stub, client):
+        fmp_stub.delay = 0.02
+        aclient = AsyncFMPClient(client, max_concurrency=4)
+
+        results = _gather(aclient, *(aclient.get_profile(f"SYM{i}") for i in range(24)))
+
+        assert results == [[]] * 24
+        assert fmp_stub.max_in_flight <= 4
+        # Keep-alive: 24 requests over at most max_concurrency connections
+        assert len(fmp_stub.connections) <= 4
+        assert aclient.get_stats()['connections_opened'] <= 4
+
+    def test_identical_requests_are_coalesced(self, fmp_stub, client):
+        fmp_stub.delay = 0.05
+        fmp_stub.route('profile/AAPL', [{'symbol': 'AAPL'}])
+        aclient = AsyncFMPClient(client, max_concurrency=4)
+
+        results = _gather(aclient, *(aclient.get_profile('AAPL') for _ in range(5)))
+
+        assert results == [[{'symbol': 'AAPL'}]] * 5
+        assert results[0] is not results[1]
+        assert fmp_stub.count('profile/AAPL') == 1
+
+    def test_http_errors_raise_and_429_slows_the_limiter(self, fmp_stub, client):
+        fmp_stub.route('profile/BAD', {'oops': True}, status=500)
+        fmp_stub.route('profile/BUSY', [], status=429, headers={'Retry-After': '0'})
+        aclient = AsyncFMPClient(client, max_concurrency=2)
+
+        bad, busy = _gather(aclient, aclient.get_profile('BAD'), aclient.get_profile('BUSY'))
+
+        assert isinstance(bad, HTTPStatusError) and bad.status == 500
+        assert isinstance(busy, HTTPStatusError) and busy.status == 429
+        assert client.rate_limiter.get_metrics()['rate_limited_responses'] == 1
+        assert len(client.errors) == 2
+
+    def test_collect_payloads_skips_failed_calls(self, fmp_stub, client):
+        fmp_stub.route('profile/MSFT', [{'symbol': 'MSFT'}])
+        fmp_stub.route('ratios-ttm/MSFT', {'oops': True}, status=500)
+        aclient = AsyncFMPClient(client, max_concurrency=4)
+
+        payloads = aclient.run(aclient.collect_payloads('MSFT', 'non_financial', include_guardrails=False))
+
+        assert payloads['get_profile'] == [{'symbol': 'MSFT'}]
+        assert 'get_ratios_ttm' not in payloads
+        assert 'get_income_statement:quarter' in payloads
+
+
+class TestPipelineAsyncIO:
+
+    def _pipeline(self, tmp_path, stub_config, async_io):
+        from src.screener.feature_store import FeatureStore
+        from src.screener.features import FeatureCalculator
+        from src.screener.guardrails import GuardrailCalculator
+        from src.screener.metrics import RunMetrics
+        from src.screener.orchestrator import ScreenerPipeline
+
+        pipeline = object.__new__(ScreenerPipeline)
+        pipeline.config = dict(stub_config, pipeline={'max_workers': 4}, guardrails={})
+        pipeline.config['cache'] = {'cache_dir': str(tmp_path / ('async' if async_io else 'threads'))}
+        pipeline.fmp = FMPClient('test-key', pipeline.config)
+        pipeline.async_fmp = AsyncFMPClient(pipeline.fmp, 4) if async_io else None
+        pipeline.checkpoint = None
+        pipeline.run_metrics = RunMetrics()
+        pipeline.features = FeatureCalculator(pipeline.fmp)
+        pipeline.guardrails = GuardrailCalculator(pipeline.fmp, pipeline.config)
+        pipeline.feature_store = FeatureStore(tmp_path / f'features-{async_io}.sqlite')
+        pipeline.incremental_max_age_hours = 24
+        pipeline.incremental_ttl_hours = 24
+        pipeline.df_topk = pd.DataFrame({
+            'ticker': ['AAA', 'BBB'],
+            'is_financial': [False, False],
+            'is_REIT': [False, False],
+            'is_utility': [False, False],
+            'industry': ['Software', 'Hardware'],
+        })
+        return pipeline
+
+    def test_pipelined_stage_driven_by_async_client(self, fmp_stub, stub_config, tmp_path):
+        for symbol, scale in (('AAA', 1.0), ('BBB', 2.0)):
+            fmp_stub.route(f'profile/{symbol}', [{'symbol': symbol, 'mktCap': 5e9 * scale, 'price': 50.0}])
+            fmp_stub.route(f'income-statement/{symbol}', [
+                {'date': f'2024-{m:02d}-28', 'revenue': 1e9 * scale, 'grossProfit': 4e8 * scale,
+                 'operatingIncome': 2e8 * scale, 'netIncome': 1.5e8 * scale, 'ebitda': 2.5e8 * scale}
+                for m in range(12, 0, -1)
+            ])
+            fmp_stub.route(f'balance-sheet-statement/{symbol}', [
+                {'date': f'2024-{m:02d}-28', 'totalAssets': 8e9 * scale, 'totalStockholdersEquity': 4e9 * scale,
+                 'totalDebt': 1e9 * scale, 'cashAndCashEquivalents': 5e8 * scale}
+                for m in range(12, 0, -1)
+            ])
+            fmp_stub.route(f'cash-flow-statement/{symbol}', [
+                {'date': f'2024-{m:02d}-28', 'operatingCashFlow': 2e8 * scale, 'capitalExpenditure': -5e7 * scale,
+                 'dividendsPaid': -2e7 * scale, 'commonStockRepurchased': -1e7 * scale}
+                for m in range(12, 0, -1)
+            ])
+
+        threaded = self._pipeline(tmp_path, stub_config, async_io=False)
+        threaded._calculate_pipelined()
+        requests_threaded = len(fmp_stub.requests)
+
+        driven = self._pipeline(tmp_path, stub_config, async_io=True)
+        driven._calculate_pipelined()
+
+        expected = threaded.df_topk.sort_values('ticker').reset_index(drop=True)
+        actual = driven.df_topk.sort_values('ticker').reset_index(drop=True)
+        pd.testing.assert_frame_equal(actual[expected.columns], expected)
+        assert actual[['ev_ebit_ttm', 'roa_%', 'altmanZ', 'guardrail_status']].notna().all().all()
+        # Every per-ticker request went through the event loop's pooled connections
+        # (only the batched profile warm-up uses the sync session)
+        per_ticker = [path for path, _ in fmp_stub.requests[requests_threaded:] if ',' not in path]
+        assert driven.async_fmp.get_stats()['requests'] == len(per_ticker)
+        assert driven.async_fmp.get_stats()['connections_opened'] <= 4
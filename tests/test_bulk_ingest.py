@@ -0,0 +1,89 @@
+"""
+Offline tests for bulk ingestion using recorded bulk CSV fixtures.
+"""
+from datetime import date
+from pathlib import Path
+
+from src.screener.bulk_ingest import BulkIngestor, parse_row
+from src.screener.ingest import FMPClient
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'bulk'
+
+
+def _serve_fixture(name):
+    def serve(query):
+        path = FIXTURES / f"{name}_{query['year']}_{query['period']}.csv"
+        if path.exists():
+            return path.read_bytes()
+        return b'date,symbol\n'  # Year with no filings yet
+    return serve
+
+
+def _stub_bulk_endpoints(fmp_stub):
+    for name in ('income-statement-bulk', 'balance-sheet-statement-bulk'):
+        fmp_stub.route(name, _serve_fixture(name))
+    fmp_stub.route('cash-flow-statement-bulk', {'Error Message': 'plan'}, status=403)
+
+
+class TestBulkIngestor:
+
+    def test_parse_row_keeps_text_fields(self):
+        row = parse_row({'symbol': 'AAPL', 'cik': '0000320193', 'calendarYear': '2025',
+                         'revenue': '94036000000', 'eps': '1.57', 'totalDebt': ''})
+
+        assert row == {'symbol': 'AAPL', 'cik': '0000320193', 'calendarYear': '2025',
+                       'revenue': 94036000000, 'eps': 1.57, 'totalDebt': None}
+
+    def test_seeds_per_symbol_statement_cache(self, fmp_stub, stub_config):
+        _stub_bulk_endpoints(fmp_stub)
+        stub_config['fmp']['statement_history'] = {'quarter': 4}
+        client = FMPClient('test-key', stub_config)
+
+        stats = BulkIngestor(client, {'fmp': {'bulk_ingest': {'profiles': False}}}).ingest(
+            ['AAPL', 'MSFT'], as_of=date(2025, 9, 1)
+        )
+
+        # 3 statements x 2 years; cash flow is not available on this plan
+        assert stats['downloads'] == 6 and stats['failed_downloads'] == 2
+        assert stats['entries'] == 4  # income + balance for AAPL and MSFT
+        requests_before = len(fmp_stub.requests)
+
+        income = client.get_income_statement('AAPL', period='quarter', limit=4)
+        assert [r['date'] for r in income] == ['2025-06-28', '2025-03-29', '2024-12-28', '2024-09-28']
+        assert income[0]['revenue'] == 94036000000 and income[0]['cik'] == '0000320193'
+        assert client.get_balance_sheet('MSFT', period='quarter', limit=1)[0]['totalDebt'] is None
+        assert len(fmp_stub.requests) == requests_before
+
+        # Not seeded (download failed) -> per-symbol fallback
+        client.get_cash_flow('AAPL', period='quarter', limit=4)
+        assert fmp_stub.count('cash-flow-statement/AAPL') == 1
+
+    def test_partial_download_failure_is_not_seeded(self, fmp_stub, stub_config):
+        _stub_bulk_endpoints(fmp_stub)
+        # First (2024) income download fails; 2025 still succeeds
+        fmp_stub.queue('income-statement-bulk', {'Error Message': 'unavailable'}, status=403)
+        stub_config['fmp']['statement_history'] = {'quarter': 4}
+        client = FMPClient('test-key', stub_config)
+
+        stats = BulkIngestor(client, {'fmp': {'bulk_ingest': {'profiles': False}}}).ingest(
+            ['AAPL'], as_of=date(2025, 9, 1)
+        )
+
+        assert stats['failed_downloads'] == 3
+        assert stats['entries'] == 1  # Balance sheet only
+
+        # Truncated income history not cached -> full per-symbol request
+        client.get_income_statement('AAPL', period='quarter', limit=4)
+        assert fmp_stub.count('income-statement/AAPL') == 1
+        client.get_balance_sheet('AAPL', period='quarter', limit=4)
+        assert fmp_stub.count('balance-sheet-statement/AAPL') == 0
+
+    def test_profiles_split_into_symbol_entries(self, fmp_stub, stub_config):
+        fmp_stub.route('profile/AAPL,MSFT', [{'symbol': 'AAPL', 'sector': 'Technology'},
+                                             {'symbol': 'MSFT', 'sector': 'Technology'}])
+        client = FMPClient('test-key', stub_config)
+
+        BulkIngestor(client, {'fmp': {'bulk_ingest': {'statements': []}}}).ingest(['MSFT', 'AAPL'])
+
+        assert client.get_profile('MSFT') == [{'symbol': 'MSFT', 'sector': 'Technology'}]
+        assert fmp_stub.count('profile/MSFT') == 0
@@ -0,0 +1,164 @@
+"""
+Tests for the unified tiered cache and the CachedFMPClient wrapper.
+"""
+import threading
+import time
+from datetime import timedelta
+
+from src.screener.cache import TieredCache, CachedFMPClient
+from src.screener.cache_store import SQLiteCacheStore
+from src.screener.ingest import FMPClient
+
+
+class TestTieredCache:
+
+    def test_policy_ttl_overrides_bucket_default(self, tmp_path):
+        store = SQLiteCacheStore(tmp_path / 'cache.sqlite')
+        cache = TieredCache(store, ttl_policy={'stock_news': timedelta(seconds=30)})
+        store.set('news', [1], endpoint='stock_news', ttl_class='qualitative')
+        store.set('profile', [2], endpoint='profile', ttl_class='symbol')
+        # Age both entries by one minute
+        with store._connect() as conn:
+            conn.execute("UPDATE responses SET fetched_at = ?", (time.time() - 60,))
+
+        # Bucket default (1 day) would keep both; policy expires the news entry
+        assert cache.get('news', 'stock_news', timedelta(days=1)) is None
+        assert cache.get('profile', 'profile', timedelta(days=1)) == [2]
+
+        stats = cache.get_stats()
+        assert stats['by_endpoint'] == {
+            'stock_news': {'hits': 0, 'stale_hits': 0, 'misses': 1},
+            'profile': {'hits': 1, 'stale_hits': 0, 'misses': 0},
+        }
+
+    def test_from_config_reads_ttl_overrides(self, tmp_path):
+        cache = TieredCache.from_config({
+            'cache_dir': str(tmp_path),
+            'ttl_policy_hours': {'quote': 1},
+            'memory_max_mb': 0,
+        })
+
+        assert cache.ttl_for('quote') == timedelta(hours=1)
+        assert cache.ttl_for('earning_call_transcript') == timedelta(days=30)
+        assert cache.ttl_for('profile', timedelta(hours=48)) == timedelta(hours=48)
+        assert cache.memory is None
+
+
+class TestCachedFMPClient:
+
+    def test_shares_client_cache_without_double_writes(self, fmp_stub, stub_config):
+        fmp_stub.route('profile/AAPL', [{'symbol': 'AAPL'}])
+        client = FMPClient('test-key', stub_config)
+        cached = CachedFMPClient(client, cache_dir='.ignored')
+
+        assert cached.cache is client.cache
+        cached.get_profile('AAPL')
+        client.get_profile('AAPL')
+        cached.get_profile('AAPL')
+
+        assert fmp_stub.count('profile/AAPL') == 1
+        assert client.cache.store.get_stats()['entries'] == 1
+        stats = cached.get_cache_stats()
+        assert stats['hits'] == 2 and stats['misses'] == 1
+        assert stats['cache_files'] == 1
+
+    def test_quotes_cached_under_shared_policy(self, fmp_stub, stub_config):
+        fmp_stub.route('quote/AAPL', [{'symbol': 'AAPL', 'price': 10}])
+        client = FMPClient('test-key', stub_config)
+        cached = CachedFMPClient(client)
+
+        assert cached.get_quote('AAPL') == [{'symbol': 'AAPL', 'price': 10}]
+        assert cached.get_quote('AAPL') == [{'symbol': 'AAPL', 'price': 10}]
+
+        assert fmp_stub.count('quote/AAPL') == 1
+        assert cached.ttls['quote'] == timedelta(hours=6)
+        assert cached.clear_cache('quote') == 1
+        cached.get_quote('AAPL')
+        assert fmp_stub.count('quote/AAPL') == 2
+
+    def test_standalone_client_uses_own_store(self, tmp_path):
+        class Fake:
+            calls = 0
+
+            def get_stock_peers(self, symbol):
+                Fake.calls += 1
+                return [{'peersList': ['MSFT']}]
+
+        cached = CachedFMPClient(Fake(), cache_dir=str(tmp_path / 'wrapper'))
+        cached.get_stock_peers('AAPL')
+        cached.get_stock_peers('AAPL')
+
+        assert Fake.calls == 1
+        assert (tmp_path / 'wrapper' / 'fmp_cache.sqlite').exists()
+        assert cached.get_cache_stats()['hit_rate'] == 50.0
+
+
+def _age_all(store, seconds):
+    with store._connect() as conn:
+        conn.execute("UPDATE responses SET fetched_at = ?", (time.time() - seconds,))
+
+
+class TestStaleWhileRevalidate:
+
+    def test_expired_entry_served_within_grace_only(self, tmp_path):
+        store = SQLiteCacheStore(tmp_path / 'cache.sqlite')
+        cache = TieredCache(
+            store, stale_while_revalidate=True,
+            ttl_policy={'quote': timedelta(seconds=30)},
+            grace_policy={'quote': timedelta(seconds=60)}
+        )
+        store.set('q', [1], endpoint='quote', ttl_class='wrapper')
+
+        _age_all(store, 45)
+        assert cache.lookup('q', 'quote') == ([1], True)
+        assert cache.get('q', 'quote') is None  # plain get never serves stale
+
+        _age_all(store, 120)
+        assert cache.lookup('q', 'quote') == (None, False)
+
+    def test_refresh_cap_and_per_key_dedup(self, tmp_path):
+        cache = TieredCache(SQLiteCacheStore(tmp_path / 'cache.sqlite'), max_refreshes=1)
+        release = threading.Event()
+
+        assert cache.revalidate('a', release.wait) is True
+        assert cache.revalidate('a', release.wait) is False
+        assert cache.revalidate('b', release.wait) is False
+        release.set()
+        cache.wait_for_refreshes(timeout=5)
+
+        assert cache.revalidate('b', lambda: None) is True
+        cache.wait_for_refreshes(timeout=5)
+        stats = cache.get_stats()
+        assert stats['refreshes'] == 2 and stats['refreshes_skipped'] == 1
+
+    def test_client_serves_stale_then_refreshes(self, fmp_stub, stub_config):
+        stub_config['cache'].update({
+            'stale_while_revalidate': True,
+            'grace_policy_hours': {'profile': 1},
+        })
+        fmp_stub.queue('profile/AAPL', [{'price': 1}])
+        fmp_stub.route('profile/AAPL', [{'price': 2}])
+        client = FMPClient('test-key', stub_config)
+        assert client.get_profile('AAPL') == [{'price': 1}]
+
+        # Past the 48h symbol TTL, inside the 1h grace window
+        _age_all(client.cache.store, 48 * 3600 + 60)
+        client.cache.memory.clear()
+        assert client.get_profile('AAPL') == [{'price': 1}]
+
+        client.cache.wait_for_refreshes(timeout=5)
+        assert fmp_stub.count('profile/AAPL') == 2
+        assert client.get_profile('AAPL') == [{'price': 2}]
+        assert client.get_metrics()['cache']['stale_hits'] == 1
+
+    def test_wrapper_exposes_grace_windows(self, fmp_stub, stub_config):
+        stub_config['cache']['stale_while_revalidate'] = True
+        cached = CachedFMPClient(FMPClient('test-key', stub_config))
+
+        assert cached.grace_windows['quote'] == timedelta(minutes=15)
+        assert cached.grace_windows['balance_sheet'] == timedelta(0)
+
+    def test_stale_serving_is_opt_in(self, fmp_stub, stub_config):
+        cached = CachedFMPClient(FMPClient('test-key', stub_config))
+
+        assert cached.grace_windows['quote'] == timedelta(0)
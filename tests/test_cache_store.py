@@ -0,0 +1,180 @@
+"""
+Unit tests for the SQLite response store and legacy cache migration.
+"""
+import json
+import multiprocessing
+import pickle
+import threading
+import time
+
+from src.screener.cache_store import (
+    SQLiteCacheStore, MemoryLRUCache, endpoint_from_url, migrate_legacy_cache
+)
+from src.screener.cache import TieredCache
+from src.screener.ingest import FMPCache, FMPClient
+
+
+def _write_entries(db_path, prefix, n):
+    store = SQLiteCacheStore(db_path)
+    for i in range(n):
+        store.set(f"{prefix}-{i}", {'i': i}, endpoint='profile', ttl_class='symbol')
+
+
+class TestSQLiteCacheStore:
+
+    def test_roundtrip_and_ttl(self, tmp_path):
+        store = SQLiteCacheStore(tmp_path / 'cache.sqlite')
+        store.set('k1', [{'symbol': 'AAPL', 'price': 1.5}], endpoint='quote', ttl_class='symbol',
+                  fetched_at=time.time() - 100)
+
+        assert store.get('k1') == [{'symbol': 'AAPL', 'price': 1.5}]
+        assert store.get('k1', max_age_seconds=1000) is not None
+        assert store.get('k1', max_age_seconds=10) is None
+        assert store.get('missing') is None
+
+    def test_payloads_are_compressed(self, tmp_path):
+        store = SQLiteCacheStore(tmp_path / 'cache.sqlite')
+        payload = [{'date': f"2024-{i:02d}", 'revenue': 1000} for i in range(200)]
+        store.set('big', payload, endpoint='income-statement', ttl_class='symbol')
+
+        stats = store.get_stats()
+        assert stats['by_endpoint']['income-statement']['size_bytes'] < len(json.dumps(payload)) / 5
+
+    def test_stats_per_endpoint(self, tmp_path):
+        store = SQLiteCacheStore(tmp_path / 'cache.sqlite')
+        store.set('a', [1], endpoint='profile', ttl_class='symbol')
+        store.set('b', [2], endpoint='profile', ttl_class='symbol')
+        store.set('c', [3], endpoint='stock-screener', ttl_class='universe')
+
+        stats = store.get_stats()
+        assert stats['entries'] == 3
+        assert stats['by_endpoint']['profile']['entries'] == 2
+        assert store.clear(ttl_class='universe') == 1
+
+    def test_concurrent_threads(self, tmp_path):
+        store = SQLiteCacheStore(tmp_path / 'cache.sqlite')
+
+        def writer(t):
+            for i in range(25):
+                store.set(f"t{t}-{i}", {'t': t, 'i': i}, endpoint='profile', ttl_class='symbol')
+                assert store.get(f"t{t}-{i}") == {'t': t, 'i': i}
+
+        threads = [threading.Thread(target=writer, args=(t,)) for t in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert store.get_stats()['entries'] == 200
+
+    def test_multiple_processes(self, tmp_path):
+        db_path = str(tmp_path / 'cache.sqlite')
+        SQLiteCacheStore(db_path)
+        ctx = multiprocessing.get_context('spawn')
+        procs = [ctx.Process(target=_write_entries, args=(db_path, f"p{i}", 30)) for i in range(3)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+
+        assert all(p.exitcode == 0 for p in procs)
+        assert SQLiteCacheStore(db_path).get_stats()['entries'] == 90
+
+    def test_endpoint_from_url(self):
+        assert endpoint_from_url('https://x/api/v3/income-statement/AAPL') == 'income-statement'
+        assert endpoint_from_url('https://x/api/v4/insider-trading') == 'insider-trading'
+
+
+class TestMemoryLRUCache:
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        cache = MemoryLRUCache(max_bytes=100)
+        cache.put('a', b'x' * 40)
+        cache.put('b', b'x' * 40)
+        cache.get('a')
+        cache.put('c', b'x' * 40)
+
+        assert cache.get('b') is None
+        assert cache.get('a') is not None and cache.get('c') is not None
+        stats = cache.get_stats()
+        assert stats['size_bytes'] == 80
+        assert stats['evictions'] == 1
+
+    def test_oversized_and_expired_entries(self):
+        cache = MemoryLRUCache(max_bytes=10)
+        cache.put('big', b'x' * 11)
+        cache.put('old', b'1', fetched_at=time.time() - 60)
+
+        assert cache.get('big') is None
+        assert cache.get('old', max_age_seconds=30) is None
+        assert cache.get('old') == b'1'
+
+    def test_payloads_kept_decoded_readers_get_copies(self):
+        cache = MemoryLRUCache(max_bytes=1024)
+        cache.put('k', [{'symbol': 'AAPL', 'tags': ['a']}], size=40)
+
+        first = cache.get('k')
+        first[0]['symbol'] = 'MUTATED'
+        first[0]['tags'].append('b')
+
+        assert cache.get('k') == [{'symbol': 'AAPL', 'tags': ['a']}]
+        assert cache.get_stats()['size_bytes'] == 40
+
+    def test_fmp_cache_tiers(self, tmp_path):
+        store = SQLiteCacheStore(tmp_path / 'cache.sqlite')
+        url, params = 'https://x/api/v3/profile/AAPL', {}
+        FMPCache(TieredCache(store)).set(url, params, [{'symbol': 'AAPL'}])
+
+        # Fresh process-level tier: first read comes from disk, then memory
+        tiered = TieredCache(store, memory=MemoryLRUCache(1024))
+        cache = FMPCache(tiered)
+        first = cache.get(url, params)
+        first[0]['symbol'] = 'MUTATED'
+        second = cache.get(url, params)
+
+        assert second == [{'symbol': 'AAPL'}]
+        assert cache.get_stats()['hits'] == 2
+        stats = tiered.get_stats()
+        assert stats['disk_hits'] == 1 and stats['memory_hits'] == 1
+
+
+class TestMigration:
+
+    def test_imports_json_and_pickle_caches(self, tmp_path):
+        cache_dir = tmp_path / 'cache'
+        (cache_dir / 'symbol').mkdir(parents=True)
+        url, params = 'https://x/api/v3/profile/AAPL', {'apikey': 'k'}
+        key = FMPCache._get_key(url, params)
+        (cache_dir / 'symbol' / f"{key}.json").write_text(json.dumps([{'symbol': 'AAPL'}]))
+
+        pkl_dir = tmp_path / '.cache'
+        (pkl_dir / 'quote').mkdir(parents=True)
+        with open(pkl_dir / 'quote' / 'abc.pkl', 'wb') as f:
+            pickle.dump([{'price': 10}], f)
+        (pkl_dir / 'quote' / 'abc.meta').write_text('2024-01-01T00:00:00')
+        (pkl_dir / 'quote' / 'broken.pkl').write_bytes(b'not a pickle')
+
+        store = SQLiteCacheStore(tmp_path / 'new.sqlite')
+        counts = migrate_legacy_cache(store, str(cache_dir), str(pkl_dir))
+
+        assert counts == {'imported': 2, 'skipped': 1}
+        assert store.get('abc') == [{'price': 10}]
+        # Migrated FMPCache entries are served under their original key
+        cache = FMPCache(TieredCache(store), ttl_hours=10 ** 6)
+        assert cache.get(url, params) == [{'symbol': 'AAPL'}]
+
+
+class TestFMPClientSQLiteBackend:
+
+    def test_responses_cached_in_single_file(self, fmp_stub, stub_config, tmp_path):
+        fmp_stub.route('profile/AAPL', [{'symbol': 'AAPL'}])
+        client = FMPClient('test-key', stub_config)
+
+        client.get_profile('AAPL')
+        client.get_profile('AAPL')
+
+        assert fmp_stub.count('profile/AAPL') == 1
+        stats = client.get_metrics()['cache']['store']
+        assert stats['by_endpoint']['profile']['entries'] == 1
+        assert (tmp_path / 'cache' / 'fmp_cache.sqlite').exists()
+        assert not (tmp_path / 'cache' / 'symbol').exists()
@@ -0,0 +1,114 @@
+"""
+Tests for run checkpoints and resuming an interrupted pipeline run.
+"""
+import pandas as pd
+import pytest
+
+from src.screener.checkpoint import RunCheckpoint, prune_runs
+from src.screener.orchestrator import ScreenerPipeline
+from tests.test_orchestrator import FakeFeatures, FakeGuardrails, _pipeline
+
+
+class TestRunCheckpoint:
+
+    def test_stage_frames_round_trip(self, tmp_path):
+        checkpoint = RunCheckpoint(tmp_path)
+        df = pd.DataFrame({'ticker': ['AAPL', 'MSFT'], 'marketCap': [3e12, 2.8e12]})
+
+        assert not checkpoint.is_complete('universe')
+        checkpoint.save_frame('universe', df)
+
+        resumed = RunCheckpoint.resume(tmp_path, checkpoint.run_id)
+        assert resumed.is_complete('universe')
+        assert resumed.manifest['stages']['universe']['rows'] == 2
+        pd.testing.assert_frame_equal(resumed.load_frame('universe'), df)
+        # Atomic writes leave no temp files behind
+        assert not [p for p in checkpoint.run_dir.iterdir() if p.name.endswith('.tmp')]
+
+    def test_unknown_run_id(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            RunCheckpoint.resume(tmp_path, 'nope')
+
+    def test_old_runs_are_pruned(self, tmp_path):
+        run_ids = [f"20240101-00000{i}-abcdef" for i in range(5)]
+        for run_id in run_ids:
+            RunCheckpoint(tmp_path, run_id)
+        (tmp_path / 'notes').mkdir()
+
+        assert prune_runs(tmp_path, keep=2, exclude=[run_ids[0]]) == [run_ids[2], run_ids[1]]
+        assert sorted(p.name for p in tmp_path.iterdir()) == [run_ids[0], run_ids[3], run_ids[4], 'notes']
+        assert prune_runs(tmp_path / 'missing', keep=0) == []
+
+    def test_torn_record_is_dropped(self, tmp_path):
+        checkpoint = RunCheckpoint(tmp_path)
+        checkpoint.record('features', 'AAPL', {'ticker': 'AAPL', 'roic_%': 40.0})
+        checkpoint.record('features', 'MSFT', {'ticker': 'MSFT', 'roic_%': 30.0})
+
+        # Simulate a crash in the middle of the last append
+        path = checkpoint.run_dir / 'features.partial'
+        path.write_bytes(path.read_bytes()[:-5])
+
+        resumed = RunCheckpoint.resume(tmp_path, checkpoint.run_id)
+        assert list(resumed.completed('features')) == ['AAPL']
+
+        resumed.record('features', 'MSFT', {'ticker': 'MSFT', 'roic_%': 30.0})
+        again = RunCheckpoint.resume(tmp_path, checkpoint.run_id)
+        assert set(again.completed('features')) == {'AAPL', 'MSFT'}
+
+
+class FlakyFeatures(FakeFeatures):
+    """Dies (like a rate-limit abort) after `limit` tickers."""
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+
+    def calculate_features(self, symbol, company_type):
+        if len(self.calls) >= self.limit:
+            raise KeyboardInterrupt
+        return super().calculate_features(symbol, company_type)
+
+
+class TestResume:
+
+    def test_completed_tickers_are_skipped(self, tmp_path):
+        checkpoint = RunCheckpoint(tmp_path / 'runs')
+
+        first = _pipeline(tmp_path, 'pipelined')
+        first.config['pipeline']['max_workers'] = 1
+        first.checkpoint = checkpoint
+        first.features = FlakyFeatures(limit=2)
+        with pytest.raises(KeyboardInterrupt):
+            first._calculate_pipelined()
+        done = set(checkpoint.completed('features'))
+        assert len(done) == 2
+
+        second = _pipeline(tmp_path, 'pipelined')
+        second.checkpoint = RunCheckpoint.resume(tmp_path / 'runs', checkpoint.run_id)
+        second.guardrails = FakeGuardrails()
+        second._calculate_pipelined()
+
+        assert not done & set(second.features.calls)
+        assert second.df_topk['roic_%'].notna().all()
+
+    def test_completed_stages_are_loaded(self, tmp_path, monkeypatch):
+        checkpoint = RunCheckpoint(tmp_path / 'runs')
+        universe = pd.DataFrame({'ticker': ['AAPL'], 'marketCap': [3e12]})
+        checkpoint.save_frame('universe', universe)
+
+        pipeline = _pipeline(tmp_path, 'staged')
+        pipeline.runs_dir = tmp_path / 'runs'
+        pipeline.checkpoint = None
+        ran = []
+        for stage in ('_build_universe', '_calculate_features', '_calculate_guardrails', '_score_universe'):
+            monkeypatch.setattr(pipeline, stage, lambda stage=stage: ran.append(stage))
+        monkeypatch.setattr(pipeline, '_select_topk', lambda: setattr(pipeline, 'df_topk', universe))
+        monkeypatch.setattr(pipeline, '_export_results', lambda: 'out.csv')
+        monkeypatch.setattr(pipeline, '_log_metrics', lambda start: None)
+        pipeline.df_final = universe
+
+        assert ScreenerPipeline.run(pipeline, resume_run_id=checkpoint.run_id) == 'out.csv'
+
+        assert '_build_universe' not in ran
+        assert ran == ['_calculate_features', '_calculate_guardrails', '_score_universe']
+        assert RunCheckpoint.resume(tmp_path / 'runs', checkpoint.run_id).is_complete('scores')
@@ -0,0 +1,153 @@
+"""
+Regression tests: vectorized classification vs the row-wise reference rules.
+"""
+import itertools
+
+import pandas as pd
+
+from src.screener.classification import (
+    ETF_INDUSTRIES, ETF_NAME_KEYWORDS, ETF_TICKERS, EXCHANGE_SUFFIXES, FINANCIAL_KEYWORDS, FLAG_COLUMNS,
+    INVALID_SECTORS, SECTOR_KEYWORDS, classify, enrich_sectors, fix_symbol_suffixes
+)
+
+
+SECTORS = ['Technology', 'Financial Services', 'Real Estate', 'Utilities', 'Unknown', 'N/A', '', '  ']
+INDUSTRIES = [
+    'Banks - Regional', 'Insurance - Life', 'REIT - Retail', 'Software - Application',
+    'Internet Retail', 'Utilities - Regulated Electric', 'Exchange Traded Fund',
+    'Closed-End Fund - Equity', 'Mortgage Finance', 'Oil & Gas E&P', 'Royalty Trust',
+    'Diversified Financial Services', 'Shell Companies', ''
+]
+NAMES = [
+    'Apple Inc.', 'iShares Core S&P 500 ETF', 'Hamilton Enhanced Covered Call',
+    'A&W Revenue Royalties Income Fund', 'Firm Capital Mortgage Investment Corporation',
+    'Realty Income Fund', 'Marketplace Corp', 'Vanguard Total Market', ''
+]
+SYMBOLS = ['AAPL', 'QQQ', 'XLRE', 'BP', 'RY.TO', 'spy']
+EXCHANGES = ['NASDAQ', 'LSE', 'TSX', 'JSE', 'XYZ', '']
+TYPES = ['stock', 'etf', 'ETF', '']
+
+
+def _universe() -> pd.DataFrame:
+    rows = []
+    for i, (sector, industry, name) in enumerate(itertools.product(SECTORS, INDUSTRIES, NAMES)):
+        rows.append({
+            'symbol': SYMBOLS[i % len(SYMBOLS)],
+            'exchangeShortName': EXCHANGES[i % len(EXCHANGES)],
+            'sector': sector,
+            'industry': industry,
+            'name': name,
+            'companyName': 'Fallback Fund Inc' if i % 3 == 0 else '',
+            'type': TYPES[i % len(TYPES)],
+        })
+    return pd.DataFrame(rows)
+
+
+# Row-wise reference: the per-row rules _build_universe applied with
+# df.apply(..., axis=1) before vectorization.
+
+def _enrich_sector(row) -> str:
+    ticker = (row.get('symbol') or row.get('ticker') or '').upper()
+    if ticker in ETF_TICKERS:
+        return 'ETF_Index'
+
+    sector = (row.get('sector') or '').strip()
+    industry = (row.get('industry') or '').lower()
+    if sector and sector.lower() not in INVALID_SECTORS:
+        return sector
+
+    for sector_name, keywords in SECTOR_KEYWORDS.items():
+        for keyword in keywords:
+            if keyword in industry:
+                return sector_name
+    return 'Unknown'
+
+
+def _classify_financial(row) -> bool:
+    sector = (row.get('sector') or '').lower()
+    industry = (row.get('industry') or '').lower()
+    return 'financial' in sector or any(kw in industry for kw in FINANCIAL_KEYWORDS)
+
+
+def _classify_reit(row) -> bool:
+    return 'reit' in (row.get('industry') or '').lower()
+
+
+def _classify_utility(row) -> bool:
+    sector = (row.get('sector') or '').lower()
+    return 'utilities' in sector or 'utility' in sector
+
+
+def _classify_etf(row) -> bool:
+    name = (row.get('name') or row.get('companyName') or '').lower()
+    industry = (row.get('industry') or '').lower()
+    if (row.get('type') or '').lower() == 'etf':
+        return True
+    if any(ind in industry for ind in ETF_INDUSTRIES):
+        return True
+    if any(keyword in name for keyword in ETF_NAME_KEYWORDS):
+        # REITs, royalty trusts/funds and mortgage investment corporations are not ETFs
+        if 'reit' in industry or 'real estate investment trust' in industry:
+            return False
+        if 'royalt' in name or 'royalt' in industry:
+            return False
+        if 'mortgage' in name and 'investment' in name and 'corporation' in name:
+            return False
+        return True
+    return False
+
+
+def _reference(df: pd.DataFrame) -> pd.DataFrame:
+    """The row-wise apply() passes _build_universe used before vectorization."""
+    df = df.copy()
+    df['sector'] = df.apply(_enrich_sector, axis=1)
+    df['is_financial'] = df.apply(_classify_financial, axis=1)
+    df['is_REIT'] = df.apply(_classify_reit, axis=1)
+    df['is_utility'] = df.apply(_classify_utility, axis=1)
+    df['is_ETF'] = df.apply(_classify_etf, axis=1)
+    return df
+
+
+class TestVectorizedClassification:
+
+    def test_identical_to_row_wise(self):
+        df = _universe()
+        expected = _reference(df)
+
+        actual = df.copy()
+        actual['sector'] = enrich_sectors(actual)
+        actual[FLAG_COLUMNS] = classify(actual)
+
+        assert len(df) > 1000
+        assert actual['sector'].tolist() == expected['sector'].tolist()
+        for column in FLAG_COLUMNS:
+            assert actual[column].dtype == bool
+            assert actual[column].tolist() == expected[column].astype(bool).tolist(), column
+
+    def test_symbol_suffixes(self):
+        df = _universe()
+
+        def reference(row):
+            symbol = row['symbol']
+            if '.' in symbol:
+                return symbol
+            return symbol + (EXCHANGE_SUFFIXES.get(row['exchangeShortName'], '') or '')
+
+        assert fix_symbol_suffixes(df).tolist() == df.apply(reference, axis=1).tolist()
+        assert fix_symbol_suffixes(pd.DataFrame({
+            'symbol': ['BP', 'RY.TO', 'NPN', 'AAPL'],
+            'exchangeShortName': ['LSE', 'TSX', 'JSE', 'NASDAQ'],
+        })).tolist() == ['BP.L', 'RY.TO', 'NPN.JO', 'AAPL']
+
+    def test_missing_values_count_as_empty(self):
+        df = pd.DataFrame({
+            'symbol': ['AAA', 'BBB'],
+            'sector': [None, 'Financial Services'],
+            'industry': ['Banks - Regional', None],
+            'name': [None, 'BBB Income Fund'],
+            'companyName': ['AAA Bancorp', None],
+        })
+        blank = df.fillna('')
+
+        assert enrich_sectors(df).tolist() == enrich_sectors(blank).tolist() == ['Financials', 'Financial Services']
+        pd.testing.assert_frame_equal(classify(df), classify(blank))
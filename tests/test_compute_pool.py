@@ -0,0 +1,151 @@
+"""
+Tests for the process-pool CPU stage.
+"""
+from src.screener.compute_pool import (
+    SnapshotFMPClient, calls_for, collect_payloads, compute_ticker, init_worker, payload_key
+)
+
+
+def _statement(i, **fields):
+    row = {'date': f"2024-{12 - i:02d}-28", 'symbol': 'AAA'}
+    row.update({k: v * (1 + 0.02 * (12 - i)) for k, v in fields.items()})
+    return row
+
+
+class FakeFMP:
+    """Deterministic stand-in for FMPClient (statement rows newest first)."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_profile(self, symbol):
+        return [{'symbol': symbol, 'mktCap': 5e10, 'price': 100.0, 'sector': 'Technology'}]
+
+    def get_key_metrics_ttm(self, symbol):
+        return [{'peRatioTTM': 18.0, 'roicTTM': 0.21, 'freeCashFlowYieldTTM': 0.05}]
+
+    def get_ratios_ttm(self, symbol):
+        return [{'grossProfitMarginTTM': 0.55, 'returnOnEquityTTM': 0.3}]
+
+    def get_enterprise_values(self, symbol, limit=4):
+        return [{'enterpriseValue': 5.5e10, 'marketCapitalization': 5e10}] * limit
+
+    def get_income_statement(self, symbol, period='quarter', limit=4):
+        self.calls.append(('income', limit))
+        return [_statement(i, revenue=1e9, grossProfit=5.5e8, operatingIncome=2.5e8, netIncome=2e8,
+                           ebitda=3e8, interestExpense=1e7, incomeTaxExpense=4e7, incomeBeforeTax=2.4e8,
+                           costOfRevenue=4.5e8, sellingGeneralAndAdministrativeExpenses=1.5e8,
+                           depreciationAndAmortization=5e7, weightedAverageShsOutDil=5e8)
+                for i in range(limit)]
+
+    def get_balance_sheet(self, symbol, period='quarter', limit=4):
+        return [_statement(i, totalAssets=2e10, totalLiabilities=8e9, totalStockholdersEquity=1.2e10,
+                           totalCurrentAssets=6e9, totalCurrentLiabilities=3e9, cashAndCashEquivalents=2e9,
+                           netReceivables=1e9, inventory=5e8, propertyPlantEquipmentNet=4e9,
+                           totalDebt=3e9, longTermDebt=2.5e9, retainedEarnings=7e9)
+                for i in range(limit)]
+
+    def get_cash_flow(self, symbol, period='quarter', limit=4):
+        return [_statement(i, operatingCashFlow=2.6e8, capitalExpenditure=-6e7, freeCashFlow=2e8,
+                           dividendsPaid=-5e7, commonStockRepurchased=-4e7, stockBasedCompensation=2e7,
+                           depreciationAndAmortization=5e7)
+                for i in range(limit)]
+
+
+class TestSnapshotClient:
+
+    def test_statements_sliced_and_misses_recorded(self):
+        client = SnapshotFMPClient({'get_income_statement:quarter': [{'q': i} for i in range(12)]})
+
+        assert client.get_income_statement('AAA', period='quarter', limit=4) == [{'q': i} for i in range(4)]
+        assert client.get_income_statement('AAA', period='annual', limit=4) == []
+        assert client.misses == ['get_income_statement:annual']
+
+    def test_one_payload_per_key_with_largest_limit(self):
+        calls = calls_for('non_financial')
+
+        assert calls['get_balance_sheet:quarter'] == ('get_balance_sheet', {'period': 'quarter', 'limit': 12})
+        assert 'get_profile' not in calls_for('non_financial', include_features=False)
+
+    def test_plan_is_what_the_calculators_call(self):
+        from src.screener.features import FeatureCalculator
+        from src.screener.guardrails import GuardrailCalculator
+
+        class Recorder:
+            def __init__(self):
+                self.calls = []
+
+            def __getattr__(self, name):
+                return lambda symbol, **kwargs: (self.calls.append((name, kwargs)), [])[1]
+
+        for company_type in ('non_financial', 'financial', 'reit', 'utility'):
+            fmp = Recorder()
+            FeatureCalculator(fmp).calculate_features('AAA', company_type)
+            GuardrailCalculator(fmp, {'guardrails': {}}).calculate_guardrails('AAA', company_type, '')
+            planned = calls_for(company_type)
+            assert {payload_key(m, kw) for m, kw in fmp.calls} == set(planned)
+            assert all(kw.get('limit', 0) <= planned[payload_key(m, kw)][1].get('limit', 0) for m, kw in fmp.calls)
+
+    def test_worker_matches_in_process_calculators(self):
+        from src.screener.features import FeatureCalculator
+        from src.screener.guardrails import GuardrailCalculator
+        from src.screener.metrics import RunMetrics
+
+        config = {'guardrails': {}}
+        fmp = FakeFMP()
+        payloads = collect_payloads(fmp, 'AAA', 'non_financial')
+        init_worker(config)
+
+        features, guardrails, misses = compute_ticker('AAA', 'non_financial', 'Software', payloads)
+
+        expected_features = FeatureCalculator(FakeFMP()).calculate_features('AAA', 'non_financial')
+        expected_guardrails = GuardrailCalculator(FakeFMP(), config).calculate_guardrails(
+            'AAA', 'non_financial', 'Software'
+        )
+        assert misses == []
+        assert {k: v for k, v in features.items() if k != 'ticker'} == expected_features
+        assert {k: v for k, v in guardrails.items() if k != 'ticker'} == expected_guardrails
+        # Largest statement history fetched once per endpoint/period
+        assert fmp.calls == [('income', 12)]
+
+
+class TestProcessPoolMode:
+
+    def test_same_result_as_pipelined(self, tmp_path):
+        import pandas as pd
+        from src.screener.feature_store import FeatureStore
+        from src.screener.features import FeatureCalculator
+        from src.screener.guardrails import GuardrailCalculator
+        from src.screener.metrics import RunMetrics
+        from src.screener.orchestrator import ScreenerPipeline
+
+        def make(mode):
+            pipeline = object.__new__(ScreenerPipeline)
+            pipeline.config = {'pipeline': {'mode': mode, 'max_workers': 2, 'cpu_workers': 2}, 'guardrails': {}}
+            pipeline.fmp = FakeFMP()
+            pipeline.async_fmp = None
+            pipeline.checkpoint = None
+            pipeline.run_metrics = RunMetrics()
+            pipeline.fmp.get_profile_bulk = lambda symbols: []
+            pipeline.features = FeatureCalculator(pipeline.fmp)
+            pipeline.guardrails = GuardrailCalculator(pipeline.fmp, pipeline.config)
+            pipeline.feature_store = FeatureStore(tmp_path / mode / 'features.sqlite')
+            pipeline.incremental_max_age_hours = 168
+            pipeline.incremental_ttl_hours = 24
+            pipeline.df_topk = pd.DataFrame({
+                'ticker': ['AAA', 'BBB', 'CCC'],
+                'is_financial': [False, True, False],
+                'is_REIT': [False, False, False],
+                'is_utility': [False, False, True],
+                'industry': ['Software', 'Banks', 'Utilities'],
+            })
+            return pipeline
+
+        threaded = make('pipelined')
+        threaded._calculate_pipelined()
+        pooled = make('process')
+        pooled._calculate_process_pool()
+
+        expected = threaded.df_topk.sort_values('ticker').reset_index(drop=True)
+        actual = pooled.df_topk.sort_values('ticker').reset_index(drop=True)
+        pd.testing.assert_frame_equal(actual[expected.columns], expected)
@@ -0,0 +1,160 @@
+"""
+Tests for the per-symbol financial bundle used by QualitativeAnalyzer.
+"""
+import json
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from src.screener.financial_bundle import BundleCache, FinancialBundle
+from src.screener.qualitative import QualitativeAnalyzer
+
+
+def _statement(i):
+    return {
+        'date': f"{2024 - i}-12-31", 'calendarYear': str(2024 - i),
+        'revenue': 1e9 * (1 - 0.05 * i), 'grossProfit': 4e8, 'operatingIncome': 1.5e8, 'netIncome': 1e8,
+        'ebitda': 2e8, 'interestExpense': 1e7, 'incomeTaxExpense': 2e7, 'incomeBeforeTax': 1.2e8,
+        'totalAssets': 2e9, 'totalDebt': 5e8, 'totalStockholdersEquity': 1e9, 'cashAndCashEquivalents': 2e8,
+        'totalCurrentAssets': 6e8, 'totalCurrentLiabilities': 3e8, 'weightedAverageShsOut': 1e8,
+        'operatingCashFlow': 1.2e8, 'freeCashFlow': 9e7, 'capitalExpenditure': -3e7,
+        'depreciationAndAmortization': 3e7, 'dividendsPaid': -1e7, 'commonStockRepurchased': -1e7,
+    }
+
+
+class CountingFMP:
+    """FMPClient stand-in that counts calls; unknown get_* endpoints return []."""
+
+    statement_history = {'annual': 6, 'quarter': 8}
+
+    def __init__(self, delay=0.0):
+        self.calls = Counter()
+        self.delay = delay
+
+    def get_profile(self, symbol):
+        self.calls[('profile', symbol)] += 1
+        time.sleep(self.delay)
+        return [{'symbol': symbol, 'companyName': symbol, 'industry': 'Software', 'sector': 'Technology',
+                 'mktCap': 1e10, 'price': 100, 'beta': 1.1,
+                 'description': 'We sell software. To enterprises. On subscription.'}]
+
+    def get_stock_peers(self, symbol):
+        return [{'peersList': ['PA', 'PB']}]
+
+    def get_profile_bulk(self, symbols):
+        return [self.get_profile(s)[0] for s in symbols]
+
+    def _series(self, name, symbol, period, limit):
+        self.calls[(name, symbol, period, limit)] += 1
+        return [_statement(i) for i in range(limit)]
+
+    def get_income_statement(self, symbol, period='quarter', limit=4):
+        return self._series('income', symbol, period, limit)
+
+    def get_balance_sheet(self, symbol, period='quarter', limit=4):
+        return self._series('balance', symbol, period, limit)
+
+    def get_cash_flow(self, symbol, period='quarter', limit=4):
+        return self._series('cash', symbol, period, limit)
+
+    def get_quote(self, symbol):
+        raise ConnectionError('quote endpoint down')
+
+    def __getattr__(self, name):
+        if not name.startswith('get_'):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: []
+
+    def subject_calls(self, symbol):
+        return sum(n for key, n in self.calls.items() if symbol in key)
+
+
+class TestFinancialBundle:
+
+    def test_statements_loaded_once_and_sliced(self):
+        fmp = CountingFMP()
+        bundle = FinancialBundle(fmp, 'AAA')
+
+        assert len(bundle.get_income_statement('AAA', period='annual', limit=2)) == 2
+        three = bundle.get_income_statement('AAA', period='annual', limit=3)
+        assert [s['date'] for s in three] == ['2024-12-31', '2023-12-31', '2022-12-31']
+        bundle.get_income_statement('AAA', period='quarter', limit=5)
+
+        assert fmp.calls == Counter({('income', 'AAA', 'annual', 6): 1, ('income', 'AAA', 'quarter', 8): 1})
+        assert bundle.get_stats() == {'loads': 2, 'hits': 1}
+
+    def test_other_symbols_and_deeper_history_pass_through(self):
+        fmp = CountingFMP()
+        bundle = FinancialBundle(fmp, 'AAA')
+
+        bundle.get_balance_sheet('PEER', period='annual', limit=2)
+        bundle.get_balance_sheet('AAA', period='annual', limit=20)
+        assert bundle.get_stock_news('AAA') == []
+
+        assert fmp.calls == Counter({('balance', 'PEER', 'annual', 2): 1, ('balance', 'AAA', 'annual', 20): 1})
+
+    def test_failures_are_remembered(self):
+        bundle = FinancialBundle(CountingFMP(), 'AAA')
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                bundle.get_quote('AAA')
+        assert bundle.get_stats() == {'loads': 1, 'hits': 1}
+
+    def test_concurrent_readers_share_one_load(self):
+        fmp = CountingFMP(delay=0.05)
+        bundle = FinancialBundle(fmp, 'AAA')
+        threads = [threading.Thread(target=bundle.get_profile, args=('AAA',)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert fmp.calls[('profile', 'AAA')] == 1
+
+    def test_returned_lists_are_copies(self):
+        bundle = FinancialBundle(CountingFMP(), 'AAA')
+        bundle.get_cash_flow('AAA', period='annual', limit=3).clear()
+        assert len(bundle.get_cash_flow('AAA', period='annual', limit=3)) == 3
+
+
+class TestQualitativeUsesBundle:
+
+    CONFIG = {'premium': {'enable_insider_trading': True, 'enable_earnings_transcripts': True}}
+
+    def test_same_summary_with_far_fewer_lookups(self):
+        bundled_fmp, direct_fmp = CountingFMP(), CountingFMP()
+
+        bundled = QualitativeAnalyzer(bundled_fmp, self.CONFIG).analyze_symbol('AAA', 'non_financial')
+        direct = QualitativeAnalyzer(direct_fmp, self.CONFIG)._analyze_sections('AAA', 'non_financial')
+
+        assert json.dumps(bundled, default=str, sort_keys=True) == json.dumps(direct, default=str, sort_keys=True)
+        # One load per bundled series instead of one lookup per section
+        assert bundled_fmp.subject_calls('AAA') <= 7
+        assert direct_fmp.subject_calls('AAA') > 3 * bundled_fmp.subject_calls('AAA')
+
+    def test_analyzer_client_is_untouched(self):
+        fmp = CountingFMP()
+        analyzer = QualitativeAnalyzer(fmp, self.CONFIG)
+        analyzer.analyze_symbol('AAA', 'non_financial')
+        assert analyzer.fmp is fmp
+
+
+class TestBundleCache:
+
+    def test_peer_data_shared_across_symbols(self):
+        fmp = CountingFMP()
+        bulk_calls = []
+        fmp.get_profile_bulk = lambda symbols: (bulk_calls.append(list(symbols)),
+                                                [CountingFMP().get_profile(s)[0] for s in symbols])[1]
+        shared = BundleCache(fmp)
+
+        assert [p['symbol'] for p in shared.get_profile_bulk(['PA', 'PB'])] == ['PA', 'PB']
+        assert [p['symbol'] for p in shared.get_profile_bulk(['PB', 'PC'])] == ['PB', 'PC']
+        shared.get_profile('PA')
+        shared.get_income_statement('PA', period='annual', limit=2)
+        FinancialBundle(shared, 'AAA').get_income_statement('PA', period='annual', limit=1)
+
+        assert bulk_calls == [['PA', 'PB'], ['PC']]
+        assert fmp.calls[('profile', 'PA')] == 0
+        assert fmp.calls == Counter({('income', 'PA', 'annual', 6): 1})
@@ -0,0 +1,239 @@
+"""
+Unit tests for the FMP ingestion layer (rate limiting, caching, request handling).
+"""
+import threading
+import time
+
+import pytest
+from src.screener.ingest import FMPClient, RateLimiter
+
+
+class TestRateLimiter:
+    """Token bucket: burst capacity, thread safety, weights, 429 slowdown."""
+
+    def test_burst_then_steady_rate(self):
+        limiter = RateLimiter(rate=50, burst=5)
+        start = time.monotonic()
+        for _ in range(15):
+            limiter.wait()
+        elapsed = time.monotonic() - start
+
+        # First 5 are free (burst), remaining 10 need 10/50 = 0.2s
+        assert elapsed >= 0.18
+        assert limiter.get_metrics()['requests'] == 15
+
+    def test_concurrent_waiters_do_not_exceed_rate(self):
+        limiter = RateLimiter(rate=100, burst=10)
+        start = time.monotonic()
+
+        def worker():
+            for _ in range(5):
+                limiter.wait()
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - start
+
+        # 40 tokens, 10 from burst, 30 at 100/s
+        assert elapsed >= 0.28
+        metrics = limiter.get_metrics()
+        assert metrics['requests'] == 40
+        assert metrics['tokens_consumed'] == pytest.approx(40)
+        assert metrics['throttled_requests'] > 0
+
+    def test_endpoint_weights(self):
+        limiter = RateLimiter(rate=10, burst=10, weights={'stock-screener': 4})
+        limiter.wait('stock-screener')
+        limiter.wait('profile/AAPL')
+
+        assert limiter.get_metrics()['tokens_consumed'] == pytest.approx(5)
+
+    def test_penalize_pauses_and_slows_down(self):
+        limiter = RateLimiter(rate=100, burst=1)
+        limiter.penalize(retry_after=0.2)
+        start = time.monotonic()
+        limiter.wait()
+
+        assert time.monotonic() - start >= 0.18
+        metrics = limiter.get_metrics()
+        assert metrics['rate_limited_responses'] == 1
+        assert metrics['current_rate'] < 100
+
+    def test_shared_limiter_per_key(self):
+        a = RateLimiter.shared('test-shared-key', 5)
+        b = RateLimiter.shared('test-shared-key', 50)
+
+        assert a is b
+        assert b.rate == 5
+
+
+class TestFMPClientRateLimiting:
+    """HTTP 429 handling in FMPClient._request."""
+
+    def test_retry_after_is_honoured(self, fmp_stub, stub_config):
+        stub_config['fmp']['max_retries'] = 1
+        fmp_stub.queue('profile/AAPL', {'Error Message': 'Limit Reach'}, status=429,
+                       headers={'Retry-After': '0.2'})
+        fmp_stub.route('profile/AAPL', [{'symbol': 'AAPL'}])
+        client = FMPClient('test-key', stub_config)
+
+        start = time.monotonic()
+        assert client.get_profile('AAPL') == [{'symbol': 'AAPL'}]
+
+        assert time.monotonic() - start >= 0.18
+        limiter_metrics = client.get_metrics()['rate_limiter']
+        assert limiter_metrics['rate_limited_responses'] == 1
+        assert fmp_stub.count('profile/AAPL') == 2
+
+    def test_parse_retry_after(self):
+        assert FMPClient._parse_retry_after('3') == 3.0
+        assert FMPClient._parse_retry_after(None) is None
+        assert FMPClient._parse_retry_after('garbage') is None
+
+
+class TestSingleFlight:
+    """Concurrent identical requests share one network fetch."""
+
+    def _fan_out(self, fn, n=8):
+        results, errors = [], []
+
+        def worker():
+            try:
+                results.append(fn())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results, errors
+
+    def test_concurrent_identical_requests_coalesce(self, fmp_stub, stub_config):
+        fmp_stub.delay = 0.2
+        fmp_stub.route('income-statement/AAPL', [{'date': '2024-06-30', 'revenue': 10}])
+        client = FMPClient('test-key', stub_config)
+
+        results, errors = self._fan_out(
+            lambda: client.get_income_statement('AAPL', period='quarter', limit=12)
+        )
+
+        assert not errors
+        assert len(results) == 8
+        assert all(r == [{'date': '2024-06-30', 'revenue': 10}] for r in results)
+        assert fmp_stub.count('income-statement/AAPL') == 1
+        assert client.get_metrics()['coalesced_requests'] == 7
+        # Followers get their own copy
+        assert len({id(r) for r in results}) == 8
+
+    def test_different_params_are_not_coalesced(self, fmp_stub, stub_config):
+        fmp_stub.delay = 0.1
+        client = FMPClient('test-key', stub_config)
+
+        self._fan_out(lambda: client.get_balance_sheet('AAPL', period='quarter'), n=2)
+        self._fan_out(lambda: client.get_balance_sheet('AAPL', period='annual'), n=2)
+
+        assert fmp_stub.count('balance-sheet-statement/AAPL') == 2
+
+    def test_errors_propagate_to_followers(self, fmp_stub, stub_config):
+        fmp_stub.delay = 0.2
+        fmp_stub.route('profile/BAD', {}, status=500)
+        client = FMPClient('test-key', stub_config)
+
+        results, errors = self._fan_out(lambda: client.get_profile('BAD'), n=4)
+
+        assert not results
+        assert len(errors) == 4
+        assert fmp_stub.count('profile/BAD') == 1
+
+
+class TestStatementStore:
+    """limit=4/8/12 share one fetch of the configured history."""
+
+    @staticmethod
+    def _quarters(query):
+        limit = int(query['limit'])
+        return [{'date': f"q{i}", 'period': query['period']} for i in range(limit)]
+
+    def test_smaller_limits_are_sliced_from_superset(self, fmp_stub, stub_config):
+        fmp_stub.route('income-statement/AAPL', self._quarters)
+        client = FMPClient('test-key', stub_config)
+
+        q12 = client.get_income_statement('AAPL', period='quarter', limit=12)
+        q8 = client.get_income_statement('AAPL', period='quarter', limit=8)
+        q4 = client.get_income_statement('AAPL', period='quarter', limit=4)
+
+        assert [r['date'] for r in q4] == ['q0', 'q1', 'q2', 'q3']
+        assert len(q8) == 8 and len(q12) == 12
+        assert fmp_stub.count('income-statement/AAPL') == 1
+        assert fmp_stub.requests[0][1]['limit'] == '12'
+
+    def test_periods_are_stored_separately(self, fmp_stub, stub_config):
+        fmp_stub.route('cash-flow-statement/AAPL', self._quarters)
+        client = FMPClient('test-key', stub_config)
+
+        annual = client.get_cash_flow('AAPL', period='annual', limit=3)
+        client.get_cash_flow('AAPL', period='annual', limit=5)
+        client.get_cash_flow('AAPL', period='quarter', limit=4)
+
+        assert len(annual) == 3 and annual[0]['period'] == 'annual'
+        assert fmp_stub.count('cash-flow-statement/AAPL') == 2
+
+    def test_limit_beyond_history_fetched_directly(self, fmp_stub, stub_config):
+        fmp_stub.route('balance-sheet-statement/AAPL', self._quarters)
+        stub_config['fmp']['statement_history'] = {'quarter': 8}
+        client = FMPClient('test-key', stub_config)
+
+        assert len(client.get_balance_sheet('AAPL', limit=20)) == 20
+
+    def test_disabled_keeps_exact_limits(self, fmp_stub, stub_config):
+        fmp_stub.route('income-statement/AAPL', self._quarters)
+        stub_config['fmp']['statement_store'] = False
+        client = FMPClient('test-key', stub_config)
+
+        client.get_income_statement('AAPL', limit=4)
+        client.get_income_statement('AAPL', limit=8)
+
+        assert fmp_stub.count('income-statement/AAPL') == 2
+
+
+class TestQuotesBatch:
+
+    def test_chunked_and_cached_per_symbol(self, fmp_stub, stub_config):
+        def serve(path):
+            return lambda query: [{'symbol': s, 'price': 1.0} for s in path.split(',')]
+
+        symbols = [f"S{i}" for i in range(5)]
+        for chunk in (symbols[:2], symbols[2:4], symbols[4:]):
+            fmp_stub.route(f"quote/{','.join(chunk)}", serve(','.join(chunk)))
+        client = FMPClient('test-key', stub_config)
+
+        quotes = client.get_quotes_batch(symbols, chunk_size=2)
+
+        assert sorted(quotes) == symbols
+        assert len(fmp_stub.requests) == 3
+        # Overlapping batch: only the new symbol is requested
+        fmp_stub.route('quote/S9', [{'symbol': 'S9', 'price': 2.0}])
+        quotes = client.get_quotes_batch(['S1', 'S9'])
+        assert quotes['S9']['price'] == 2.0 and quotes['S1']['price'] == 1.0
+        assert fmp_stub.requests[-1][0] == 'quote/S9' and len(fmp_stub.requests) == 4
+
+    def test_market_breadth_uses_batches(self, fmp_stub, stub_config):
+        from src.screener.market_timing import MarketTimingAnalyzer
+
+        fmp_stub.route('quote/A,B,C', [
+            {'symbol': 'A', 'price': 150, 'priceAvg200': 100},
+            {'symbol': 'B', 'price': 100, 'priceAvg200': 100},
+            {'symbol': 'C', 'price': 170, 'priceAvg200': 100},
+        ])
+        client = FMPClient('test-key', stub_config)
+
+        result = MarketTimingAnalyzer(client).analyze_market_overextension(['A', 'B', 'C'])
+
+        assert result['total_analyzed'] == 3
+        assert result['by_level'] == {'extreme': 1, 'high': 1, 'medium': 0, 'low': 1}
+        assert len(fmp_stub.requests) == 1
@@ -0,0 +1,72 @@
+"""
+Tests for run instrumentation (stage/ticker timings, endpoint latency).
+"""
+import json
+
+from src.screener.ingest import FMPClient
+from src.screener.metrics import RequestMetrics, RunMetrics, latency_summary
+
+
+class TestRequestMetrics:
+
+    def test_percentiles_per_endpoint(self):
+        metrics = RequestMetrics()
+        for i in range(1, 101):
+            metrics.record('profile', i / 100, nbytes=10)
+        metrics.record('ratios-ttm', 0.5, nbytes=5, ok=False)
+        metrics.record_retry('ratios-ttm')
+
+        summary = metrics.summary()
+        profile = summary['endpoints']['profile']
+        assert profile['count'] == 100
+        assert profile['p50'] == 0.505
+        assert 0.95 <= profile['p95'] <= 0.96
+        assert profile['max'] == 1.0
+        assert summary['endpoints']['ratios-ttm']['errors'] == 1
+        assert summary['bytes_downloaded'] == 1005
+        assert summary['retries'] == 1
+
+    def test_empty_summary(self):
+        assert latency_summary([])['p95'] is None
+        assert RequestMetrics().summary() == {'bytes_downloaded': 0, 'retries': 0, 'endpoints': {}}
+
+
+class TestRunMetrics:
+
+    def test_stages_and_slowest_tickers(self):
+        metrics = RunMetrics()
+        with metrics.stage('universe'):
+            pass
+        metrics.record_ticker('AAPL', 'features', 0.2)
+        metrics.record_ticker('AAPL', 'guardrails', 0.3)
+        metrics.record_ticker('MSFT', 'features', 0.1)
+        with metrics.ticker('JPM', 'features'):
+            pass
+
+        summary = metrics.summary(slowest=2)
+        assert 'universe' in summary['stages_seconds']
+        assert summary['tickers']['count'] == 3
+        assert summary['tickers']['by_step']['features']['count'] == 3
+        assert [t['ticker'] for t in summary['tickers']['slowest']] == ['AAPL', 'MSFT']
+        assert summary['tickers']['slowest'][0]['seconds'] == 0.5
+        json.dumps(summary)
+
+
+class TestFMPClientInstrumentation:
+
+    def test_latency_bytes_and_retries_recorded(self, fmp_stub, stub_config):
+        stub_config['fmp']['max_retries'] = 1
+        fmp_stub.queue('profile/AAPL', {'Error Message': 'Limit Reach'}, status=429,
+                       headers={'Retry-After': '0.01'})
+        fmp_stub.route('profile/AAPL', [{'symbol': 'AAPL'}])
+        client = FMPClient('test-key', stub_config)
+
+        client.get_profile('AAPL')
+
+        requests = client.get_metrics()['requests']
+        profile = requests['endpoints']['profile']
+        assert profile['count'] == 2
+        assert profile['errors'] == 1
+        assert profile['retries'] == 1
+        assert profile['p99'] is not None
+        assert requests['bytes_downloaded'] == profile['bytes'] > len(b'[{"symbol": "AAPL"}]')
@@ -0,0 +1,275 @@
+"""
+Tests for ScreenerPipeline execution modes (no network: calculators are faked).
+"""
+import json
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.screener.feature_store import FeatureStore
+from src.screener.metrics import RunMetrics
+from src.screener.orchestrator import ScreenerPipeline
+
+
+class FakeFeatures:
+    def __init__(self):
+        self.calls = []
+
+    def calculate_features(self, symbol, company_type):
+        self.calls.append(symbol)
+        return {'roic_%': len(symbol) * 10.0, 'company_type_seen': company_type}
+
+
+class FakeGuardrails:
+    def __init__(self, seen_features=None):
+        self.seen_features = seen_features
+        self.order_ok = True
+
+    def calculate_guardrails(self, symbol, company_type, industry):
+        # Pipelined mode: this ticker's features were computed first
+        if self.seen_features is not None and symbol not in self.seen_features.calls:
+            self.order_ok = False
+        if symbol == 'BAD':
+            raise ValueError('boom')
+        return {'guardrail_status': 'VERDE', 'industry_seen': industry}
+
+
+class FakeFMP:
+    def __init__(self):
+        self.filings = {}
+
+    def get_profile_bulk(self, symbols):
+        return []
+
+    def get_income_statement(self, symbol, period='quarter', limit=4):
+        filed = self.filings.get(symbol, '2024-05-01')
+        return [{'date': '2024-03-31', 'fillingDate': filed}][:limit]
+
+
+def _pipeline(tmp_path, mode):
+    pipeline = object.__new__(ScreenerPipeline)
+    pipeline.config = {'pipeline': {'mode': mode, 'max_workers': 4}}
+    pipeline.fmp = FakeFMP()
+    pipeline.async_fmp = None
+    pipeline.checkpoint = None
+    pipeline.run_metrics = RunMetrics()
+    pipeline.features = FakeFeatures()
+    pipeline.guardrails = FakeGuardrails(pipeline.features)
+    pipeline.feature_store = FeatureStore(tmp_path / mode / 'features.sqlite')
+    pipeline.incremental_max_age_hours = 168
+    pipeline.incremental_ttl_hours = 24
+    pipeline.df_topk = pd.DataFrame({
+        'ticker': ['AAPL', 'JPM', 'O', 'BAD'],
+        'is_financial': [False, True, False, False],
+        'is_REIT': [False, False, True, False],
+        'is_utility': [False, False, False, False],
+        'industry': ['Hardware', 'Banks', 'REIT', 'Other'],
+    })
+    return pipeline
+
+
+class TestPipelinedMode:
+
+    def test_same_result_as_staged(self, tmp_path):
+        staged = _pipeline(tmp_path, 'staged')
+        staged._calculate_features()
+        staged._calculate_guardrails()
+
+        pipelined = _pipeline(tmp_path, 'pipelined')
+        pipelined._calculate_pipelined()
+
+        expected = staged.df_topk.sort_values('ticker').reset_index(drop=True)
+        actual = pipelined.df_topk.sort_values('ticker').reset_index(drop=True)
+        pd.testing.assert_frame_equal(actual[expected.columns], expected)
+        assert actual.set_index('ticker').loc['BAD', 'guardrail_status'] == 'AMBAR'
+        assert pipelined.guardrails.order_ok
+
+    def test_incremental_features_skip_recompute(self, tmp_path):
+        first = _pipeline(tmp_path, 'pipelined')
+        first._calculate_pipelined()
+
+        second = _pipeline(tmp_path, 'pipelined')
+        second.guardrails = FakeGuardrails()
+        second._calculate_pipelined()
+
+        assert second.features.calls == []
+        assert second.df_topk.set_index('ticker').loc['AAPL', 'roic_%'] == 40.0
+
+
+class FakeScreenerFMP:
+    """stock-screener by country; tracks concurrency, fails for 'XX'."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+
+    def get_stock_screener(self, country=None, **filters):
+        with self.lock:
+            self.calls.append(country)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.05)
+            if country == 'XX':
+                raise ConnectionError('market down')
+            return [{'symbol': f'{country}1'}, {'symbol': f'{country}2'}]
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class TestScreenMarkets:
+
+    def _pipeline(self):
+        pipeline = object.__new__(ScreenerPipeline)
+        pipeline.config = {'universe': {'fetch_workers': 4}}
+        pipeline.fmp = FakeScreenerFMP()
+        pipeline.checkpoint = None
+        return pipeline
+
+    def test_concurrent_and_ordered(self):
+        pipeline = self._pipeline()
+        markets = ['US', 'CA', 'UK', 'DE', 'JP', 'AU']
+
+        profiles = pipeline._screen_markets('country', markets, 1_000_000, 5_000_000)
+
+        assert [p['symbol'] for p in profiles][::2] == [f'{m}1' for m in markets]
+        assert 1 < pipeline.fmp.max_in_flight <= 4
+
+    def test_failing_market_is_isolated(self):
+        pipeline = self._pipeline()
+
+        profiles = pipeline._screen_markets('country', ['US', 'XX', 'CA'], 1_000_000, 5_000_000)
+
+        assert [p['symbol'] for p in profiles] == ['US1', 'US2', 'CA1', 'CA2']
+
+    def test_all_markets_failing_raises(self):
+        pipeline = self._pipeline()
+
+        with pytest.raises(ConnectionError):
+            pipeline._screen_markets('country', ['XX'], 1_000_000, 5_000_000)
+
+
+class TestFilingKeyedIncremental:
+
+    def test_new_filing_triggers_recompute(self, tmp_path):
+        first = _pipeline(tmp_path, 'staged')
+        first._calculate_features()
+
+        second = _pipeline(tmp_path, 'staged')
+        second.fmp.filings = {'JPM': '2024-08-01'}  # New 10-Q for JPM only
+        second._calculate_features()
+
+        assert second.features.calls == ['JPM']
+        assert len(second.df_topk) == 4
+        assert second.df_topk['roic_%'].notna().all()
+
+    def test_unchanged_filing_survives_wall_clock_ttl(self, tmp_path):
+        first = _pipeline(tmp_path, 'pipelined')
+        first._calculate_pipelined()
+        with first.feature_store._connect() as conn:
+            conn.execute("UPDATE features SET computed_at = computed_at - ?", (3 * 24 * 3600,))
+
+        second = _pipeline(tmp_path, 'pipelined')
+        second.guardrails = FakeGuardrails()
+        second._calculate_pipelined()
+
+        # 3 days > incremental_ttl_hours, but no new filing and < max age
+        assert second.features.calls == []
+
+    def test_failures_are_not_stored(self, tmp_path):
+        pipeline = _pipeline(tmp_path, 'staged')
+        pipeline.features.calculate_features = lambda symbol, company_type: {}
+        pipeline._calculate_features()
+
+        assert pipeline.feature_store.get_stats()['symbols'] == 0
+
+
+class TestQualitativeBatch:
+
+    failing = ()
+
+    class FakeAnalyzer:
+        """Records analyze_symbol calls; fails for 'BAD'."""
+
+        def __init__(self, fmp, config):
+            self.calls = []
+            TestQualitativeBatch.analyzer = self
+
+        def analyze_symbol(self, symbol, company_type, peers_df=None):
+            self.calls.append((symbol, company_type))
+            if symbol == 'BAD':
+                raise RuntimeError('boom')
+            if symbol in TestQualitativeBatch.failing:
+                return {'symbol': symbol, 'error': 'All sections failed'}
+            return {'symbol': symbol, 'business_summary': f"{symbol} summary"}
+
+    def _pipeline(self, tmp_path, monkeypatch):
+        import src.screener.orchestrator as orchestrator
+        monkeypatch.setattr(orchestrator, 'QualitativeAnalyzer', self.FakeAnalyzer)
+
+        pipeline = object.__new__(ScreenerPipeline)
+        pipeline.config = {'output': {'qualitative_dir': str(tmp_path / 'qualitative')}}
+        pipeline.fmp = FakeFMP()
+        pipeline.checkpoint = None
+        pipeline.run_id = None
+        pipeline.df_final = pd.DataFrame({
+            'ticker': ['AAPL', 'JPM', 'O', 'BAD', 'XOM'],
+            'decision': ['BUY', 'MONITOR', 'AVOID', 'BUY', 'BUY'],
+            'is_financial': [False, True, False, False, False],
+            'is_REIT': [False, False, True, False, False],
+            'is_utility': [False, False, False, False, False],
+        })
+        return pipeline
+
+    def test_buy_and_monitor_persisted_with_progress(self, tmp_path, monkeypatch):
+        pipeline = self._pipeline(tmp_path, monkeypatch)
+        progress = []
+
+        summaries = pipeline.run_qualitative_batch(progress=lambda done, total, s: progress.append((done, total)))
+
+        assert set(summaries) == {'AAPL', 'JPM', 'BAD', 'XOM'}
+        assert summaries['BAD']['error'] == 'boom'
+        assert ('JPM', 'financial') in self.analyzer.calls
+        assert sorted(progress) == [(1, 4), (2, 4), (3, 4), (4, 4)]
+
+        run_dir = next((tmp_path / 'qualitative').iterdir())
+        assert json.loads((run_dir / 'AAPL.json').read_text())['business_summary'] == 'AAPL summary'
+        assert not (run_dir / 'BAD.json').exists()
+        assert json.loads((run_dir / 'index.json').read_text())['BAD']['error'] == 'boom'
+
+    def test_resumes_from_persisted_tickers(self, tmp_path, monkeypatch):
+        pipeline = self._pipeline(tmp_path, monkeypatch)
+        pipeline.run_qualitative_batch(symbols=['AAPL', 'XOM'])
+
+        summaries = pipeline.run_qualitative_batch()
+
+        assert sorted(s for s, _ in self.analyzer.calls) == ['BAD', 'JPM']
+        assert summaries['AAPL']['business_summary'] == 'AAPL summary'
+
+    def test_errored_summaries_are_retried_on_resume(self, tmp_path, monkeypatch):
+        pipeline = self._pipeline(tmp_path, monkeypatch)
+        monkeypatch.setattr(TestQualitativeBatch, 'failing', ('XOM',))
+        first = pipeline.run_qualitative_batch(symbols=['AAPL', 'XOM'])
+
+        assert first['XOM']['error'] == 'All sections failed'
+        run_dir = next((tmp_path / 'qualitative').iterdir())
+        assert not (run_dir / 'XOM.json').exists()
+
+        monkeypatch.setattr(TestQualitativeBatch, 'failing', ())
+        summaries = pipeline.run_qualitative_batch(symbols=['AAPL', 'XOM'])
+
+        assert self.analyzer.calls == [('XOM', 'non_financial')]
+        assert summaries['XOM']['business_summary'] == 'XOM summary'
+
+    def test_same_day_runs_get_their_own_directory(self, tmp_path, monkeypatch):
+        self._pipeline(tmp_path, monkeypatch).run_qualitative_batch(symbols=['AAPL'])
+        self._pipeline(tmp_path, monkeypatch).run_qualitative_batch(symbols=['AAPL'])
+
+        # Second run analyzed again instead of resuming the first run's directory
+        assert self.analyzer.calls == [('AAPL', 'non_financial')]
+        assert len(list((tmp_path / 'qualitative').iterdir())) == 2
@@ -0,0 +1,210 @@
+"""
+Tests for the shared peer metrics cache (peer multiples, peer guardrails).
+"""
+from collections import Counter
+
+import pytest
+
+from src.screener.peer_comparison import PeerComparator
+from src.screener.peer_metrics import PeerMetricsCache
+from src.screener.qualitative import QualitativeAnalyzer
+
+
+class PeerFMP:
+    """Statements and profiles for any symbol; counts every call."""
+
+    def __init__(self, filing_date='2024-12-31'):
+        self.calls = Counter()
+        self.filing_date = filing_date
+
+    def get_profile(self, symbol):
+        self.calls[('profile', symbol)] += 1
+        return [self._profile(symbol)]
+
+    def get_profile_bulk(self, symbols):
+        self.calls[('profile_bulk',)] += 1
+        return [self._profile(s) for s in symbols]
+
+    def _profile(self, symbol):
+        return {'symbol': symbol, 'price': 50.0, 'mktCap': 5e9, 'sharesOutstanding': 1e8}
+
+    def get_income_statement(self, symbol, period='quarter', limit=4):
+        self.calls[('income', symbol, period, limit)] += 1
+        records = [
+            {'date': self.filing_date, 'fillingDate': self.filing_date, 'eps': 2.5, 'revenue': 2e9, 'ebitda': 5e8,
+             'netIncome': 2.5e8},
+            {'date': '2023-12-31', 'fillingDate': '2024-02-01', 'eps': 2.0, 'revenue': 1.8e9, 'ebitda': 4e8},
+        ]
+        return records[:limit]
+
+    def get_balance_sheet(self, symbol, period='quarter', limit=4):
+        self.calls[('balance', symbol, period, limit)] += 1
+        return [{'date': self.filing_date, 'totalStockholdersEquity': 1e9, 'totalDebt': 1e9,
+                 'cashAndCashEquivalents': 5e8}][:limit]
+
+
+class FakeGuardrails:
+    def __init__(self, fmp, config=None):
+        self.fmp = fmp
+        self.config = config or {}
+        self.calls = Counter()
+
+    def calculate_guardrails(self, symbol, company_type, industry):
+        self.calls[symbol] += 1
+        return {'altmanZ': 3.0 + len(symbol), 'beneishM': -2.5,
+                'margin_trajectory': {'gross_margin_current': 40.0 + len(symbol)}}
+
+
+class TestPeerMultiples:
+
+    EXPECTED = {'symbol': 'P1', 'pe': 20.0, 'pb': 5.0, 'ps': 2.5, 'ev_ebitda': 11.0, 'peg': 0.8}
+
+    def test_multiples_from_bulk_profiles(self):
+        fmp = PeerFMP()
+        multiples = QualitativeAnalyzer(fmp, {})._get_peer_multiples(['P1', 'P2'])
+
+        assert multiples[0] == pytest.approx(self.EXPECTED)
+        assert [m['symbol'] for m in multiples] == ['P1', 'P2']
+        assert fmp.calls[('profile_bulk',)] == 1
+        assert fmp.calls[('profile', 'P1')] == 0
+
+    def test_industry_peers_computed_once(self):
+        fmp = PeerFMP()
+        analyzer = QualitativeAnalyzer(fmp, {})
+        peer_sets = [[f"P{(i + j) % 8}" for j in range(5)] for i in range(20)]
+
+        for peers in peer_sets:
+            assert len(analyzer._get_peer_multiples(peers)) == 5
+
+        # Statements read once per distinct peer, not per ticker (later
+        # lookups only re-check the latest filing date)
+        assert all(fmp.calls[('income', f"P{i}", 'annual', 2)] == 1 for i in range(8))
+        assert all(fmp.calls[('balance', f"P{i}", 'annual', 1)] == 1 for i in range(8))
+        assert analyzer.peer_metrics.get_stats()['computed'] == 8
+
+    def test_persisted_until_new_filing(self, tmp_path):
+        db_path = str(tmp_path / 'peer_metrics.sqlite')
+        QualitativeAnalyzer(PeerFMP(), {}, PeerMetricsCache(db_path))._get_peer_multiples(['P1'])
+
+        # Next session: only the filing-date check reads a statement
+        fmp = PeerFMP()
+        cache = PeerMetricsCache(db_path)
+        multiples = QualitativeAnalyzer(fmp, {}, cache)._get_peer_multiples(['P1'])
+        assert multiples[0] == pytest.approx(self.EXPECTED)
+        assert cache.get_stats()['store_hits'] == 1
+        assert fmp.calls[('balance', 'P1', 'annual', 1)] == 0
+
+        # A new annual filing invalidates the entry
+        fmp = PeerFMP(filing_date='2025-12-31')
+        cache = PeerMetricsCache(db_path)
+        QualitativeAnalyzer(fmp, {}, cache)._get_peer_multiples(['P1'])
+        assert cache.get_stats()['computed'] == 1
+        assert fmp.calls[('balance', 'P1', 'annual', 1)] == 1
+
+    def test_missing_statements_skip_the_peer(self):
+        fmp = PeerFMP()
+        fmp.get_balance_sheet = lambda symbol, period='quarter', limit=4: []
+        assert QualitativeAnalyzer(fmp, {})._get_peer_multiples(['P1']) == []
+
+
+class TestPeerComparator:
+
+    GUARDRAILS = {'altmanZ': 4.0, 'beneishM': -2.0, 'margin_trajectory': {'gross_margin_current': 45.0}}
+
+    def test_peer_guardrails_shared_across_companies(self):
+        fmp = PeerFMP()
+        calc = FakeGuardrails(fmp)
+        comparator = PeerComparator(fmp, calc)
+
+        first = comparator.compare_to_peers('AAA', self.GUARDRAILS, ['AAA', 'P1', 'P22', 'P333'], 'Semiconductors')
+        comparator.compare_to_peers('BBB', self.GUARDRAILS, ['P1', 'P22', 'P333', 'P4444'], 'Semiconductors')
+
+        assert first['altman_z']['peer_count'] == 3
+        assert first['altman_z']['peer_median'] == pytest.approx(5.0 + 1)
+        assert calc.calls == Counter({'P1': 1, 'P22': 1, 'P333': 1, 'P4444': 1})
+
+    def test_industry_is_part_of_the_key(self):
+        fmp = PeerFMP()
+        calc = FakeGuardrails(fmp)
+        cache = PeerMetricsCache()
+        cache.guardrails(calc, 'P1', 'non_financial', 'Semiconductors')
+        cache.guardrails(calc, 'P1', 'non_financial', 'Software')
+        cache.guardrails(calc, 'P1', 'non_financial', 'Semiconductors')
+        assert calc.calls['P1'] == 2
+
+    def test_default_cache_follows_guardrails_config(self, tmp_path):
+        db_path = str(tmp_path / 'peer_metrics.sqlite')
+        config = {'cache': {'peer_metrics_db_path': db_path}}
+        peers = ['P1', 'P22', 'P333']
+
+        PeerComparator(PeerFMP(), FakeGuardrails(PeerFMP(), config)).compare_to_peers('AAA', self.GUARDRAILS, peers)
+
+        # A new comparator (next session) reads the persisted peer guardrails
+        calc = FakeGuardrails(PeerFMP(), config)
+        comparator = PeerComparator(calc.fmp, calc)
+        comparator.compare_to_peers('AAA', self.GUARDRAILS, peers)
+        assert comparator.peer_metrics.db_path == db_path
+        assert calc.calls == Counter()
+        assert comparator.peer_metrics.get_stats()['store_hits'] == 3
+
+
+class TestMemoryBound:
+
+    def test_least_recently_used_entries_dropped(self):
+        cache = PeerMetricsCache(memory_max_entries=2)
+        computed = Counter()
+
+        def get(symbol):
+            def compute():
+                computed[symbol] += 1
+                return symbol.lower()
+            return cache.get('kind', symbol, compute, lambda: None)
+
+        assert [get(s) for s in ('A', 'B', 'A', 'C')] == ['a', 'b', 'a', 'c']
+        assert cache.get_stats()['memory_entries'] == 2
+        get('A')  # Still held (used more recently than B)
+        get('B')  # Dropped when C was added
+        assert computed == Counter({'A': 1, 'B': 2, 'C': 1})
+        assert not cache._loading
+
+
+class TestMemoryRevalidation:
+
+    def test_new_filing_invalidates_memory_entry(self):
+        fmp = PeerFMP()
+        cache = PeerMetricsCache()
+        cache.multiples_inputs(fmp, 'P1')
+        cache.multiples_inputs(fmp, 'P1')
+        assert cache.get_stats()['memory_hits'] == 1
+
+        fmp.filing_date = '2025-12-31'
+        inputs = cache.multiples_inputs(fmp, 'P1')
+
+        assert inputs['income'][0]['date'] == '2025-12-31'
+        assert cache.get_stats()['computed'] == 2
+
+    def test_memory_entry_expires_after_max_age(self):
+        cache = PeerMetricsCache(max_age_hours=1)
+        computed = Counter()
+
+        def get():
+            def compute():
+                computed['A'] += 1
+                return 'a'
+            return cache.get('kind', 'A', compute, lambda: 'filing-1')
+
+        get()
+        get()
+        cache._memory[('kind', 'A')]['computed_at'] -= 2 * 3600
+        get()
+        assert computed['A'] == 2
+
+    def test_missing_data_is_not_memoized(self):
+        fmp = PeerFMP()
+        fmp.get_balance_sheet = lambda symbol, period='quarter', limit=4: []
+        cache = PeerMetricsCache()
+
+        assert cache.multiples_inputs(fmp, 'P1') is None
+        assert cache.multiples_inputs(fmp, 'P1') is None
+        assert cache.get_stats()['computed'] == 2
+        assert cache.get_stats()['memory_entries'] == 0
@@ -0,0 +1,139 @@
+"""
+Tests for the incremental EOD price store.
+"""
+from datetime import date, timedelta
+
+from src.screener.ingest import FMPClient
+from src.screener.price_store import PriceStore
+
+
+def _bars(start: date, days: int):
+    """FMP-style bars, newest first."""
+    return [
+        {'date': (start + timedelta(days=i)).isoformat(), 'close': 100.0 + i, 'high': 101.0 + i,
+         'low': 99.0 + i, 'open': 100.0, 'volume': 1000 + i, 'label': 'ignored'}
+        for i in range(days)
+    ][::-1]
+
+
+class FakeAPI:
+    """Serves a fixed bar history filtered by from/to like FMP does."""
+
+    def __init__(self, bars):
+        self.bars = bars
+        self.calls = []
+
+    def __call__(self, from_date, to_date):
+        self.calls.append((from_date, to_date))
+        return {'symbol': 'AAPL', 'historical': [
+            b for b in self.bars
+            if (not from_date or b['date'] >= from_date) and (not to_date or b['date'] <= to_date)
+        ]}
+
+
+def _age_sync(store, seconds):
+    with store._connect() as conn:
+        conn.execute("UPDATE sync SET synced_at = synced_at - ?", (seconds,))
+
+
+class TestPriceStore:
+
+    def test_only_missing_bars_are_fetched(self, tmp_path):
+        store = PriceStore(tmp_path / 'prices.sqlite', refresh_hours=6)
+        api = FakeAPI(_bars(date(2024, 1, 1), 30))
+
+        first = store.history('AAPL', api, from_date='2024-01-01')
+        assert len(first['historical']) == 30
+        assert first['historical'][0]['date'] == '2024-01-30'
+
+        # Within the refresh period: served locally
+        store.history('AAPL', api, from_date='2024-01-01')
+        assert len(api.calls) == 1
+
+        # Next day: one new bar; only the tail is requested (from the last
+        # final stored bar, re-checked for upstream re-adjustment)
+        api.bars = _bars(date(2024, 1, 1), 31)
+        _age_sync(store, 7 * 3600)
+        latest = store.history('AAPL', api, from_date='2024-01-05')
+        assert api.calls[-1] == ('2024-01-29', None)
+        assert latest['historical'][0]['date'] == '2024-01-31'
+        assert latest['historical'][-1]['date'] == '2024-01-05'
+        assert store.get_stats()['bars_fetched'] == 30 + 3
+
+    def test_readjusted_history_is_replaced(self, tmp_path):
+        store = PriceStore(tmp_path / 'prices.sqlite')
+        bars = _bars(date(2024, 1, 1), 30)
+        for bar in bars:
+            bar['adjClose'] = bar['close']
+        api = FakeAPI(bars)
+        store.history('AAPL', api, from_date='2024-01-01')
+
+        # Dividend: FMP re-adjusts every past adjClose, then a new bar arrives
+        api.bars = _bars(date(2024, 1, 1), 31)
+        for bar in api.bars:
+            bar['adjClose'] = round(bar['close'] * 0.98, 4)
+        _age_sync(store, 7 * 3600)
+        result = store.history('AAPL', api, from_date='2024-01-01')
+
+        assert api.calls[-2:] == [('2024-01-29', None), ('2024-01-01', None)]
+        assert len(result['historical']) == 31
+        assert all(b['adjClose'] == round(b['close'] * 0.98, 4) for b in result['historical'])
+
+        # Unchanged anchor: plain delta, no re-sync
+        _age_sync(store, 7 * 3600)
+        store.history('AAPL', api, from_date='2024-01-01')
+        assert api.calls[-1] == ('2024-01-30', None)
+
+    def test_older_window_is_back_filled_once(self, tmp_path):
+        store = PriceStore(tmp_path / 'prices.sqlite')
+        api = FakeAPI(_bars(date(2024, 1, 1), 30))
+
+        store.history('AAPL', api, from_date='2024-01-20')
+        window = store.history('AAPL', api, from_date='2024-01-10', to_date='2024-01-15')
+        assert api.calls[-1] == ('2024-01-10', '2024-01-20')
+        assert [b['date'] for b in window['historical']][::5] == ['2024-01-15', '2024-01-10']
+
+        # Earlier than the listing date: remembered, not re-requested
+        store.history('AAPL', api, from_date='2023-06-01')
+        store.history('AAPL', api, from_date='2023-06-01')
+        assert len(api.calls) == 3
+
+    def test_unknown_symbol_returns_empty(self, tmp_path):
+        store = PriceStore(tmp_path / 'prices.sqlite')
+
+        assert store.history('NOPE', lambda f, t: {}, from_date='2024-01-01') == {}
+        assert store.get_sync_state('NOPE')['last_date'] is None
+
+    def test_frame_is_chronological_backtester_input(self, tmp_path):
+        store = PriceStore(tmp_path / 'prices.sqlite')
+        store.append('AAPL', _bars(date(2024, 1, 1), 10))
+
+        df = store.get_frame('AAPL', from_date='2024-01-03')
+
+        assert len(df) == 8
+        assert df['close'].iloc[0] == 102.0
+        assert df['date'].is_monotonic_increasing
+        assert {'date', 'close', 'high', 'low', 'volume'} <= set(df.columns)
+        assert 'label' not in df.columns
+
+
+class TestFMPClientPriceStore:
+
+    def test_daily_refresh_downloads_delta(self, fmp_stub, stub_config):
+        history = _bars(date(2024, 1, 1), 400)
+
+        def serve(query):
+            return {'symbol': 'AAPL', 'historical': [
+                b for b in history if b['date'] >= query.get('from', '')
+            ]}
+
+        fmp_stub.route('historical-price-full/AAPL', serve)
+        client = FMPClient('test-key', stub_config)
+
+        client.get_historical_prices('AAPL', from_date='2024-01-01')
+        _age_sync(client.price_store, 24 * 3600)
+        result = client.get_historical_prices('AAPL', from_date='2024-01-02')
+
+        assert len(result['historical']) == 399
+        assert fmp_stub.requests[-1][1]['from'] == history[1]['date']
+        assert client.price_store.get_stats()['bars_fetched'] == 402
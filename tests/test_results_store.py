@@ -0,0 +1,156 @@
+"""
+Tests for the columnar (Arrow IPC) results store.
+"""
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from src.screener.results_store import list_results, load_results, write_results
+
+
+def _results(n=3):
+    return pd.DataFrame({
+        'ticker': [f'T{i}' for i in range(n)],
+        'composite_0_100': np.linspace(10, 90, n),
+        'is_financial': [i % 2 == 0 for i in range(n)],
+        'altmanZ': [None if i == 1 else 3.2 for i in range(n)],
+        'guardrail_reasons': ['Beneish M > -1.78; Dilution', None, 'OK'][:n] * (n // 3 or 1),
+        'working_capital': [
+            {'dso_trend': 'rising', 'flags': ['AR growth > revenue'], 'dso_current': 48.5},
+            None,
+            {'dso_trend': 'stable', 'flags': [], 'dso_current': 31.0},
+        ][:n] * (n // 3 or 1),
+        # Mixed types: Arrow can't type it, stored as JSON
+        'notes_short': ['ok', 12.5, None][:n] * (n // 3 or 1),
+    })
+
+
+class TestResultsStore:
+
+    def test_round_trip_is_lossless(self, tmp_path):
+        df = _results()
+        path = write_results(df, tmp_path, run_id='run1', run_at=datetime(2024, 1, 15, 9, 30))
+
+        assert path == tmp_path / 'run_date=2024-01-15' / 'results-run1.arrow'
+        loaded = load_results(path)
+
+        assert loaded['ticker'].tolist() == df['ticker'].tolist()
+        assert loaded['composite_0_100'].tolist() == df['composite_0_100'].tolist()
+        assert loaded['is_financial'].dtype == bool
+        assert pd.isna(loaded['altmanZ'][1]) and loaded['altmanZ'][0] == 3.2
+        assert pd.isna(loaded['guardrail_reasons'][1]) and loaded['guardrail_reasons'][0] == df['guardrail_reasons'][0]
+        assert loaded['working_capital'][0]['dso_trend'] == 'rising'
+        assert list(loaded['working_capital'][0]['flags']) == ['AR growth > revenue']
+        assert loaded['working_capital'][1] is None
+        assert loaded['notes_short'].tolist() == ['ok', 12.5, None]
+
+    def test_latest_run_and_column_projection(self, tmp_path):
+        write_results(_results(), tmp_path, run_id='a', run_at=datetime(2024, 1, 14))
+        write_results(_results(6), tmp_path, run_id='b', run_at=datetime(2024, 1, 15))
+
+        assert [p.name for p in list_results(tmp_path)] == ['results-a.arrow', 'results-b.arrow']
+        latest = load_results(tmp_path, columns=['ticker', 'composite_0_100', 'missing'])
+        assert list(latest.columns) == ['ticker', 'composite_0_100']
+        assert len(latest) == 6
+
+    def test_empty_store(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_results(tmp_path)
+
+
+def _pipeline(tmp_path, df, **output):
+    from src.screener.orchestrator import ScreenerPipeline
+
+    pipeline = object.__new__(ScreenerPipeline)
+    pipeline.config = {'output': dict({
+        'csv_path': str(tmp_path / 'screener_results.csv'),
+        'results_dir': str(tmp_path / 'results'),
+    }, **output)}
+    pipeline.checkpoint = None
+    pipeline.df_final = df
+    return pipeline
+
+
+class TestPipelineExport:
+
+    def test_csv_and_columnar_exports(self, tmp_path):
+        from src.screener.orchestrator import EXPORT_COLUMNS, ScreenerPipeline
+
+        pipeline = object.__new__(ScreenerPipeline)
+        pipeline.config = {'output': {
+            'csv_path': str(tmp_path / 'screener_results.csv'),
+            'results_dir': str(tmp_path / 'results'),
+            'columnar': True,
+        }}
+        pipeline.checkpoint = None
+        pipeline.df_final = _results()
+
+        csv_path = pipeline._export_results()
+
+        assert list(pd.read_csv(csv_path).columns) == EXPORT_COLUMNS
+        loaded = load_results(tmp_path / 'results')
+        assert list(loaded.columns[:len(EXPORT_COLUMNS)]) == EXPORT_COLUMNS
+        assert loaded['working_capital'][0]['dso_trend'] == 'rising'
+
+    def test_columnar_off_by_default(self, tmp_path):
+        pipeline = _pipeline(tmp_path, _results())
+        pipeline._export_results()
+
+        assert pipeline.results_path is None
+        assert not (tmp_path / 'results').exists()
+
+    def test_csv_and_columnar_loaders_agree(self, tmp_path):
+        """The UI reads the CSV, --qualitative-batch the columnar copy: same frame."""
+        from src.screener.orchestrator import EXPORT_COLUMNS
+
+        df = pd.DataFrame({
+            'ticker': ['AAA', 'BBB', 'CCC'],
+            'name': ['Alpha, Inc.', 'Beta "B" Corp', 'Gamma\nHoldings'],
+            'sector': ['Technology', 'Financial Services', 'Utilities'],
+            'is_financial': [False, True, False],
+            'marketCap': [5.2e9, 1.1e10, 8e8],
+            'altmanZ': [3.1, None, 1.2],
+            'guardrail_status': ['VERDE', 'AMBAR', 'ROJO'],
+            'guardrail_reasons': ['OK', None, 'Beneish M > -1.78; Dilution'],
+            'composite_0_100': [81.5, 64.0, 22.25],
+            'decision': ['BUY', 'MONITOR', 'AVOID'],
+        })
+        pipeline = _pipeline(tmp_path, df, columnar=True)
+        csv_path = pipeline._export_results()
+
+        from_csv = pd.read_csv(csv_path, encoding='utf-8', quoting=1)
+        from_arrow = load_results(pipeline.results_path, columns=EXPORT_COLUMNS)
+
+        assert from_csv['name'].tolist() == ['Alpha, Inc.', 'Beta "B" Corp', 'Gamma Holdings']
+        pd.testing.assert_frame_equal(from_arrow, from_csv, check_dtype=False)
+
+    def test_load_prefers_the_newer_export(self, tmp_path):
+        import os
+
+        pipeline = _pipeline(tmp_path, _results(), columnar=True)
+        pipeline._export_results()
+        label = pipeline.results_path.stem[len('results-'):]
+
+        pipeline.df_final = None
+        assert pipeline._load_final_results() == label
+        assert 'working_capital' in pipeline.df_final.columns
+
+        # A later CSV-only export supersedes the columnar copy
+        csv_path = tmp_path / 'screener_results.csv'
+        os.utime(csv_path, (time.time() + 60, time.time() + 60))
+        assert pipeline._load_final_results() != label
+        assert 'working_capital' not in pipeline.df_final.columns
+
+    def test_load_ignores_columnar_copy_when_disabled(self, tmp_path):
+        pipeline = _pipeline(tmp_path, _results(), columnar=True)
+        pipeline._export_results()
+
+        pipeline.config['output']['columnar'] = False
+        pipeline._load_final_results()
+
+        assert 'working_capital' not in pipeline.df_final.columns
@@ -0,0 +1,147 @@
+"""
+Tests for the dependency-aware task runner and its use in qualitative analysis.
+"""
+import threading
+import time
+
+import pytest
+
+from src.screener.qualitative import QualitativeAnalyzer
+from src.screener.task_graph import Task, run_tasks
+from src.screener.tracing import InMemorySpanExporter, Tracer, flush_traces, set_tracer, span
+
+from tests.test_financial_bundle import CountingFMP
+
+
+def _sleep(seconds, value):
+    def fn(inputs):
+        time.sleep(seconds)
+        return value
+    return fn
+
+
+class TestRunTasks:
+
+    def test_independent_tasks_overlap(self):
+        tasks = [Task(name, _sleep(0.2, name)) for name in 'abcde']
+        start = time.monotonic()
+        results, failures = run_tasks(tasks)
+        assert time.monotonic() - start < 0.6
+        assert results == {name: name for name in 'abcde'}
+        assert failures == {}
+
+    def test_dependencies_see_results_in_order(self):
+        order = []
+        lock = threading.Lock()
+
+        def record(name, value):
+            def fn(inputs):
+                with lock:
+                    order.append(name)
+                return value(inputs)
+            return fn
+
+        tasks = [
+            Task('value', record('value', lambda r: r['moats'] + r['peers']), deps=('peers', 'moats')),
+            Task('moats', record('moats', lambda r: r['peers'] * 10), deps=('peers',)),
+            Task('peers', record('peers', lambda r: (time.sleep(0.05), 1)[1])),
+        ]
+        results, _ = run_tasks(tasks)
+        assert order == ['peers', 'moats', 'value']
+        assert results['value'] == 11
+
+    def test_failure_and_timeout_yield_defaults(self):
+        def boom(inputs):
+            raise RuntimeError('endpoint down')
+
+        tasks = [
+            Task('slow', _sleep(5, 'late'), default={}, timeout=0.2),
+            Task('broken', boom, default=[]),
+            Task('after', lambda r: (r['slow'], r['broken']), deps=('slow', 'broken')),
+        ]
+        start = time.monotonic()
+        results, failures = run_tasks(tasks, timeout=10)
+        assert time.monotonic() - start < 1.0
+        assert results['after'] == ({}, [])
+        assert failures == {'slow': 'timeout', 'broken': 'RuntimeError: endpoint down'}
+
+    def test_invalid_graphs_are_rejected(self):
+        with pytest.raises(ValueError, match='cycle'):
+            run_tasks([Task('a', lambda r: 1, deps=('b',)), Task('b', lambda r: 1, deps=('a',))])
+        with pytest.raises(ValueError, match='unknown'):
+            run_tasks([Task('a', lambda r: 1, deps=('missing',))])
+
+    def test_spans_nest_under_the_caller(self):
+        exporter = InMemorySpanExporter()
+        set_tracer(Tracer(exporter))
+        try:
+            def traced_task(inputs):
+                with span('child'):
+                    return 1
+
+            with span('parent'):
+                run_tasks([Task('a', traced_task)])
+            flush_traces()
+        finally:
+            set_tracer(None)
+        spans = {s['name']: s for s in exporter.spans}
+        assert spans['child']['parentSpanId'] == spans['parent']['spanId']
+
+
+def _raise(*args, **kwargs):
+    raise RuntimeError('down')
+
+
+class SlowTranscriptFMP(CountingFMP):
+    """Every section endpoint takes `delay`; transcripts hang."""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay_per_call = delay
+
+    def __getattr__(self, name):
+        if name == 'get_earnings_call_transcript':
+            return lambda *args, **kwargs: (time.sleep(5), [])[1]
+        if name.startswith('get_'):
+            return lambda *args, **kwargs: (time.sleep(self.delay_per_call), [])[1]
+        raise AttributeError(name)
+
+
+class TestQualitativeSections:
+
+    def test_slow_transcript_does_not_stall_report(self):
+        config = {'qualitative': {'section_timeout_seconds': 1, 'section_timeouts': {'transcript': 0.3}}}
+        analyzer = QualitativeAnalyzer(SlowTranscriptFMP(delay=0.05), config)
+
+        start = time.monotonic()
+        summary = analyzer.analyze_symbol('AAA', 'non_financial')
+        assert time.monotonic() - start < 3
+
+        # Sections that read transcripts time out; the rest complete
+        assert summary['sections_failed']['transcript'] == 'timeout'
+        assert set(summary['sections_failed']) <= {'transcript', 'contextual_warnings'}
+        assert summary['transcript_TLDR'] == {}
+        assert summary['business_summary']
+        assert summary['intrinsic_value']
+
+    def test_timed_out_section_leaves_a_usable_summary(self):
+        config = {'qualitative': {'section_timeouts': {'transcript': 0.1}}}
+        summary = QualitativeAnalyzer(SlowTranscriptFMP(delay=0), config).analyze_symbol('AAA', 'non_financial')
+
+        # The UI treats 'error' as a failed analysis; a partial failure is not one
+        assert 'error' not in summary
+        assert summary['sections_failed']['transcript'] == 'timeout'
+        assert summary['business_summary'] and summary['intrinsic_value']
+
+    def test_error_when_every_section_fails(self):
+        config = {'qualitative': {'section_timeout_seconds': 0.2}}
+        analyzer = QualitativeAnalyzer(SlowTranscriptFMP(delay=0), config)
+        for name in ('_get_business_summary', '_get_peer_analysis', '_assess_moats', '_assess_skin_in_game',
+                     '_summarize_news', '_summarize_press_releases', '_summarize_transcript',
+                     '_extract_backlog_data', '_get_recent_mna', '_synthesize_risks',
+                     '_estimate_intrinsic_value', '_assess_contextual_warnings'):
+            setattr(analyzer, name, _raise)
+
+        summary = analyzer.analyze_symbol('AAA', 'non_financial')
+        assert len(summary['sections_failed']) == 12
+        assert 'business_summary: RuntimeError: down' in summary['error']
@@ -0,0 +1,100 @@
+"""
+Tests for the precompiled keyword matcher and its use in qualitative analysis.
+"""
+import random
+
+from src.screener.qualitative import (
+    BACKLOG_CHANGE_PATTERNS, GUIDANCE_PATTERN, MOAT_KEYWORDS, NEWS_TAGS, QualitativeAnalyzer
+)
+from src.screener.text_matching import KeywordMatcher
+
+
+def _naive_hits(categories, text):
+    lower = text.lower()
+    return {name for name, keywords in categories.items() if any(kw.lower() in lower for kw in keywords)}
+
+
+class TestKeywordMatcher:
+
+    CATEGORIES = {
+        'switching': ['platform', 'cloud platform', 'subscription'],
+        'network': ['platform', 'network', 'social network'],
+        'regulatory': ['license', 'licensed', 'FDA approved'],
+        'litigation': ['sue', 'lawsuit'],
+    }
+
+    def test_all_categories_in_one_call(self):
+        matcher = KeywordMatcher(self.CATEGORIES)
+        assert matcher.hits('A Cloud Platform, FDA-approved? No: FDA Approved.') == {
+            'switching', 'network', 'regulatory'
+        }
+        assert matcher.hits('The issue was settled') == {'litigation'}
+        assert matcher.hits('') == set()
+
+    def test_same_result_as_substring_search(self):
+        random.seed(7)
+        words = [kw for keywords in self.CATEGORIES.values() for kw in keywords] + ['the', 'iss', 'ue', 'plat', 'form']
+        matcher = KeywordMatcher(self.CATEGORIES)
+        for _ in range(500):
+            text = ''.join(random.choice(words) + random.choice(['', ' ', '-']) for _ in range(random.randint(0, 6)))
+            assert matcher.hits(text) == _naive_hits(self.CATEGORIES, text)
+
+    def test_redundant_keywords_are_dropped(self):
+        matcher = KeywordMatcher(self.CATEGORIES)
+        assert matcher.categories['switching'] == ('platform', 'subscription')
+        assert matcher.categories['regulatory'] == ('license', 'fda approved')
+
+    def test_restricted_categories(self):
+        matcher = KeywordMatcher(self.CATEGORIES)
+        assert matcher.hits('lawsuit over the platform', ('litigation',)) == {'litigation'}
+        assert matcher.matches('social network', 'network')
+        assert not matcher.matches('social network', 'switching')
+
+
+class TestQualitativeKeywords:
+
+    def test_moat_categories(self):
+        hits = MOAT_KEYWORDS.hits('Enterprise SaaS platform with a developer ecosystem; FDA approved')
+        assert {'switching_strong', 'switching_probable', 'network_probable', 'regulatory_strong'} <= hits
+
+    def test_news_tags(self):
+        assert NEWS_TAGS.hits('SEC settles lawsuit; company raises guidance') == {
+            'regulatory', 'litigation', 'financing', 'guidance'
+        }
+
+    def test_transcript_sections(self):
+        content = '\n\n'.join(
+            ['Revenue growth was strong.', 'We see FX headwinds.', 'We expect margin expansion next quarter.']
+            + ['Thank you, operator.'] * 8
+            + ['Our outlook for Q4 revenue is $3.2B.', 'One more risk to revenue.']
+        )
+
+        class FMP:
+            def get_earnings_call_transcript(self, symbol):
+                return [{'content': content}]
+
+        tldr = QualitativeAnalyzer(FMP(), {})._summarize_transcript('AAA')
+        assert tldr['highlights'] == ['Revenue growth was strong.', 'We expect margin expansion next quarter.']
+        assert tldr['risks'] == ['We see FX headwinds.']
+        # Outlook looks past the first 10 paragraphs; highlights and risks don't
+        assert tldr['outlook'] == ['We expect margin expansion next quarter.', 'Our outlook for Q4 revenue is $3.2B.']
+        assert tldr['guidance_points'] == [{'horizon': 'Q4', 'metric': 'revenue', 'value': '3.2B'}]
+
+    def test_precompiled_patterns(self):
+        assert GUIDANCE_PATTERN.findall('fy2025 EPS of 4.10 and Full-Year ebitda near 900M') == [
+            ('fy2025', 'EPS', '4.10'), ('Full-Year', 'ebitda', '900M')
+        ]
+        assert BACKLOG_CHANGE_PATTERNS[2].search('a 12.5% increase in backlog').group(1) == '12.5'
+
+    def test_backlog_only_for_order_driven_industries(self):
+        class FMP:
+            def get_earnings_call_transcript(self, symbol):
+                return [{'content': 'Record backlog of $45.2 billion. Book-to-bill was 1.3 this quarter, strong.'}]
+
+        analyzer = QualitativeAnalyzer(FMP(), {})
+        assert analyzer._extract_backlog_data('AAA', 'Software')['backlog_mentioned'] is False
+
+        backlog = analyzer._extract_backlog_data('AAA', 'Aerospace & Defense')
+        assert backlog['backlog_value'] == '$45.2B'
+        assert backlog['book_to_bill'] == '1.3x'
+        assert backlog['order_trend'] == 'Positive'
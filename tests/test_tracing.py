@@ -0,0 +1,130 @@
+"""
+Tests for pipeline tracing.
+"""
+import json
+import threading
+
+import pytest
+
+from src.screener import tracing
+from src.screener.features import FeatureCalculator
+from src.screener.ingest import FMPClient
+from src.screener.tracing import (
+    NOOP_SPAN, InMemorySpanExporter, Tracer, configure_tracing, flush_traces, set_tracer, span, traced
+)
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    set_tracer(Tracer(exporter, batch_size=1000))
+    yield exporter
+    set_tracer(None)
+
+
+class TestDisabled:
+
+    def test_noop_when_disabled(self):
+        set_tracer(None)
+        assert span('anything', symbol='AAPL') is NOOP_SPAN
+
+        calls = []
+
+        @traced('work', attributes=('symbol',))
+        def work(symbol):
+            calls.append(symbol)
+            return symbol.lower()
+
+        assert work('AAPL') == 'aapl'
+        assert calls == ['AAPL']
+
+    def test_configure_from_config(self, tmp_path):
+        assert configure_tracing({}) is None
+        assert tracing.get_tracer() is None
+
+        path = tmp_path / 'traces.jsonl'
+        tracer = configure_tracing({'tracing': {'enabled': True, 'file_path': str(path)}})
+        try:
+            with span('pipeline.universe', markets=3):
+                pass
+            flush_traces()
+            record = json.loads(path.read_text().splitlines()[0])
+            assert record['name'] == 'pipeline.universe'
+            assert record['attributes'] == [{'key': 'markets', 'value': {'intValue': '3'}}]
+        finally:
+            set_tracer(None)
+        assert tracer is not None
+
+
+class TestSpans:
+
+    def test_nesting_and_attributes(self, exporter):
+        @traced(attributes=('symbol',))
+        def inner(self, symbol, limit=4):
+            return limit
+
+        with span('outer'):
+            inner(None, 'AAPL')
+            inner(None, symbol='MSFT')
+        flush_traces()
+
+        spans = {(s['name'], s['attributes'][0]['value']['stringValue'] if s['attributes'] else None): s
+                 for s in exporter.spans}
+        outer = spans[('outer', None)]
+        name = 'TestSpans.test_nesting_and_attributes.<locals>.inner'
+        for symbol in ('AAPL', 'MSFT'):
+            child = spans[(name, symbol)]
+            assert child['parentSpanId'] == outer['spanId']
+            assert child['traceId'] == outer['traceId']
+            assert int(child['endTimeUnixNano']) >= int(child['startTimeUnixNano'])
+        assert 'parentSpanId' not in outer
+
+    def test_error_status_and_reraise(self, exporter):
+        with pytest.raises(ValueError):
+            with span('failing'):
+                raise ValueError('boom')
+        flush_traces()
+        assert exporter.spans[0]['status'] == {'code': 2, 'message': 'ValueError: boom'}
+
+    def test_threads_start_their_own_traces(self, exporter):
+        def work():
+            with span('worker'):
+                pass
+
+        with span('main'):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        flush_traces()
+
+        spans = {s['name']: s for s in exporter.spans}
+        assert 'parentSpanId' not in spans['worker']
+        assert spans['worker']['traceId'] != spans['main']['traceId']
+
+    def test_batches_are_exported_when_full(self):
+        exporter = InMemorySpanExporter()
+        set_tracer(Tracer(exporter, batch_size=2))
+        try:
+            for name in ('a', 'b', 'c'):
+                with span(name):
+                    pass
+            assert [s['name'] for s in exporter.spans] == ['a', 'b']
+        finally:
+            set_tracer(None)
+        assert [s['name'] for s in exporter.spans] == ['a', 'b', 'c']
+
+
+class TestInstrumentation:
+
+    def test_feature_calculation_traces_api_requests(self, exporter, fmp_stub, stub_config):
+        fmp_stub.route('profile/AAPL', [{'symbol': 'AAPL', 'mktCap': 1e12}])
+        calculator = FeatureCalculator(FMPClient('test-key', stub_config))
+
+        calculator.calculate_features('AAPL', 'non_financial')
+        flush_traces()
+
+        root = next(s for s in exporter.spans if s['name'] == 'features.calculate')
+        assert {'key': 'symbol', 'value': {'stringValue': 'AAPL'}} in root['attributes']
+        requests = [s for s in exporter.spans if s['name'] == 'fmp.request']
+        assert requests
+        assert all(s['parentSpanId'] == root['spanId'] for s in requests)